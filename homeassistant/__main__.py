@@ -138,6 +138,11 @@ def get_arguments() -> argparse.Namespace:
     parser.add_argument(
         "--log-no-color", action="store_true", help="Disable color logs"
     )
+    parser.add_argument(
+        "--compact-states",
+        action="store_true",
+        help="Share equal state attribute strings to reduce memory usage",
+    )
     parser.add_argument(
         "--script", nargs=argparse.REMAINDER, help="Run one of the embedded scripts"
     )
@@ -201,6 +206,7 @@ def main() -> int:
         debug=args.debug,
         open_ui=args.open_ui,
         safe_mode=safe_mode,
+        compact_states=args.compact_states,
     )
 
     fault_file_name = os.path.join(config_dir, FAULT_LOG_FILENAME)
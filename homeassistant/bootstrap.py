@@ -262,6 +262,8 @@ async def async_setup_hass(
     async def create_hass() -> core.HomeAssistant:
         """Create the hass object and do basic setup."""
         hass = core.HomeAssistant(runtime_config.config_dir)
+        if runtime_config.compact_states:
+            hass.states.async_enable_compact_store()
         loader.async_setup(hass)
 
         await async_enable_logging(
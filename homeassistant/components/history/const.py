@@ -5,3 +5,6 @@ DOMAIN = "history"
 EVENT_COALESCE_TIME = 0.35
 
 MAX_PENDING_HISTORY_STATES = 2048
+
+# Historical states are fetched and sent to the client in chunks of rows
+HISTORY_CHUNK_SIZE = 8192
@@ -4,9 +4,13 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from datetime import datetime as dt
+from itertools import groupby
+import math
+from typing import Any
 
 from homeassistant.components.recorder import get_instance
 from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.const import COMPRESSED_STATE_LAST_UPDATED, COMPRESSED_STATE_STATE
 from homeassistant.core import HomeAssistant
 
 
@@ -31,3 +35,68 @@ def has_recorder_run_after(hass: HomeAssistant, run_time: dt) -> bool:
     return run_time >= process_timestamp(
         get_instance(hass).recorder_runs_manager.first.start
     )
+
+
+def _numeric_state(state: dict[str, Any]) -> float | None:
+    """Return the state as a float or None if it is not a finite number."""
+    try:
+        value = float(state[COMPRESSED_STATE_STATE])
+    except ValueError:
+        return None
+    return value if math.isfinite(value) else None
+
+
+def downsample_states(
+    states: list[dict[str, Any]],
+    start_time_ts: float,
+    end_time_ts: float,
+    max_points: int,
+) -> list[dict[str, Any]]:
+    """Downsample compressed states to at most max_points states.
+
+    The period is split in max_points // 4 buckets of equal duration and
+    the first, last, minimum and maximum state of each bucket are kept,
+    which preserves the shape of a graph of the states.
+
+    Every change to or from a non-numeric state is kept as well, so a door
+    that opened and closed within a bucket is not lost. The result can
+    have more than max_points states for entities which are not numeric.
+    """
+    if len(states) <= max_points or end_time_ts <= start_time_ts:
+        return states
+    buckets = max_points // 4
+    bucket_duration = (end_time_ts - start_time_ts) / buckets
+    result: list[dict[str, Any]] = []
+    for _, group in groupby(
+        states,
+        lambda state: min(
+            int(
+                (state[COMPRESSED_STATE_LAST_UPDATED] - start_time_ts)
+                // bucket_duration
+            ),
+            buckets - 1,
+        ),
+    ):
+        bucket = list(group)
+        if len(bucket) <= 4:
+            result.extend(bucket)
+            continue
+        keep = {0, len(bucket) - 1}
+        numeric: list[tuple[float, int]] = []
+        previous_value: float | None = None
+        for idx, state in enumerate(bucket):
+            if (value := _numeric_state(state)) is not None:
+                numeric.append((value, idx))
+            if (
+                idx
+                and (value is None or previous_value is None)
+                and state[COMPRESSED_STATE_STATE]
+                != bucket[idx - 1][COMPRESSED_STATE_STATE]
+            ):
+                keep.add(idx)
+            previous_value = value
+        if numeric:
+            keep.add(min(numeric)[1])
+            keep.add(max(numeric)[1])
+        result.extend(bucket[idx] for idx in sorted(keep))
+    return result
@@ -35,11 +35,15 @@ from homeassistant.helpers.event import (
     async_track_state_change_event,
 )
 from homeassistant.helpers.json import json_bytes
-from homeassistant.util.async_ import create_eager_task
+from homeassistant.util.async_ import create_eager_task, run_callback_threadsafe
 import homeassistant.util.dt as dt_util
 
-from .const import EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
-from .helpers import entities_may_have_state_changes_after, has_recorder_run_after
+from .const import EVENT_COALESCE_TIME, HISTORY_CHUNK_SIZE, MAX_PENDING_HISTORY_STATES
+from .helpers import (
+    downsample_states,
+    entities_may_have_state_changes_after,
+    has_recorder_run_after,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -72,25 +76,32 @@ def _ws_get_significant_states(
     significant_changes_only: bool,
     minimal_response: bool,
     no_attributes: bool,
+    max_points: int | None,
 ) -> bytes:
     """Fetch history significant_states and convert them to json in the executor."""
-    return json_bytes(
-        messages.result_message(
-            msg_id,
-            history.get_significant_states(
-                hass,
-                start_time,
-                end_time,
-                entity_ids,
-                None,
-                include_start_time_state,
-                significant_changes_only,
-                minimal_response,
-                no_attributes,
-                True,
-            ),
-        )
+    states = history.get_significant_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        None,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        True,
     )
+    if max_points:
+        start_time_ts = start_time.timestamp()
+        end_time_ts = (end_time or dt_util.utcnow()).timestamp()
+        for entity_id, entity_states in states.items():
+            states[entity_id] = downsample_states(  # type: ignore[assignment]
+                cast(list[dict[str, Any]], entity_states),
+                start_time_ts,
+                end_time_ts,
+                max_points,
+            )
+    return json_bytes(messages.result_message(msg_id, states))
 
 
 @websocket_api.websocket_command(
@@ -103,6 +114,7 @@ def _ws_get_significant_states(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("max_points"): vol.All(int, vol.Range(min=4)),
     }
 )
 @websocket_api.async_response
@@ -167,6 +179,7 @@ async def ws_get_history_during_period(
             significant_changes_only,
             minimal_response,
             no_attributes,
+            msg.get("max_points"),
         )
     )
 
@@ -210,8 +223,9 @@ def _generate_websocket_response(
     )
 
 
-def _generate_historical_response(
+def _send_historical_states(
     hass: HomeAssistant,
+    connection: ActiveConnection,
     msg_id: int,
     start_time: dt,
     end_time: dt,
@@ -221,47 +235,82 @@ def _generate_historical_response(
     minimal_response: bool,
     no_attributes: bool,
     send_empty: bool,
-) -> tuple[float, dt | None, bytes | None]:
-    """Generate a historical response."""
-    states = cast(
-        dict[str, list[dict[str, Any]]],
-        history.get_significant_states(
-            hass,
-            start_time,
-            end_time,
-            entity_ids,
-            None,
-            include_start_time_state,
-            significant_changes_only,
-            minimal_response,
-            no_attributes,
-            True,
-        ),
-    )
+) -> float:
+    """Fetch history significant_states and send them in chunks of rows.
+
+    Each chunk is converted to json and handed to the connection in the
+    event loop before the next chunk is fetched, so the rows held here are
+    bounded by the chunk size and the fetch stops as soon as the stream is
+    closed. The connection closes a client which does not keep up with the
+    queued messages.
+    """
+    loop = hass.loop
     last_time_ts = 0.0
-    for state_list in states.values():
+    for chunk in history.get_significant_states_chunks(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        None,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        True,
+        HISTORY_CHUNK_SIZE,
+    ):
+        states = cast(dict[str, list[dict[str, Any]]], chunk)
+        for state_list in states.values():
+            if (
+                state_list
+                and (state_last_time := state_list[-1][COMPRESSED_STATE_LAST_UPDATED])
+                > last_time_ts
+            ):
+                last_time_ts = cast(float, state_last_time)
         if (
-            state_list
-            and (state_last_time := state_list[-1][COMPRESSED_STATE_LAST_UPDATED])
-            > last_time_ts
+            states
+            and not run_callback_threadsafe(
+                loop,
+                _async_send_stream_message,
+                connection,
+                msg_id,
+                _generate_websocket_response(
+                    msg_id,
+                    start_time,
+                    dt_util.utc_from_timestamp(last_time_ts),
+                    states,
+                ),
+            ).result()
         ):
-            last_time_ts = cast(float, state_last_time)
+            # The stream was closed, closing the generator ends the query
+            break
 
-    if last_time_ts == 0:
+    if last_time_ts == 0 and send_empty:
         # If we did not send any states ever, we need to send an empty response
         # so the websocket client knows it should render/process/consume the
         # data.
-        if not send_empty:
-            return last_time_ts, None, None
-        last_time_dt = end_time
-    else:
-        last_time_dt = dt_util.utc_from_timestamp(last_time_ts)
+        run_callback_threadsafe(
+            loop,
+            _async_send_stream_message,
+            connection,
+            msg_id,
+            _generate_websocket_response(msg_id, start_time, end_time, {}),
+        ).result()
+    return last_time_ts
 
-    return (
-        last_time_ts,
-        last_time_dt,
-        _generate_websocket_response(msg_id, start_time, last_time_dt, states),
-    )
+
+@callback
+def _async_send_stream_message(
+    connection: ActiveConnection, msg_id: int, message: bytes
+) -> bool:
+    """Send a message of the stream unless it was closed.
+
+    Returns if the stream is still open.
+    """
+    if msg_id not in connection.subscriptions:
+        return False
+    connection.send_message(message)
+    return True
 
 
 async def _async_send_historical_states(
@@ -279,9 +328,10 @@ async def _async_send_historical_states(
 ) -> dt | None:
     """Fetch history significant_states and send them to the client."""
     instance = get_instance(hass)
-    last_time_ts, last_time_dt, payload = await instance.async_add_executor_job(
-        _generate_historical_response,
+    last_time_ts = await instance.async_add_executor_job(
+        _send_historical_states,
         hass,
+        connection,
         msg_id,
         start_time,
         end_time,
@@ -292,9 +342,7 @@ async def _async_send_historical_states(
         no_attributes,
         send_empty,
     )
-    if payload:
-        connection.send_message(payload)
-    return last_time_dt if last_time_ts != 0 else None
+    return dt_util.utc_from_timestamp(last_time_ts) if last_time_ts != 0 else None
 
 
 def _history_compressed_state(state: State, no_attributes: bool) -> dict[str, Any]:
@@ -13,6 +13,7 @@ from homeassistant.components.recorder.filters import Filters
 from homeassistant.components.recorder.models import (
     bytes_to_ulid_or_none,
     bytes_to_uuid_hex_or_none,
+    decompress_json_object,
     ulid_to_bytes_or_none,
     uuid_hex_to_bytes_or_none,
 )
@@ -35,6 +36,35 @@ class LogbookConfig:
     entity_filter: Callable[[str], bool] | None = None
 
 
+class LogbookCursor(NamedTuple):
+    """The position of a logbook page.
+
+    The events and states are paged separately, the next page has the
+    events before (events_ts, event_id) and the states before
+    (states_ts, state_id).
+    """
+
+    events_ts: float
+    event_id: int
+    states_ts: float
+    state_id: int
+
+    @classmethod
+    def from_time(cls, end_day: float) -> LogbookCursor:
+        """Create the cursor of the newest page which ends at end_day."""
+        return cls(end_day, 0, end_day, 0)
+
+    @classmethod
+    def from_string(cls, cursor: str) -> LogbookCursor:
+        """Parse a cursor from the string sent to the client."""
+        events_ts, event_id, states_ts, state_id = cursor.split(":")
+        return cls(float(events_ts), int(event_id), float(states_ts), int(state_id))
+
+    def as_string(self) -> str:
+        """Return the cursor as a string which can be sent to the client."""
+        return f"{self.events_ts!r}:{self.event_id}:{self.states_ts!r}:{self.state_id}"
+
+
 class LazyEventPartialState:
     """A lazy version of core Event with limited State joined in."""
 
@@ -61,9 +91,10 @@ class LazyEventPartialState:
         elif event_data := event_data_cache.get(source):
             self.data = event_data
         else:
-            self.data = event_data_cache[source] = cast(
-                dict[str, Any], json_loads(source)
-            )
+            data = json_loads(source)
+            if type(data) is dict:
+                data = decompress_json_object(data)
+            self.data = event_data_cache[source] = cast(dict[str, Any], data)
 
     @cached_property
     def event_type(self) -> EventType[Any] | str | None:
@@ -11,8 +11,9 @@ from typing import TYPE_CHECKING, Any
 
 from sqlalchemy.engine import Result
 from sqlalchemy.engine.row import Row
+from sqlalchemy.orm import Session
 
-from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder import Recorder, get_instance
 from homeassistant.components.recorder.filters import Filters
 from homeassistant.components.recorder.models import (
     bytes_to_uuid_hex_or_none,
@@ -77,9 +78,10 @@ from .models import (
     EventAsRow,
     LazyEventPartialState,
     LogbookConfig,
+    LogbookCursor,
     async_event_to_row,
 )
-from .queries import statement_for_request
+from .queries import statement_for_page_request, statement_for_request
 from .queries.common import PSEUDO_EVENT_STATE_CHANGED
 
 _LOGGER = logging.getLogger(__name__)
@@ -150,6 +152,22 @@ class EventProcessor:
         self.logbook_run.context_lookup.clear()
         self.logbook_run.memoize_new_contexts = False
 
+    def _get_ids(
+        self, instance: Recorder, session: Session
+    ) -> tuple[list[int] | None, tuple[int, ...]]:
+        """Get the metadata ids of the entities and the ids of the event types."""
+        metadata_ids: list[int] | None = None
+        if self.entity_ids:
+            metadata_ids = extract_metadata_ids(
+                instance.states_meta_manager.get_many(self.entity_ids, session, False)
+            )
+        event_type_ids = tuple(
+            extract_event_type_ids(
+                instance.event_type_manager.get_many(self.event_types, session)
+            )
+        )
+        return metadata_ids, event_type_ids
+
     def get_events(
         self,
         start_day: dt,
@@ -157,19 +175,8 @@ class EventProcessor:
     ) -> list[dict[str, Any]]:
         """Get events for a period of time."""
         with session_scope(hass=self.hass, read_only=True) as session:
-            metadata_ids: list[int] | None = None
             instance = get_instance(self.hass)
-            if self.entity_ids:
-                metadata_ids = extract_metadata_ids(
-                    instance.states_meta_manager.get_many(
-                        self.entity_ids, session, False
-                    )
-                )
-            event_type_ids = tuple(
-                extract_event_type_ids(
-                    instance.event_type_manager.get_many(self.event_types, session)
-                )
-            )
+            metadata_ids, event_type_ids = self._get_ids(instance, session)
             stmt = statement_for_request(
                 start_day,
                 end_day,
@@ -179,11 +186,50 @@ class EventProcessor:
                 self.device_ids,
                 self.filters,
                 self.context_id,
+                instance.context_origins_ready,
             )
             return self.humanify(
                 execute_stmt_lambda_element(session, stmt, orm_rows=False)
             )
 
+    def get_events_page(
+        self,
+        start_day: dt,
+        end_day: dt,
+        cursor: LogbookCursor | None,
+        limit: int,
+    ) -> tuple[list[dict[str, Any]], LogbookCursor | None]:
+        """Get the newest events of a period of time before the cursor.
+
+        Returns the events and the cursor of the next page, which is None
+        once there are no older events. Rows which are not shown in the
+        logbook count towards the limit so a page can have fewer events.
+        """
+        if cursor is None:
+            cursor = LogbookCursor.from_time(end_day.timestamp())
+        with session_scope(hass=self.hass, read_only=True) as session:
+            instance = get_instance(self.hass)
+            metadata_ids, event_type_ids = self._get_ids(instance, session)
+            stmt = statement_for_page_request(
+                start_day,
+                end_day,
+                event_type_ids,
+                cursor,
+                limit,
+                self.entity_ids,
+                metadata_ids,
+                self.device_ids,
+                self.filters,
+                self.context_id,
+                instance.context_origins_ready,
+            )
+            rows, next_cursor = _limit_page_rows(
+                execute_stmt_lambda_element(session, stmt, orm_rows=False),
+                cursor,
+                limit,
+            )
+            return self.humanify(rows), next_cursor
+
     def humanify(
         self, rows: Generator[EventAsRow] | Sequence[Row] | Result
     ) -> list[dict[str, str]]:
@@ -199,6 +245,52 @@ class EventProcessor:
         )
 
 
+def _limit_page_rows(
+    result: Sequence[Row] | Result, cursor: LogbookCursor, limit: int
+) -> tuple[list[Row], LogbookCursor | None]:
+    """Limit the rows of a page and find the cursor of the next page.
+
+    The events and the states of a page are each limited, the oldest rows
+    are dropped until limit rows are left. The next page starts before the
+    oldest event and state which were kept.
+    """
+    rows = list(result)
+    events = states = 0
+    for row in rows:
+        if row[CONTEXT_ONLY_POS]:
+            continue
+        if row[EVENT_TYPE_POS] is PSEUDO_EVENT_STATE_CHANGED:
+            states += 1
+        else:
+            events += 1
+    if events < limit and states < limit and events + states <= limit:
+        return rows, None
+
+    events_ts, event_id, states_ts, state_id = cursor
+    drop = events + states - limit
+    oldest_event: Row | None = None
+    oldest_state: Row | None = None
+    page_rows: list[Row] = []
+    for row in rows:
+        if not row[CONTEXT_ONLY_POS]:
+            if drop > 0:
+                drop -= 1
+                continue
+            if row[EVENT_TYPE_POS] is PSEUDO_EVENT_STATE_CHANGED:
+                if oldest_state is None:
+                    oldest_state = row
+            elif oldest_event is None:
+                oldest_event = row
+        page_rows.append(row)
+    if oldest_event is not None:
+        events_ts = oldest_event[TIME_FIRED_TS_POS]
+        event_id = oldest_event[ROW_ID_POS]
+    if oldest_state is not None:
+        states_ts = oldest_state[TIME_FIRED_TS_POS]
+        state_id = oldest_state[ROW_ID_POS]
+    return page_rows, LogbookCursor(events_ts, event_id, states_ts, state_id)
+
+
 def _humanify(
     hass: HomeAssistant,
     rows: Generator[EventAsRow] | Sequence[Row] | Result,
@@ -11,10 +11,11 @@ from homeassistant.components.recorder.filters import Filters
 from homeassistant.components.recorder.models import ulid_to_bytes_or_none
 from homeassistant.helpers.json import json_dumps
 
-from .all import all_stmt
-from .devices import devices_stmt
-from .entities import entities_stmt
-from .entities_and_devices import entities_devices_stmt
+from ..models import LogbookCursor
+from .all import all_page_stmt, all_stmt
+from .devices import devices_page_stmt, devices_stmt
+from .entities import entities_page_stmt, entities_stmt
+from .entities_and_devices import entities_devices_page_stmt, entities_devices_stmt
 
 
 def statement_for_request(
@@ -26,8 +27,13 @@ def statement_for_request(
     device_ids: list[str] | None = None,
     filters: Filters | None = None,
     context_id: str | None = None,
+    context_origins: bool = False,
 ) -> StatementLambdaElement:
-    """Generate the logbook statement for a logbook request."""
+    """Generate the logbook statement for a logbook request.
+
+    With context_origins the origins of the contexts are looked up in
+    the context_origins table instead of joining all rows of the contexts.
+    """
     start_day = start_day_dt.timestamp()
     end_day = end_day_dt.timestamp()
     # No entities: logbook sends everything for the timeframe
@@ -56,6 +62,7 @@ def statement_for_request(
             states_metadata_ids or [],
             [json_dumps(entity_id) for entity_id in entity_ids],
             [json_dumps(device_id) for device_id in device_ids],
+            context_origins,
         )
 
     # entities: logbook sends everything for the timeframe for the entities
@@ -66,6 +73,7 @@ def statement_for_request(
             event_type_ids,
             states_metadata_ids or [],
             [json_dumps(entity_id) for entity_id in entity_ids],
+            context_origins,
         )
 
     # devices: logbook sends everything for the timeframe for the devices
@@ -75,4 +83,74 @@ def statement_for_request(
         end_day,
         event_type_ids,
         [json_dumps(device_id) for device_id in device_ids],
+        context_origins,
+    )
+
+
+def statement_for_page_request(
+    start_day_dt: dt,
+    end_day_dt: dt,
+    event_type_ids: tuple[int, ...],
+    cursor: LogbookCursor,
+    limit: int,
+    entity_ids: list[str] | None = None,
+    states_metadata_ids: Collection[int] | None = None,
+    device_ids: list[str] | None = None,
+    filters: Filters | None = None,
+    context_id: str | None = None,
+    context_origins: bool = False,
+) -> StatementLambdaElement:
+    """Generate the logbook statement for a page of a logbook request.
+
+    The page has up to limit events and up to limit states before the cursor.
+    """
+    start_day = start_day_dt.timestamp()
+    end_day = end_day_dt.timestamp()
+    if not entity_ids and not device_ids:
+        context_id_bin = ulid_to_bytes_or_none(context_id)
+        return all_page_stmt(
+            start_day,
+            end_day,
+            event_type_ids,
+            filters,
+            cursor,
+            limit,
+            context_id_bin,
+            context_origins,
+        )
+
+    if entity_ids and device_ids:
+        return entities_devices_page_stmt(
+            start_day,
+            end_day,
+            event_type_ids,
+            states_metadata_ids or [],
+            [json_dumps(entity_id) for entity_id in entity_ids],
+            [json_dumps(device_id) for device_id in device_ids],
+            cursor,
+            limit,
+            context_origins,
+        )
+
+    if entity_ids:
+        return entities_page_stmt(
+            start_day,
+            end_day,
+            event_type_ids,
+            states_metadata_ids or [],
+            [json_dumps(entity_id) for entity_id in entity_ids],
+            cursor,
+            limit,
+            context_origins,
+        )
+
+    assert device_ids is not None
+    return devices_page_stmt(
+        start_day,
+        end_day,
+        event_type_ids,
+        [json_dumps(device_id) for device_id in device_ids],
+        cursor,
+        limit,
+        context_origins,
     )
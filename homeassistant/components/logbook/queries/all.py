@@ -13,7 +13,17 @@ from homeassistant.components.recorder.db_schema import (
 )
 from homeassistant.components.recorder.filters import Filters
 
-from .common import apply_states_filters, select_events_without_states, select_states
+from ..models import LogbookCursor
+from .common import (
+    apply_states_filters,
+    select_context_origin_rows,
+    select_context_rows,
+    select_events_page,
+    select_events_without_states,
+    select_page_rows_with_context,
+    select_states,
+    select_states_page,
+)
 
 
 def all_stmt(
@@ -47,6 +57,89 @@ def all_stmt(
     return stmt
 
 
+def all_page_stmt(
+    start_day: float,
+    end_day: float,
+    event_type_ids: tuple[int, ...],
+    filters: Filters | None,
+    cursor: LogbookCursor,
+    limit: int,
+    context_id_bin: bytes | None = None,
+    context_origins: bool = False,
+) -> StatementLambdaElement:
+    """Generate a logbook query for a page of all entities.
+
+    The rows of the contexts of the page are selected with it since the
+    origin of a context can be on an older page.
+    """
+    events_ts, event_id, states_ts, state_id = cursor
+    context_rows = (
+        select_context_origin_rows if context_origins else select_context_rows
+    )
+    if context_id_bin is not None:
+        return lambda_stmt(
+            lambda: select_page_rows_with_context(
+                context_rows,
+                select_events_page(
+                    select_events_without_states(
+                        start_day, end_day, event_type_ids
+                    ).where(Events.context_id_bin == context_id_bin),
+                    events_ts,
+                    event_id,
+                    limit,
+                ),
+                select_states_page(
+                    _states_query_for_context_id(start_day, end_day, context_id_bin),
+                    states_ts,
+                    state_id,
+                    limit,
+                ),
+            ),
+            track_on=[context_origins],
+        )
+    if filters and filters.has_config:
+        return lambda_stmt(
+            lambda: select_page_rows_with_context(
+                context_rows,
+                select_events_page(
+                    select_events_without_states(
+                        start_day, end_day, event_type_ids
+                    ).filter(filters.events_entity_filter()),
+                    events_ts,
+                    event_id,
+                    limit,
+                ),
+                select_states_page(
+                    _states_query_for_all(start_day, end_day).where(
+                        filters.states_metadata_entity_filter()
+                    ),
+                    states_ts,
+                    state_id,
+                    limit,
+                ),
+            ),
+            track_on=[filters, context_origins],
+        )
+    return lambda_stmt(
+        lambda: select_page_rows_with_context(
+            context_rows,
+            select_events_page(
+                select_events_without_states(start_day, end_day, event_type_ids),
+                events_ts,
+                event_id,
+                limit,
+            ),
+            select_states_page(
+                _states_query_for_all(start_day, end_day),
+                states_ts,
+                state_id,
+                limit,
+            ),
+        ),
+        track_on=[context_origins],
+    )
+
+
 def _states_query_for_all(start_day: float, end_day: float) -> Select:
     return apply_states_filters(_apply_all_hints(select_states()), start_day, end_day)
 
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import Final
 
 import sqlalchemy
-from sqlalchemy import select
+from sqlalchemy import select, union_all
 from sqlalchemy.sql.elements import BooleanClauseList, ColumnElement
-from sqlalchemy.sql.expression import literal
-from sqlalchemy.sql.selectable import Select
+from sqlalchemy.sql.expression import literal, literal_column
+from sqlalchemy.sql.selectable import CTE, CompoundSelect, Select
 
 from homeassistant.components.recorder.db_schema import (
     EVENTS_CONTEXT_ID_BIN_INDEX,
@@ -17,6 +18,7 @@ from homeassistant.components.recorder.db_schema import (
     SHARED_ATTRS_JSON,
     SHARED_DATA_OR_LEGACY_EVENT_DATA,
     STATES_CONTEXT_ID_BIN_INDEX,
+    ContextOrigins,
     EventData,
     Events,
     EventTypes,
@@ -106,6 +108,10 @@ EVENT_ROWS_NO_STATES = (
 CONTEXT_ONLY = literal(value="1", type_=sqlalchemy.String).label("context_only")
 NOT_CONTEXT_ONLY = literal(value=None, type_=sqlalchemy.String).label("context_only")
 
+# The rows of a page are ordered by time and id, which keeps the events
+# and the states in the order of their cursors
+PAGE_ORDER_BY = (literal_column("time_fired_ts"), literal_column("row_id"))
+
 
 def select_events_context_id_subquery(
     start_day: float,
@@ -142,6 +148,110 @@ def select_states_context_only() -> Select:
     )
 
 
+def select_context_rows(context_cte: CTE) -> tuple[Select, Select]:
+    """Generate the events and states queries for the rows of the contexts.
+
+    All rows which share a context with the rows of the request are
+    selected, the first one is the origin of the context.
+    """
+    return (
+        apply_events_context_hints(
+            select_events_context_only()
+            .select_from(context_cte)
+            .outerjoin(Events, context_cte.c.context_id_bin == Events.context_id_bin)
+            .outerjoin(EventTypes, (Events.event_type_id == EventTypes.event_type_id))
+            .outerjoin(EventData, (Events.data_id == EventData.data_id))
+        ),
+        apply_states_context_hints(
+            select_states_context_only()
+            .select_from(context_cte)
+            .outerjoin(States, context_cte.c.context_id_bin == States.context_id_bin)
+            .outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
+        ),
+    )
+
+
+def select_context_origin_rows(context_cte: CTE) -> tuple[Select, Select]:
+    """Generate the events and states queries for the origins of the contexts.
+
+    The origins are found in the context_origins table which the recorder
+    maintains so the rows of a context are selected by its primary key.
+    A context recorded again after the recorder forgot its origin has
+    more than one origin, the rows are ordered oldest first and the
+    logbook keeps the first row of each context.
+    """
+    return (
+        select_events_context_only()
+        .select_from(context_cte)
+        .join(
+            ContextOrigins,
+            context_cte.c.context_id_bin == ContextOrigins.context_id_bin,
+        )
+        .join(Events, ContextOrigins.event_id == Events.event_id)
+        .outerjoin(EventTypes, (Events.event_type_id == EventTypes.event_type_id))
+        .outerjoin(EventData, (Events.data_id == EventData.data_id)),
+        select_states_context_only()
+        .select_from(context_cte)
+        .join(
+            ContextOrigins,
+            context_cte.c.context_id_bin == ContextOrigins.context_id_bin,
+        )
+        .join(States, ContextOrigins.state_id == States.state_id)
+        .outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id)),
+    )
+
+
+def select_events_page(
+    sel: Select, before_ts: float, before_id: int, limit: int
+) -> CTE:
+    """Generate a CTE for the newest events before the cursor.
+
+    The time of the cursor bounds the range scan of the time_fired_ts
+    index, the event_id orders the events which were fired at the same time.
+    """
+    return (
+        sel.where(Events.time_fired_ts <= before_ts)
+        .where((Events.time_fired_ts < before_ts) | (Events.event_id < before_id))
+        .order_by(Events.time_fired_ts.desc(), Events.event_id.desc())
+        .limit(limit)
+        .cte()
+    )
+
+
+def select_states_page(
+    sel: Select, before_ts: float, before_id: int, limit: int
+) -> CTE:
+    """Generate a CTE for the newest states before the cursor.
+
+    The time of the cursor bounds the range scan of the last_updated_ts
+    index, the state_id orders the states which were updated at the same time.
+    """
+    return (
+        sel.where(States.last_updated_ts <= before_ts)
+        .where((States.last_updated_ts < before_ts) | (States.state_id < before_id))
+        .order_by(States.last_updated_ts.desc(), States.state_id.desc())
+        .limit(limit)
+        .cte()
+    )
+
+
+def select_page_rows_with_context(
+    context_rows: Callable[[CTE], tuple[Select, Select]], *pages: CTE
+) -> CompoundSelect:
+    """Generate a query for the rows of the pages and the rows of their contexts."""
+    context_ids = union_all(
+        *(select(page.c.context_id_bin) for page in pages)
+    ).subquery()
+    context_cte: CTE = (
+        select(context_ids.c.context_id_bin)
+        .group_by(context_ids.c.context_id_bin)
+        .cte()
+    )
+    return union_all(
+        *(select(page) for page in pages), *context_rows(context_cte)
+    ).order_by(*PAGE_ORDER_BY)
+
+
 def select_events_without_states(
     start_day: float, end_day: float, event_type_ids: tuple[int, ...]
 ) -> Select:
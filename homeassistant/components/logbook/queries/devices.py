@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 
 import sqlalchemy
 from sqlalchemy import lambda_stmt, select
@@ -10,22 +10,16 @@ from sqlalchemy.sql.elements import BooleanClauseList
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import CTE, CompoundSelect, Select
 
-from homeassistant.components.recorder.db_schema import (
-    DEVICE_ID_IN_EVENT,
-    EventData,
-    Events,
-    EventTypes,
-    States,
-    StatesMeta,
-)
+from homeassistant.components.recorder.db_schema import DEVICE_ID_IN_EVENT, Events
 
+from ..models import LogbookCursor
 from .common import (
-    apply_events_context_hints,
-    apply_states_context_hints,
+    select_context_origin_rows,
+    select_context_rows,
     select_events_context_id_subquery,
-    select_events_context_only,
+    select_events_page,
     select_events_without_states,
-    select_states_context_only,
+    select_page_rows_with_context,
 )
 
 
@@ -50,6 +44,7 @@ def _apply_devices_context_union(
     end_day: float,
     event_type_ids: tuple[int, ...],
     json_quotable_device_ids: list[str],
+    context_rows: Callable[[CTE], tuple[Select, Select]],
 ) -> CompoundSelect:
     """Generate a CTE to find the device context ids and a query to find linked row."""
     devices_cte: CTE = _select_device_id_context_ids_sub_query(
@@ -58,21 +53,7 @@ def _apply_devices_context_union(
         event_type_ids,
         json_quotable_device_ids,
     ).cte()
-    return sel.union_all(
-        apply_events_context_hints(
-            select_events_context_only()
-            .select_from(devices_cte)
-            .outerjoin(Events, devices_cte.c.context_id_bin == Events.context_id_bin)
-            .outerjoin(EventTypes, (Events.event_type_id == EventTypes.event_type_id))
-            .outerjoin(EventData, (Events.data_id == EventData.data_id)),
-        ),
-        apply_states_context_hints(
-            select_states_context_only()
-            .select_from(devices_cte)
-            .outerjoin(States, devices_cte.c.context_id_bin == States.context_id_bin)
-            .outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
-        ),
-    )
+    return sel.union_all(*context_rows(devices_cte))
 
 
 def devices_stmt(
@@ -80,8 +61,22 @@ def devices_stmt(
     end_day: float,
     event_type_ids: tuple[int, ...],
     json_quotable_device_ids: list[str],
+    context_origins: bool = False,
 ) -> StatementLambdaElement:
     """Generate a logbook query for multiple devices."""
+    if context_origins:
+        return lambda_stmt(
+            lambda: _apply_devices_context_union(
+                select_events_without_states(start_day, end_day, event_type_ids).where(
+                    apply_event_device_id_matchers(json_quotable_device_ids)
+                ),
+                start_day,
+                end_day,
+                event_type_ids,
+                json_quotable_device_ids,
+                select_context_origin_rows,
+            ).order_by(Events.time_fired_ts)
+        )
     return lambda_stmt(
         lambda: _apply_devices_context_union(
             select_events_without_states(start_day, end_day, event_type_ids).where(
@@ -91,10 +86,52 @@ def devices_stmt(
             end_day,
             event_type_ids,
             json_quotable_device_ids,
+            select_context_rows,
         ).order_by(Events.time_fired_ts)
     )
 
 
+def devices_page_stmt(
+    start_day: float,
+    end_day: float,
+    event_type_ids: tuple[int, ...],
+    json_quotable_device_ids: list[str],
+    cursor: LogbookCursor,
+    limit: int,
+    context_origins: bool = False,
+) -> StatementLambdaElement:
+    """Generate a logbook query for a page of multiple devices."""
+    events_ts = cursor.events_ts
+    event_id = cursor.event_id
+    if context_origins:
+        return lambda_stmt(
+            lambda: select_page_rows_with_context(
+                select_context_origin_rows,
+                select_events_page(
+                    select_events_without_states(
+                        start_day, end_day, event_type_ids
+                    ).where(apply_event_device_id_matchers(json_quotable_device_ids)),
+                    events_ts,
+                    event_id,
+                    limit,
+                ),
+            )
+        )
+    return lambda_stmt(
+        lambda: select_page_rows_with_context(
+            select_context_rows,
+            select_events_page(
+                select_events_without_states(start_day, end_day, event_type_ids).where(
+                    apply_event_device_id_matchers(json_quotable_device_ids)
+                ),
+                events_ts,
+                event_id,
+                limit,
+            ),
+        )
+    )
+
+
 def apply_event_device_id_matchers(
     json_quotable_device_ids: Iterable[str],
 ) -> BooleanClauseList:
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Collection, Iterable
+from collections.abc import Callable, Collection, Iterable
 
 import sqlalchemy
 from sqlalchemy import lambda_stmt, select, union_all
@@ -14,22 +14,21 @@ from homeassistant.components.recorder.db_schema import (
     ENTITY_ID_IN_EVENT,
     METADATA_ID_LAST_UPDATED_INDEX_TS,
     OLD_ENTITY_ID_IN_EVENT,
-    EventData,
     Events,
-    EventTypes,
     States,
-    StatesMeta,
 )
 
+from ..models import LogbookCursor
 from .common import (
-    apply_events_context_hints,
-    apply_states_context_hints,
     apply_states_filters,
+    select_context_origin_rows,
+    select_context_rows,
     select_events_context_id_subquery,
-    select_events_context_only,
+    select_events_page,
     select_events_without_states,
+    select_page_rows_with_context,
     select_states,
-    select_states_context_only,
+    select_states_page,
 )
 
 
@@ -61,6 +60,7 @@ def _apply_entities_context_union(
     event_type_ids: tuple[int, ...],
     states_metadata_ids: Collection[int],
     json_quoted_entity_ids: list[str],
+    context_rows: Callable[[CTE], tuple[Select, Select]],
 ) -> CompoundSelect:
     """Generate a CTE to find the entity and device context ids and a query to find linked row."""
     entities_cte: CTE = _select_entities_context_ids_sub_query(
@@ -77,19 +77,7 @@ def _apply_entities_context_union(
     # set on them the impact is minimal.
     return sel.union_all(
         states_select_for_entity_ids(start_day, end_day, states_metadata_ids),
-        apply_events_context_hints(
-            select_events_context_only()
-            .select_from(entities_cte)
-            .outerjoin(Events, entities_cte.c.context_id_bin == Events.context_id_bin)
-            .outerjoin(EventTypes, (Events.event_type_id == EventTypes.event_type_id))
-            .outerjoin(EventData, (Events.data_id == EventData.data_id))
-        ),
-        apply_states_context_hints(
-            select_states_context_only()
-            .select_from(entities_cte)
-            .outerjoin(States, entities_cte.c.context_id_bin == States.context_id_bin)
-            .outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
-        ),
+        *context_rows(entities_cte),
     )
 
 
@@ -99,8 +87,23 @@ def entities_stmt(
     event_type_ids: tuple[int, ...],
     states_metadata_ids: Collection[int],
     json_quoted_entity_ids: list[str],
+    context_origins: bool = False,
 ) -> StatementLambdaElement:
     """Generate a logbook query for multiple entities."""
+    if context_origins:
+        return lambda_stmt(
+            lambda: _apply_entities_context_union(
+                select_events_without_states(start_day, end_day, event_type_ids).where(
+                    apply_event_entity_id_matchers(json_quoted_entity_ids)
+                ),
+                start_day,
+                end_day,
+                event_type_ids,
+                states_metadata_ids,
+                json_quoted_entity_ids,
+                select_context_origin_rows,
+            ).order_by(Events.time_fired_ts)
+        )
     return lambda_stmt(
         lambda: _apply_entities_context_union(
             select_events_without_states(start_day, end_day, event_type_ids).where(
@@ -111,10 +114,91 @@ def entities_stmt(
             event_type_ids,
             states_metadata_ids,
             json_quoted_entity_ids,
+            select_context_rows,
         ).order_by(Events.time_fired_ts)
     )
 
 
+def _select_entities_pages(
+    start_day: float,
+    end_day: float,
+    event_type_ids: tuple[int, ...],
+    states_metadata_ids: Collection[int],
+    json_quoted_entity_ids: list[str],
+    events_ts: float,
+    event_id: int,
+    states_ts: float,
+    state_id: int,
+    limit: int,
+) -> tuple[CTE, CTE]:
+    """Generate the CTEs for a page of events and states for multiple entities."""
+    return (
+        select_events_page(
+            select_events_without_states(start_day, end_day, event_type_ids).where(
+                apply_event_entity_id_matchers(json_quoted_entity_ids)
+            ),
+            events_ts,
+            event_id,
+            limit,
+        ),
+        select_states_page(
+            states_select_for_entity_ids(start_day, end_day, states_metadata_ids),
+            states_ts,
+            state_id,
+            limit,
+        ),
+    )
+
+
+def entities_page_stmt(
+    start_day: float,
+    end_day: float,
+    event_type_ids: tuple[int, ...],
+    states_metadata_ids: Collection[int],
+    json_quoted_entity_ids: list[str],
+    cursor: LogbookCursor,
+    limit: int,
+    context_origins: bool = False,
+) -> StatementLambdaElement:
+    """Generate a logbook query for a page of multiple entities."""
+    events_ts, event_id, states_ts, state_id = cursor
+    if context_origins:
+        return lambda_stmt(
+            lambda: select_page_rows_with_context(
+                select_context_origin_rows,
+                *_select_entities_pages(
+                    start_day,
+                    end_day,
+                    event_type_ids,
+                    states_metadata_ids,
+                    json_quoted_entity_ids,
+                    events_ts,
+                    event_id,
+                    states_ts,
+                    state_id,
+                    limit,
+                ),
+            )
+        )
+    return lambda_stmt(
+        lambda: select_page_rows_with_context(
+            select_context_rows,
+            *_select_entities_pages(
+                start_day,
+                end_day,
+                event_type_ids,
+                states_metadata_ids,
+                json_quoted_entity_ids,
+                events_ts,
+                event_id,
+                states_ts,
+                state_id,
+                limit,
+            ),
+        )
+    )
+
+
 def states_select_for_entity_ids(
     start_day: float, end_day: float, states_metadata_ids: Collection[int]
 ) -> Select:
@@ -2,28 +2,24 @@
 
 from __future__ import annotations
 
-from collections.abc import Collection, Iterable
+from collections.abc import Callable, Collection, Iterable
 
 from sqlalchemy import lambda_stmt, select, union_all
 from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import CTE, CompoundSelect, Select
 
-from homeassistant.components.recorder.db_schema import (
-    EventData,
-    Events,
-    EventTypes,
-    States,
-    StatesMeta,
-)
+from homeassistant.components.recorder.db_schema import Events, States
 
+from ..models import LogbookCursor
 from .common import (
-    apply_events_context_hints,
-    apply_states_context_hints,
+    select_context_origin_rows,
+    select_context_rows,
     select_events_context_id_subquery,
-    select_events_context_only,
+    select_events_page,
     select_events_without_states,
-    select_states_context_only,
+    select_page_rows_with_context,
+    select_states_page,
 )
 from .devices import apply_event_device_id_matchers
 from .entities import (
@@ -65,6 +61,7 @@ def _apply_entities_devices_context_union(
     states_metadata_ids: Collection[int],
     json_quoted_entity_ids: list[str],
     json_quoted_device_ids: list[str],
+    context_rows: Callable[[CTE], tuple[Select, Select]],
 ) -> CompoundSelect:
     devices_entities_cte: CTE = _select_entities_device_id_context_ids_sub_query(
         start_day,
@@ -81,23 +78,7 @@ def _apply_entities_devices_context_union(
     # set on them the impact is minimal.
     return sel.union_all(
         states_select_for_entity_ids(start_day, end_day, states_metadata_ids),
-        apply_events_context_hints(
-            select_events_context_only()
-            .select_from(devices_entities_cte)
-            .outerjoin(
-                Events, devices_entities_cte.c.context_id_bin == Events.context_id_bin
-            )
-            .outerjoin(EventTypes, (Events.event_type_id == EventTypes.event_type_id))
-            .outerjoin(EventData, (Events.data_id == EventData.data_id)),
-        ),
-        apply_states_context_hints(
-            select_states_context_only()
-            .select_from(devices_entities_cte)
-            .outerjoin(
-                States, devices_entities_cte.c.context_id_bin == States.context_id_bin
-            )
-            .outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
-        ),
+        *context_rows(devices_entities_cte),
     )
 
 
@@ -108,8 +89,26 @@ def entities_devices_stmt(
     states_metadata_ids: Collection[int],
     json_quoted_entity_ids: list[str],
     json_quoted_device_ids: list[str],
+    context_origins: bool = False,
 ) -> StatementLambdaElement:
     """Generate a logbook query for multiple entities."""
+    if context_origins:
+        return lambda_stmt(
+            lambda: _apply_entities_devices_context_union(
+                select_events_without_states(start_day, end_day, event_type_ids).where(
+                    _apply_event_entity_id_device_id_matchers(
+                        json_quoted_entity_ids, json_quoted_device_ids
+                    )
+                ),
+                start_day,
+                end_day,
+                event_type_ids,
+                states_metadata_ids,
+                json_quoted_entity_ids,
+                json_quoted_device_ids,
+                select_context_origin_rows,
+            ).order_by(Events.time_fired_ts)
+        )
     return lambda_stmt(
         lambda: _apply_entities_devices_context_union(
             select_events_without_states(start_day, end_day, event_type_ids).where(
@@ -123,10 +122,97 @@ def entities_devices_stmt(
             states_metadata_ids,
             json_quoted_entity_ids,
             json_quoted_device_ids,
+            select_context_rows,
         ).order_by(Events.time_fired_ts)
     )
 
 
+def _select_entities_devices_pages(
+    start_day: float,
+    end_day: float,
+    event_type_ids: tuple[int, ...],
+    states_metadata_ids: Collection[int],
+    json_quoted_entity_ids: list[str],
+    json_quoted_device_ids: list[str],
+    events_ts: float,
+    event_id: int,
+    states_ts: float,
+    state_id: int,
+    limit: int,
+) -> tuple[CTE, CTE]:
+    """Generate the CTEs for a page of events and states for entities and devices."""
+    return (
+        select_events_page(
+            select_events_without_states(start_day, end_day, event_type_ids).where(
+                _apply_event_entity_id_device_id_matchers(
+                    json_quoted_entity_ids, json_quoted_device_ids
+                )
+            ),
+            events_ts,
+            event_id,
+            limit,
+        ),
+        select_states_page(
+            states_select_for_entity_ids(start_day, end_day, states_metadata_ids),
+            states_ts,
+            state_id,
+            limit,
+        ),
+    )
+
+
+def entities_devices_page_stmt(
+    start_day: float,
+    end_day: float,
+    event_type_ids: tuple[int, ...],
+    states_metadata_ids: Collection[int],
+    json_quoted_entity_ids: list[str],
+    json_quoted_device_ids: list[str],
+    cursor: LogbookCursor,
+    limit: int,
+    context_origins: bool = False,
+) -> StatementLambdaElement:
+    """Generate a logbook query for a page of multiple entities and devices."""
+    events_ts, event_id, states_ts, state_id = cursor
+    if context_origins:
+        return lambda_stmt(
+            lambda: select_page_rows_with_context(
+                select_context_origin_rows,
+                *_select_entities_devices_pages(
+                    start_day,
+                    end_day,
+                    event_type_ids,
+                    states_metadata_ids,
+                    json_quoted_entity_ids,
+                    json_quoted_device_ids,
+                    events_ts,
+                    event_id,
+                    states_ts,
+                    state_id,
+                    limit,
+                ),
+            )
+        )
+    return lambda_stmt(
+        lambda: select_page_rows_with_context(
+            select_context_rows,
+            *_select_entities_devices_pages(
+                start_day,
+                end_day,
+                event_type_ids,
+                states_metadata_ids,
+                json_quoted_entity_ids,
+                json_quoted_device_ids,
+                events_ts,
+                event_id,
+                states_ts,
+                state_id,
+                limit,
+            ),
+        )
+    )
+
+
 def _apply_event_entity_id_device_id_matchers(
     json_quoted_entity_ids: Iterable[str], json_quoted_device_ids: Iterable[str]
 ) -> ColumnElement[bool]:
@@ -26,7 +26,7 @@ from .helpers import (
     async_filter_entities,
     async_subscribe_events,
 )
-from .models import LogbookConfig, async_event_to_row
+from .models import LogbookConfig, LogbookCursor, async_event_to_row
 from .processor import EventProcessor
 
 MAX_PENDING_LOGBOOK_EVENTS = 2048
@@ -441,6 +441,29 @@ def _ws_formatted_get_events(
     )
 
 
+def _ws_formatted_get_events_page(
+    msg_id: int,
+    start_time: dt,
+    end_time: dt,
+    event_processor: EventProcessor,
+    cursor: LogbookCursor | None,
+    limit: int,
+) -> bytes:
+    """Fetch a page of events and convert them to json in the executor."""
+    events, next_cursor = event_processor.get_events_page(
+        start_time, end_time, cursor, limit
+    )
+    return json_bytes(
+        messages.result_message(
+            msg_id,
+            {
+                "events": events,
+                "cursor": next_cursor.as_string() if next_cursor else None,
+            },
+        )
+    )
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "logbook/get_events",
@@ -449,6 +472,8 @@ def _ws_formatted_get_events(
         vol.Optional("entity_ids"): [str],
         vol.Optional("device_ids"): [str],
         vol.Optional("context_id"): str,
+        vol.Optional("limit"): vol.All(int, vol.Range(min=1)),
+        vol.Optional("cursor"): str,
     }
 )
 @websocket_api.async_response
@@ -474,8 +499,17 @@ async def ws_get_events(
         connection.send_error(msg["id"], "invalid_end_time", "Invalid end_time")
         return
 
+    limit: int | None = msg.get("limit")
+    cursor: LogbookCursor | None = None
+    if cursor_str := msg.get("cursor"):
+        try:
+            cursor = LogbookCursor.from_string(cursor_str)
+        except ValueError:
+            connection.send_error(msg["id"], "invalid_cursor", "Invalid cursor")
+            return
+
     if start_time > utc_now:
-        connection.send_result(msg["id"], [])
+        connection.send_result(msg["id"], _empty_result(limit))
         return
 
     device_ids = msg.get("device_ids")
@@ -485,7 +519,7 @@ async def ws_get_events(
         entity_ids = async_filter_entities(hass, entity_ids)
         if not entity_ids and not device_ids:
             # Everything has been filtered away
-            connection.send_result(msg["id"], [])
+            connection.send_result(msg["id"], _empty_result(limit))
             return
 
     event_types = async_determine_event_types(hass, entity_ids, device_ids)
@@ -500,12 +534,33 @@ async def ws_get_events(
         include_entity_name=False,
     )
 
+    if limit is None:
+        connection.send_message(
+            await get_instance(hass).async_add_executor_job(
+                _ws_formatted_get_events,
+                msg["id"],
+                start_time,
+                end_time,
+                event_processor,
+            )
+        )
+        return
+
     connection.send_message(
         await get_instance(hass).async_add_executor_job(
-            _ws_formatted_get_events,
+            _ws_formatted_get_events_page,
             msg["id"],
             start_time,
             end_time,
             event_processor,
+            cursor,
+            limit,
         )
     )
+
+
+def _empty_result(limit: int | None) -> list[Any] | dict[str, Any]:
+    """Return the result of a request without events."""
+    if limit is None:
+        return []
+    return {"events": [], "cursor": None}
@@ -32,6 +32,7 @@ from . import entity_registry, websocket_api
 from .const import (  # noqa: F401
     CONF_DB_INTEGRITY_CHECK,
     DOMAIN,
+    INTEGRATION_PLATFORM_ASYNC_SETUP_STATISTICS,
     INTEGRATION_PLATFORM_COMPILE_STATISTICS,
     INTEGRATION_PLATFORM_METHODS,
     SQLITE_URL_PREFIX,
@@ -61,6 +62,9 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_SHED_EVENT_TYPES = "shed_event_types"
+CONF_PARTITION_BY_DAY = "partition_by_day"
+CONF_COMPRESS_SHARED_DATA = "compress_shared_data"
 
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
@@ -113,6 +117,11 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(CONF_SHED_EVENT_TYPES, default=list): vol.All(
+                        cv.ensure_list, [cv.string]
+                    ),
+                    vol.Optional(CONF_PARTITION_BY_DAY, default=False): cv.boolean,
+                    vol.Optional(CONF_COMPRESS_SHARED_DATA, default=False): cv.boolean,
                 }
             ),
         )
@@ -152,6 +161,10 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     if EVENT_STATE_CHANGED in exclude_event_types:
         _LOGGER.error("State change events cannot be excluded, use a filter instead")
         exclude_event_types.remove(EVENT_STATE_CHANGED)
+    shed_event_types: set[EventType[Any] | str] = set(conf[CONF_SHED_EVENT_TYPES])
+    if EVENT_STATE_CHANGED in shed_event_types:
+        _LOGGER.error("State change events cannot be shed, use a filter instead")
+        shed_event_types.remove(EVENT_STATE_CHANGED)
     instance = hass.data[DATA_INSTANCE] = Recorder(
         hass=hass,
         auto_purge=auto_purge,
@@ -163,8 +176,12 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_event_types=exclude_event_types,
+        shed_event_types=shed_event_types,
+        partition_by_day=conf[CONF_PARTITION_BY_DAY],
+        compress_shared_data=conf[CONF_COMPRESS_SHARED_DATA],
     )
     get_instance.cache_clear()
+    await instance.async_load_spool()
     instance.async_initialize()
     instance.async_register()
     instance.start()
@@ -191,5 +208,11 @@ async def _async_setup_integration_platform(
         # add it to the recorder queue to be processed.
         if any(hasattr(platform, _attr) for _attr in INTEGRATION_PLATFORM_METHODS):
             instance.queue_task(AddRecorderPlatformTask(domain, platform))
+        # Platforms may collect what they need to compile statistics
+        # from the event loop instead of querying the database.
+        if async_setup_statistics := getattr(
+            platform, INTEGRATION_PLATFORM_ASYNC_SETUP_STATISTICS, None
+        ):
+            async_setup_statistics(hass)
 
     await async_process_integration_platforms(hass, DOMAIN, _process_recorder_platform)
@@ -32,25 +32,49 @@ def ws_info(
         backlog = instance.backlog
         migration_in_progress = instance.migration_in_progress
         migration_is_live = instance.migration_is_live
+        migration_progress = {
+            migration_id: progress.as_dict()
+            for migration_id, progress in list(instance.migration_progress.items())
+        }
         recording = instance.recording
         # We avoid calling is_alive() as it can block waiting
         # for the thread state lock which will block the event loop.
         is_running = instance.is_running
         max_backlog = instance.max_backlog
+        commit_interval = instance.commit_interval * instance.commit_interval_multiplier
+        commit_batch_size = instance.commit_batch_size
+        queue_latency = round(instance.queue_latency, 3)
+        shedding = instance.shedding
+        recent_states_hits = instance.recent_states_manager.hits
+        recent_states_misses = instance.recent_states_manager.misses
     else:
         backlog = None
         migration_in_progress = False
         migration_is_live = False
+        migration_progress = {}
         recording = False
         is_running = False
         max_backlog = None
+        commit_interval = None
+        commit_batch_size = None
+        queue_latency = None
+        shedding = False
+        recent_states_hits = None
+        recent_states_misses = None
 
     recorder_info = {
         "backlog": backlog,
+        "commit_batch_size": commit_batch_size,
+        "commit_interval": commit_interval,
         "max_backlog": max_backlog,
         "migration_in_progress": migration_in_progress,
         "migration_is_live": migration_is_live,
+        "migration_progress": migration_progress,
+        "queue_latency": queue_latency,
+        "recent_states_hits": recent_states_hits,
+        "recent_states_misses": recent_states_misses,
         "recording": recording,
+        "shedding": shedding,
         "thread_running": is_running,
     }
     connection.send_result(msg["id"], recorder_info)
@@ -0,0 +1,105 @@
+"""Checkpoints of the latest state of each entity.
+
+Every hour the recorder writes a row per entity with the last_updated_ts
+of its latest state before the hour. The states of entities at the start
+of a history window are then found from the latest checkpoint before the
+window and the states after the checkpoint instead of from all states
+since the recorder run started.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from sqlalchemy import func, insert, literal, select, union_all
+
+from homeassistant.util import dt as dt_util
+
+from .db_schema import States, StatesCheckpoints
+from .queries import (
+    delete_states_checkpoints_after_rows,
+    find_latest_states_checkpoint_ts,
+)
+from .util import retryable_database_job, session_scope
+
+if TYPE_CHECKING:
+    from .core import Recorder
+
+_LOGGER = logging.getLogger(__name__)
+
+CHECKPOINT_INTERVAL = 3600  # seconds
+
+
+def states_checkpoint_ts(timestamp: float) -> float:
+    """Return the timestamp of the checkpoint at or before a timestamp."""
+    return timestamp - timestamp % CHECKPOINT_INTERVAL
+
+
+@retryable_database_job("write states checkpoint")
+def write_states_checkpoint(instance: Recorder, checkpoint_ts: float) -> bool:
+    """Write the latest state of each entity before checkpoint_ts.
+
+    The checkpoint is built from the previous checkpoint and the states
+    recorded since, only the first checkpoint needs to look at all states.
+    """
+    with session_scope(session=instance.get_session()) as session:
+        previous_ts: float | None = session.execute(
+            find_latest_states_checkpoint_ts(checkpoint_ts)
+        ).scalar()
+        if previous_ts == checkpoint_ts:
+            instance.states_checkpoint_ts = checkpoint_ts
+            return True
+        latest_states = select(
+            States.metadata_id.label("metadata_id"),
+            States.last_updated_ts.label("last_updated_ts"),
+        ).where(
+            (States.last_updated_ts < checkpoint_ts) & States.metadata_id.isnot(None)
+        )
+        if previous_ts is not None:
+            latest_states = union_all(
+                latest_states.where(States.last_updated_ts >= previous_ts),
+                select(
+                    StatesCheckpoints.metadata_id, StatesCheckpoints.last_updated_ts
+                ).where(StatesCheckpoints.checkpoint_ts == previous_ts),
+            )
+        latest = latest_states.subquery()
+        _LOGGER.debug(
+            "Writing states checkpoint at %s",
+            dt_util.utc_from_timestamp(checkpoint_ts).isoformat(),
+        )
+        session.execute(
+            insert(StatesCheckpoints).from_select(
+                ["checkpoint_ts", "metadata_id", "last_updated_ts"],
+                select(
+                    literal(checkpoint_ts),
+                    latest.c.metadata_id,
+                    func.max(latest.c.last_updated_ts),
+                ).group_by(latest.c.metadata_id),
+            )
+        )
+    instance.states_checkpoint_ts = checkpoint_ts
+    return True
+
+
+@retryable_database_job("invalidate states checkpoints")
+def invalidate_states_checkpoints(instance: Recorder, last_updated_ts: float) -> bool:
+    """Delete the checkpoints after a state which was recorded late.
+
+    The checkpoints are built from the states recorded before them, a state
+    committed after a checkpoint it is older than, like the events replayed
+    from the spool, would be missing from the checkpoints after it. The
+    checkpoint of the current hour is written again from an older checkpoint.
+    """
+    with session_scope(session=instance.get_session()) as session:
+        deleted_rows = session.execute(
+            delete_states_checkpoints_after_rows(last_updated_ts)
+        ).rowcount
+    if deleted_rows:
+        _LOGGER.debug(
+            "Deleted %s states checkpoints after %s",
+            deleted_rows,
+            dt_util.utc_from_timestamp(last_updated_ts).isoformat(),
+        )
+        instance.states_checkpoint_ts = None
+    return True
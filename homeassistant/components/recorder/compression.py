@@ -0,0 +1,85 @@
+"""Compress the shared_attrs and shared_data of existing rows.
+
+When compress_shared_data is enabled new rows are written compressed
+and the rows written before are compressed in the background a batch at
+a time by the SharedDataCompressionMigration, see models/compression.py
+for the encoding.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from sqlalchemy import select, update
+from sqlalchemy.orm.session import Session
+
+from .db_schema import EventData, StateAttributes
+from .models import (
+    COMPRESSED_KEY_JSON,
+    SHARED_ATTRS_PLAIN_KEYS,
+    SHARED_DATA_PLAIN_KEYS,
+    compress_json_object,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+COMPRESS_BATCH_SIZE = 1000
+
+
+def compress_shared_data(
+    session: Session,
+    table: type[StateAttributes | EventData],
+    last_id: int,
+    encoder: Callable[[Any], bytes],
+) -> tuple[int | None, set[int]]:
+    """Compress the batch of state_attributes or event_data rows after last_id.
+
+    Returns the id of the last row of the batch or None once all rows
+    of the table are done, and the ids of the rows which were rewritten.
+    """
+    if table is StateAttributes:
+        id_column = StateAttributes.attributes_id
+        shared_column = StateAttributes.shared_attrs
+        plain_keys = SHARED_ATTRS_PLAIN_KEYS
+        hash_bytes = StateAttributes.hash_shared_attrs_bytes
+    else:
+        id_column = EventData.data_id
+        shared_column = EventData.shared_data
+        plain_keys = SHARED_DATA_PLAIN_KEYS
+        hash_bytes = EventData.hash_shared_data_bytes
+    rows = session.execute(
+        select(id_column, shared_column)
+        .where(id_column > last_id)
+        .order_by(id_column)
+        .limit(COMPRESS_BATCH_SIZE)
+    ).all()
+    updates = []
+    for row_id, shared in rows:
+        # Rows with the marker key are compressed already or are
+        # rows written before the compression existed which must be
+        # kept as they are
+        if not shared or COMPRESSED_KEY_JSON in shared:
+            continue
+        shared_bytes = shared.encode("utf-8")
+        if (
+            compressed := compress_json_object(shared_bytes, plain_keys, encoder)
+        ) is shared_bytes:
+            continue
+        updates.append(
+            {
+                id_column.key: row_id,
+                shared_column.key: compressed.decode("utf-8"),
+                "hash": hash_bytes(compressed),
+            }
+        )
+    if updates:
+        session.execute(update(table), updates)
+    _LOGGER.debug(
+        "Compressed %s of %s %s rows", len(updates), len(rows), table.__tablename__
+    )
+    rewritten_ids = {row_update[id_column.key] for row_update in updates}
+    if len(rows) < COMPRESS_BATCH_SIZE:
+        return None, rewritten_ids
+    return rows[-1][0], rewritten_ids
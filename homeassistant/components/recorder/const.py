@@ -30,6 +30,17 @@ CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
 MAX_QUEUE_BACKLOG_MIN_VALUE = 65000
 MIN_AVAILABLE_MEMORY_FOR_QUEUE_BACKLOG = 256 * 1024**2
 
+# While the queue is deeper than the threshold the commit interval
+# is stretched, up to the max multiplier, to write more rows per commit
+COMMIT_BACKLOG_THRESHOLD = 1000
+MAX_COMMIT_INTERVAL_MULTIPLIER = 8
+# Shed the shed event types once the commit interval is fully stretched
+# and the queue is still this deep, until the interval is back to normal
+SHED_BACKLOG_THRESHOLD = 5000
+# Commit on the next interval regardless of the multiplier
+# once this many rows are pending
+MAX_COMMIT_BATCH_SIZE = 20000
+
 # The maximum number of rows (events) we purge in one delete statement
 
 # sqlite3 has a limit of 999 until version 3.32.0
@@ -58,9 +69,13 @@ CONTEXT_ID_AS_BINARY_SCHEMA_VERSION = 36
 EVENT_TYPE_IDS_SCHEMA_VERSION = 37
 STATES_META_SCHEMA_VERSION = 38
 LAST_REPORTED_SCHEMA_VERSION = 43
+STATISTICS_ROLLUPS_SCHEMA_VERSION = 48
+STATES_CHECKPOINTS_SCHEMA_VERSION = 49
+CONTEXT_ORIGINS_SCHEMA_VERSION = 50
 
 LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION = 28
 
+INTEGRATION_PLATFORM_ASYNC_SETUP_STATISTICS = "async_setup_statistics"
 INTEGRATION_PLATFORM_COMPILE_STATISTICS = "compile_statistics"
 INTEGRATION_PLATFORM_LIST_STATISTIC_IDS = "list_statistic_ids"
 INTEGRATION_PLATFORM_UPDATE_STATISTICS_ISSUES = "update_statistics_issues"
@@ -8,6 +8,7 @@ from concurrent.futures import CancelledError
 import contextlib
 from datetime import datetime, timedelta
 import logging
+import os
 import queue
 import sqlite3
 import threading
@@ -16,7 +17,14 @@ from typing import TYPE_CHECKING, Any, cast
 
 from propcache import cached_property
 import psutil_home_assistant as ha_psutil
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, select, update
+from sqlalchemy import (
+    create_engine,
+    event as sqlalchemy_event,
+    exc,
+    insert,
+    select,
+    update,
+)
 from sqlalchemy.engine import Engine
 from sqlalchemy.engine.interfaces import DBAPIConnection
 from sqlalchemy.exc import SQLAlchemyError
@@ -49,20 +57,25 @@ import homeassistant.util.dt as dt_util
 from homeassistant.util.enum import try_parse_enum
 from homeassistant.util.event_type import EventType
 
-from . import migration, statistics
+from . import checkpoints, migration, statistics
 from .const import (
+    COMMIT_BACKLOG_THRESHOLD,
     DB_WORKER_PREFIX,
     DOMAIN,
     KEEPALIVE_TIME,
     LAST_REPORTED_SCHEMA_VERSION,
     MARIADB_PYMYSQL_URL_PREFIX,
     MARIADB_URL_PREFIX,
+    MAX_COMMIT_BATCH_SIZE,
+    MAX_COMMIT_INTERVAL_MULTIPLIER,
     MAX_QUEUE_BACKLOG_MIN_VALUE,
     MIN_AVAILABLE_MEMORY_FOR_QUEUE_BACKLOG,
     MYSQLDB_PYMYSQL_URL_PREFIX,
     MYSQLDB_URL_PREFIX,
+    SHED_BACKLOG_THRESHOLD,
     SQLITE_MAX_BIND_VARS,
     SQLITE_URL_PREFIX,
+    STATES_CHECKPOINTS_SCHEMA_VERSION,
     SupportedDialect,
 )
 from .db_schema import (
@@ -79,17 +92,30 @@ from .db_schema import (
 )
 from .executor import DBInterruptibleThreadPoolExecutor
 from .migration import (
+    ContextOriginsMigration,
     EntityIDMigration,
     EventIDPostMigration,
     EventsContextIDMigration,
     EventTypeIDMigration,
+    SharedDataCompressionMigration,
     StatesContextIDMigration,
+    StatisticsRollupsMigration,
+)
+from .models import (
+    DatabaseEngine,
+    DatabaseJobStats,
+    StatisticData,
+    StatisticMetaData,
+    UnsupportedDialect,
 )
-from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
+from .partition import create_partitions, has_partitioned_layout
 from .pool import POOL_SIZE, MutexPool, RecorderPool
 from .queries import get_migration_changes
+from .spool import SPOOL_DIR, EventSpool
+from .table_managers.context_origins import ContextOriginsManager
 from .table_managers.event_data import EventDataManager
 from .table_managers.event_types import EventTypeManager
+from .table_managers.recent_states import RecentStatesManager
 from .table_managers.recorder_runs import RecorderRunsManager
 from .table_managers.state_attributes import StateAttributesManager
 from .table_managers.states import StatesManager
@@ -108,6 +134,8 @@ from .tasks import (
     PerodicCleanupTask,
     PurgeTask,
     RecorderTask,
+    ReplaySpooledEventsTask,
+    StatesCheckpointTask,
     StatisticsTask,
     StopTask,
     SynchronizeTask,
@@ -118,6 +146,7 @@ from .tasks import (
 from .util import (
     async_create_backup_failure_issue,
     build_mysqldb_conv,
+    bulk_insert_params,
     dburl_to_path,
     end_incomplete_runs,
     execute_stmt_lambda_element,
@@ -125,6 +154,7 @@ from .util import (
     move_away_broken_database,
     session_scope,
     setup_connection_for_dialect,
+    setup_read_only_sqlite_connection,
     validate_or_move_away_sqlite_database,
     write_lock_db_sqlite,
 )
@@ -155,6 +185,10 @@ CONNECTIVITY_ERR = "Error in database connectivity during commit"
 # Pool size must accommodate Recorder thread + All db executors
 MAX_DB_EXECUTOR_WORKERS = POOL_SIZE - 1
 
+# SQLite in WAL mode does not block readers while the recorder
+# thread writes so the executor is sized to the CPU count instead
+MAX_SQLITE_DB_EXECUTOR_WORKERS = 8
+
 
 class Recorder(threading.Thread):
     """A threaded recorder class."""
@@ -173,6 +207,9 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool] | None,
         exclude_event_types: set[EventType[Any] | str],
+        shed_event_types: set[EventType[Any] | str],
+        partition_by_day: bool,
+        compress_shared_data: bool = False,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -183,10 +220,24 @@ class Recorder(threading.Thread):
         self.auto_purge = auto_purge
         self.auto_repack = auto_repack
         self.keep_days = keep_days
+        self.partition_by_day = partition_by_day
+        self.compress_shared_data = compress_shared_data
+        self.partitioned_layout = False
         self.is_running: bool = False
         self._hass_started: asyncio.Future[object] = hass.loop.create_future()
         self.commit_interval = commit_interval
+        # The commit interval is multiplied while the queue is backed up
+        self.commit_interval_multiplier = 1
+        self._commit_ticks = 0
+        # Number of rows written by the last commit
+        self.commit_batch_size = 0
+        # Seconds between the newest row of the last commit being
+        # fired and the commit, which is how far behind the recorder is
+        self.queue_latency = 0.0
+        self._last_event_time_fired = 0.0
         self._queue: queue.SimpleQueue[RecorderTask | Event] = queue.SimpleQueue()
+        # Events are spilled to disk instead of the queue while it is too deep
+        self.event_spool = EventSpool(hass, hass.config.path(SPOOL_DIR))
         self.db_url = uri
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
@@ -208,13 +259,25 @@ class Recorder(threading.Thread):
         # by is_entity_recorder and the sensor recorder.
         self.entity_filter = entity_filter
         self.exclude_event_types = exclude_event_types
+        # Event types that are not recorded while the backlog is
+        # too deep instead of stopping recording altogether
+        self.shed_event_types = shed_event_types
+        self.shedding = False
+        self._listener_exclude_event_types = set(exclude_event_types)
 
         self.schema_version = 0
         self._commits_without_expire = 0
         self._event_session_has_pending_writes = False
+        # States and events are not added to the session, they
+        # are written with multi-row inserts when the session is committed
+        self._pending_states: list[dict[str, Any]] = []
+        self._pending_events: list[dict[str, Any]] = []
+        self._bulk_insert_states = False
 
         self.recorder_runs_manager = RecorderRunsManager()
         self.states_manager = StatesManager()
+        self.recent_states_manager = RecentStatesManager()
+        self.context_origins_manager = ContextOriginsManager(self)
         self.event_data_manager = EventDataManager(self)
         self.event_type_manager = EventTypeManager(self)
         self.states_meta_manager = StatesMetaManager(self)
@@ -223,12 +286,20 @@ class Recorder(threading.Thread):
 
         self.event_session: Session | None = None
         self._get_session: Callable[[], Session] | None = None
+        self._read_only_engine: Engine | None = None
+        self._get_read_only_session: Callable[[], Session] | None = None
         self._completed_first_database_setup: bool | None = None
         self.migration_in_progress = False
         self.migration_is_live = False
+        self.migration_progress: dict[str, migration.MigrationProgress] = {}
         self.use_legacy_events_index = False
+        self.statistics_rollups_ready = False
+        self.context_origins_ready = False
+        self.states_checkpoint_ts: float | None = None
         self._database_lock_task: DatabaseLockTask | None = None
         self._db_executor: DBInterruptibleThreadPoolExecutor | None = None
+        self._db_executor_workers = MAX_DB_EXECUTOR_WORKERS
+        self.database_job_stats = DatabaseJobStats()
 
         self._event_listener: CALLBACK_TYPE | None = None
         self._queue_watcher: CALLBACK_TYPE | None = None
@@ -249,7 +320,7 @@ class Recorder(threading.Thread):
     @property
     def backlog(self) -> int:
         """Return the number of items in the recorder backlog."""
-        return self._queue.qsize()
+        return self._queue.qsize() + self.event_spool.size
 
     @cached_property
     def dialect_name(self) -> SupportedDialect | None:
@@ -274,10 +345,37 @@ class Recorder(threading.Thread):
             raise RuntimeError("The database connection has not been established")
         return self._get_session()
 
+    def get_read_only_session(self) -> Session:
+        """Get a new sqlalchemy session for reading from the database.
+
+        When the database is a SQLite file, the session uses a connection
+        that cannot write and does not share the engine with the writer.
+
+        The recorder thread always gets a regular session since it
+        must see the rows it has not committed yet.
+        """
+        if (
+            self._get_read_only_session is None
+            or threading.get_ident() == self.thread_id
+        ):
+            return self.get_session()
+        return self._get_read_only_session()
+
     def queue_task(self, task: RecorderTask | Event) -> None:
         """Add a task to the recorder queue."""
         self._queue.put(task)
 
+    def queue_statistics_rollups_rebuild(self) -> None:
+        """Rebuild the daily and monthly statistics, e.g. for a new time zone.
+
+        The hourly statistics are used for queries until the rebuild is done.
+        """
+        if not self.statistics_rollups_ready:
+            return
+        self.statistics_rollups_ready = False
+        migrator = StatisticsRollupsMigration(SCHEMA_VERSION, {})
+        self.queue_task(migrator.task(migrator))
+
     def set_enable(self, enable: bool) -> None:
         """Enable or disable recording events and states."""
         self.enabled = enable
@@ -288,21 +386,32 @@ class Recorder(threading.Thread):
         self._db_executor = DBInterruptibleThreadPoolExecutor(
             self.recorder_and_worker_thread_ids,
             thread_name_prefix=DB_WORKER_PREFIX,
-            max_workers=MAX_DB_EXECUTOR_WORKERS,
+            max_workers=self._db_executor_workers,
             shutdown_hook=self._shutdown_pool,
         )
 
     def _shutdown_pool(self) -> None:
         """Close the dbpool connections in the current thread."""
-        if self.engine and hasattr(self.engine.pool, "shutdown"):
-            self.engine.pool.shutdown()
+        for engine in (self.engine, self._read_only_engine):
+            if engine and hasattr(engine.pool, "shutdown"):
+                engine.pool.shutdown()
 
     @callback
     def async_initialize(self) -> None:
         """Initialize the recorder."""
         entity_filter = self.entity_filter
-        exclude_event_types = self.exclude_event_types
-        queue_put = self._queue.put_nowait
+        exclude_event_types = self._listener_exclude_event_types
+        put_nowait = self._queue.put_nowait
+        qsize = self._queue.qsize
+        event_spool = self.event_spool
+
+        @callback
+        def queue_put(event: Event) -> None:
+            """Put an event in the process queue unless it is spilled to disk."""
+            if not event_spool.active and qsize() >= MAX_QUEUE_BACKLOG_MIN_VALUE:
+                self._async_start_spool()
+            if not event_spool.active or not event_spool.async_put(event):
+                put_nowait(event)
 
         @callback
         def _event_listener(event: Event) -> None:
@@ -363,27 +472,70 @@ class Recorder(threading.Thread):
         self, target: Callable[..., _T], *args: Any
     ) -> asyncio.Future[_T]:
         """Add an executor job from within the event loop."""
-        return self.hass.loop.run_in_executor(self._db_executor, target, *args)
+        return self.hass.loop.run_in_executor(
+            self._db_executor, self._run_timed_executor_job, target, *args
+        )
+
+    def _run_timed_executor_job[_T](self, target: Callable[..., _T], *args: Any) -> _T:
+        """Run an executor job and record how long it took."""
+        start = time.monotonic()
+        try:
+            return target(*args)
+        finally:
+            self.database_job_stats.add(time.monotonic() - start)
 
     @callback
     def _async_check_queue(self, *_: Any) -> None:
-        """Periodic check of the queue size to ensure we do not exhaust memory.
+        """Periodic log of the queue size.
 
-        The queue grows during migration or if something really goes wrong.
+        The queue grows during migration or if something really goes wrong,
+        the event listener spills the new events to disk once it is too deep
+        so we do not exhaust memory.
         """
         _LOGGER.debug("Recorder queue size is: %s", self.backlog)
-        if not self._reached_max_backlog():
-            return
-        _LOGGER.error(
+
+    @callback
+    def _async_start_spool(self) -> None:
+        """Start spilling the new events to disk once the queue is too deep."""
+        _LOGGER.warning(
             (
-                "The recorder backlog queue reached the maximum size of %s events; "
-                "usually, the system is CPU bound, I/O bound, or the database "
-                "is corrupt due to a disk problem; The recorder will stop "
-                "recording events to avoid running out of memory"
+                "The recorder backlog queue reached %s events; usually, the system "
+                "is CPU bound, I/O bound, or the database is corrupt due to a disk "
+                "problem; New events will be written to disk and recorded once "
+                "the backlog has been processed"
             ),
             self.backlog,
         )
-        self._async_stop_queue_watcher_and_event_listener()
+        self.event_spool.async_start()
+        self.queue_task(ReplaySpooledEventsTask())
+
+    async def async_load_spool(self) -> None:
+        """Replay the events left on disk by the previous run before the new events."""
+        if await self.hass.async_add_executor_job(self.event_spool.load):
+            self.queue_task(ReplaySpooledEventsTask())
+
+    @callback
+    def _async_set_shedding(self, shedding: bool) -> None:
+        """Start or stop shedding the shed event types."""
+        if shedding == self.shedding:
+            return
+        self.shedding = shedding
+        exclude_event_types = self._listener_exclude_event_types
+        if shedding:
+            _LOGGER.warning(
+                (
+                    "The recorder backlog queue reached %s events; events of type"
+                    " %s will not be recorded until the backlog has been processed"
+                ),
+                self.backlog,
+                ", ".join(sorted(self.shed_event_types)),
+            )
+            exclude_event_types.update(self.shed_event_types)
+            return
+        _LOGGER.info("The recorder backlog has been processed, recording all events")
+        exclude_event_types.difference_update(
+            self.shed_event_types - self.exclude_event_types
+        )
 
     def _available_memory(self) -> int:
         """Return the available memory in bytes."""
@@ -443,6 +595,7 @@ class Recorder(threading.Thread):
                 self._queue.get_nowait()
             except queue.Empty:
                 break
+        await self.hass.async_add_executor_job(self.event_spool.clear)
         self.queue_task(StopTask())
         await self.hass.async_add_executor_job(self.join)
 
@@ -450,6 +603,8 @@ class Recorder(threading.Thread):
         """Shut down the Recorder at final write."""
         if not self._hass_started.done():
             self._hass_started.set_result(SHUTDOWN_TASK)
+        if self.event_spool.active:
+            self.queue_task(ReplaySpooledEventsTask(drain=True))
         self.queue_task(StopTask())
         self._async_stop_listeners()
         await self.hass.async_add_executor_job(self.join)
@@ -533,6 +688,22 @@ class Recorder(threading.Thread):
         """Run tasks every five minutes."""
         self.queue_task(ADJUST_LRU_SIZE_TASK)
         self.async_periodic_statistics()
+        self._async_states_checkpoint(now)
+
+    @callback
+    def _async_states_checkpoint(self, now: datetime) -> None:
+        """Trigger writing the states checkpoint of the current hour.
+
+        The checkpoint can only be written once all states have a metadata_id.
+        """
+        if (
+            self.schema_version < STATES_CHECKPOINTS_SCHEMA_VERSION
+            or not self.states_meta_manager.active
+        ):
+            return
+        checkpoint_ts = checkpoints.states_checkpoint_ts(now.timestamp())
+        if checkpoint_ts != self.states_checkpoint_ts:
+            self.queue_task(StatesCheckpointTask(checkpoint_ts))
 
     def _adjust_lru_size(self) -> None:
         """Trigger the LRU adjustment.
@@ -699,6 +870,18 @@ class Recorder(threading.Thread):
         self._event_session_has_pending_writes = True
         session.add(obj)
 
+    def _add_to_pending_states(self, dbstate: dict[str, Any]) -> None:
+        """Add a state row to be inserted on the next commit."""
+        self._event_session_has_pending_writes = True
+        self._pending_states.append(dbstate)
+        self.context_origins_manager.add_pending_state(dbstate)
+
+    def _add_to_pending_events(self, dbevent: dict[str, Any]) -> None:
+        """Add an event row to be inserted on the next commit."""
+        self._event_session_has_pending_writes = True
+        self._pending_events.append(dbevent)
+        self.context_origins_manager.add_pending_event(dbevent)
+
     def _notify_migration_failed(self) -> None:
         """Notify the user schema migration failed."""
         persistent_notification.create(
@@ -717,7 +900,6 @@ class Recorder(threading.Thread):
         thread_id = threading.get_ident()
         self.thread_id = thread_id
         self.recorder_and_worker_thread_ids.add(thread_id)
-
         setup_result = self._setup_recorder()
 
         if not setup_result:
@@ -801,20 +983,41 @@ class Recorder(threading.Thread):
             # there are a lot of statistics graphs on the frontend.
             self.statistics_meta_manager.load(session)
 
+            assert self.engine is not None
+            if self.engine.dialect.name == SupportedDialect.POSTGRESQL:
+                self.partitioned_layout = has_partitioned_layout(session)
+            if self.partitioned_layout:
+                create_partitions(session, dt_util.utcnow())
+            elif self.partition_by_day:
+                _LOGGER.warning(
+                    "The partitioned layout can only be created"
+                    " for a new PostgreSQL database"
+                )
+
             migration_changes: dict[str, int] = {
                 row[0]: row[1]
                 for row in execute_stmt_lambda_element(session, get_migration_changes())
             }
 
-            for migrator_cls in (
+            migrator_classes: list[type[migration.BaseRunTimeMigration]] = [
                 StatesContextIDMigration,
                 EventsContextIDMigration,
                 EventTypeIDMigration,
                 EntityIDMigration,
                 EventIDPostMigration,
-            ):
-                migrator = migrator_cls(schema_status.start_version, migration_changes)
-                migrator.do_migrate(self, session)
+                StatisticsRollupsMigration,
+                ContextOriginsMigration,
+            ]
+            if self.compress_shared_data:
+                migrator_classes.append(SharedDataCompressionMigration)
+            migration.queue_run_time_migrations(
+                self,
+                session,
+                (
+                    migrator_cls(schema_status.start_version, migration_changes)
+                    for migrator_cls in migrator_classes
+                ),
+            )
 
         # We must only set the db ready after we have set the table managers
         # to active if there is no data to migrate.
@@ -917,7 +1120,11 @@ class Recorder(threading.Thread):
         while tries <= self.db_max_retries:
             try:
                 self._setup_connection()
-                return migration.initialize_database(self.get_session)
+                return migration.initialize_database(
+                    self.get_session,
+                    partition_by_day=self.partition_by_day
+                    and self.dialect_name is SupportedDialect.POSTGRESQL,
+                )
             except UnsupportedDialect:
                 break
             except Exception:
@@ -1025,6 +1232,7 @@ class Recorder(threading.Thread):
     def _process_one_event(self, event: Event[Any]) -> None:
         if not self.enabled:
             return
+        self._last_event_time_fired = event.time_fired_timestamp
         if event.event_type == EVENT_STATE_CHANGED:
             self._process_state_changed_event_into_session(event)
         else:
@@ -1037,22 +1245,22 @@ class Recorder(threading.Thread):
         """Process any event into the session except state changed."""
         session = self.event_session
         assert session is not None
-        dbevent = Events.from_event(event)
+        dbevent = Events.insert_params_from_event(event)
 
         # Map the event_type to the EventTypes table
         event_type_manager = self.event_type_manager
         if pending_event_types := event_type_manager.get_pending(event.event_type):
-            dbevent.event_type_rel = pending_event_types
+            dbevent["event_type_rel"] = pending_event_types
         elif event_type_id := event_type_manager.get(event.event_type, session, True):
-            dbevent.event_type_id = event_type_id
+            dbevent["event_type_id"] = event_type_id
         else:
             event_types = EventTypes(event_type=event.event_type)
             event_type_manager.add_pending(event_types)
             self._add_to_session(session, event_types)
-            dbevent.event_type_rel = event_types
+            dbevent["event_type_rel"] = event_types
 
         if not event.data:
-            self._add_to_session(session, dbevent)
+            self._add_to_pending_events(dbevent)
             return
 
         event_data_manager = self.event_data_manager
@@ -1063,21 +1271,21 @@ class Recorder(threading.Thread):
         shared_data = shared_data_bytes.decode("utf-8")
         # Matching attributes found in the pending commit
         if pending_event_data := event_data_manager.get_pending(shared_data):
-            dbevent.event_data_rel = pending_event_data
+            dbevent["event_data_rel"] = pending_event_data
         # Matching attributes id found in the cache
         elif (data_id := event_data_manager.get_from_cache(shared_data)) or (
             (hash_ := EventData.hash_shared_data_bytes(shared_data_bytes))
             and (data_id := event_data_manager.get(shared_data, hash_, session))
         ):
-            dbevent.data_id = data_id
+            dbevent["data_id"] = data_id
         else:
             # No matching attributes found, save them in the DB
             dbevent_data = EventData(shared_data=shared_data, hash=hash_)
             event_data_manager.add_pending(dbevent_data)
             self._add_to_session(session, dbevent_data)
-            dbevent.event_data_rel = dbevent_data
+            dbevent["event_data_rel"] = dbevent_data
 
-        self._add_to_session(session, dbevent)
+        self._add_to_pending_events(dbevent)
 
     def _process_state_changed_event_into_session(
         self, event: Event[EventStateChangedData]
@@ -1088,7 +1296,7 @@ class Recorder(threading.Thread):
         entity_removed = not event.data.get("new_state")
         entity_id = event.data["entity_id"]
 
-        dbstate = States.from_event(event)
+        dbstate = States.insert_params_from_event(event)
         old_state = event.data["old_state"]
 
         assert self.event_session is not None
@@ -1096,22 +1304,22 @@ class Recorder(threading.Thread):
 
         states_manager = self.states_manager
         if pending_state := states_manager.pop_pending(entity_id):
-            dbstate.old_state = pending_state
+            dbstate["old_state"] = pending_state
             if old_state:
-                pending_state.last_reported_ts = old_state.last_reported_timestamp
+                pending_state["last_reported_ts"] = old_state.last_reported_timestamp
         elif old_state_id := states_manager.pop_committed(entity_id):
-            dbstate.old_state_id = old_state_id
+            dbstate["old_state_id"] = old_state_id
             if old_state:
                 states_manager.update_pending_last_reported(
                     old_state_id, old_state.last_reported_timestamp
                 )
         if entity_removed:
-            dbstate.state = None
+            dbstate["state"] = None
         else:
             states_manager.add_pending(entity_id, dbstate)
 
         if states_meta_manager.active:
-            dbstate.entity_id = None
+            dbstate["entity_id"] = None
 
         if entity_id is None or not (
             shared_attrs_bytes := state_attributes_manager.serialize_from_event(event)
@@ -1120,9 +1328,9 @@ class Recorder(threading.Thread):
 
         # Map the entity_id to the StatesMeta table
         if pending_states_meta := states_meta_manager.get_pending(entity_id):
-            dbstate.states_meta_rel = pending_states_meta
+            dbstate["states_meta_rel"] = pending_states_meta
         elif metadata_id := states_meta_manager.get(entity_id, session, True):
-            dbstate.metadata_id = metadata_id
+            dbstate["metadata_id"] = metadata_id
         elif states_meta_manager.active and entity_removed:
             # If the entity was removed, we don't need to add it to the
             # StatesMeta table or record it in the pending commit
@@ -1133,14 +1341,20 @@ class Recorder(threading.Thread):
             states_meta = StatesMeta(entity_id=entity_id)
             states_meta_manager.add_pending(states_meta)
             self._add_to_session(session, states_meta)
-            dbstate.states_meta_rel = states_meta
+            dbstate["states_meta_rel"] = states_meta
 
         # Map the event data to the StateAttributes table
         shared_attrs = shared_attrs_bytes.decode("utf-8")
-        dbstate.attributes = None
+        self.recent_states_manager.add_pending(
+            entity_id,
+            dbstate["state"],
+            shared_attrs,
+            dbstate["last_updated_ts"],
+            dbstate["last_changed_ts"],
+        )
         # Matching attributes found in the pending commit
         if pending_event_data := state_attributes_manager.get_pending(shared_attrs):
-            dbstate.state_attributes = pending_event_data
+            dbstate["state_attributes"] = pending_event_data
         # Matching attributes id found in the cache
         elif (
             attributes_id := state_attributes_manager.get_from_cache(shared_attrs)
@@ -1152,15 +1366,15 @@ class Recorder(threading.Thread):
                 )
             )
         ):
-            dbstate.attributes_id = attributes_id
+            dbstate["attributes_id"] = attributes_id
         else:
             # No matching attributes found, save them in the DB
             dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
             state_attributes_manager.add_pending(dbstate_attributes)
             self._add_to_session(session, dbstate_attributes)
-            dbstate.state_attributes = dbstate_attributes
+            dbstate["state_attributes"] = dbstate_attributes
 
-        self._add_to_session(session, dbstate)
+        self._add_to_pending_states(dbstate)
 
     def _handle_database_error(self, err: Exception, *, setup_run: bool) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -1203,11 +1417,146 @@ class Recorder(threading.Thread):
             else:
                 return
 
+    def _commit_event_session_on_interval(self) -> None:
+        """Commit the event session when the commit interval has passed.
+
+        The commit interval grows while the queue is backed up so
+        more rows are written per commit and shrinks back once the
+        backlog is below the threshold again.
+        """
+        if self.backlog >= COMMIT_BACKLOG_THRESHOLD:
+            self.commit_interval_multiplier = min(
+                self.commit_interval_multiplier * 2, MAX_COMMIT_INTERVAL_MULTIPLIER
+            )
+        else:
+            self.commit_interval_multiplier = max(
+                self.commit_interval_multiplier // 2, 1
+            )
+        if self.shed_event_types:
+            self._update_shedding()
+        self._commit_ticks += 1
+        if (
+            self._commit_ticks < self.commit_interval_multiplier
+            and len(self._pending_states) + len(self._pending_events)
+            < MAX_COMMIT_BATCH_SIZE
+        ):
+            return
+        self._commit_ticks = 0
+        self._commit_event_session_or_retry()
+
+    def _update_shedding(self) -> None:
+        """Start or stop shedding the shed event types.
+
+        Shedding starts once stretching the commit interval is not enough
+        to keep up with the queue and stops once the interval is back to
+        normal, so it does not flap around a single queue size.
+        """
+        if self.shedding:
+            if self.commit_interval_multiplier == 1:
+                self.hass.add_job(self._async_set_shedding, False)
+        elif (
+            self.commit_interval_multiplier == MAX_COMMIT_INTERVAL_MULTIPLIER
+            and self.backlog >= SHED_BACKLOG_THRESHOLD
+        ):
+            self.hass.add_job(self._async_set_shedding, True)
+
+    def _insert_pending_rows(self, session: Session) -> None:
+        """Write the pending states and events with multi-row inserts.
+
+        The pending rows are plain insert parameters so building them
+        skips the database objects and the ORM unit of work does not do
+        per-object bookkeeping on flush. Since States.old_state is
+        self-referential, the unit of work would also emit one INSERT
+        per state.
+
+        The event types, event data, states meta and state attributes
+        are flushed first so their ids are known when the parameters
+        of the rows that link to them are built.
+        """
+        session.flush()
+        if pending_events := self._pending_events:
+            stmt = insert(Events).execution_options(render_nulls=True)
+            params = bulk_insert_params(Events, pending_events)
+            if (
+                self._bulk_insert_states
+                and self.context_origins_manager.has_pending_events
+            ):
+                # The context origins link to the new event_ids
+                event_ids = session.execute(
+                    stmt.returning(Events.event_id, sort_by_parameter_order=True),
+                    params,
+                ).scalars()
+                for dbevent, event_id in zip(pending_events, event_ids, strict=True):
+                    dbevent["event_id"] = event_id
+            else:
+                self.context_origins_manager.load_last_event_id(session)
+                session.execute(stmt, params)
+        if not (pending_states := self._pending_states):
+            return
+        # A state can link to an old state that is pending in the same
+        # commit so the states are inserted in generations where each
+        # generation only links to states already inserted.
+        generations: list[list[dict[str, Any]]] = []
+        generation_by_state: dict[int, int] = {}
+        for dbstate in pending_states:
+            chain: list[dict[str, Any]] = []
+            link: dict[str, Any] | None = dbstate
+            while link is not None and id(link) not in generation_by_state:
+                chain.append(link)
+                link = link.get("old_state")
+            generation = -1 if link is None else generation_by_state[id(link)]
+            for link in reversed(chain):
+                generation += 1
+                generation_by_state[id(link)] = generation
+                if generation == len(generations):
+                    generations.append([])
+                generations[generation].append(link)
+        if not self._bulk_insert_states:
+            # The dialect cannot return the new state_ids in
+            # parameter order so let the ORM insert them instead
+            self._insert_pending_states_with_orm(session, generations)
+            return
+        stmt = (
+            insert(States)
+            .returning(States.state_id, sort_by_parameter_order=True)
+            .execution_options(render_nulls=True)
+        )
+        for dbstates in generations:
+            state_ids = session.execute(
+                stmt, bulk_insert_params(States, dbstates)
+            ).scalars()
+            for dbstate, state_id in zip(dbstates, state_ids, strict=True):
+                dbstate["state_id"] = state_id
+
+    def _insert_pending_states_with_orm(
+        self, session: Session, generations: list[list[dict[str, Any]]]
+    ) -> None:
+        """Insert the pending states by flushing database objects.
+
+        The database objects are only built here, each one linked to
+        the object of its old state if that is pending as well.
+        """
+        states_by_row: dict[int, States] = {}
+        for dbstates in generations:
+            for dbstate in dbstates:
+                params = dbstate
+                if (old_state := dbstate.get("old_state")) is not None:
+                    params = dbstate | {"old_state": states_by_row[id(old_state)]}
+                states_by_row[id(dbstate)] = States(**params)
+        session.add_all(states_by_row.values())
+        session.flush()
+        for dbstates in generations:
+            for dbstate in dbstates:
+                dbstate["state_id"] = states_by_row[id(dbstate)].state_id
+
     def _commit_event_session(self) -> None:
         assert self.event_session is not None
         session = self.event_session
         self._commits_without_expire += 1
 
+        if pending_rows := len(self._pending_states) + len(self._pending_events):
+            self._insert_pending_rows(session)
+            self.context_origins_manager.insert_pending(session)
         if (
             pending_last_reported
             := self.states_manager.get_pending_last_reported_timestamp()
@@ -1226,6 +1575,11 @@ class Recorder(threading.Thread):
         session.commit()
 
         self._event_session_has_pending_writes = False
+        self._pending_states.clear()
+        self._pending_events.clear()
+        self.commit_batch_size = pending_rows
+        if pending_rows:
+            self.queue_latency = max(time.time() - self._last_event_time_fired, 0)
         # We just committed the state attributes to the database
         # and we now know the attributes_ids.  We can save
         # many selects for matching attributes by loading them
@@ -1235,6 +1589,8 @@ class Recorder(threading.Thread):
         self.event_data_manager.post_commit_pending()
         self.event_type_manager.post_commit_pending()
         self.states_meta_manager.post_commit_pending()
+        self.recent_states_manager.post_commit_pending()
+        self.context_origins_manager.post_commit_pending()
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -1257,7 +1613,11 @@ class Recorder(threading.Thread):
 
     def _close_event_session(self) -> None:
         """Close the event session."""
+        self._pending_states.clear()
+        self._pending_events.clear()
         self.states_manager.reset()
+        self.recent_states_manager.reset()
+        self.context_origins_manager.reset()
         self.state_attributes_manager.reset()
         self.event_data_manager.reset()
         self.event_type_manager.reset()
@@ -1377,6 +1737,13 @@ class Recorder(threading.Thread):
             self.max_bind_vars = database_engine.max_bind_vars
         self._completed_first_database_setup = True
 
+    def _setup_read_only_connection(
+        self, dbapi_connection: DBAPIConnection, connection_record: Any
+    ) -> None:
+        """Dbapi specific connection settings for read only connections."""
+        self._setup_recorder_connection(dbapi_connection, connection_record)
+        setup_read_only_sqlite_connection(dbapi_connection, connection_record)
+
     def _setup_connection(self) -> None:
         """Ensure database is ready to fly."""
         kwargs: dict[str, Any] = {}
@@ -1388,7 +1755,12 @@ class Recorder(threading.Thread):
             MutexPool.pool_lock = threading.RLock()
             kwargs["pool_reset_on_return"] = None
         elif self.db_url.startswith(SQLITE_URL_PREFIX):
+            self._db_executor_workers = max(
+                MAX_DB_EXECUTOR_WORKERS,
+                min(os.cpu_count() or 1, MAX_SQLITE_DB_EXECUTOR_WORKERS),
+            )
             kwargs["poolclass"] = RecorderPool
+            kwargs["pool_size"] = self._db_executor_workers + 1
             kwargs["recorder_and_worker_thread_ids"] = (
                 self.recorder_and_worker_thread_ids
             )
@@ -1425,15 +1797,38 @@ class Recorder(threading.Thread):
 
         migration.pre_migrate_schema(self.engine)
         Base.metadata.create_all(self.engine)
+        self._bulk_insert_states = (
+            self.engine.dialect.insert_executemany_returning_sort_by_parameter_order
+        )
         self._get_session = scoped_session(sessionmaker(bind=self.engine, future=True))
+        if kwargs.get("poolclass") is RecorderPool:
+            self._setup_read_only_engine(kwargs)
         _LOGGER.debug("Connected to recorder database")
 
+    def _setup_read_only_engine(self, kwargs: dict[str, Any]) -> None:
+        """Create the engine used for read only sessions.
+
+        SQLite in WAL mode lets readers run while the recorder thread
+        writes, so the executor jobs get their own query_only connections.
+        """
+        self._read_only_engine = create_engine(self.db_url, **kwargs, future=True)
+        sqlalchemy_event.listen(
+            self._read_only_engine, "connect", self._setup_read_only_connection
+        )
+        self._get_read_only_session = scoped_session(
+            sessionmaker(bind=self._read_only_engine, future=True)
+        )
+
     def _close_connection(self) -> None:
         """Close the connection."""
         if self.engine:
             self.engine.dispose()
             self.engine = None
         self._get_session = None
+        if self._read_only_engine:
+            self._read_only_engine.dispose()
+            self._read_only_engine = None
+        self._get_read_only_session = None
 
     def _setup_run(self) -> None:
         """Log the start of the current run and schedule any needed jobs."""
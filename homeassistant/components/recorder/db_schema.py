@@ -62,6 +62,7 @@ from .models import (
     bytes_to_ulid_or_none,
     bytes_to_uuid_hex_or_none,
     datetime_to_timestamp_or_none,
+    decompress_json_object,
     process_timestamp,
     ulid_to_bytes_or_none,
     uuid_hex_to_bytes_or_none,
@@ -77,7 +78,7 @@ class LegacyBase(DeclarativeBase):
     """Base class for tables, used for schema migration."""
 
 
-SCHEMA_VERSION = 47
+SCHEMA_VERSION = 50
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -87,10 +88,14 @@ TABLE_EVENT_TYPES = "event_types"
 TABLE_STATES = "states"
 TABLE_STATE_ATTRIBUTES = "state_attributes"
 TABLE_STATES_META = "states_meta"
+TABLE_STATES_CHECKPOINTS = "states_checkpoints"
+TABLE_CONTEXT_ORIGINS = "context_origins"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
 TABLE_STATISTICS = "statistics"
+TABLE_STATISTICS_DAILY = "statistics_daily"
 TABLE_STATISTICS_META = "statistics_meta"
+TABLE_STATISTICS_MONTHLY = "statistics_monthly"
 TABLE_STATISTICS_RUNS = "statistics_runs"
 TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
 TABLE_MIGRATION_CHANGES = "migration_changes"
@@ -112,8 +117,12 @@ ALL_TABLES = [
     TABLE_SCHEMA_CHANGES,
     TABLE_MIGRATION_CHANGES,
     TABLE_STATES_META,
+    TABLE_STATES_CHECKPOINTS,
+    TABLE_CONTEXT_ORIGINS,
     TABLE_STATISTICS,
+    TABLE_STATISTICS_DAILY,
     TABLE_STATISTICS_META,
+    TABLE_STATISTICS_MONTHLY,
     TABLE_STATISTICS_RUNS,
     TABLE_STATISTICS_SHORT_TERM,
 ]
@@ -129,6 +138,7 @@ LAST_UPDATED_INDEX_TS = "ix_states_last_updated_ts"
 METADATA_ID_LAST_UPDATED_INDEX_TS = "ix_states_metadata_id_last_updated_ts"
 EVENTS_CONTEXT_ID_BIN_INDEX = "ix_events_context_id_bin"
 STATES_CONTEXT_ID_BIN_INDEX = "ix_states_context_id_bin"
+CONTEXT_ORIGINS_CONTEXT_ID_BIN_INDEX = "ix_context_origins_context_id_bin"
 LEGACY_STATES_EVENT_ID_INDEX = "ix_states_event_id"
 LEGACY_STATES_ENTITY_ID_LAST_UPDATED_INDEX = "ix_states_entity_id_last_updated_ts"
 CONTEXT_ID_BIN_MAX_LENGTH = 16
@@ -312,20 +322,33 @@ class Events(Base):
     @staticmethod
     def from_event(event: Event) -> Events:
         """Create an event database object from a native event."""
+        return Events(**Events.insert_params_from_event(event))
+
+    @staticmethod
+    def insert_params_from_event(event: Event) -> dict[str, Any]:
+        """Create the insert parameters of an event row from a native event.
+
+        The parameters hold every column except the event_id so the rows
+        can be written with a multi-row INSERT without building the
+        database object.
+        """
         context = event.context
-        return Events(
-            event_type=None,
-            event_data=None,
-            origin_idx=event.origin.idx,
-            time_fired=None,
-            time_fired_ts=event.time_fired_timestamp,
-            context_id=None,
-            context_id_bin=ulid_to_bytes_or_none(context.id),
-            context_user_id=None,
-            context_user_id_bin=uuid_hex_to_bytes_or_none(context.user_id),
-            context_parent_id=None,
-            context_parent_id_bin=ulid_to_bytes_or_none(context.parent_id),
-        )
+        return {
+            "event_type": None,
+            "event_data": None,
+            "origin": None,
+            "origin_idx": event.origin.idx,
+            "time_fired": None,
+            "time_fired_ts": event.time_fired_timestamp,
+            "context_id": None,
+            "context_user_id": None,
+            "context_parent_id": None,
+            "data_id": None,
+            "context_id_bin": ulid_to_bytes_or_none(context.id),
+            "context_user_id_bin": uuid_hex_to_bytes_or_none(context.user_id),
+            "context_parent_id_bin": ulid_to_bytes_or_none(context.parent_id),
+            "event_type_id": None,
+        }
 
     def to_native(self, validate_entity_id: bool = True) -> Event | None:
         """Convert to a native HA Event."""
@@ -399,7 +422,7 @@ class EventData(Base):
         if shared_data is None:
             return {}
         try:
-            return cast(dict[str, Any], json_loads(shared_data))
+            return decompress_json_object(cast(dict[str, Any], json_loads(shared_data)))
         except JSON_DECODE_EXCEPTIONS:
             _LOGGER.exception("Error converting row to event data: %s", self)
             return {}
@@ -499,6 +522,18 @@ class States(Base):
     @staticmethod
     def from_event(event: Event[EventStateChangedData]) -> States:
         """Create object from a state_changed event."""
+        return States(**States.insert_params_from_event(event))
+
+    @staticmethod
+    def insert_params_from_event(
+        event: Event[EventStateChangedData],
+    ) -> dict[str, Any]:
+        """Create the insert parameters of a state row from a state_changed event.
+
+        The parameters hold every column except the state_id so the rows
+        can be written with a multi-row INSERT without building the
+        database object.
+        """
         state = event.data["new_state"]
         # None state means the state was removed from the state machine
         if state is None:
@@ -518,23 +553,27 @@ class States(Base):
             else:
                 last_reported_ts = state.last_reported_timestamp
         context = event.context
-        return States(
-            state=state_value,
-            entity_id=event.data["entity_id"],
-            attributes=None,
-            context_id=None,
-            context_id_bin=ulid_to_bytes_or_none(context.id),
-            context_user_id=None,
-            context_user_id_bin=uuid_hex_to_bytes_or_none(context.user_id),
-            context_parent_id=None,
-            context_parent_id_bin=ulid_to_bytes_or_none(context.parent_id),
-            origin_idx=event.origin.idx,
-            last_updated=None,
-            last_changed=None,
-            last_updated_ts=last_updated_ts,
-            last_changed_ts=last_changed_ts,
-            last_reported_ts=last_reported_ts,
-        )
+        return {
+            "entity_id": event.data["entity_id"],
+            "state": state_value,
+            "attributes": None,
+            "event_id": None,
+            "last_changed": None,
+            "last_changed_ts": last_changed_ts,
+            "last_reported_ts": last_reported_ts,
+            "last_updated": None,
+            "last_updated_ts": last_updated_ts,
+            "old_state_id": None,
+            "attributes_id": None,
+            "context_id": None,
+            "context_user_id": None,
+            "context_parent_id": None,
+            "origin_idx": event.origin.idx,
+            "context_id_bin": ulid_to_bytes_or_none(context.id),
+            "context_user_id_bin": uuid_hex_to_bytes_or_none(context.user_id),
+            "context_parent_id_bin": ulid_to_bytes_or_none(context.parent_id),
+            "metadata_id": None,
+        }
 
     def to_native(self, validate_entity_id: bool = True) -> State | None:
         """Convert to an HA state object."""
@@ -642,7 +681,9 @@ class StateAttributes(Base):
         if shared_attrs is None:
             return {}
         try:
-            return cast(dict[str, Any], json_loads(shared_attrs))
+            return decompress_json_object(
+                cast(dict[str, Any], json_loads(shared_attrs))
+            )
         except JSON_DECODE_EXCEPTIONS:
             # When json_loads fails
             _LOGGER.exception("Error converting row to state attributes: %s", self)
@@ -668,6 +709,76 @@ class StatesMeta(Base):
         )
 
 
+class StatesCheckpoints(Base):
+    """The latest state of each entity before a point in time.
+
+    A checkpoint holds the last_updated_ts of the latest state of every
+    entity before checkpoint_ts so the states at the start of a history
+    window are found without scanning all older states.
+    """
+
+    __table_args__ = (
+        # Used for fetching the checkpoint of entities at a specific time
+        Index(
+            "ix_states_checkpoints_checkpoint_ts_metadata_id",
+            "checkpoint_ts",
+            "metadata_id",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATES_CHECKPOINTS
+    checkpoint_id: Mapped[int] = mapped_column(ID_TYPE, Identity(), primary_key=True)
+    checkpoint_ts: Mapped[float] = mapped_column(TIMESTAMP_TYPE)
+    metadata_id: Mapped[int] = mapped_column(ID_TYPE)
+    last_updated_ts: Mapped[float] = mapped_column(TIMESTAMP_TYPE, index=True)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            "<recorder.StatesCheckpoints("
+            f"id={self.checkpoint_id}, checkpoint_ts={self.checkpoint_ts}, "
+            f"metadata_id={self.metadata_id}, last_updated_ts={self.last_updated_ts}"
+            ")>"
+        )
+
+
+class ContextOrigins(Base):
+    """The row which originated a context.
+
+    The first event or state recorded with a context is its origin. The
+    logbook looks up the origins of the contexts on a page here instead
+    of joining all events and states which share the contexts.
+    """
+
+    __table_args__ = (
+        # Used for fetching the origins of contexts
+        # see logbook
+        Index(
+            CONTEXT_ORIGINS_CONTEXT_ID_BIN_INDEX,
+            "context_id_bin",
+            mysql_length=CONTEXT_ID_BIN_MAX_LENGTH,
+            mariadb_length=CONTEXT_ID_BIN_MAX_LENGTH,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_CONTEXT_ORIGINS
+    origin_id: Mapped[int] = mapped_column(ID_TYPE, Identity(), primary_key=True)
+    context_id_bin: Mapped[bytes | None] = mapped_column(CONTEXT_BINARY_TYPE)
+    time_fired_ts: Mapped[float | None] = mapped_column(TIMESTAMP_TYPE, index=True)
+    event_id: Mapped[int | None] = mapped_column(ID_TYPE)
+    state_id: Mapped[int | None] = mapped_column(ID_TYPE)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            "<recorder.ContextOrigins("
+            f"id={self.origin_id}, time_fired_ts={self.time_fired_ts}, "
+            f"event_id={self.event_id}, state_id={self.state_id}"
+            ")>"
+        )
+
+
 class StatisticsBase:
     """Statistics base class."""
 
@@ -789,6 +900,53 @@ class LegacyStatisticsShortTerm(LegacyBase, _StatisticsShortTerm):
     )
 
 
+class StatisticsRollupBase(StatisticsBase):
+    """Long term statistics rolled up from the hourly statistics.
+
+    The rows start at the local midnight of their period. mean_weight is
+    the number of hourly means the mean is computed from, which allows
+    rolling up the rollups again.
+    """
+
+    mean_weight: Mapped[int | None] = mapped_column(Integer)
+
+
+class StatisticsDaily(Base, StatisticsRollupBase):
+    """Long term statistics rolled up per day."""
+
+    duration = timedelta(days=1)
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index(
+            "ix_statistics_daily_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATISTICS_DAILY
+
+
+class StatisticsMonthly(Base, StatisticsRollupBase):
+    """Long term statistics rolled up per month."""
+
+    duration = timedelta(days=31)
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index(
+            "ix_statistics_monthly_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATISTICS_MONTHLY
+
+
 class _StatisticsMeta:
     """Statistics meta data."""
 
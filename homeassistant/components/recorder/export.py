@@ -0,0 +1,341 @@
+"""Export recorder data to files and import statistics from them.
+
+The exports are CSV files, gzip compressed when the file name ends with
+.gz, with one row per state or statistic and a header naming the
+columns. They are written from read-only sessions in the database
+executor a chunk of rows at a time so the recorder thread is not
+blocked and memory use is bounded by the chunk size.
+
+The statistics exports name their period in each row. Only hourly
+statistics can be imported, the whole file is checked before the first
+chunk is imported so an import does not stop halfway.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+import csv
+from datetime import datetime
+import gzip
+import logging
+from typing import IO, Any
+
+from sqlalchemy import Select, select
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util.async_ import run_callback_threadsafe
+import homeassistant.util.dt as dt_util
+
+from .const import DOMAIN
+from .db_schema import (
+    StateAttributes,
+    States,
+    StatesMeta,
+    Statistics,
+    StatisticsBase,
+    StatisticsMeta,
+    StatisticsShortTerm,
+)
+from .models import StatisticData, StatisticMetaData
+from .models.state_attributes import decode_attributes_from_source
+from .statistics import async_add_external_statistics, async_import_statistics
+from .util import get_instance, session_scope
+
+_LOGGER = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 10000
+# The number of rows of a statistic in each import job
+IMPORT_CHUNK_SIZE = 5000
+
+STATES_COLUMNS = ("entity_id", "state", "last_changed", "last_updated", "attributes")
+STATISTICS_COLUMNS = (
+    "statistic_id",
+    "source",
+    "name",
+    "unit_of_measurement",
+    "has_mean",
+    "has_sum",
+    "period",
+    "start",
+    "mean",
+    "min",
+    "max",
+    "last_reset",
+    "state",
+    "sum",
+)
+STATISTICS_TABLES: dict[str, type[StatisticsBase]] = {
+    "hour": Statistics,
+    "5minute": StatisticsShortTerm,
+}
+
+
+@contextmanager
+def _open_export_file(filename: str, mode: str) -> Iterator[IO[str]]:
+    """Open an export file, compressed if the name ends with .gz."""
+    if filename.endswith(".gz"):
+        with gzip.open(filename, f"{mode}t", newline="", encoding="utf-8") as file:
+            yield file
+        return
+    with open(filename, mode, newline="", encoding="utf-8") as file:
+        yield file
+
+
+def _isoformat_or_empty(timestamp: float | None) -> str:
+    """Return a timestamp as an ISO formatted UTC string."""
+    if timestamp is None:
+        return ""
+    return dt_util.utc_from_timestamp(timestamp).isoformat()
+
+
+def _states_export_stmt(
+    start_time_ts: float, end_time_ts: float, metadata_ids: list[int] | None
+) -> Select:
+    """Return the statement to select the states to export."""
+    stmt = (
+        select(
+            StatesMeta.entity_id,
+            States.state,
+            States.last_changed_ts,
+            States.last_updated_ts,
+            StateAttributes.shared_attrs,
+        )
+        .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+        .outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        )
+        .where(
+            (States.last_updated_ts >= start_time_ts)
+            & (States.last_updated_ts < end_time_ts)
+        )
+    )
+    if metadata_ids is not None:
+        stmt = stmt.where(States.metadata_id.in_(metadata_ids))
+    return stmt.order_by(States.last_updated_ts)
+
+
+def export_states(
+    hass: HomeAssistant,
+    filename: str,
+    start_time: datetime,
+    end_time: datetime,
+    entity_ids: list[str] | None,
+) -> int:
+    """Export the states of a period to a file, returns the number of rows."""
+    rows_written = 0
+    with (
+        session_scope(hass=hass, read_only=True) as session,
+        _open_export_file(filename, "w") as file,
+    ):
+        metadata_ids: list[int] | None = None
+        if entity_ids is not None:
+            metadata_ids = [
+                metadata_id
+                for metadata_id in get_instance(hass)
+                .states_meta_manager.get_many(entity_ids, session, False)
+                .values()
+                if metadata_id is not None
+            ]
+        writer = csv.writer(file)
+        writer.writerow(STATES_COLUMNS)
+        result = session.execute(
+            _states_export_stmt(
+                start_time.timestamp(), end_time.timestamp(), metadata_ids
+            ).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+        for rows in result.partitions():
+            attr_cache: dict[str, dict[str, Any]] = {}
+            writer.writerows(
+                (
+                    entity_id,
+                    state,
+                    _isoformat_or_empty(last_changed_ts or last_updated_ts),
+                    _isoformat_or_empty(last_updated_ts),
+                    json_dumps(decode_attributes_from_source(shared_attrs, attr_cache)),
+                )
+                for entity_id, state, last_changed_ts, last_updated_ts, shared_attrs in rows
+            )
+            rows_written += len(rows)
+    _LOGGER.debug("Exported %s states to %s", rows_written, filename)
+    return rows_written
+
+
+def _statistics_export_stmt(
+    table: type[StatisticsBase],
+    start_time_ts: float,
+    end_time_ts: float,
+    statistic_ids: list[str] | None,
+) -> Select:
+    """Return the statement to select the statistics to export."""
+    stmt = (
+        select(
+            StatisticsMeta.statistic_id,
+            StatisticsMeta.source,
+            StatisticsMeta.name,
+            StatisticsMeta.unit_of_measurement,
+            StatisticsMeta.has_mean,
+            StatisticsMeta.has_sum,
+            table.start_ts,
+            table.mean,
+            table.min,
+            table.max,
+            table.last_reset_ts,
+            table.state,
+            table.sum,
+        )
+        .join(StatisticsMeta, table.metadata_id == StatisticsMeta.id)
+        .where((table.start_ts >= start_time_ts) & (table.start_ts < end_time_ts))
+    )
+    if statistic_ids is not None:
+        stmt = stmt.where(StatisticsMeta.statistic_id.in_(statistic_ids))
+    return stmt.order_by(table.metadata_id, table.start_ts)
+
+
+def export_statistics(
+    hass: HomeAssistant,
+    filename: str,
+    start_time: datetime,
+    end_time: datetime,
+    statistic_ids: list[str] | None,
+    period: str,
+) -> int:
+    """Export the statistics of a period to a file, returns the number of rows."""
+    rows_written = 0
+    with (
+        session_scope(hass=hass, read_only=True) as session,
+        _open_export_file(filename, "w") as file,
+    ):
+        writer = csv.writer(file)
+        writer.writerow(STATISTICS_COLUMNS)
+        result = session.execute(
+            _statistics_export_stmt(
+                STATISTICS_TABLES[period],
+                start_time.timestamp(),
+                end_time.timestamp(),
+                statistic_ids,
+            ).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+        for rows in result.partitions():
+            writer.writerows(
+                (
+                    *row[:6],
+                    period,
+                    _isoformat_or_empty(row.start_ts),
+                    row.mean,
+                    row.min,
+                    row.max,
+                    _isoformat_or_empty(row.last_reset_ts),
+                    row.state,
+                    row.sum,
+                )
+                for row in rows
+            )
+            rows_written += len(rows)
+    _LOGGER.debug("Exported %s statistics to %s", rows_written, filename)
+    return rows_written
+
+
+def _float_or_none(value: str) -> float | None:
+    """Return a float for a CSV field."""
+    return float(value) if value else None
+
+
+def _datetime_or_none(value: str) -> datetime | None:
+    """Return a datetime for a CSV field."""
+    return dt_util.parse_datetime(value, raise_on_error=True) if value else None
+
+
+def _read_statistics_rows(
+    filename: str,
+) -> Iterator[tuple[StatisticMetaData, str, StatisticData]]:
+    """Read the metadata, period and statistic of each row of an export file."""
+    metadata: StatisticMetaData | None = None
+    with _open_export_file(filename, "r") as file:
+        try:
+            for row in csv.DictReader(file):
+                statistic_id = row["statistic_id"]
+                if metadata is None or metadata["statistic_id"] != statistic_id:
+                    metadata = {
+                        "has_mean": row["has_mean"] in ("True", "1"),
+                        "has_sum": row["has_sum"] in ("True", "1"),
+                        "name": row["name"] or None,
+                        "source": row["source"],
+                        "statistic_id": statistic_id,
+                        "unit_of_measurement": row["unit_of_measurement"] or None,
+                    }
+                statistic: StatisticData = {
+                    "start": _datetime_or_none(row["start"]),  # type: ignore[typeddict-item]
+                    "last_reset": _datetime_or_none(row["last_reset"]),
+                }
+                for key in ("mean", "min", "max", "state", "sum"):
+                    if (value := _float_or_none(row[key])) is not None:
+                        statistic[key] = value  # type: ignore[literal-required]
+                yield metadata, row["period"], statistic
+        except (KeyError, ValueError) as err:
+            raise HomeAssistantError(
+                f"Invalid statistics file {filename}: {err}"
+            ) from err
+
+
+def check_statistics(filename: str) -> None:
+    """Check all rows of an export file can be imported."""
+    for metadata, period, statistic in _read_statistics_rows(filename):
+        if period != "hour":
+            raise HomeAssistantError(
+                f"Invalid statistics file {filename}: only hourly statistics can"
+                f" be imported, {metadata['statistic_id']} has {period} statistics"
+            )
+        start = statistic["start"]
+        if start is None or start.minute or start.second or start.microsecond:
+            raise HomeAssistantError(
+                f"Invalid statistics file {filename}: {metadata['statistic_id']}"
+                f" has a statistic starting at {start}, not at the top of the hour"
+            )
+
+
+def read_statistics(
+    filename: str,
+) -> Iterator[tuple[StatisticMetaData, list[StatisticData]]]:
+    """Read the statistics of an export file in import sized chunks.
+
+    The rows of a statistic are next to each other in an export, only
+    one chunk is held in memory at a time.
+    """
+    metadata: StatisticMetaData | None = None
+    statistics: list[StatisticData] = []
+    for row_metadata, _, statistic in _read_statistics_rows(filename):
+        if row_metadata is not metadata or len(statistics) == IMPORT_CHUNK_SIZE:
+            if metadata is not None:
+                yield metadata, statistics
+            metadata = row_metadata
+            statistics = []
+        statistics.append(statistic)
+    if metadata is not None:
+        yield metadata, statistics
+
+
+@callback
+def _async_import_chunk(
+    hass: HomeAssistant, metadata: StatisticMetaData, statistics: list[StatisticData]
+) -> None:
+    """Queue the import of a chunk of statistics."""
+    if metadata["source"] == DOMAIN:
+        async_import_statistics(hass, metadata, statistics)
+    else:
+        async_add_external_statistics(hass, metadata, statistics)
+
+
+def import_statistics(hass: HomeAssistant, filename: str) -> None:
+    """Import the statistics of an export file.
+
+    The file is checked first, then each chunk is handed to the recorder
+    as soon as it is read.
+    """
+    check_statistics(filename)
+    for metadata, statistics in read_statistics(filename):
+        run_callback_threadsafe(
+            hass.loop, _async_import_chunk, hass, metadata, statistics
+        ).result()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from datetime import datetime
 from typing import Any
 
@@ -11,11 +12,13 @@ from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers.recorder import get_instance
 
 from ..filters import Filters
+from ..util import DEFAULT_YIELD_STATES_ROWS
 from .const import NEED_ATTRIBUTE_DOMAINS, SIGNIFICANT_DOMAINS
 from .modern import (
     get_full_significant_states_with_session as _modern_get_full_significant_states_with_session,
     get_last_state_changes as _modern_get_last_state_changes,
     get_significant_states as _modern_get_significant_states,
+    get_significant_states_chunks as _modern_get_significant_states_chunks,
     get_significant_states_with_session as _modern_get_significant_states_with_session,
     state_changes_during_period as _modern_state_changes_during_period,
 )
@@ -27,6 +30,7 @@ __all__ = [
     "get_full_significant_states_with_session",
     "get_last_state_changes",
     "get_significant_states",
+    "get_significant_states_chunks",
     "get_significant_states_with_session",
     "state_changes_during_period",
 ]
@@ -115,6 +119,54 @@ def get_significant_states(
     )
 
 
+def get_significant_states_chunks(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Filters | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+    compressed_state_format: bool = False,
+    chunk_size: int = DEFAULT_YIELD_STATES_ROWS,
+) -> Iterator[dict[str, list[State | dict[str, Any]]]]:
+    """Yield the significant states during a time period in chunks of rows."""
+    if not get_instance(hass).states_meta_manager.active:
+        from .legacy import (  # pylint: disable=import-outside-toplevel
+            get_significant_states as _legacy_get_significant_states,
+        )
+
+        # The legacy queries are not chunked
+        yield _legacy_get_significant_states(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            compressed_state_format,
+        )
+        return
+    yield from _modern_get_significant_states_chunks(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        compressed_state_format,
+        chunk_size,
+    )
+
+
 def get_significant_states_with_session(
     hass: HomeAssistant,
     session: Session,
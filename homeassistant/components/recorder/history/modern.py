@@ -4,9 +4,9 @@ from __future__ import annotations
 
 from collections.abc import Callable, Iterable, Iterator
 from datetime import datetime
-from itertools import groupby
+from itertools import batched, groupby
 from operator import itemgetter
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
 
 from sqlalchemy import (
     CompoundSelect,
@@ -27,8 +27,13 @@ from homeassistant.core import HomeAssistant, State, split_entity_id
 from homeassistant.helpers.recorder import get_instance
 import homeassistant.util.dt as dt_util
 
-from ..const import LAST_REPORTED_SCHEMA_VERSION
-from ..db_schema import SHARED_ATTR_OR_LEGACY_ATTRIBUTES, StateAttributes, States
+from ..const import LAST_REPORTED_SCHEMA_VERSION, STATES_CHECKPOINTS_SCHEMA_VERSION
+from ..db_schema import (
+    SHARED_ATTR_OR_LEGACY_ATTRIBUTES,
+    StateAttributes,
+    States,
+    StatesCheckpoints,
+)
 from ..filters import Filters
 from ..models import (
     LazyState,
@@ -37,7 +42,8 @@ from ..models import (
     process_timestamp,
     row_to_compressed_state,
 )
-from ..util import execute_stmt_lambda_element, session_scope
+from ..queries import find_latest_states_checkpoint_ts
+from ..util import DEFAULT_YIELD_STATES_ROWS, execute_stmt_lambda_element, session_scope
 from .const import (
     LAST_CHANGED_KEY,
     NEED_ATTRIBUTE_DOMAINS,
@@ -45,6 +51,9 @@ from .const import (
     STATE_KEY,
 )
 
+if TYPE_CHECKING:
+    from ..core import Recorder
+
 _FIELD_MAP = {
     "metadata_id": 0,
     "state": 1,
@@ -145,6 +154,7 @@ def _significant_states_stmt(
     no_attributes: bool,
     include_start_time_state: bool,
     run_start_ts: float | None,
+    checkpoint_ts: float | None,
 ) -> Select | CompoundSelect:
     """Query the database for significant state changes."""
     include_last_changed = not significant_changes_only
@@ -184,6 +194,7 @@ def _significant_states_stmt(
                 metadata_ids,
                 no_attributes,
                 include_last_changed,
+                checkpoint_ts,
             ).subquery(),
             no_attributes,
             include_last_changed,
@@ -201,6 +212,37 @@ def _significant_states_stmt(
     ).order_by(unioned_subquery.c.metadata_id, unioned_subquery.c.last_updated_ts)
 
 
+def get_significant_states_chunks(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Filters | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+    compressed_state_format: bool = False,
+    chunk_size: int = DEFAULT_YIELD_STATES_ROWS,
+) -> Iterator[dict[str, list[State | dict[str, Any]]]]:
+    """Wrap get_significant_states_chunks_with_session with an sql session."""
+    with session_scope(hass=hass, read_only=True) as session:
+        yield from get_significant_states_chunks_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            compressed_state_format,
+            chunk_size,
+        )
+
+
 def get_significant_states_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -225,6 +267,45 @@ def get_significant_states_with_session(
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
     """
+    return next(
+        get_significant_states_chunks_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            compressed_state_format,
+            None,
+        ),
+        {},
+    )
+
+
+def get_significant_states_chunks_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str] | None,
+    filters: Filters | None,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    compressed_state_format: bool,
+    chunk_size: int | None,
+) -> Iterator[dict[str, list[State | dict[str, Any]]]]:
+    """Yield states changes during UTC period start_time - end_time in chunks.
+
+    The rows are fetched and converted chunk_size rows at a time so memory
+    use is bounded by the chunk size. The states of an entity may be split
+    over consecutive chunks. All rows are yielded at once if chunk_size is None.
+    """
     if filters is not None:
         raise NotImplementedError("Filters are no longer supported")
     if not entity_ids:
@@ -237,7 +318,7 @@ def get_significant_states_with_session(
             entity_ids, session, False
         )
     ) or not (possible_metadata_ids := extract_metadata_ids(entity_id_to_metadata_id)):
-        return {}
+        return
     metadata_ids = possible_metadata_ids
     if significant_changes_only:
         metadata_ids_in_significant_domains = [
@@ -254,6 +335,34 @@ def get_significant_states_with_session(
     start_time_ts = dt_util.utc_to_timestamp(start_time)
     end_time_ts = datetime_to_timestamp_or_none(end_time)
     single_metadata_id = metadata_ids[0] if len(metadata_ids) == 1 else None
+    if (
+        recent_rows := _recent_significant_states_rows(
+            instance,
+            start_time_ts,
+            end_time_ts,
+            entity_id_to_metadata_id,
+            significant_changes_only,
+            no_attributes,
+            include_start_time_state,
+            run_start_ts,
+            bool(single_metadata_id),
+        )
+    ) is not None:
+        yield _sorted_states_to_dict(
+            recent_rows,
+            start_time_ts if include_start_time_state else None,
+            entity_ids,
+            entity_id_to_metadata_id,
+            minimal_response,
+            compressed_state_format,
+            no_attributes=no_attributes,
+        )
+        return
+    checkpoint_ts: float | None = None
+    if include_start_time_state and not single_metadata_id:
+        checkpoint_ts = _get_states_checkpoint_ts(
+            hass, session, cast(float, run_start_ts), start_time_ts
+        )
     stmt = lambda_stmt(
         lambda: _significant_states_stmt(
             start_time_ts,
@@ -265,6 +374,7 @@ def get_significant_states_with_session(
             no_attributes,
             include_start_time_state,
             run_start_ts,
+            checkpoint_ts,
         ),
         track_on=[
             bool(single_metadata_id),
@@ -273,17 +383,116 @@ def get_significant_states_with_session(
             significant_changes_only,
             no_attributes,
             include_start_time_state,
+            bool(checkpoint_ts),
         ],
     )
-    return _sorted_states_to_dict(
-        execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False),
-        start_time_ts if include_start_time_state else None,
-        entity_ids,
-        entity_id_to_metadata_id,
-        minimal_response,
-        compressed_state_format,
-        no_attributes=no_attributes,
-    )
+    if chunk_size is None:
+        yield _sorted_states_to_dict(
+            execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False),
+            start_time_ts if include_start_time_state else None,
+            entity_ids,
+            entity_id_to_metadata_id,
+            minimal_response,
+            compressed_state_format,
+            no_attributes=no_attributes,
+        )
+        return
+    # The minimal response only has a full state for the first row of each
+    # entity, the last state of each entity is carried to the next chunk
+    last_states: dict[str, str | None] = {}
+    for rows in batched(
+        execute_stmt_lambda_element(
+            session, stmt, None, end_time, chunk_size, orm_rows=False, stream=True
+        ),
+        chunk_size,
+    ):
+        yield _sorted_states_to_dict(
+            rows,
+            start_time_ts if include_start_time_state else None,
+            entity_ids,
+            entity_id_to_metadata_id,
+            minimal_response,
+            compressed_state_format,
+            no_attributes=no_attributes,
+            last_states=last_states,
+        )
+
+
+class _RecentStateRow(NamedTuple):
+    """A recent state in the shape of a row of the significant states query."""
+
+    metadata_id: int
+    state: str | None
+    last_updated_ts: float
+    last_changed_ts: float | None
+    attributes: str | None
+
+
+def _recent_significant_states_rows(
+    instance: Recorder,
+    start_time_ts: float,
+    end_time_ts: float | None,
+    entity_id_to_metadata_id: dict[str, int | None],
+    significant_changes_only: bool,
+    no_attributes: bool,
+    include_start_time_state: bool,
+    run_start_ts: float | None,
+    single_entity: bool,
+) -> list[_RecentStateRow] | None:
+    """Return the rows of the significant states query from the recent states.
+
+    None is returned if the recent states do not cover the period for all
+    of the entities and the database needs to be queried instead.
+    """
+    metadata_ids = {
+        entity_id: metadata_id
+        for entity_id, metadata_id in entity_id_to_metadata_id.items()
+        if metadata_id is not None
+    }
+    if (
+        recent_states := instance.recent_states_manager.get_many(
+            metadata_ids, start_time_ts, end_time_ts, include_start_time_state
+        )
+    ) is None:
+        return None
+    rows: list[_RecentStateRow] = []
+    for entity_id, (start_state, period_states) in recent_states.items():
+        metadata_id = metadata_ids[entity_id]
+        if (
+            include_start_time_state
+            and start_state
+            # The start states of multiple entities are only looked
+            # up since the run started
+            and (
+                single_entity
+                or start_state.last_updated_ts >= cast(float, run_start_ts)
+            )
+        ):
+            rows.append(
+                _RecentStateRow(
+                    metadata_id,
+                    start_state.state,
+                    0,
+                    0,
+                    None if no_attributes else start_state.attributes,
+                )
+            )
+        in_significant_domain = split_entity_id(entity_id)[0] in SIGNIFICANT_DOMAINS
+        rows.extend(
+            _RecentStateRow(
+                metadata_id,
+                recent_state.state,
+                recent_state.last_updated_ts,
+                None if significant_changes_only else recent_state.last_changed_ts,
+                None if no_attributes else recent_state.attributes,
+            )
+            for recent_state in period_states
+            if not significant_changes_only
+            or in_significant_domain
+            or recent_state.last_changed_ts is None
+            or recent_state.last_changed_ts == recent_state.last_updated_ts
+        )
+    return rows
 
 
 def get_full_significant_states_with_session(
@@ -550,12 +759,61 @@ def get_last_state_changes(
         )
 
 
+def _get_most_recent_states_for_entities_by_date_stmt(
+    run_start_ts: float,
+    epoch_time: float,
+    metadata_ids: list[int],
+    checkpoint_ts: float | None,
+) -> Subquery:
+    """Return the last_updated_ts of the latest state of each entity."""
+    if not checkpoint_ts:
+        return (
+            select(
+                States.metadata_id.label("max_metadata_id"),
+                func.max(States.last_updated_ts).label("max_last_updated"),
+            )
+            .filter(
+                (States.last_updated_ts >= run_start_ts)
+                & (States.last_updated_ts < epoch_time)
+                & States.metadata_id.in_(metadata_ids)
+            )
+            .group_by(States.metadata_id)
+            .subquery()
+        )
+    # The checkpoint holds the latest state of each entity before
+    # checkpoint_ts so only the states after it need to be looked at
+    latest_states = union_all(
+        select(
+            StatesCheckpoints.metadata_id.label("metadata_id"),
+            StatesCheckpoints.last_updated_ts.label("last_updated_ts"),
+        ).filter(
+            (StatesCheckpoints.checkpoint_ts == checkpoint_ts)
+            & StatesCheckpoints.metadata_id.in_(metadata_ids)
+            & (StatesCheckpoints.last_updated_ts >= run_start_ts)
+        ),
+        select(States.metadata_id, States.last_updated_ts).filter(
+            (States.last_updated_ts >= checkpoint_ts)
+            & (States.last_updated_ts < epoch_time)
+            & States.metadata_id.in_(metadata_ids)
+        ),
+    ).subquery()
+    return (
+        select(
+            latest_states.c.metadata_id.label("max_metadata_id"),
+            func.max(latest_states.c.last_updated_ts).label("max_last_updated"),
+        )
+        .group_by(latest_states.c.metadata_id)
+        .subquery()
+    )
+
+
 def _get_start_time_state_for_entities_stmt(
     run_start_ts: float,
     epoch_time: float,
     metadata_ids: list[int],
     no_attributes: bool,
     include_last_changed: bool,
+    checkpoint_ts: float | None = None,
 ) -> Select:
     """Baked query to get states for specific entities."""
     # We got an include-list of entities, accelerate the query by filtering already
@@ -567,17 +825,9 @@ def _get_start_time_state_for_entities_stmt(
         .join(
             (
                 most_recent_states_for_entities_by_date := (
-                    select(
-                        States.metadata_id.label("max_metadata_id"),
-                        func.max(States.last_updated_ts).label("max_last_updated"),
-                    )
-                    .filter(
-                        (States.last_updated_ts >= run_start_ts)
-                        & (States.last_updated_ts < epoch_time)
-                        & States.metadata_id.in_(metadata_ids)
+                    _get_most_recent_states_for_entities_by_date_stmt(
+                        run_start_ts, epoch_time, metadata_ids, checkpoint_ts
                     )
-                    .group_by(States.metadata_id)
-                    .subquery()
                 )
             ),
             and_(
@@ -614,6 +864,20 @@ def _get_run_start_ts_for_utc_point_in_time(
     return None
 
 
+def _get_states_checkpoint_ts(
+    hass: HomeAssistant, session: Session, run_start_ts: float, epoch_time: float
+) -> float | None:
+    """Return the latest states checkpoint since the run start before epoch_time."""
+    if get_instance(hass).schema_version < STATES_CHECKPOINTS_SCHEMA_VERSION:
+        return None
+    checkpoint_ts: float | None = session.execute(
+        find_latest_states_checkpoint_ts(epoch_time)
+    ).scalar()
+    if checkpoint_ts is None or checkpoint_ts <= run_start_ts:
+        return None
+    return checkpoint_ts
+
+
 def _get_start_time_state_stmt(
     run_start_ts: float,
     epoch_time: float,
@@ -621,6 +885,7 @@ def _get_start_time_state_stmt(
     metadata_ids: list[int],
     no_attributes: bool,
     include_last_changed: bool,
+    checkpoint_ts: float | None = None,
 ) -> Select:
     """Return the states at a specific point in time."""
     if single_metadata_id:
@@ -641,6 +906,7 @@ def _get_start_time_state_stmt(
         metadata_ids,
         no_attributes,
         include_last_changed,
+        checkpoint_ts,
     )
 
 
@@ -680,6 +946,7 @@ def _sorted_states_to_dict(
     compressed_state_format: bool = False,
     descending: bool = False,
     no_attributes: bool = False,
+    last_states: dict[str, str | None] | None = None,
 ) -> dict[str, list[State | dict[str, Any]]]:
     """Convert SQL results into JSON friendly data structure.
 
@@ -688,6 +955,10 @@ def _sorted_states_to_dict(
 
     States must be sorted by entity_id and last_updated
 
+    When the states are converted in chunks, last_states holds the last
+    state of each entity in the previous chunks so the minimal response
+    continues from it instead of starting with a full state again.
+
     We also need to go back and create a synthetic zero data point for
     each list of states, otherwise our graphs won't start on the Y
     axis correctly.
@@ -758,7 +1029,9 @@ def _sorted_states_to_dict(
         # State for the first and last response. All the states
         # in-between only provide the "state" and the
         # "last_changed".
-        if not ent_results:
+        if last_states is not None and entity_id in last_states:
+            prev_state = last_states[entity_id]
+        elif not ent_results:
             if (first_state := next(group, None)) is None:
                 continue
             prev_state = first_state[state_idx]
@@ -793,22 +1066,23 @@ def _sorted_states_to_dict(
                     if (state := row[state_idx]) != prev_state
                 ]
             )
-            continue
-
-        # Non-compressed state format returns an ISO formatted string
-        _utc_from_timestamp = dt_util.utc_from_timestamp
-        ent_results.extend(
-            [
-                {
-                    attr_state: (prev_state := state),
-                    attr_time: _utc_from_timestamp(
-                        row[last_updated_ts_idx]
-                    ).isoformat(),
-                }
-                for row in group
-                if (state := row[state_idx]) != prev_state
-            ]
-        )
+        else:
+            # Non-compressed state format returns an ISO formatted string
+            _utc_from_timestamp = dt_util.utc_from_timestamp
+            ent_results.extend(
+                [
+                    {
+                        attr_state: (prev_state := state),
+                        attr_time: _utc_from_timestamp(
+                            row[last_updated_ts_idx]
+                        ).isoformat(),
+                    }
+                    for row in group
+                    if (state := row[state_idx]) != prev_state
+                ]
+            )
+        if last_states is not None:
+            last_states[entity_id] = prev_state
 
     if descending:
         for ent_results in result.values():
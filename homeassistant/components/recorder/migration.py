@@ -3,18 +3,28 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 import contextlib
 from dataclasses import dataclass, replace as dataclass_replace
 from datetime import timedelta
 import logging
-from time import time
+from time import monotonic, time
 from typing import TYPE_CHECKING, Any, cast, final
 from uuid import UUID
 
 import sqlalchemy
-from sqlalchemy import ForeignKeyConstraint, MetaData, Table, func, text, update
-from sqlalchemy.engine import CursorResult, Engine
+from sqlalchemy import (
+    ForeignKeyConstraint,
+    MetaData,
+    Table,
+    delete,
+    func,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.engine import CursorResult, Engine, Row
 from sqlalchemy.exc import (
     DatabaseError,
     IntegrityError,
@@ -29,6 +39,8 @@ from sqlalchemy.sql.expression import true
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes, json_bytes_strip_null
+from homeassistant.util import dt as dt_util
 from homeassistant.util.enum import try_parse_enum
 from homeassistant.util.ulid import ulid_at_time, ulid_to_bytes
 
@@ -48,11 +60,14 @@ from .auto_repairs.statistics.schema import (
     correct_db_schema as statistics_correct_db_schema,
     validate_db_schema as statistics_validate_db_schema,
 )
+from .compression import compress_shared_data
 from .const import (
     CONTEXT_ID_AS_BINARY_SCHEMA_VERSION,
+    CONTEXT_ORIGINS_SCHEMA_VERSION,
     EVENT_TYPE_IDS_SCHEMA_VERSION,
     LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION,
     STATES_META_SCHEMA_VERSION,
+    STATISTICS_ROLLUPS_SCHEMA_VERSION,
     SupportedDialect,
 )
 from .db_schema import (
@@ -67,20 +82,27 @@ from .db_schema import (
     STATISTICS_TABLES,
     TABLE_STATES,
     Base,
+    ContextOrigins,
+    EventData,
     Events,
     EventTypes,
     LegacyBase,
     MigrationChanges,
     SchemaChanges,
+    StateAttributes,
     States,
+    StatesCheckpoints,
     StatesMeta,
     Statistics,
+    StatisticsDaily,
     StatisticsMeta,
+    StatisticsMonthly,
     StatisticsRuns,
     StatisticsShortTerm,
 )
 from .models import process_timestamp
 from .models.time import datetime_to_timestamp_or_none
+from .partition import create_partitioned_layout
 from .queries import (
     batch_cleanup_entity_ids,
     delete_duplicate_short_term_statistics_row,
@@ -88,7 +110,9 @@ from .queries import (
     find_entity_ids_to_migrate,
     find_event_type_to_migrate,
     find_events_context_ids_to_migrate,
+    find_events_id_range,
     find_states_context_ids_to_migrate,
+    find_states_id_range,
     find_unmigrated_short_term_statistics_rows,
     find_unmigrated_statistics_rows,
     has_entity_ids_to_migrate,
@@ -97,10 +121,17 @@ from .queries import (
     has_states_context_ids_to_migrate,
     has_used_states_entity_ids,
     has_used_states_event_ids,
+    insert_events_context_origins,
+    insert_states_context_origins,
     migrate_single_short_term_statistics_row_to_timestamp,
     migrate_single_statistics_row_to_timestamp,
 )
-from .statistics import cleanup_statistics_timestamp_migration, get_start_time
+from .statistics import (
+    cleanup_statistics_timestamp_migration,
+    get_start_time,
+    reduce_month_ts_factory,
+    update_statistics_rollups,
+)
 from .tasks import RecorderTask
 from .util import (
     database_job_retry_wrapper,
@@ -132,6 +163,9 @@ MIGRATION_NOTE_WHILE = "This will take a while; please be patient!"
 _EMPTY_ENTITY_ID = "missing.entity_id"
 _EMPTY_EVENT_TYPE = "missing_event_type"
 
+# The number of event_ids or state_ids the origins are recorded for per task
+CONTEXT_ORIGINS_BATCH_SIZE = 10000
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -1758,6 +1792,36 @@ class _SchemaVersion47Migrator(_SchemaVersionMigrator, target_version=47):
         )
 
 
+class _SchemaVersion48Migrator(_SchemaVersionMigrator, target_version=48):
+    def _apply_update(self) -> None:
+        """Version specific update method."""
+        # The daily and monthly statistics tables are filled
+        # by the StatisticsRollupsMigration after the schema migration
+        for table in (StatisticsDaily, StatisticsMonthly):
+            # We need to cast __table__ to Table, explanation in
+            # https://github.com/sqlalchemy/sqlalchemy/issues/9130
+            cast(Table, table.__table__).create(self.engine, checkfirst=True)
+
+
+class _SchemaVersion49Migrator(_SchemaVersionMigrator, target_version=49):
+    def _apply_update(self) -> None:
+        """Version specific update method."""
+        # The first checkpoint is written by the recorder at the next hour
+        # We need to cast __table__ to Table, explanation in
+        # https://github.com/sqlalchemy/sqlalchemy/issues/9130
+        cast(Table, StatesCheckpoints.__table__).create(self.engine, checkfirst=True)
+
+
+class _SchemaVersion50Migrator(_SchemaVersionMigrator, target_version=50):
+    def _apply_update(self) -> None:
+        """Version specific update method."""
+        # The origins of existing events and states are recorded
+        # by the ContextOriginsMigration after the schema migration
+        # We need to cast __table__ to Table, explanation in
+        # https://github.com/sqlalchemy/sqlalchemy/issues/9130
+        cast(Table, ContextOrigins.__table__).create(self.engine, checkfirst=True)
+
+
 def _migrate_statistics_columns_to_timestamp_removing_duplicates(
     hass: HomeAssistant,
     instance: Recorder,
@@ -2125,7 +2189,7 @@ def post_migrate_entity_ids(instance: Recorder) -> bool:
     return is_done
 
 
-def _initialize_database(session: Session) -> bool:
+def _initialize_database(session: Session, partition_by_day: bool) -> bool:
     """Initialize a new database.
 
     The function determines the schema version by inspecting the db structure.
@@ -2142,6 +2206,8 @@ def _initialize_database(session: Session) -> bool:
     for index in indexes:
         if index["column_names"] in (["time_fired"], ["time_fired_ts"]):
             # Schema addition from version 1 detected. New DB.
+            if partition_by_day:
+                create_partitioned_layout(session)
             session.add(StatisticsRuns(start=get_start_time()))
             session.add(SchemaChanges(schema_version=SCHEMA_VERSION))
             return True
@@ -2152,15 +2218,21 @@ def _initialize_database(session: Session) -> bool:
     return True
 
 
-def initialize_database(session_maker: Callable[[], Session]) -> bool:
-    """Initialize a new database."""
+def initialize_database(
+    session_maker: Callable[[], Session], partition_by_day: bool = False
+) -> bool:
+    """Initialize a new database.
+
+    When partition_by_day is set, a new database gets the time
+    partitioned layout for the states and events tables.
+    """
     try:
         with session_scope(session=session_maker(), read_only=True) as session:
             if _get_schema_version(session) is not None:
                 return True
 
         with session_scope(session=session_maker()) as session:
-            return _initialize_database(session)
+            return _initialize_database(session, partition_by_day)
 
     except Exception:
         _LOGGER.exception("Error when initialise database")
@@ -2188,6 +2260,86 @@ class CommitBeforeMigrationTask(MigrationTask):
     commit_before = True
 
 
+@dataclass(slots=True)
+class ConcurrentMigrationTask(RecorderTask):
+    """Run a batch of each migration concurrently, each on its own connection."""
+
+    migrators: list[BaseRunTimeMigration]
+    commit_before = False
+
+    def run(self, instance: Recorder) -> None:
+        """Run concurrent migration task."""
+        with ThreadPoolExecutor(
+            max_workers=len(self.migrators), thread_name_prefix="RecorderMigration"
+        ) as executor:
+            migrated = list(
+                executor.map(
+                    lambda migrator: migrator.migrate_data(instance), self.migrators
+                )
+            )
+        if remaining := [
+            migrator
+            for migrator, done in zip(self.migrators, migrated, strict=True)
+            if not done
+        ]:
+            instance.queue_task(ConcurrentMigrationTask(remaining))
+
+
+@dataclass(slots=True)
+class MigrationProgress:
+    """Progress of a run time migration.
+
+    The rows are estimated from the range of the primary key the rows
+    are migrated in the order of.
+    """
+
+    min_id: int
+    max_id: int
+    last_id: int = 0
+    started_last_id: int | None = None
+    started: float = 0
+
+    @property
+    def rows_done(self) -> int:
+        """Return the number of rows migrated."""
+        return max(self.last_id - self.min_id + 1, 0)
+
+    @property
+    def rows_total(self) -> int:
+        """Return the number of rows to migrate."""
+        return self.max_id - self.min_id + 1
+
+    @property
+    def eta(self) -> float | None:
+        """Return the estimated number of seconds until the migration is done."""
+        if (
+            self.started_last_id is None
+            or self.last_id <= self.started_last_id
+            or (elapsed := monotonic() - self.started) <= 0
+        ):
+            return None
+        rate = (self.last_id - self.started_last_id) / elapsed
+        return max(self.max_id - self.last_id, 0) / rate
+
+    def update(self, last_id: int) -> None:
+        """Update the progress after a batch has been migrated."""
+        if self.started_last_id is None:
+            # The rate is measured from the first batch of this run
+            # since the batches before a restart took an unknown time
+            self.started_last_id = last_id
+            self.started = monotonic()
+        self.last_id = last_id
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the progress as a dict for the recorder info."""
+        eta = self.eta
+        return {
+            "rows_done": self.rows_done,
+            "rows_total": self.rows_total,
+            "eta": None if eta is None else round(eta),
+        }
+
+
 @dataclass(frozen=True, kw_only=True)
 class DataMigrationStatus:
     """Container for data migrator status."""
@@ -2204,11 +2356,18 @@ class BaseRunTimeMigration(ABC):
     migration_version = 1
     migration_id: str
     task = MigrationTask
+    # Migrations which only change their own table and do not use the
+    # table managers can run concurrently with each other
+    concurrent = False
+    # Migrations which migrate the rows in the order of the primary key
+    # set the query for its range to keep a cursor and report progress
+    id_range_query: Callable[[], StatementLambdaElement] | None = None
 
     def __init__(self, schema_version: int, migration_changes: dict[str, int]) -> None:
         """Initialize a new BaseRunTimeMigration."""
         self.schema_version = schema_version
         self.migration_changes = migration_changes
+        self.last_id = 0
 
     def do_migrate(self, instance: Recorder, session: Session) -> None:
         """Start migration if needed."""
@@ -2221,6 +2380,8 @@ class BaseRunTimeMigration(ABC):
     def migrate_data(self, instance: Recorder) -> bool:
         """Migrate some data, returns True if migration is completed."""
         status = self.migrate_data_impl(instance)
+        if self.id_range_query is not None:
+            self._update_progress(instance, status)
         if status.migration_done:
             if self.index_to_drop is not None:
                 table, index = self.index_to_drop
@@ -2234,6 +2395,44 @@ class BaseRunTimeMigration(ABC):
     def migrate_data_impl(self, instance: Recorder) -> DataMigrationStatus:
         """Migrate some data, return if the migration needs to run and if it is done."""
 
+    def _advance_cursor(self, rows: Sequence[Row]) -> bool:
+        """Move the cursor past a batch of rows, return True if all rows are migrated.
+
+        The batches are found after the cursor so the rows migrated before
+        are not scanned again. After a restart the cursor starts over, the
+        first batch then finds the rows where the migration stopped. Once
+        no rows are left after the cursor, the whole table is checked once
+        more before the migration is done.
+        """
+        if rows:
+            self.last_id = rows[-1][0]
+            return False
+        if self.last_id:
+            self.last_id = 0
+            return False
+        return True
+
+    def _update_progress(self, instance: Recorder, status: DataMigrationStatus) -> None:
+        """Update the progress of the migration in the recorder."""
+        if status.migration_done or not status.needs_migrate:
+            instance.migration_progress.pop(self.migration_id, None)
+            return
+        if not self.last_id:
+            return
+        progress = instance.migration_progress.get(self.migration_id)
+        if progress is None or self.last_id > progress.max_id:
+            assert self.id_range_query is not None
+            with session_scope(
+                session=instance.get_session(), read_only=True
+            ) as session:
+                min_id, max_id = session.execute(self.id_range_query()).one()
+            if progress is None:
+                progress = MigrationProgress(min_id or 0, max_id or 0)
+                instance.migration_progress[self.migration_id] = progress
+            else:
+                progress.max_id = max_id or 0
+        progress.update(self.last_id)
+
     def migration_done(self, instance: Recorder, session: Session) -> None:
         """Will be called after migrate returns True or if migration is not needed."""
 
@@ -2297,6 +2496,8 @@ class StatesContextIDMigration(BaseRunTimeMigrationWithQuery):
     migration_id = "state_context_id_as_binary"
     migration_version = 2
     index_to_drop = ("states", "ix_states_context_id")
+    concurrent = True
+    id_range_query = staticmethod(find_states_id_range)
 
     def migrate_data_impl(self, instance: Recorder) -> DataMigrationStatus:
         """Migrate states context_ids to use binary format, return True if completed."""
@@ -2305,7 +2506,7 @@ class StatesContextIDMigration(BaseRunTimeMigrationWithQuery):
         _LOGGER.debug("Migrating states context_ids to binary format")
         with session_scope(session=session_maker()) as session:
             if states := session.execute(
-                find_states_context_ids_to_migrate(instance.max_bind_vars)
+                find_states_context_ids_to_migrate(instance.max_bind_vars, self.last_id)
             ).all():
                 session.execute(
                     update(States),
@@ -2323,7 +2524,7 @@ class StatesContextIDMigration(BaseRunTimeMigrationWithQuery):
                         for state_id, last_updated_ts, context_id, context_user_id, context_parent_id in states
                     ],
                 )
-            is_done = not states
+            is_done = self._advance_cursor(states)
 
         _LOGGER.debug("Migrating states context_ids to binary format: done=%s", is_done)
         return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
@@ -2340,6 +2541,8 @@ class EventsContextIDMigration(BaseRunTimeMigrationWithQuery):
     migration_id = "event_context_id_as_binary"
     migration_version = 2
     index_to_drop = ("events", "ix_events_context_id")
+    concurrent = True
+    id_range_query = staticmethod(find_events_id_range)
 
     def migrate_data_impl(self, instance: Recorder) -> DataMigrationStatus:
         """Migrate events context_ids to use binary format, return True if completed."""
@@ -2348,7 +2551,7 @@ class EventsContextIDMigration(BaseRunTimeMigrationWithQuery):
         _LOGGER.debug("Migrating context_ids to binary format")
         with session_scope(session=session_maker()) as session:
             if events := session.execute(
-                find_events_context_ids_to_migrate(instance.max_bind_vars)
+                find_events_context_ids_to_migrate(instance.max_bind_vars, self.last_id)
             ).all():
                 session.execute(
                     update(Events),
@@ -2366,7 +2569,7 @@ class EventsContextIDMigration(BaseRunTimeMigrationWithQuery):
                         for event_id, time_fired_ts, context_id, context_user_id, context_parent_id in events
                     ],
                 )
-            is_done = not events
+            is_done = self._advance_cursor(events)
 
         _LOGGER.debug("Migrating events context_ids to binary format: done=%s", is_done)
         return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
@@ -2382,6 +2585,7 @@ class EventTypeIDMigration(BaseRunTimeMigrationWithQuery):
     required_schema_version = EVENT_TYPE_IDS_SCHEMA_VERSION
     migration_id = "event_type_id_migration"
     task = CommitBeforeMigrationTask
+    id_range_query = staticmethod(find_events_id_range)
     # We have to commit before to make sure there are
     # no new pending event_types about to be added to
     # the db since this happens live
@@ -2393,7 +2597,7 @@ class EventTypeIDMigration(BaseRunTimeMigrationWithQuery):
         event_type_manager = instance.event_type_manager
         with session_scope(session=session_maker()) as session:
             if events := session.execute(
-                find_event_type_to_migrate(instance.max_bind_vars)
+                find_event_type_to_migrate(instance.max_bind_vars, self.last_id)
             ).all():
                 event_types = {event_type for _, event_type in events}
                 if None in event_types:
@@ -2439,7 +2643,7 @@ class EventTypeIDMigration(BaseRunTimeMigrationWithQuery):
                     ],
                 )
 
-            is_done = not events
+            is_done = self._advance_cursor(events)
 
         _LOGGER.debug("Migrating event_types done=%s", is_done)
         return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
@@ -2460,6 +2664,7 @@ class EntityIDMigration(BaseRunTimeMigrationWithQuery):
     required_schema_version = STATES_META_SCHEMA_VERSION
     migration_id = "entity_id_migration"
     task = CommitBeforeMigrationTask
+    id_range_query = staticmethod(find_states_id_range)
     # We have to commit before to make sure there are
     # no new pending states_meta about to be added to
     # the db since this happens live
@@ -2477,7 +2682,7 @@ class EntityIDMigration(BaseRunTimeMigrationWithQuery):
         states_meta_manager = instance.states_meta_manager
         with session_scope(session=instance.get_session()) as session:
             if states := session.execute(
-                find_entity_ids_to_migrate(instance.max_bind_vars)
+                find_entity_ids_to_migrate(instance.max_bind_vars, self.last_id)
             ).all():
                 entity_ids = {entity_id for _, entity_id in states}
                 if None in entity_ids:
@@ -2527,7 +2732,7 @@ class EntityIDMigration(BaseRunTimeMigrationWithQuery):
                     ],
                 )
 
-            is_done = not states
+            is_done = self._advance_cursor(states)
 
         _LOGGER.debug("Migrating entity_ids done=%s", is_done)
         return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
@@ -2648,6 +2853,214 @@ class EntityIDPostMigration(BaseRunTimeMigrationWithQuery):
         return has_used_states_entity_ids()
 
 
+class StatisticsRollupsMigration(BaseRunTimeMigration):
+    """Migration to roll up the hourly statistics to daily and monthly statistics."""
+
+    migration_id = "statistics_rollups"
+    required_schema_version = STATISTICS_ROLLUPS_SCHEMA_VERSION
+
+    def __init__(self, schema_version: int, migration_changes: dict[str, int]) -> None:
+        """Initialize a new StatisticsRollupsMigration."""
+        super().__init__(schema_version, migration_changes)
+        # The rollups are built one month at a time, newest month first
+        self._month_end_ts: float | None = None
+
+    def migrate_data_impl(self, instance: Recorder) -> DataMigrationStatus:
+        """Roll up the statistics of one month, returns True if completed."""
+        _, month_start_end = reduce_month_ts_factory()
+        with session_scope(session=instance.get_session()) as session:
+            first_start_ts, last_start_ts = session.execute(
+                select(func.min(Statistics.start_ts), func.max(Statistics.start_ts))
+            ).one()
+            if first_start_ts is None:
+                return DataMigrationStatus(needs_migrate=False, migration_done=True)
+            if self._month_end_ts is None:
+                self._month_end_ts = month_start_end(last_start_ts)[1]
+                # Drop rollups left behind by a different time zone
+                for table in (StatisticsDaily, StatisticsMonthly):
+                    session.execute(
+                        delete(table).where(table.start_ts >= self._month_end_ts)
+                    )
+            month_start_ts = month_start_end(self._month_end_ts - 1)[0]
+            _LOGGER.debug(
+                "Rolling up statistics from %s",
+                dt_util.utc_from_timestamp(month_start_ts).isoformat(),
+            )
+            update_statistics_rollups(session, None, month_start_ts, self._month_end_ts)
+            if is_done := month_start_ts <= first_start_ts:
+                for table in (StatisticsDaily, StatisticsMonthly):
+                    session.execute(
+                        delete(table).where(table.start_ts < month_start_ts)
+                    )
+        self._month_end_ts = month_start_ts
+        return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
+
+    def migration_done(self, instance: Recorder, session: Session) -> None:
+        """Will be called after migrate returns True or if migration is not needed."""
+        instance.statistics_rollups_ready = True
+
+    def needs_migrate_impl(
+        self, instance: Recorder, session: Session
+    ) -> DataMigrationStatus:
+        """Return if the migration needs to run."""
+        needs_migrate = session.execute(select(Statistics.id).limit(1)).first()
+        return DataMigrationStatus(
+            needs_migrate=bool(needs_migrate), migration_done=not needs_migrate
+        )
+
+
+class ContextOriginsMigration(BaseRunTimeMigration):
+    """Migration to record the context origins of existing events and states."""
+
+    migration_id = "context_origins"
+    required_schema_version = CONTEXT_ORIGINS_SCHEMA_VERSION
+
+    def __init__(self, schema_version: int, migration_changes: dict[str, int]) -> None:
+        """Initialize a new ContextOriginsMigration."""
+        super().__init__(schema_version, migration_changes)
+        # The recorder writes the origins of the rows recorded after the
+        # migration started, only the rows up to these ids are migrated
+        self._max_ids: tuple[int, int] | None = None
+        self._last_state_id = 0
+
+    def migrate_data_impl(self, instance: Recorder) -> DataMigrationStatus:
+        """Record the origins of a batch of rows, returns True if completed."""
+        with session_scope(session=instance.get_session()) as session:
+            if self._max_ids is None:
+                if execute_stmt_lambda_element(
+                    session, has_events_context_ids_to_migrate()
+                ) or execute_stmt_lambda_element(
+                    session, has_states_context_ids_to_migrate()
+                ):
+                    # The origins are found by the binary context ids
+                    _LOGGER.debug("Waiting for the context ids to be migrated")
+                    return DataMigrationStatus(needs_migrate=True, migration_done=False)
+                self._max_ids = (
+                    session.execute(find_events_id_range()).one()[1] or 0,
+                    session.execute(find_states_id_range()).one()[1] or 0,
+                )
+            max_event_id, max_state_id = self._max_ids
+            # The events are migrated first, the origin of a context which
+            # has both events and states is the earliest of its rows
+            if self.last_id < max_event_id:
+                until_id = min(self.last_id + CONTEXT_ORIGINS_BATCH_SIZE, max_event_id)
+                session.execute(insert_events_context_origins(self.last_id, until_id))
+                self.last_id = until_id
+            elif self._last_state_id < max_state_id:
+                until_id = min(
+                    self._last_state_id + CONTEXT_ORIGINS_BATCH_SIZE, max_state_id
+                )
+                session.execute(
+                    insert_states_context_origins(self._last_state_id, until_id)
+                )
+                self._last_state_id = until_id
+        is_done = self.last_id >= max_event_id and self._last_state_id >= max_state_id
+        _LOGGER.debug("Migrating context origins done=%s", is_done)
+        return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
+
+    def migration_done(self, instance: Recorder, session: Session) -> None:
+        """Will be called after migrate returns True or if migration is not needed."""
+        instance.context_origins_ready = True
+
+    def needs_migrate_impl(
+        self, instance: Recorder, session: Session
+    ) -> DataMigrationStatus:
+        """Return if the migration needs to run."""
+        needs_migrate = (
+            session.execute(select(Events.event_id).limit(1)).first()
+            or session.execute(select(States.state_id).limit(1)).first()
+        )
+        return DataMigrationStatus(
+            needs_migrate=bool(needs_migrate), migration_done=not needs_migrate
+        )
+
+
+class SharedDataCompressionMigration(BaseRunTimeMigration):
+    """Migration to compress the shared_attrs and shared_data of existing rows.
+
+    It is only queued when compress_shared_data is enabled. Once it is
+    done it is not run again, the rows written while the option was
+    disabled stay uncompressed.
+    """
+
+    migration_id = "compress_shared_data"
+    # It rewrites the rows cached by the StateAttributesManager and the
+    # EventDataManager so it cannot run concurrently
+
+    def __init__(self, schema_version: int, migration_changes: dict[str, int]) -> None:
+        """Initialize a new SharedDataCompressionMigration."""
+        super().__init__(schema_version, migration_changes)
+        # The state_attributes rows are compressed first, the
+        # cursor of the event_data rows is None until they are started
+        self._last_data_id: int | None = None
+
+    def migrate_data_impl(self, instance: Recorder) -> DataMigrationStatus:
+        """Compress a batch of rows, returns True if completed."""
+        encoder = (
+            json_bytes_strip_null
+            if instance.dialect_name == SupportedDialect.POSTGRESQL
+            else json_bytes
+        )
+        is_done = False
+        # The caches of the managers still map the old shared_attrs and
+        # shared_data of the rewritten rows to their ids
+        with session_scope(session=instance.get_session()) as session:
+            if self._last_data_id is None:
+                last_id, rewritten_ids = compress_shared_data(
+                    session, StateAttributes, self.last_id, encoder
+                )
+                instance.state_attributes_manager.evict_purged(rewritten_ids)
+                if last_id is None:
+                    self._last_data_id = 0
+                else:
+                    self.last_id = last_id
+            else:
+                last_id, rewritten_ids = compress_shared_data(
+                    session, EventData, self._last_data_id, encoder
+                )
+                instance.event_data_manager.evict_purged(rewritten_ids)
+                if last_id is None:
+                    is_done = True
+                else:
+                    self._last_data_id = last_id
+        _LOGGER.debug("Compressing shared data done=%s", is_done)
+        return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
+
+    def needs_migrate_impl(
+        self, instance: Recorder, session: Session
+    ) -> DataMigrationStatus:
+        """Return if the migration needs to run."""
+        needs_migrate = (
+            session.execute(select(StateAttributes.attributes_id).limit(1)).first()
+            or session.execute(select(EventData.data_id).limit(1)).first()
+        )
+        return DataMigrationStatus(
+            needs_migrate=bool(needs_migrate), migration_done=not needs_migrate
+        )
+
+
+def queue_run_time_migrations(
+    instance: Recorder, session: Session, migrators: Iterable[BaseRunTimeMigration]
+) -> None:
+    """Queue the run time migrations which need to run.
+
+    SQLite only allows one writer at a time, on the other databases the
+    concurrent migrations run together in one task.
+    """
+    concurrent_task: ConcurrentMigrationTask | None = None
+    for migrator in migrators:
+        if not migrator.concurrent or instance.dialect_name == SupportedDialect.SQLITE:
+            migrator.do_migrate(instance, session)
+            continue
+        if not migrator.needs_migrate(instance, session):
+            migrator.migration_done(instance, session)
+            continue
+        if concurrent_task is None:
+            concurrent_task = ConcurrentMigrationTask([])
+            instance.queue_task(concurrent_task)
+        concurrent_task.migrators.append(migrator)
+
+
 def _mark_migration_done(
     session: Session, migration: type[BaseRunTimeMigration]
 ) -> None:
@@ -2,13 +2,26 @@
 
 from __future__ import annotations
 
+from .compression import (
+    COMPRESSED_KEY_JSON,
+    COMPRESSED_KEY_JSON_BYTES,
+    SHARED_ATTRS_PLAIN_KEYS,
+    SHARED_DATA_PLAIN_KEYS,
+    compress_json_object,
+    decompress_json_object,
+)
 from .context import (
     bytes_to_ulid_or_none,
     bytes_to_uuid_hex_or_none,
     ulid_to_bytes_or_none,
     uuid_hex_to_bytes_or_none,
 )
-from .database import DatabaseEngine, DatabaseOptimizer, UnsupportedDialect
+from .database import (
+    DatabaseEngine,
+    DatabaseJobStats,
+    DatabaseOptimizer,
+    UnsupportedDialect,
+)
 from .event import extract_event_type_ids
 from .state import LazyState, extract_metadata_ids, row_to_compressed_state
 from .statistics import (
@@ -29,8 +42,13 @@ from .time import (
 )
 
 __all__ = [
+    "COMPRESSED_KEY_JSON",
+    "COMPRESSED_KEY_JSON_BYTES",
+    "SHARED_ATTRS_PLAIN_KEYS",
+    "SHARED_DATA_PLAIN_KEYS",
     "CalendarStatisticPeriod",
     "DatabaseEngine",
+    "DatabaseJobStats",
     "DatabaseOptimizer",
     "FixedStatisticPeriod",
     "LazyState",
@@ -43,7 +61,9 @@ __all__ = [
     "UnsupportedDialect",
     "bytes_to_ulid_or_none",
     "bytes_to_uuid_hex_or_none",
+    "compress_json_object",
     "datetime_to_timestamp_or_none",
+    "decompress_json_object",
     "extract_event_type_ids",
     "extract_metadata_ids",
     "process_timestamp",
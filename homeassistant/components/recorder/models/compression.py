@@ -0,0 +1,99 @@
+"""Compressed encoding of the shared_attrs and shared_data columns.
+
+A compressed row is still a JSON object so the JSON functions and LIKE
+matchers the history and logbook queries run on the columns keep working.
+The keys that are queried stay plain and the rest of the object is
+deflated with a preset dictionary of common attribute and event data
+snippets and stored base64 encoded under COMPRESSED_KEY.
+
+An object which has a key named COMPRESSED_KEY itself is always stored
+compressed, so the key in a row written by the recorder always marks a
+compressed row.
+"""
+
+from __future__ import annotations
+
+from base64 import b64decode, b64encode
+from collections.abc import Callable
+from typing import Any
+import zlib
+
+from homeassistant.util.json import json_loads_object
+
+COMPRESSED_KEY = "$zlib"
+COMPRESSED_KEY_JSON = f'"{COMPRESSED_KEY}":'
+COMPRESSED_KEY_JSON_BYTES = COMPRESSED_KEY_JSON.encode()
+
+# Keys matched with SQL that must stay readable by the database
+SHARED_ATTRS_PLAIN_KEYS = ("icon", "unit_of_measurement")
+SHARED_DATA_PLAIN_KEYS = ("entity_id", "device_id")
+
+# Objects this small do not get smaller once the base64 overhead is added
+MIN_COMPRESS_BYTES = 96
+
+_COMPRESS_LEVEL = 6
+# Raw deflate streams, the zlib header and checksum are not needed
+_WBITS = -zlib.MAX_WBITS
+
+# The preset dictionary, deflate finds matches in the dictionary as if
+# it came before the data. The most common snippets go last as they
+# are the closest and cheapest to reference.
+_ZDICT = (
+    b'"hvac_modes":["off","heat","cool","auto"],"preset_modes":'
+    b'"effect_list":"supported_color_modes":["color_temp","hs","xy"],'
+    b'"color_mode":"min_color_temp_kelvin":"max_color_temp_kelvin":'
+    b'"min_mireds":"max_mireds":"brightness":"hs_color":"rgb_color":"xy_color":'
+    b'"editable":false,"id":"last_triggered":"current":0,"mode":"single",'
+    b'"user_id":null,"context_id":"service_data":{"service":"domain":"'
+    b'"options":["initial":null,"min":0,"max":100,"step":1,"pattern":null,'
+    b'"latitude":"longitude":"gps_accuracy":"source_type":"gps","battery_level":'
+    b'"attribution":"Data provided by ","restored":true,"supported_features":0,'
+    b'"device_class":"temperature","device_class":"power","device_class":"energy",'
+    b'"state_class":"total_increasing","state_class":"measurement",'
+    b'"friendly_name":"'
+)
+
+
+def compress_json_object(
+    json_bytes: bytes,
+    plain_keys: tuple[str, ...],
+    encoder: Callable[[Any], bytes],
+) -> bytes:
+    """Return the compressed encoding of a JSON object if it is smaller."""
+    if (
+        len(json_bytes) < MIN_COMPRESS_BYTES
+        and COMPRESSED_KEY_JSON_BYTES not in json_bytes
+    ):
+        return json_bytes
+    data = json_loads_object(json_bytes)
+    has_compressed_key = COMPRESSED_KEY in data
+    plain = {key: data.pop(key) for key in plain_keys if key in data}
+    if not data:
+        return json_bytes
+    compressor = zlib.compressobj(_COMPRESS_LEVEL, zlib.DEFLATED, _WBITS, zdict=_ZDICT)
+    compressed = compressor.compress(encoder(data)) + compressor.flush()
+    plain[COMPRESSED_KEY] = b64encode(compressed).decode("ascii")
+    compressed_bytes = encoder(plain)
+    if has_compressed_key or len(compressed_bytes) < len(json_bytes):
+        return compressed_bytes
+    return json_bytes
+
+
+def decompress_json_object(data: dict[str, Any]) -> dict[str, Any]:
+    """Restore a decoded JSON object stored with compress_json_object.
+
+    A row written before the compression existed can have a key named
+    COMPRESSED_KEY, if its value does not decode the object is returned
+    as it is.
+    """
+    if type(compressed := data.get(COMPRESSED_KEY)) is not str:
+        return data
+    decompressor = zlib.decompressobj(_WBITS, zdict=_ZDICT)
+    try:
+        json_bytes = decompressor.decompress(b64decode(compressed, validate=True))
+        decompressed = json_loads_object(json_bytes + decompressor.flush())
+    except (zlib.error, ValueError):
+        return data
+    del data[COMPRESSED_KEY]
+    data.update(decompressed)
+    return data
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import threading
 
 from awesomeversion import AwesomeVersion
 
@@ -33,3 +34,25 @@ class DatabaseOptimizer:
     # https://jira.mariadb.org/browse/MDEV-25020
     #
     slow_range_in_select: bool
+
+
+@dataclass
+class DatabaseJobStats:
+    """Timing of the jobs run in the database executor."""
+
+    count: int = 0
+    total_time: float = 0
+    max_time: float = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, duration: float) -> None:
+        """Record a job that took duration seconds."""
+        with self._lock:
+            self.count += 1
+            self.total_time += duration
+            self.max_time = max(self.max_time, duration)
+
+    @property
+    def average_time(self) -> float:
+        """Return the average time of a job in seconds."""
+        return self.total_time / self.count if self.count else 0
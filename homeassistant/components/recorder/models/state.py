@@ -55,6 +55,7 @@ class LazyState(State):
         self.state = state or ""
         self._attributes: dict[str, Any] | None = None
         self._last_updated_ts: float | None = last_updated_ts or start_time_ts
+        self.last_updated_timestamp = self._last_updated_ts  # type: ignore[assignment]
         self.attr_cache = attr_cache
         self.context = EMPTY_CONTEXT
 
@@ -0,0 +1,169 @@
+"""Time partitioned layout for the states and events tables.
+
+The layout is only available for PostgreSQL. The states and events tables
+are range partitioned by day on their timestamp column so history queries
+only scan the days they ask for and purging drops whole days at once.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+import logging
+import re
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.session import Session
+from sqlalchemy.schema import AddConstraint
+
+from homeassistant.util import dt as dt_util
+
+from .db_schema import TABLE_EVENTS, TABLE_STATES, Base
+
+_LOGGER = logging.getLogger(__name__)
+
+# The table name maps to the primary key and the column to partition by
+PARTITIONED_TABLES: dict[str, tuple[str, str]] = {
+    TABLE_STATES: ("state_id", "last_updated_ts"),
+    TABLE_EVENTS: ("event_id", "time_fired_ts"),
+}
+
+# Partitions are created this many days ahead so rows never
+# have to fall back to the default partition
+PARTITION_DAYS_AHEAD = 7
+
+_PARTITION_NAME_RE = re.compile(r"_p(\d{8})$")
+
+
+def partition_name(table: str, day: date) -> str:
+    """Return the name of the partition holding the rows of a day."""
+    return f"{table}_p{day:%Y%m%d}"
+
+
+def partition_day(name: str) -> date | None:
+    """Return the day a partition holds or None if it is not a day partition."""
+    if not (match := _PARTITION_NAME_RE.search(name)):
+        return None
+    return datetime.strptime(match.group(1), "%Y%m%d").date()
+
+
+def _day_start_timestamp(day: date) -> float:
+    """Return the UTC timestamp of the start of a day."""
+    return datetime(day.year, day.month, day.day, tzinfo=dt_util.UTC).timestamp()
+
+
+def has_partitioned_layout(session: Session) -> bool:
+    """Return if the states table is partitioned."""
+    return bool(
+        session.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table"
+                " WHERE partrelid = to_regclass(:table)"
+            ),
+            {"table": TABLE_STATES},
+        ).scalar()
+    )
+
+
+def create_partitioned_layout(session: Session) -> None:
+    """Recreate the empty states and events tables partitioned by day.
+
+    This must only be called for a new database since the tables are
+    recreated without their rows.
+
+    A unique constraint on a partitioned table must include the partition
+    column, so the primary key is extended with the timestamp and the
+    states.old_state_id self reference is not enforced by a foreign key.
+    """
+    connection = session.connection()
+    for table, (id_column, ts_column) in PARTITIONED_TABLES.items():
+        _LOGGER.debug("Creating partitioned %s table", table)
+        template = f"{table}_template"
+        connection.execute(text(f"ALTER TABLE {table} RENAME TO {template}"))
+        connection.execute(
+            text(
+                f"CREATE TABLE {table} (LIKE {template}"
+                " INCLUDING DEFAULTS INCLUDING IDENTITY)"
+                f" PARTITION BY RANGE ({ts_column})"
+            )
+        )
+        connection.execute(text(f"DROP TABLE {template}"))
+        connection.execute(
+            text(f"ALTER TABLE {table} ADD PRIMARY KEY ({id_column}, {ts_column})")
+        )
+        connection.execute(
+            text(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        )
+        schema_table = Base.metadata.tables[table]
+        for constraint in schema_table.foreign_key_constraints:
+            if constraint.referred_table is schema_table:
+                continue
+            # AddConstraint mutates the constraint passed to it, we need to
+            # undo that to avoid changing the behavior of the table schema.
+            create_rule = constraint._create_rule  # noqa: SLF001
+            add_constraint = AddConstraint(constraint)  # type: ignore[no-untyped-call]
+            constraint._create_rule = create_rule  # noqa: SLF001
+            connection.execute(add_constraint)
+        for index in schema_table.indexes:
+            index.create(connection)
+    create_partitions(session, dt_util.utcnow())
+
+
+def create_partitions(session: Session, now: datetime) -> None:
+    """Create the day partitions from today until PARTITION_DAYS_AHEAD."""
+    today = dt_util.as_utc(now).date()
+    for table in PARTITIONED_TABLES:
+        for days in range(PARTITION_DAYS_AHEAD + 1):
+            day = today + timedelta(days=days)
+            try:
+                # A savepoint keeps the other partitions when one of them
+                # fails because the default partition has rows in its range
+                with session.begin_nested():
+                    session.execute(
+                        text(
+                            "CREATE TABLE IF NOT EXISTS"
+                            f" {partition_name(table, day)} PARTITION OF {table}"
+                            f" FOR VALUES FROM ({_day_start_timestamp(day)})"
+                            f" TO ({_day_start_timestamp(day + timedelta(days=1))})"
+                        )
+                    )
+            except SQLAlchemyError:
+                _LOGGER.exception(
+                    "Error creating partition of %s for %s", table, day.isoformat()
+                )
+
+
+def expired_partitions(names: Iterable[str], purge_before: datetime) -> list[str]:
+    """Return the day partitions only holding rows before purge_before.
+
+    The partitions are sorted oldest first.
+    """
+    purge_before_ts = purge_before.timestamp()
+    partitions = sorted(
+        (day, name)
+        for name in names
+        if (day := partition_day(name)) is not None
+        and _day_start_timestamp(day + timedelta(days=1)) <= purge_before_ts
+    )
+    return [name for _, name in partitions]
+
+
+def find_expired_partitions(
+    session: Session, table: str, purge_before: datetime
+) -> list[str]:
+    """Return the day partitions of a table only holding rows before purge_before.
+
+    The partitions are sorted oldest first.
+    """
+    return expired_partitions(
+        session.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits"
+                " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+                " WHERE pg_inherits.inhparent = to_regclass(:table)"
+            ),
+            {"table": table},
+        ).scalars(),
+        purge_before,
+    )
@@ -9,27 +9,33 @@ import logging
 import time
 from typing import TYPE_CHECKING
 
+from sqlalchemy import text
 from sqlalchemy.orm.session import Session
 
 from homeassistant.util.collection import chunked_or_all
 
-from .db_schema import Events, States, StatesMeta
+from .db_schema import TABLE_EVENTS, TABLE_STATES, Events, States, StatesMeta
 from .models import DatabaseEngine
+from .partition import find_expired_partitions
 from .queries import (
     attributes_ids_exist_in_states,
     attributes_ids_exist_in_states_with_fast_in_distinct,
     data_ids_exist_in_events,
     data_ids_exist_in_events_with_fast_in_distinct,
+    delete_context_origins_rows,
     delete_event_data_rows,
     delete_event_rows,
     delete_event_types_rows,
     delete_recorder_runs_rows,
     delete_states_attributes_rows,
+    delete_states_checkpoints_metadata_ids_rows,
+    delete_states_checkpoints_rows,
     delete_states_meta_rows,
     delete_states_rows,
     delete_statistics_runs_rows,
     delete_statistics_short_term_rows,
     disconnect_states_rows,
+    find_context_origins_to_purge,
     find_entity_ids_to_purge,
     find_event_types_to_purge,
     find_events_to_purge,
@@ -53,6 +59,11 @@ _LOGGER = logging.getLogger(__name__)
 DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
 
+# A purge pass holds the recorder thread and a write transaction,
+# the number of batches per pass is scaled to stay near this time
+PURGE_TARGET_TIME = 1.0  # seconds
+MAX_BATCHES_PER_PURGE_MULTIPLIER = 4
+
 
 @retryable_database_job("purge")
 def purge_old_data(
@@ -86,12 +97,19 @@ def purge_old_data(
                 " remaining"
             )
             # Once we are done purging legacy rows, we use the new method
+            if instance.partitioned_layout:
+                has_more_to_purge |= _drop_expired_partitions(
+                    instance, session, purge_before
+                )
             has_more_to_purge |= _purge_states_and_attributes_ids(
                 instance, session, states_batch_size, purge_before
             )
             has_more_to_purge |= _purge_events_and_data_ids(
                 instance, session, events_batch_size, purge_before
             )
+            has_more_to_purge |= _purge_context_origins(
+                instance, session, events_batch_size, purge_before
+            )
 
         statistics_runs = _select_statistics_runs_to_purge(
             session, purge_before, instance.max_bind_vars
@@ -122,12 +140,23 @@ def purge_old_data(
         if instance.states_meta_manager.active:
             _purge_old_entity_ids(instance, session)
 
+        _purge_old_states_checkpoints(session, purge_before)
         _purge_old_recorder_runs(instance, session, purge_before)
     if repack:
         repack_database(instance)
     return True
 
 
+def adapt_batches_per_purge(batches: int, default: int, elapsed: float) -> int:
+    """Return the batches per purge for the next pass.
+
+    The batches are scaled by at most a factor of two per pass so a
+    single slow pass does not shrink the purge to a crawl.
+    """
+    scale = min(max(PURGE_TARGET_TIME / elapsed, 0.5), 2) if elapsed > 0 else 2
+    return min(max(int(batches * scale), 1), default * MAX_BATCHES_PER_PURGE_MULTIPLIER)
+
+
 def _purging_legacy_format(session: Session) -> bool:
     """Check if there are any legacy event_id linked states rows remaining."""
     return bool(session.execute(find_legacy_row()).scalar())
@@ -245,6 +274,79 @@ def _purge_events_and_data_ids(
     return has_remaining_event_ids_to_purge
 
 
+def _purge_context_origins(
+    instance: Recorder,
+    session: Session,
+    events_batch_size: int,
+    purge_before: datetime,
+) -> bool:
+    """Purge the context origins of purged events and states in a batch.
+
+    Returns true if there are more context origins to purge.
+    """
+    purge_before_ts = purge_before.timestamp()
+    max_bind_vars = instance.max_bind_vars
+    for _ in range(events_batch_size):
+        if not (
+            origin_ids := session.execute(
+                find_context_origins_to_purge(purge_before_ts, max_bind_vars)
+            )
+            .scalars()
+            .all()
+        ):
+            return False
+        deleted_rows = session.execute(delete_context_origins_rows(origin_ids))
+        _LOGGER.debug("Deleted %s context origins", deleted_rows)
+    return True
+
+
+def _drop_expired_partitions(
+    instance: Recorder, session: Session, purge_before: datetime
+) -> bool:
+    """Drop the oldest expired day partition of the states and events tables.
+
+    Returns true if a partition was dropped.
+    """
+    dropped = False
+    if partitions := find_expired_partitions(session, TABLE_STATES, purge_before):
+        attributes_ids = set(
+            session.execute(
+                text(
+                    f"SELECT DISTINCT attributes_id FROM {partitions[0]}"  # noqa: S608
+                    " WHERE attributes_id IS NOT NULL"
+                )
+            ).scalars()
+        )
+        # The partitioned table has no foreign key to keep old_state_id
+        # consistent, so the states after the partition are disconnected
+        # like the row by row purge does
+        session.execute(
+            text(
+                f"UPDATE {TABLE_STATES} SET old_state_id = NULL"  # noqa: S608
+                " WHERE old_state_id IN"
+                f" (SELECT state_id FROM {partitions[0]})"
+            )
+        )
+        _LOGGER.debug("Dropping states partition %s", partitions[0])
+        session.execute(text(f"DROP TABLE {partitions[0]}"))
+        _purge_unused_attributes_ids(instance, session, attributes_ids)
+        dropped = True
+    if partitions := find_expired_partitions(session, TABLE_EVENTS, purge_before):
+        data_ids = set(
+            session.execute(
+                text(
+                    f"SELECT DISTINCT data_id FROM {partitions[0]}"  # noqa: S608
+                    " WHERE data_id IS NOT NULL"
+                )
+            ).scalars()
+        )
+        _LOGGER.debug("Dropping events partition %s", partitions[0])
+        session.execute(text(f"DROP TABLE {partitions[0]}"))
+        _purge_unused_data_ids(instance, session, data_ids)
+        dropped = True
+    return dropped
+
+
 def _select_state_attributes_ids_to_purge(
     session: Session, purge_before: datetime, max_bind_vars: int
 ) -> tuple[set[int], set[int]]:
@@ -591,6 +693,15 @@ def _purge_old_recorder_runs(
     _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
 
 
+def _purge_old_states_checkpoints(session: Session, purge_before: datetime) -> None:
+    """Purge all states checkpoints of purged states."""
+    # There is a row per entity and hour, no need to batch run it
+    deleted_rows = session.execute(
+        delete_states_checkpoints_rows(purge_before.timestamp())
+    )
+    _LOGGER.debug("Deleted %s states checkpoints", deleted_rows)
+
+
 def _purge_old_event_types(instance: Recorder, session: Session) -> None:
     """Purge all old event types."""
     # Event types is small, no need to batch run it
@@ -622,6 +733,10 @@ def _purge_old_entity_ids(instance: Recorder, session: Session) -> None:
     if not states_metadata_ids:
         return
 
+    deleted_rows = session.execute(
+        delete_states_checkpoints_metadata_ids_rows(states_metadata_ids)
+    )
+    _LOGGER.debug("Deleted %s states checkpoints", deleted_rows)
     deleted_rows = session.execute(delete_states_meta_rows(states_metadata_ids))
     _LOGGER.debug("Deleted %s states meta", deleted_rows)
 
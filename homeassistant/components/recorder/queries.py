@@ -5,11 +5,22 @@ from __future__ import annotations
 from collections.abc import Iterable
 from datetime import datetime
 
-from sqlalchemy import delete, distinct, func, lambda_stmt, select, union_all, update
+from sqlalchemy import (
+    delete,
+    distinct,
+    exists,
+    func,
+    insert,
+    lambda_stmt,
+    select,
+    union_all,
+    update,
+)
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import Select
 
 from .db_schema import (
+    ContextOrigins,
     EventData,
     Events,
     EventTypes,
@@ -17,6 +28,7 @@ from .db_schema import (
     RecorderRuns,
     StateAttributes,
     States,
+    StatesCheckpoints,
     StatesMeta,
     Statistics,
     StatisticsRuns,
@@ -614,6 +626,142 @@ def delete_recorder_runs_rows(
     )
 
 
+def delete_states_checkpoints_rows(purge_before: float) -> StatementLambdaElement:
+    """Delete states_checkpoints rows of states before purge_before."""
+    return lambda_stmt(
+        lambda: delete(StatesCheckpoints)
+        .where(StatesCheckpoints.last_updated_ts < purge_before)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_states_checkpoints_after_rows(after: float) -> StatementLambdaElement:
+    """Delete states_checkpoints rows of checkpoints after a point in time."""
+    return lambda_stmt(
+        lambda: delete(StatesCheckpoints)
+        .where(StatesCheckpoints.checkpoint_ts > after)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_states_checkpoints_metadata_ids_rows(
+    metadata_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Delete states_checkpoints rows of purged entity_ids."""
+    return lambda_stmt(
+        lambda: delete(StatesCheckpoints)
+        .where(StatesCheckpoints.metadata_id.in_(metadata_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def find_latest_states_checkpoint_ts(before: float) -> StatementLambdaElement:
+    """Find the latest states checkpoint at or before a point in time."""
+    return lambda_stmt(
+        lambda: select(func.max(StatesCheckpoints.checkpoint_ts)).where(
+            StatesCheckpoints.checkpoint_ts <= before
+        )
+    )
+
+
+def delete_context_origins_rows(origin_ids: Iterable[int]) -> StatementLambdaElement:
+    """Delete context_origins rows."""
+    return lambda_stmt(
+        lambda: delete(ContextOrigins)
+        .where(ContextOrigins.origin_id.in_(origin_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def find_context_origins_to_purge(
+    purge_before: float, max_bind_vars: int
+) -> StatementLambdaElement:
+    """Find context origins of purged events and states."""
+    return lambda_stmt(
+        lambda: select(ContextOrigins.origin_id)
+        .filter(ContextOrigins.time_fired_ts < purge_before)
+        .limit(max_bind_vars)
+    )
+
+
+def find_first_event_ids_by_context_ids(
+    context_ids: Iterable[bytes], after_event_id: int
+) -> StatementLambdaElement:
+    """Find the first event_id of each context after an event_id."""
+    return lambda_stmt(
+        lambda: select(func.min(Events.event_id), Events.context_id_bin)
+        .where(Events.event_id > after_event_id)
+        .where(Events.context_id_bin.in_(context_ids))
+        .group_by(Events.context_id_bin)
+    )
+
+
+def insert_events_context_origins(
+    after_event_id: int, until_event_id: int
+) -> StatementLambdaElement:
+    """Insert the origins of the contexts of a range of events.
+
+    The first event of each context is its origin unless an earlier
+    origin was recorded already.
+    """
+    return lambda_stmt(
+        lambda: insert(ContextOrigins).from_select(
+            ["context_id_bin", "time_fired_ts", "event_id"],
+            select(Events.context_id_bin, Events.time_fired_ts, Events.event_id)
+            .where(
+                Events.event_id.in_(
+                    select(func.min(Events.event_id))
+                    .where(
+                        (Events.event_id > after_event_id)
+                        & (Events.event_id <= until_event_id)
+                    )
+                    .where(Events.context_id_bin.is_not(None))
+                    .group_by(Events.context_id_bin)
+                )
+            )
+            .where(
+                ~exists().where(
+                    (ContextOrigins.context_id_bin == Events.context_id_bin)
+                    & (ContextOrigins.time_fired_ts <= Events.time_fired_ts)
+                )
+            ),
+        )
+    )
+
+
+def insert_states_context_origins(
+    after_state_id: int, until_state_id: int
+) -> StatementLambdaElement:
+    """Insert the origins of the contexts of a range of states.
+
+    The first state of each context is its origin unless an earlier
+    origin was recorded already.
+    """
+    return lambda_stmt(
+        lambda: insert(ContextOrigins).from_select(
+            ["context_id_bin", "time_fired_ts", "state_id"],
+            select(States.context_id_bin, States.last_updated_ts, States.state_id)
+            .where(
+                States.state_id.in_(
+                    select(func.min(States.state_id))
+                    .where(
+                        (States.state_id > after_state_id)
+                        & (States.state_id <= until_state_id)
+                    )
+                    .where(States.context_id_bin.is_not(None))
+                    .group_by(States.context_id_bin)
+                )
+            )
+            .where(
+                ~exists().where(
+                    (ContextOrigins.context_id_bin == States.context_id_bin)
+                    & (ContextOrigins.time_fired_ts <= States.last_updated_ts)
+                )
+            ),
+        )
+    )
+
+
 def find_events_to_purge(
     purge_before: float, max_bind_vars: int
 ) -> StatementLambdaElement:
@@ -699,7 +847,9 @@ def find_legacy_row() -> StatementLambdaElement:
     return lambda_stmt(lambda: select(func.max(States.event_id)))
 
 
-def find_events_context_ids_to_migrate(max_bind_vars: int) -> StatementLambdaElement:
+def find_events_context_ids_to_migrate(
+    max_bind_vars: int, start_id: int
+) -> StatementLambdaElement:
     """Find events context_ids to migrate."""
     return lambda_stmt(
         lambda: select(
@@ -709,31 +859,38 @@ def find_events_context_ids_to_migrate(max_bind_vars: int) -> StatementLambdaEle
             Events.context_user_id,
             Events.context_parent_id,
         )
-        .filter(Events.context_id_bin.is_(None))
+        .filter((Events.event_id > start_id) & Events.context_id_bin.is_(None))
+        .order_by(Events.event_id)
         .limit(max_bind_vars)
     )
 
 
-def find_event_type_to_migrate(max_bind_vars: int) -> StatementLambdaElement:
+def find_event_type_to_migrate(
+    max_bind_vars: int, start_id: int
+) -> StatementLambdaElement:
     """Find events event_type to migrate."""
     return lambda_stmt(
         lambda: select(
             Events.event_id,
             Events.event_type,
         )
-        .filter(Events.event_type_id.is_(None))
+        .filter((Events.event_id > start_id) & Events.event_type_id.is_(None))
+        .order_by(Events.event_id)
         .limit(max_bind_vars)
     )
 
 
-def find_entity_ids_to_migrate(max_bind_vars: int) -> StatementLambdaElement:
+def find_entity_ids_to_migrate(
+    max_bind_vars: int, start_id: int
+) -> StatementLambdaElement:
     """Find entity_id to migrate."""
     return lambda_stmt(
         lambda: select(
             States.state_id,
             States.entity_id,
         )
-        .filter(States.metadata_id.is_(None))
+        .filter((States.state_id > start_id) & States.metadata_id.is_(None))
+        .order_by(States.state_id)
         .limit(max_bind_vars)
     )
 
@@ -805,7 +962,9 @@ def has_entity_ids_to_migrate() -> StatementLambdaElement:
     )
 
 
-def find_states_context_ids_to_migrate(max_bind_vars: int) -> StatementLambdaElement:
+def find_states_context_ids_to_migrate(
+    max_bind_vars: int, start_id: int
+) -> StatementLambdaElement:
     """Find events context_ids to migrate."""
     return lambda_stmt(
         lambda: select(
@@ -815,11 +974,26 @@ def find_states_context_ids_to_migrate(max_bind_vars: int) -> StatementLambdaEle
             States.context_user_id,
             States.context_parent_id,
         )
-        .filter(States.context_id_bin.is_(None))
+        .filter((States.state_id > start_id) & States.context_id_bin.is_(None))
+        .order_by(States.state_id)
         .limit(max_bind_vars)
     )
 
 
+def find_states_id_range() -> StatementLambdaElement:
+    """Find the lowest and highest state_id."""
+    return lambda_stmt(
+        lambda: select(func.min(States.state_id), func.max(States.state_id))
+    )
+
+
+def find_events_id_range() -> StatementLambdaElement:
+    """Find the lowest and highest event_id."""
+    return lambda_stmt(
+        lambda: select(func.min(Events.event_id), func.max(Events.event_id))
+    )
+
+
 def get_migration_changes() -> StatementLambdaElement:
     """Query the database for previous migration changes."""
     return lambda_stmt(
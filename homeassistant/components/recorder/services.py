@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import cast
 
 import voluptuous as vol
 
 from homeassistant.const import ATTR_ENTITY_ID
 from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import ServiceValidationError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import generate_filter
 from homeassistant.helpers.service import (
@@ -19,12 +20,21 @@ import homeassistant.util.dt as dt_util
 
 from .const import ATTR_APPLY_FILTER, ATTR_KEEP_DAYS, ATTR_REPACK, DOMAIN
 from .core import Recorder
+from .export import (
+    STATISTICS_TABLES,
+    export_states,
+    export_statistics,
+    import_statistics,
+)
 from .tasks import PurgeEntitiesTask, PurgeTask
 
 SERVICE_PURGE = "purge"
 SERVICE_PURGE_ENTITIES = "purge_entities"
 SERVICE_ENABLE = "enable"
 SERVICE_DISABLE = "disable"
+SERVICE_EXPORT_STATES = "export_states"
+SERVICE_EXPORT_STATISTICS = "export_statistics"
+SERVICE_IMPORT_STATISTICS = "import_statistics"
 
 SERVICE_PURGE_SCHEMA = vol.Schema(
     {
@@ -63,6 +73,37 @@ SERVICE_PURGE_ENTITIES_SCHEMA = vol.All(
 SERVICE_ENABLE_SCHEMA = vol.Schema({})
 SERVICE_DISABLE_SCHEMA = vol.Schema({})
 
+ATTR_FILENAME = "filename"
+ATTR_START_TIME = "start_time"
+ATTR_END_TIME = "end_time"
+ATTR_STATISTIC_ID = "statistic_id"
+ATTR_PERIOD = "period"
+
+SERVICE_EXPORT_STATES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_FILENAME): cv.string,
+        vol.Required(ATTR_START_TIME): cv.datetime,
+        vol.Optional(ATTR_END_TIME): cv.datetime,
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+    }
+)
+
+SERVICE_EXPORT_STATISTICS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_FILENAME): cv.string,
+        vol.Required(ATTR_START_TIME): cv.datetime,
+        vol.Optional(ATTR_END_TIME): cv.datetime,
+        vol.Optional(ATTR_STATISTIC_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_PERIOD, default="hour"): vol.In(STATISTICS_TABLES),
+    }
+)
+
+SERVICE_IMPORT_STATISTICS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_FILENAME): cv.string,
+    }
+)
+
 
 @callback
 def _async_register_purge_service(hass: HomeAssistant, instance: Recorder) -> None:
@@ -135,6 +176,96 @@ def _async_register_disable_service(hass: HomeAssistant, instance: Recorder) ->
     )
 
 
+def _allowed_filename(hass: HomeAssistant, service: ServiceCall) -> str:
+    """Return the filename of a service call if it is an allowed path."""
+    filename: str = service.data[ATTR_FILENAME]
+    if not hass.config.is_allowed_path(filename):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="path_not_allowed",
+            translation_placeholders={"filename": filename},
+        )
+    return filename
+
+
+def _service_period(service: ServiceCall) -> tuple[datetime, datetime]:
+    """Return the start and end time of a service call in UTC."""
+    start_time = dt_util.as_utc(service.data[ATTR_START_TIME])
+    end_time = dt_util.as_utc(service.data.get(ATTR_END_TIME) or dt_util.utcnow())
+    return start_time, end_time
+
+
+@callback
+def _async_register_export_states_service(
+    hass: HomeAssistant, instance: Recorder
+) -> None:
+    async def async_handle_export_states_service(service: ServiceCall) -> None:
+        """Handle calls to the export states service."""
+        filename = _allowed_filename(hass, service)
+        start_time, end_time = _service_period(service)
+        await instance.async_add_executor_job(
+            export_states,
+            hass,
+            filename,
+            start_time,
+            end_time,
+            service.data.get(ATTR_ENTITY_ID),
+        )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_EXPORT_STATES,
+        async_handle_export_states_service,
+        schema=SERVICE_EXPORT_STATES_SCHEMA,
+    )
+
+
+@callback
+def _async_register_export_statistics_service(
+    hass: HomeAssistant, instance: Recorder
+) -> None:
+    async def async_handle_export_statistics_service(service: ServiceCall) -> None:
+        """Handle calls to the export statistics service."""
+        filename = _allowed_filename(hass, service)
+        start_time, end_time = _service_period(service)
+        await instance.async_add_executor_job(
+            export_statistics,
+            hass,
+            filename,
+            start_time,
+            end_time,
+            service.data.get(ATTR_STATISTIC_ID),
+            service.data[ATTR_PERIOD],
+        )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_EXPORT_STATISTICS,
+        async_handle_export_statistics_service,
+        schema=SERVICE_EXPORT_STATISTICS_SCHEMA,
+    )
+
+
+@callback
+def _async_register_import_statistics_service(
+    hass: HomeAssistant, instance: Recorder
+) -> None:
+    async def async_handle_import_statistics_service(service: ServiceCall) -> None:
+        """Handle calls to the import statistics service."""
+        filename = _allowed_filename(hass, service)
+        await hass.async_add_executor_job(import_statistics, hass, filename)
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_IMPORT_STATISTICS,
+        async_handle_import_statistics_service,
+        schema=SERVICE_IMPORT_STATISTICS_SCHEMA,
+    )
+
+
 @callback
 def async_register_services(hass: HomeAssistant, instance: Recorder) -> None:
     """Register recorder services."""
@@ -142,3 +273,6 @@ def async_register_services(hass: HomeAssistant, instance: Recorder) -> None:
     _async_register_purge_entities_service(hass, instance)
     _async_register_enable_service(hass, instance)
     _async_register_disable_service(hass, instance)
+    _async_register_export_states_service(hass, instance)
+    _async_register_export_statistics_service(hass, instance)
+    _async_register_import_statistics_service(hass, instance)
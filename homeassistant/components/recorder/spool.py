@@ -0,0 +1,255 @@
+"""Spill the events of a deep recorder backlog to disk.
+
+When the recorder cannot keep up with the events, for example during a
+long migration or purge or on a slow disk, the new events are appended
+to segment files instead of the in-memory queue. The recorder replays
+them in order once it has caught up with the queue, so memory use stays
+bounded without losing any events. The events left on disk when Home
+Assistant stopped before they were replayed are replayed at the next
+start before the new events.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+import logging
+import os
+import shutil
+import threading
+from typing import BinaryIO
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import (
+    Context,
+    Event,
+    EventOrigin,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
+
+_LOGGER = logging.getLogger(__name__)
+
+SPOOL_DIR = ".recorder_spool"
+
+# The number of spilled events kept in memory before they are
+# appended to the current segment file in the executor
+FLUSH_EVENTS = 1000
+
+# Segments are removed once replayed, starting a new segment
+# when the current one is full frees the disk space early
+SEGMENT_MAX_BYTES = 16 * 1024 * 1024
+
+# The number of events replayed by each recorder task
+REPLAY_BATCH_SIZE = 1000
+
+
+def _serialize_event(event: Event) -> bytes:
+    """Serialize an event to a line of a segment file."""
+    context = event.context
+    return (
+        json_bytes(
+            (
+                event.event_type,
+                event.data,
+                event.origin.value,
+                event.time_fired_timestamp,
+                context.id,
+                context.user_id,
+                context.parent_id,
+            )
+        )
+        + b"\n"
+    )
+
+
+def _deserialize_event(line: bytes) -> Event:
+    """Deserialize an event from a line of a segment file."""
+    (
+        event_type,
+        data,
+        origin,
+        time_fired_timestamp,
+        context_id,
+        context_user_id,
+        context_parent_id,
+    ) = json_loads(line)
+    if event_type == EVENT_STATE_CHANGED:
+        data["old_state"] = State.from_dict(data.get("old_state"))
+        data["new_state"] = State.from_dict(data.get("new_state"))
+    return Event(
+        event_type,
+        data,
+        EventOrigin(origin),
+        time_fired_timestamp,
+        Context(context_user_id, context_parent_id, context_id),
+    )
+
+
+class EventSpool:
+    """Spill events to append-only segment files and replay them in order.
+
+    The event loop spills the events to an in-memory buffer which is
+    appended to the segment files in the executor. The recorder thread
+    reads the segments oldest first and the buffer last, once everything
+    has been replayed the spool is stopped and the events go to the queue
+    again.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """Initialize the event spool."""
+        self.hass = hass
+        self.path = path
+        self.active = False
+        # The number of events spilled and not yet replayed
+        self.size = 0
+        # Protects the buffer, active and size
+        self._lock = threading.Lock()
+        # Protects the segment files, taken before _lock
+        self._file_lock = threading.Lock()
+        self._buffer: list[bytes] = []
+        self._flush_scheduled = False
+        self._segments: deque[str] = deque()
+        self._segment_id = 0
+        self._write_file: BinaryIO | None = None
+        self._write_bytes = 0
+        self._read_file: BinaryIO | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start spilling events."""
+        self.active = True
+
+    @callback
+    def async_put(self, event: Event) -> bool:
+        """Spill an event, returns False if the spool has been stopped."""
+        try:
+            line = _serialize_event(event)
+        except TypeError as err:
+            # The recorder would not be able to write the event either
+            _LOGGER.warning("Event is not JSON serializable: %s: %s", event, err)
+            return True
+        with self._lock:
+            if not self.active:
+                return False
+            self._buffer.append(line)
+            self.size += 1
+            if len(self._buffer) >= FLUSH_EVENTS and not self._flush_scheduled:
+                self._flush_scheduled = True
+                self.hass.async_add_executor_job(self.flush)
+        return True
+
+    def flush(self) -> None:
+        """Append the buffered events to the current segment file."""
+        with self._file_lock:
+            with self._lock:
+                lines = self._buffer
+                self._buffer = []
+                self._flush_scheduled = False
+            if not lines:
+                return
+            if self._write_file is None or self._write_bytes >= SEGMENT_MAX_BYTES:
+                self._open_segment()
+            assert self._write_file is not None
+            data = b"".join(lines)
+            self._write_file.write(data)
+            self._write_file.flush()
+            self._write_bytes += len(data)
+
+    def _open_segment(self) -> None:
+        """Start a new segment file.
+
+        Must be called with the file lock held.
+        """
+        if self._write_file is not None:
+            self._write_file.close()
+        os.makedirs(self.path, exist_ok=True)
+        self._segment_id += 1
+        filename = os.path.join(self.path, f"{self._segment_id:08d}.jsonl")
+        self._write_file = open(filename, "ab")  # noqa: SIM115
+        self._write_bytes = 0
+        self._segments.append(filename)
+
+    def load(self) -> bool:
+        """Pick up the segments left by a previous run, returns True if there are any.
+
+        The spool is started so the new events are spilled after the
+        events left on disk and everything is replayed in order.
+        """
+        try:
+            names = sorted(
+                name
+                for name in os.listdir(self.path)
+                if name.endswith(".jsonl") and name.partition(".")[0].isdigit()
+            )
+        except FileNotFoundError:
+            return False
+        if not names:
+            return False
+        size = 0
+        for name in names:
+            with open(os.path.join(self.path, name), "rb") as file:
+                size += sum(line[-1:] == b"\n" for line in file)
+        with self._file_lock:
+            self._segments.extend(os.path.join(self.path, name) for name in names)
+            self._segment_id = max(self._segment_id, int(names[-1].partition(".")[0]))
+            with self._lock:
+                self.size += size
+                self.active = True
+        _LOGGER.info("Replaying %s events left on disk by the previous run", size)
+        return True
+
+    def _read_lines(self, max_events: int) -> list[bytes]:
+        """Read events from the segment files, removing the replayed segments.
+
+        Must be called with the file lock held.
+        """
+        lines: list[bytes] = []
+        while len(lines) < max_events and self._segments:
+            if self._read_file is None:
+                self._read_file = open(self._segments[0], "rb")  # noqa: SIM115
+            if line := self._read_file.readline():
+                # The last line is cut short if the previous run stopped
+                # while it was written
+                if line[-1:] == b"\n":
+                    lines.append(line)
+                continue
+            self._read_file.close()
+            self._read_file = None
+            if len(self._segments) == 1 and self._write_file is not None:
+                self._write_file.close()
+                self._write_file = None
+            os.remove(self._segments.popleft())
+        return lines
+
+    def take(self, max_events: int) -> list[Event]:
+        """Return the oldest spilled events, stops the spool once it is empty.
+
+        This call must be called from the recorder thread.
+        """
+        with self._file_lock:
+            lines = self._read_lines(max_events)
+            with self._lock:
+                if not lines:
+                    lines = self._buffer[:max_events]
+                    del self._buffer[:max_events]
+                if not lines:
+                    self.active = False
+                self.size -= len(lines)
+        return [_deserialize_event(line) for line in lines]
+
+    def clear(self) -> None:
+        """Stop the spool and remove the events which have not been replayed."""
+        with self._file_lock:
+            for file in (self._read_file, self._write_file):
+                if file is not None:
+                    file.close()
+            self._read_file = self._write_file = None
+            self._segments.clear()
+            shutil.rmtree(self.path, ignore_errors=True)
+            with self._lock:
+                self._buffer.clear()
+                self.active = False
+                self.size = 0
@@ -3,17 +3,18 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Callable, Iterable, Sequence
+from collections.abc import Callable, Collection, Iterable, Sequence
 import dataclasses
 from datetime import datetime, timedelta
 from functools import lru_cache, partial
 from itertools import chain, groupby
 import logging
-from operator import itemgetter
+from operator import attrgetter, itemgetter
 import re
+import time
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
 
-from sqlalchemy import Select, and_, bindparam, func, lambda_stmt, select, text
+from sqlalchemy import Select, and_, bindparam, delete, func, lambda_stmt, select, text
 from sqlalchemy.engine.row import Row
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm.session import Session
@@ -60,6 +61,9 @@ from .db_schema import (
     STATISTICS_TABLES,
     Statistics,
     StatisticsBase,
+    StatisticsDaily,
+    StatisticsMonthly,
+    StatisticsRollupBase,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -444,6 +448,114 @@ def _compile_hourly_statistics(session: Session, start: datetime) -> None:
         for metadata_id, summary_item in summary.items()
     )
 
+    # Keep the daily and monthly statistics of the hour up to date
+    if summary:
+        session.flush()
+        update_statistics_rollups(session, None, start_time_ts, end_time_ts)
+
+
+def _rollup_statistics(
+    rows: Iterable[Row],
+    period_start_end: Callable[[float], tuple[float, float]],
+    table: type[StatisticsRollupBase],
+    weighted: bool,
+) -> list[StatisticsRollupBase]:
+    """Roll up statistics rows sorted by metadata_id and start_ts.
+
+    The mean is the mean of the hourly means, rows of a rollup
+    are weighted by their mean_weight.
+    """
+    result: list[StatisticsRollupBase] = []
+    created_ts = time.time()
+    for metadata_id, metadata_rows in groupby(rows, attrgetter("metadata_id")):
+        for period_start, period_rows in groupby(
+            metadata_rows, lambda row: period_start_end(row.start_ts)[0]
+        ):
+            mean_sum = 0.0
+            mean_weight = 0
+            _min: float | None = None
+            _max: float | None = None
+            for row in period_rows:
+                if row.mean is not None:
+                    weight = row.mean_weight if weighted else 1
+                    mean_sum += row.mean * weight
+                    mean_weight += weight
+                if row.min is not None and (_min is None or row.min < _min):
+                    _min = row.min
+                if row.max is not None and (_max is None or row.max > _max):
+                    _max = row.max
+            # The last row of the period has the state and sum of the period
+            result.append(
+                table(  # type: ignore[call-arg]
+                    metadata_id=metadata_id,
+                    created_ts=created_ts,
+                    start_ts=period_start,
+                    mean=mean_sum / mean_weight if mean_weight else None,
+                    mean_weight=mean_weight or None,
+                    min=_min,
+                    max=_max,
+                    last_reset_ts=row.last_reset_ts,
+                    state=row.state,
+                    sum=row.sum,
+                )
+            )
+    return result
+
+
+def update_statistics_rollups(
+    session: Session,
+    metadata_ids: Collection[int] | None,
+    start_ts: float,
+    end_ts: float,
+) -> None:
+    """Recompute the daily and monthly statistics overlapping start_ts - end_ts.
+
+    The daily statistics are rolled up from the hourly statistics and the
+    monthly statistics from the daily statistics. If metadata_ids is None,
+    the statistics of all statistic_ids are recomputed.
+    """
+    if metadata_ids is not None and not metadata_ids:
+        return
+    _, day_start_end = reduce_day_ts_factory()
+    _, month_start_end = reduce_month_ts_factory()
+    for table, source_table, period_start_end in (
+        (StatisticsDaily, Statistics, day_start_end),
+        (StatisticsMonthly, StatisticsDaily, month_start_end),
+    ):
+        period_start_ts = period_start_end(start_ts)[0]
+        period_end_ts = period_start_end(end_ts - 1)[1]
+        columns = [
+            source_table.metadata_id,
+            source_table.start_ts,
+            source_table.mean,
+            source_table.min,
+            source_table.max,
+            source_table.last_reset_ts,
+            source_table.state,
+            source_table.sum,
+        ]
+        weighted = issubclass(source_table, StatisticsRollupBase)
+        if weighted:
+            columns.append(source_table.mean_weight)
+        stmt = select(*columns).where(
+            source_table.start_ts >= period_start_ts,
+            source_table.start_ts < period_end_ts,
+        )
+        delete_stmt = delete(table).where(
+            table.start_ts >= period_start_ts, table.start_ts < period_end_ts
+        )
+        if metadata_ids is not None:
+            stmt = stmt.where(source_table.metadata_id.in_(metadata_ids))
+            delete_stmt = delete_stmt.where(table.metadata_id.in_(metadata_ids))
+        rows = session.execute(
+            stmt.order_by(source_table.metadata_id, source_table.start_ts)
+        )
+        rollups = _rollup_statistics(rows, period_start_end, table, weighted)
+        session.execute(delete_stmt)
+        session.add_all(rollups)
+        # The monthly statistics are rolled up from the daily statistics
+        session.flush()
+
 
 @retryable_database_job("compile missing statistics")
 def compile_missing_statistics(instance: Recorder) -> bool:
@@ -1698,6 +1810,59 @@ def _augment_result_with_change(
             prev_sum = _sum
 
 
+def _statistics_rollup_table(
+    hass: HomeAssistant,
+    period: Literal["5minute", "day", "hour", "week", "month"],
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> type[StatisticsRollupBase] | None:
+    """Return the coarsest rollup table which can be reduced to the period."""
+    if not get_instance(hass).statistics_rollups_ready:
+        return None
+    if period == "month":
+        return StatisticsMonthly
+    # The mean of a week is the mean of its hours, which is not the
+    # mean of its daily means when the days have a different number
+    # of hours, hence the hourly statistics are used for it.
+    if period == "day" or (period == "week" and "mean" not in types):
+        return StatisticsDaily
+    return None
+
+
+def _statistics_rollups_during_period(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    metadata_ids: list[int] | None,
+    table: type[StatisticsRollupBase],
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> Sequence[Row] | None:
+    """Return the rollup statistics during start_time - end_time.
+
+    Returns None if the rollups were made for a different time zone,
+    a rebuild of the rollups is scheduled in that case.
+    """
+    stmt = _generate_statistics_during_period_stmt(
+        start_time, end_time, metadata_ids, table, types
+    )
+    stats = cast(
+        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+    )
+    _, period_start_end = (
+        reduce_month_ts_factory()
+        if table is StatisticsMonthly
+        else reduce_day_ts_factory()
+    )
+    if all(
+        period_start_end(start_ts)[0] == start_ts
+        for start_ts in {row.start_ts for row in stats}
+    ):
+        return stats
+    _LOGGER.debug("Statistics rollups do not match the time zone, rebuilding")
+    get_instance(hass).queue_statistics_rollups_rebuild()
+    return None
+
+
 def _statistics_during_period_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -1768,12 +1933,21 @@ def _statistics_during_period_with_session(
     table: type[Statistics | StatisticsShortTerm] = (
         Statistics if period != "5minute" else StatisticsShortTerm
     )
-    stmt = _generate_statistics_during_period_stmt(
-        start_time, end_time, metadata_ids, table, types
-    )
-    stats = cast(
-        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
-    )
+    stats: Sequence[Row] | None = None
+    if rollup_table := _statistics_rollup_table(hass, period, types):
+        # The rollup rows are reduced to the period like hourly rows, which
+        # leaves daily rows per day and monthly rows per month unchanged
+        stats = _statistics_rollups_during_period(
+            hass, session, start_time, end_time, metadata_ids, rollup_table, types
+        )
+    if stats is None:
+        rollup_table = None
+        stmt = _generate_statistics_during_period_stmt(
+            start_time, end_time, metadata_ids, table, types
+        )
+        stats = cast(
+            Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+        )
 
     if not stats:
         return {}
@@ -1784,7 +1958,7 @@ def _statistics_during_period_with_session(
         statistic_ids,
         metadata,
         True,
-        table,
+        rollup_table or table,
         units,
         types,
     )
@@ -2234,20 +2408,22 @@ def update_statistics_issues(hass: HomeAssistant) -> None:
                 platform_update_statistics_issues(hass, session)
 
 
-def _statistics_exists(
+def _statistics_exist(
     session: Session,
     table: type[StatisticsBase],
     metadata_id: int,
-    start: datetime,
-) -> int | None:
-    """Return id if a statistics entry already exists."""
-    start_ts = start.timestamp()
-    result = (
-        session.query(table.id)
-        .filter((table.metadata_id == metadata_id) & (table.start_ts == start_ts))
-        .first()
+    start_timestamps: list[float],
+) -> dict[float, int]:
+    """Return the ids of the statistics entries that already exist by start_ts."""
+    if not start_timestamps:
+        return {}
+    return dict(
+        session.query(table.start_ts, table.id).filter(
+            (table.metadata_id == metadata_id)
+            & (table.start_ts >= min(start_timestamps))
+            & (table.start_ts <= max(start_timestamps))
+        )
     )
-    return result.id if result else None
 
 
 @callback
@@ -2340,12 +2516,29 @@ def _import_statistics_with_session(
     _, metadata_id = statistics_meta_manager.update_or_add(
         session, metadata, old_metadata_dict
     )
-    for stat in statistics:
-        if stat_id := _statistics_exists(session, table, metadata_id, stat["start"]):
+    # The last entry wins if a start is given more than once
+    statistics_by_start_ts = {stat["start"].timestamp(): stat for stat in statistics}
+    start_timestamps = list(statistics_by_start_ts)
+    # Look up the existing rows with a single query, the new rows
+    # are inserted in batches when the session is flushed
+    existing = _statistics_exist(session, table, metadata_id, start_timestamps)
+    for start_ts, stat in statistics_by_start_ts.items():
+        if stat_id := existing.get(start_ts):
             _update_statistics(session, table, stat_id, stat)
         else:
             _insert_statistics(session, table, metadata_id, stat)
 
+    if table == Statistics:
+        if start_timestamps:
+            session.flush()
+            update_statistics_rollups(
+                session,
+                (metadata_id,),
+                min(start_timestamps),
+                max(start_timestamps) + table.duration.total_seconds(),
+            )
+        return True
+
     if table != StatisticsShortTerm:
         return True
 
@@ -2435,6 +2628,8 @@ def import_statistics(
         return _import_statistics_with_session(
             instance, session, metadata, statistics, table
         )
+    # The rollups flush the session, a duplicated row has been rolled back
+    return True
 
 
 @retryable_database_job("adjust_statistics")
@@ -2475,6 +2670,22 @@ def adjust_statistics(
             start_time.replace(minute=0),
             sum_adjustment,
         )
+        # The sums of all rollups from the start time on have changed
+        metadata_id = metadata[statistic_id][0]
+        session.flush()
+        if (
+            last_start_ts := session.execute(
+                select(func.max(Statistics.start_ts)).where(
+                    Statistics.metadata_id == metadata_id
+                )
+            ).scalar()
+        ) is not None:
+            update_statistics_rollups(
+                session,
+                (metadata_id,),
+                start_time.replace(minute=0).timestamp(),
+                last_start_ts + Statistics.duration.total_seconds(),
+            )
 
     return True
 
@@ -2536,6 +2747,8 @@ def change_statistics_unit(
         tables: tuple[type[StatisticsBase], ...] = (
             Statistics,
             StatisticsShortTerm,
+            StatisticsDaily,
+            StatisticsMonthly,
         )
         for table in tables:
             _change_statistics_unit_for_table(session, table, metadata_id, convert)
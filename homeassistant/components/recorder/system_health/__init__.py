@@ -55,6 +55,17 @@ def _async_get_db_engine_info(instance: Recorder) -> dict[str, Any]:
     return db_engine_info
 
 
+@callback
+def _async_get_db_job_info(instance: Recorder) -> dict[str, Any]:
+    """Get timing info about the database executor jobs."""
+    job_stats = instance.database_job_stats
+    return {
+        "database_queries": job_stats.count,
+        "average_query_time": f"{job_stats.average_time*1000:.2f} ms",
+        "slowest_query_time": f"{job_stats.max_time*1000:.2f} ms",
+    }
+
+
 async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     """Get info for the info page."""
     instance = get_instance(hass)
@@ -72,4 +83,4 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
             "oldest_recorder_run": recorder_runs_manager.first.start,
             "current_recorder_run": recorder_runs_manager.current.start,
         }
-    return db_runs | db_stats | db_engine_info
+    return db_runs | db_stats | db_engine_info | _async_get_db_job_info(instance)
@@ -0,0 +1,161 @@
+"""Support managing ContextOrigins."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from lru import LRU
+from sqlalchemy import insert
+from sqlalchemy.orm.session import Session
+
+from homeassistant.util.collection import chunked_or_all
+
+from ..const import CONTEXT_ORIGINS_SCHEMA_VERSION
+from ..db_schema import ContextOrigins
+from ..queries import find_events_id_range, find_first_event_ids_by_context_ids
+from ..util import execute_stmt_lambda_element
+
+if TYPE_CHECKING:
+    from ..core import Recorder
+
+# Contexts of automations and scripts can last a long time, a context
+# which is recorded again after it has been evicted or after a restart
+# gets another origin. The logbook reads the origins of a context oldest
+# first and keeps the first one, the newer origins are ignored.
+CACHE_SIZE = 8192
+
+
+class ContextOriginsManager:
+    """Manage the ContextOrigins table.
+
+    The first event or state recorded with a context is its origin. The
+    origins are written in the same commit as the events and states so
+    the ids of the rows are known.
+    """
+
+    def __init__(self, recorder: Recorder) -> None:
+        """Initialize the context origins manager."""
+        self.recorder = recorder
+        self._seen: LRU[bytes, None] = LRU(CACHE_SIZE)
+        self._pending_events: list[dict[str, Any]] = []
+        self._pending_states: list[dict[str, Any]] = []
+        self.has_pending_events = False
+        # The last event_id before the pending events were inserted
+        # without returning their ids
+        self._last_event_id = 0
+
+    def add_pending_event(self, row: dict[str, Any]) -> None:
+        """Add the event row as origin if it is the first one with its context.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if self._is_origin(row["context_id_bin"]):
+            self._pending_events.append(row)
+            self.has_pending_events = True
+
+    def add_pending_state(self, row: dict[str, Any]) -> None:
+        """Add the state row as origin if it is the first one with its context.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if self._is_origin(row["context_id_bin"]):
+            self._pending_states.append(row)
+
+    def _is_origin(self, context_id_bin: bytes | None) -> bool:
+        """Return if a row with the context is its origin and mark it seen."""
+        if context_id_bin is None or context_id_bin in self._seen:
+            return False
+        if self.recorder.schema_version < CONTEXT_ORIGINS_SCHEMA_VERSION:
+            return False
+        self._seen[context_id_bin] = None
+        return True
+
+    def load_last_event_id(self, session: Session) -> None:
+        """Load the last event_id before the pending events are inserted.
+
+        The ids of the events inserted without returning them are looked
+        up after it so an earlier event with the same context is not
+        taken for the new one.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if self.has_pending_events:
+            self._last_event_id = session.execute(find_events_id_range()).one()[1] or 0
+
+    def insert_pending(self, session: Session) -> None:
+        """Insert the origins of the pending rows.
+
+        The states and events must already have been inserted. Events
+        which were inserted without returning their ids are looked up
+        by their context, the first event of the context after the last
+        event_id loaded before the insert is the pending one.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self._pending_events and not self._pending_states:
+            return
+        event_ids: dict[bytes, int] = {}
+        if missing := [
+            row["context_id_bin"]
+            for row in self._pending_events
+            if row.get("event_id") is None
+        ]:
+            for context_ids_chunk in chunked_or_all(
+                missing, self.recorder.max_bind_vars
+            ):
+                event_ids.update(
+                    (context_id_bin, event_id)
+                    for event_id, context_id_bin in execute_stmt_lambda_element(
+                        session,
+                        find_first_event_ids_by_context_ids(
+                            context_ids_chunk, self._last_event_id
+                        ),
+                        orm_rows=False,
+                    )
+                )
+        params: list[dict[str, bytes | float | int | None]] = [
+            {
+                "context_id_bin": row["context_id_bin"],
+                "time_fired_ts": row["time_fired_ts"],
+                "event_id": (
+                    row.get("event_id") or event_ids.get(row["context_id_bin"])
+                ),
+                "state_id": None,
+            }
+            for row in self._pending_events
+        ]
+        params.extend(
+            {
+                "context_id_bin": row["context_id_bin"],
+                "time_fired_ts": row["last_updated_ts"],
+                "event_id": None,
+                "state_id": row["state_id"],
+            }
+            for row in self._pending_states
+        )
+        session.execute(insert(ContextOrigins), params)
+
+    def post_commit_pending(self) -> None:
+        """Call after commit to clear the pending origins.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending_events.clear()
+        self._pending_states.clear()
+        self.has_pending_events = False
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._seen.clear()
+        self._pending_events.clear()
+        self._pending_states.clear()
+        self.has_pending_events = False
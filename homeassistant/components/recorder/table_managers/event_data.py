@@ -9,10 +9,17 @@ from typing import TYPE_CHECKING, cast
 from sqlalchemy.orm.session import Session
 
 from homeassistant.core import Event
+from homeassistant.helpers.json import json_bytes, json_bytes_strip_null
 from homeassistant.util.collection import chunked_or_all
 from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS
 
+from ..const import SupportedDialect
 from ..db_schema import EventData
+from ..models import (
+    COMPRESSED_KEY_JSON_BYTES,
+    SHARED_DATA_PLAIN_KEYS,
+    compress_json_object,
+)
 from ..queries import get_shared_event_datas
 from ..util import execute_stmt_lambda_element
 from . import BaseLRUTableManager
@@ -35,13 +42,28 @@ class EventDataManager(BaseLRUTableManager[EventData]):
 
     def serialize_from_event(self, event: Event) -> bytes | None:
         """Serialize event data."""
+        dialect_name = self.recorder.dialect_name
         try:
-            return EventData.shared_data_bytes_from_event(
-                event, self.recorder.dialect_name
+            shared_data_bytes = EventData.shared_data_bytes_from_event(
+                event, dialect_name
             )
         except JSON_ENCODE_EXCEPTIONS as ex:
             _LOGGER.warning("Event is not JSON serializable: %s: %s", event, ex)
             return None
+        # Objects with a key named like the compressed marker are always
+        # compressed so they are not read back as a compressed row
+        if (
+            not self.recorder.compress_shared_data
+            and COMPRESSED_KEY_JSON_BYTES not in shared_data_bytes
+        ):
+            return shared_data_bytes
+        return compress_json_object(
+            shared_data_bytes,
+            SHARED_DATA_PLAIN_KEYS,
+            json_bytes_strip_null
+            if dialect_name == SupportedDialect.POSTGRESQL
+            else json_bytes,
+        )
 
     def load(self, events: list[Event], session: Session) -> None:
         """Load the shared_datas to data_ids mapping into memory from events.
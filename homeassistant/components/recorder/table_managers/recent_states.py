@@ -0,0 +1,201 @@
+"""Keep the recently recorded states in memory."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+import threading
+from typing import NamedTuple
+
+# The memory budget for the recent states
+#
+# Based on:
+# - How far back the history graphs on the dashboards usually look
+# - How much memory our low end hardware has
+MAX_BYTES = 16 * 1024 * 1024
+
+# The estimated size of a state without its state and attributes strings
+_ENTRY_OVERHEAD = 200
+
+
+class RecentState(NamedTuple):
+    """A recorded state as it was written to the states table."""
+
+    state: str | None
+    attributes: str
+    last_updated_ts: float
+    last_changed_ts: float | None
+    size: int
+
+
+class RecentStatesManager:
+    """Manage the recently recorded states.
+
+    The states are kept per entity in the order they were recorded and
+    only once they have been committed so they always match the states
+    table. An entity covers the history since its oldest kept state,
+    the oldest states of all entities are dropped first once the memory
+    budget is used up. Consecutive states with the same attributes share
+    the attributes string.
+    """
+
+    def __init__(self, max_bytes: int = MAX_BYTES) -> None:
+        """Initialize the recent states manager."""
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending: list[tuple[str, str | None, str, float, float | None]] = []
+        self._states: dict[str, deque[RecentState]] = {}
+        self._order: deque[tuple[str, RecentState]] = deque()
+
+    def add_pending(
+        self,
+        entity_id: str,
+        state: str | None,
+        attributes: str,
+        last_updated_ts: float,
+        last_changed_ts: float | None,
+    ) -> None:
+        """Add a state that is in the session but not yet committed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending.append(
+            (entity_id, state, attributes, last_updated_ts, last_changed_ts)
+        )
+
+    def post_commit_pending(self) -> None:
+        """Call after commit to keep the committed states.
+
+        This call must be called from the recorder thread.
+        """
+        if not self._pending:
+            return
+        states = self._states
+        order = self._order
+        with self._lock:
+            for (
+                entity_id,
+                state,
+                attributes,
+                last_updated_ts,
+                last_changed_ts,
+            ) in self._pending:
+                size = _ENTRY_OVERHEAD + (len(state) if state else 0)
+                if (entity_states := states.get(entity_id)) is None:
+                    entity_states = states[entity_id] = deque()
+                elif entity_states:
+                    last = entity_states[-1]
+                    if last_updated_ts < last.last_updated_ts:
+                        # The clock went backwards, what came before
+                        # can no longer be trusted to cover the history
+                        self._drop(entity_id)
+                        entity_states = states[entity_id] = deque()
+                    elif attributes == last.attributes:
+                        attributes = last.attributes
+                        size -= len(attributes)
+                size += len(attributes)
+                recent_state = RecentState(
+                    state, attributes, last_updated_ts, last_changed_ts, size
+                )
+                entity_states.append(recent_state)
+                order.append((entity_id, recent_state))
+                self.size += size
+            while self.size > self.max_bytes and order:
+                self._pop_oldest()
+        self._pending.clear()
+
+    def _pop_oldest(self) -> None:
+        """Drop the oldest state of all entities.
+
+        Must be called with the lock held.
+        """
+        entity_id, recent_state = self._order.popleft()
+        # The state may already be gone if the entity was dropped
+        if (entity_states := self._states.get(entity_id)) and entity_states[
+            0
+        ] is recent_state:
+            entity_states.popleft()
+            self.size -= recent_state.size
+            if not entity_states:
+                del self._states[entity_id]
+
+    def _drop(self, entity_id: str) -> None:
+        """Drop all states of an entity.
+
+        Must be called with the lock held.
+        """
+        for recent_state in self._states.pop(entity_id, ()):
+            self.size -= recent_state.size
+
+    def evict_before(self, purge_before_ts: float) -> None:
+        """Drop the states purged from the database.
+
+        This call must be called from the recorder thread.
+        """
+        with self._lock:
+            for entity_id in list(self._states):
+                entity_states = self._states[entity_id]
+                while entity_states and entity_states[0].last_updated_ts < (
+                    purge_before_ts
+                ):
+                    self.size -= entity_states.popleft().size
+                if not entity_states:
+                    del self._states[entity_id]
+            while self._order and self._order[0][1].last_updated_ts < (purge_before_ts):
+                self._order.popleft()
+
+    def get_many(
+        self,
+        entity_ids: Iterable[str],
+        start_time_ts: float,
+        end_time_ts: float | None,
+        include_start_time_state: bool,
+    ) -> dict[str, tuple[RecentState | None, list[RecentState]]] | None:
+        """Return the states of entities during a period.
+
+        For each entity the latest state before start_time_ts is returned
+        with the states after start_time_ts and before end_time_ts. None
+        is returned if the period is not covered for all of the entities.
+
+        This call is thread-safe.
+        """
+        result: dict[str, tuple[RecentState | None, list[RecentState]]] = {}
+        with self._lock:
+            for entity_id in entity_ids:
+                if not (entity_states := self._states.get(entity_id)) or (
+                    start_time_ts < entity_states[0].last_updated_ts
+                    or (
+                        include_start_time_state
+                        and start_time_ts == entity_states[0].last_updated_ts
+                    )
+                ):
+                    self.misses += 1
+                    return None
+                start_state: RecentState | None = None
+                period_states: list[RecentState] = []
+                for recent_state in entity_states:
+                    last_updated_ts = recent_state.last_updated_ts
+                    if last_updated_ts < start_time_ts:
+                        start_state = recent_state
+                    elif end_time_ts and last_updated_ts >= end_time_ts:
+                        break
+                    elif last_updated_ts > start_time_ts:
+                        period_states.append(recent_state)
+                result[entity_id] = (start_state, period_states)
+            self.hits += 1
+        return result
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call must be called from the recorder thread.
+        """
+        with self._lock:
+            self._pending.clear()
+            self._states.clear()
+            self._order.clear()
+            self.size = 0
@@ -9,10 +9,17 @@ from typing import TYPE_CHECKING, cast
 from sqlalchemy.orm.session import Session
 
 from homeassistant.core import Event, EventStateChangedData
+from homeassistant.helpers.json import json_bytes, json_bytes_strip_null
 from homeassistant.util.collection import chunked_or_all
 from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS
 
+from ..const import SupportedDialect
 from ..db_schema import StateAttributes
+from ..models import (
+    COMPRESSED_KEY_JSON_BYTES,
+    SHARED_ATTRS_PLAIN_KEYS,
+    compress_json_object,
+)
 from ..queries import get_shared_attributes
 from ..util import execute_stmt_lambda_element
 from . import BaseLRUTableManager
@@ -40,9 +47,10 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
 
     def serialize_from_event(self, event: Event[EventStateChangedData]) -> bytes | None:
         """Serialize event data."""
+        dialect_name = self.recorder.dialect_name
         try:
-            return StateAttributes.shared_attrs_bytes_from_event(
-                event, self.recorder.dialect_name
+            shared_attrs_bytes = StateAttributes.shared_attrs_bytes_from_event(
+                event, dialect_name
             )
         except JSON_ENCODE_EXCEPTIONS as ex:
             _LOGGER.warning(
@@ -51,6 +59,20 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
                 ex,
             )
             return None
+        # Objects with a key named like the compressed marker are always
+        # compressed so they are not read back as a compressed row
+        if (
+            not self.recorder.compress_shared_data
+            and COMPRESSED_KEY_JSON_BYTES not in shared_attrs_bytes
+        ):
+            return shared_attrs_bytes
+        return compress_json_object(
+            shared_attrs_bytes,
+            SHARED_ATTRS_PLAIN_KEYS,
+            json_bytes_strip_null
+            if dialect_name == SupportedDialect.POSTGRESQL
+            else json_bytes,
+        )
 
     def load(
         self, events: list[Event[EventStateChangedData]], session: Session
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from ..db_schema import States
+from typing import Any
 
 
 class StatesManager:
@@ -10,14 +10,14 @@ class StatesManager:
 
     def __init__(self) -> None:
         """Initialize the states manager for linking old_state_id."""
-        self._pending: dict[str, States] = {}
+        self._pending: dict[str, dict[str, Any]] = {}
         self._last_committed_id: dict[str, int] = {}
         self._last_reported: dict[int, float] = {}
 
-    def pop_pending(self, entity_id: str) -> States | None:
+    def pop_pending(self, entity_id: str) -> dict[str, Any] | None:
         """Pop a pending state.
 
-        Pending states are states that are in the session but not yet committed.
+        Pending states are the rows of states that are not yet committed.
 
         This call is not thread-safe and must be called from the
         recorder thread.
@@ -35,10 +35,10 @@ class StatesManager:
         """
         return self._last_committed_id.pop(entity_id, None)
 
-    def add_pending(self, entity_id: str, state: States) -> None:
+    def add_pending(self, entity_id: str, state: dict[str, Any]) -> None:
         """Add a pending state.
 
-        Pending states are states that are in the session but not yet committed.
+        Pending states are the rows of states that are not yet committed.
 
         This call is not thread-safe and must be called from the
         recorder thread.
@@ -62,7 +62,7 @@ class StatesManager:
         recorder thread.
         """
         for entity_id, db_states in self._pending.items():
-            self._last_committed_id[entity_id] = db_states.state_id
+            self._last_committed_id[entity_id] = db_states.get("state_id")
         self._pending.clear()
         self._last_reported.clear()
 
@@ -9,15 +9,18 @@ from dataclasses import dataclass
 from datetime import datetime
 import logging
 import threading
+import time
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.helpers.typing import UndefinedType
 from homeassistant.util.event_type import EventType
 
-from . import entity_registry, purge, statistics
+from . import checkpoints, entity_registry, purge, statistics
 from .const import DOMAIN
 from .db_schema import Statistics, StatisticsShortTerm
 from .models import StatisticData, StatisticMetaData
+from .spool import REPLAY_BATCH_SIZE
 from .util import periodic_db_cleanups, session_scope
 
 _LOGGER = logging.getLogger(__name__)
@@ -105,6 +108,7 @@ class UpdateStatesMetadataTask(RecorderTask):
             self.entity_id,
             self.new_entity_id,
         )
+        instance.recent_states_manager.reset()
 
 
 @dataclass(slots=True)
@@ -114,22 +118,48 @@ class PurgeTask(RecorderTask):
     purge_before: datetime
     repack: bool
     apply_filter: bool
+    events_batch_size: int = purge.DEFAULT_EVENTS_BATCHES_PER_PURGE
+    states_batch_size: int = purge.DEFAULT_STATES_BATCHES_PER_PURGE
 
     def run(self, instance: Recorder) -> None:
         """Purge the database."""
+        start = time.monotonic()
         if purge.purge_old_data(
-            instance, self.purge_before, self.repack, self.apply_filter
+            instance,
+            self.purge_before,
+            self.repack,
+            self.apply_filter,
+            self.events_batch_size,
+            self.states_batch_size,
         ):
             with instance.get_session() as session:
                 instance.recorder_runs_manager.load_from_db(session)
+            instance.recent_states_manager.evict_before(self.purge_before.timestamp())
             # We always need to do the db cleanups after a purge
             # is finished to ensure the WAL checkpoint and other
             # tasks happen after a vacuum.
             periodic_db_cleanups(instance)
             return
-        # Schedule a new purge task if this one didn't finish
+        # Schedule a new purge task if this one didn't finish, it goes to
+        # the back of the queue so pending events are committed in between
+        # and the batches are sized to keep each pass short
+        elapsed = time.monotonic() - start
         instance.queue_task(
-            PurgeTask(self.purge_before, self.repack, self.apply_filter)
+            PurgeTask(
+                self.purge_before,
+                self.repack,
+                self.apply_filter,
+                purge.adapt_batches_per_purge(
+                    self.events_batch_size,
+                    purge.DEFAULT_EVENTS_BATCHES_PER_PURGE,
+                    elapsed,
+                ),
+                purge.adapt_batches_per_purge(
+                    self.states_batch_size,
+                    purge.DEFAULT_STATES_BATCHES_PER_PURGE,
+                    elapsed,
+                ),
+            )
         )
 
 
@@ -143,6 +173,7 @@ class PurgeEntitiesTask(RecorderTask):
     def run(self, instance: Recorder) -> None:
         """Purge entities from the database."""
         if purge.purge_entity_data(instance, self.entity_filter, self.purge_before):
+            instance.recent_states_manager.reset()
             return
         # Schedule a new purge task if this one didn't finish
         instance.queue_task(PurgeEntitiesTask(self.entity_filter, self.purge_before))
@@ -175,6 +206,20 @@ class StatisticsTask(RecorderTask):
         instance.queue_task(StatisticsTask(self.start, self.fire_events))
 
 
+@dataclass(slots=True)
+class StatesCheckpointTask(RecorderTask):
+    """An object to insert into the recorder queue to write a states checkpoint."""
+
+    checkpoint_ts: float
+
+    def run(self, instance: Recorder) -> None:
+        """Run states checkpoint task."""
+        if checkpoints.write_states_checkpoint(instance, self.checkpoint_ts):
+            return
+        # Schedule a new states checkpoint task if this one didn't finish
+        instance.queue_task(StatesCheckpointTask(self.checkpoint_ts))
+
+
 @dataclass(slots=True)
 class CompileMissingStatisticsTask(RecorderTask):
     """An object to insert into the recorder queue to run a compile missing statistics."""
@@ -294,7 +339,43 @@ class CommitTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Handle the task."""
-        instance._commit_event_session_or_retry()  # noqa: SLF001
+        instance._commit_event_session_on_interval()  # noqa: SLF001
+
+
+@dataclass(slots=True)
+class ReplaySpooledEventsTask(RecorderTask):
+    """Replay a batch of the events spilled to disk.
+
+    The task queues itself again until all events have been replayed so
+    other tasks can run in between, with drain set all events are
+    replayed at once before the recorder stops.
+    """
+
+    drain: bool = False
+
+    def run(self, instance: Recorder) -> None:
+        """Handle the task."""
+        events = instance.event_spool.take(REPLAY_BATCH_SIZE)
+        # The events are replayed in order so the first state is the oldest,
+        # the checkpoints written while it was on disk are missing it
+        if (
+            oldest_state_ts := next(
+                (
+                    event.time_fired_timestamp
+                    for event in events
+                    if event.event_type == EVENT_STATE_CHANGED
+                ),
+                None,
+            )
+        ) is not None:
+            checkpoints.invalidate_states_checkpoints(instance, oldest_state_ts)
+        while events:
+            for event in events:
+                instance._guarded_process_one_task_or_event_or_recover(event)  # noqa: SLF001
+            if not self.drain:
+                instance.queue_task(self)
+                return
+            events = instance.event_spool.take(REPLAY_BATCH_SIZE)
 
 
 @dataclass(slots=True)
@@ -57,6 +57,7 @@ from .models import (
     UnsupportedDialect,
     process_timestamp,
 )
+from .partition import create_partitions
 
 if TYPE_CHECKING:
     from sqlite3.dbapi2 import Cursor as SQLiteCursor
@@ -176,19 +177,22 @@ def execute_stmt_lambda_element(
     end_time: datetime | None = None,
     yield_per: int = DEFAULT_YIELD_STATES_ROWS,
     orm_rows: bool = True,
+    stream: bool = False,
 ) -> Sequence[Row] | Result:
     """Execute a StatementLambdaElement.
 
-    If the time window passed is greater than one day
-    the execution method will switch to yield_per to
-    reduce memory pressure.
+    If the time window passed is greater than one day,
+    or stream is set, the execution method will switch
+    to yield_per to reduce memory pressure.
 
     It is not recommended to pass a time window
     when selecting non-ranged rows (ie selecting
     specific entities) since they are usually faster
     with .all().
     """
-    use_all = not start_time or ((end_time or dt_util.utcnow()) - start_time).days <= 1
+    use_all = not stream and (
+        not start_time or ((end_time or dt_util.utcnow()) - start_time).days <= 1
+    )
     for tryno in range(RETRIES):
         try:
             if orm_rows:
@@ -208,6 +212,62 @@ def execute_stmt_lambda_element(
     raise RuntimeError  # pragma: no cover
 
 
+@functools.cache
+def _bulk_insert_columns(
+    mapped_class: type,
+) -> tuple[frozenset[str], tuple[tuple[str, tuple[tuple[str, str], ...]], ...]]:
+    """Return the column keys and foreign key links of a mapped class."""
+    mapper = inspect(mapped_class)
+    column_keys = frozenset(
+        prop.key
+        for prop in mapper.column_attrs
+        if not any(column.primary_key for column in prop.columns)
+    )
+    links = tuple(
+        (
+            relationship.key,
+            tuple(
+                (
+                    mapper.get_property_by_column(local).key,
+                    relationship.mapper.get_property_by_column(remote).key,
+                )
+                for local, remote in relationship.local_remote_pairs
+            ),
+        )
+        for relationship in mapper.relationships
+    )
+    return column_keys, links
+
+
+def bulk_insert_params(
+    mapped_class: type, rows: Sequence[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Build executemany parameters for pending rows of a mapped class.
+
+    Each row holds the value of every column except the primary key.
+    Foreign keys can instead be set through the key of a relationship,
+    either to a database object or to another pending row, which must
+    already have its primary key assigned.
+
+    All parameter sets share the same keys so the rows can be
+    written with a single multi-row INSERT.
+    """
+    column_keys, links = _bulk_insert_columns(mapped_class)
+    params: list[dict[str, Any]] = []
+    for row in rows:
+        row_params = {key: row[key] for key in column_keys}
+        for relationship_key, pairs in links:
+            if (related := row.get(relationship_key)) is not None:
+                for local_key, remote_key in pairs:
+                    row_params[local_key] = (
+                        related[remote_key]
+                        if type(related) is dict
+                        else getattr(related, remote_key)
+                    )
+        params.append(row_params)
+    return params
+
+
 def validate_or_move_away_sqlite_database(dburl: str) -> bool:
     """Ensure that the database is valid or move it away."""
     dbpath = dburl_to_path(dburl)
@@ -622,6 +682,16 @@ def setup_connection_for_dialect(
     )
 
 
+def setup_read_only_sqlite_connection(
+    dbapi_connection: DBAPIConnection, connection_record: Any
+) -> None:
+    """Execute statements needed for a read only sqlite connection.
+
+    Must run after setup_connection_for_dialect.
+    """
+    execute_on_connection(dbapi_connection, "PRAGMA query_only = ON")
+
+
 def end_incomplete_runs(session: Session, start_time: datetime) -> None:
     """End any incomplete recorder runs."""
     for run in session.query(RecorderRuns).filter_by(end=None):
@@ -755,6 +825,10 @@ def periodic_db_cleanups(instance: Recorder) -> None:
         with instance.engine.connect() as connection:
             connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE);"))
             connection.execute(text("PRAGMA OPTIMIZE;"))
+    if instance.partitioned_layout:
+        # Keep the day partitions ahead of the current time
+        with session_scope(session=instance.get_session()) as session:
+            create_partitions(session, dt_util.utcnow())
 
 
 @contextmanager
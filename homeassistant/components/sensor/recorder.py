@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
+import bisect
 from collections import defaultdict
 from collections.abc import Callable, Iterable
 from contextlib import suppress
 import datetime
-import itertools
 import logging
 import math
+import threading
 from typing import Any
 
 from sqlalchemy.orm.session import Session
@@ -26,12 +27,23 @@ from homeassistant.components.recorder.models import (
 )
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_STOP,
+    EVENT_STATE_CHANGED,
     REVOLUTIONS_PER_MINUTE,
     UnitOfIrradiance,
     UnitOfSoundPressure,
     UnitOfVolume,
 )
-from homeassistant.core import HomeAssistant, State, callback, split_entity_id
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventListenerKey,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+    split_entity_id,
+)
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.entity import entity_sources
@@ -78,6 +90,186 @@ WARN_UNSUPPORTED_UNIT: HassKey[set[str]] = HassKey(f"{DOMAIN}_warn_unsupported_u
 WARN_UNSTABLE_UNIT: HassKey[set[str]] = HassKey(f"{DOMAIN}_warn_unstable_unit")
 # Link to dev statistics where issues around LTS can be fixed
 LINK_DEV_STATISTICS = "https://my.home-assistant.io/redirect/developer_statistics"
+# Sensor states seen since the last compiled statistics period
+STATISTICS_STATES: HassKey[StatisticsStatesBuffer] = HassKey(
+    f"{DOMAIN}_statistics_states"
+)
+
+
+class StatisticsStatesBuffer:
+    """Sensor states seen since the last compiled statistics period.
+
+    The buffer is filled from state_changed events in the event loop and
+    read by the statistics compile in the recorder thread, which saves
+    querying the history of every sensor again from the database.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the buffer."""
+        self._hass = hass
+        self._lock = threading.Lock()
+        self._states: dict[str, list[State]] = {}
+        # Periods starting before this timestamp may miss states
+        self._complete_since = dt_util.utcnow().timestamp()
+        self._entity_filter: Callable[[str], bool] | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start buffering sensor states."""
+        if self._unsub:
+            self._unsub()
+        # The states the recorder excludes are never compiled
+        entity_filter = self._entity_filter = get_instance(self._hass).entity_filter
+        with self._lock:
+            self._states = {
+                state.entity_id: [state]
+                for state in self._hass.states.async_all(DOMAIN)
+                if not entity_filter or entity_filter(state.entity_id)
+            }
+            # Only the current states are known, not the ones before them
+            self._complete_since = max(
+                (
+                    entity_states[0].last_updated_timestamp
+                    for entity_states in self._states.values()
+                ),
+                default=0.0,
+            )
+            self._complete_since = max(
+                self._complete_since, dt_util.utcnow().timestamp()
+            )
+        self._unsub = self._hass.bus.async_listen_keyed(
+            EVENT_STATE_CHANGED,
+            self._async_state_changed,
+            EventListenerKey.DOMAIN,
+            DOMAIN,
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop buffering sensor states.
+
+        The statistics are compiled from the database after the buffer
+        has been stopped.
+        """
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        with self._lock:
+            self._states = {}
+            self._complete_since = math.inf
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Buffer a sensor state."""
+        if (new_state := event.data["new_state"]) is None or (
+            self._entity_filter and not self._entity_filter(new_state.entity_id)
+        ):
+            return
+        with self._lock:
+            if not get_instance(self._hass).enabled:
+                # The recorder does not record this state so the
+                # database has to be used for the period
+                self._complete_since = max(
+                    self._complete_since, new_state.last_updated_timestamp
+                )
+            if not (entity_states := self._states.get(new_state.entity_id)):
+                self._states[new_state.entity_id] = [new_state]
+            elif (
+                new_state.last_updated_timestamp
+                >= entity_states[-1].last_updated_timestamp
+            ):
+                entity_states.append(new_state)
+            else:
+                # Keep the states ordered like the database returns them
+                bisect.insort(
+                    entity_states,
+                    new_state,
+                    key=lambda state: state.last_updated_timestamp,
+                )
+
+    def states_during_period(
+        self,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        entity_ids: list[str],
+        significant_changes_only: bool,
+    ) -> dict[str, list[State]] | None:
+        """Return the states of the entities during start-end.
+
+        The states are the same as get_full_significant_states_with_session
+        returns, the last state before the period followed by the states
+        during the period. Returns None if the buffer may miss states of
+        the period.
+        """
+        start_ts = (start - datetime.timedelta.resolution).timestamp()
+        end_ts = end.timestamp()
+        result: dict[str, list[State]] = {}
+        with self._lock:
+            if start.timestamp() < self._complete_since:
+                return None
+            for entity_id in entity_ids:
+                if not (buffered_states := self._states.get(entity_id)):
+                    continue
+                start_state: State | None = None
+                entity_states: list[State] = []
+                for state in buffered_states:
+                    last_updated_ts = state.last_updated_timestamp
+                    if last_updated_ts >= end_ts:
+                        break
+                    if last_updated_ts < start_ts:
+                        start_state = state
+                    elif last_updated_ts > start_ts and (
+                        not significant_changes_only
+                        or state.last_changed_timestamp == last_updated_ts
+                    ):
+                        entity_states.append(state)
+                if start_state is not None:
+                    entity_states.insert(0, start_state)
+                if entity_states:
+                    result[entity_id] = entity_states
+        return result
+
+    def prune(self, end: datetime.datetime) -> None:
+        """Drop the states which are not needed to compile periods after end.
+
+        The last state before end is kept as it is the state at the start
+        of the next period.
+        """
+        end_ts = end.timestamp()
+        with self._lock:
+            for entity_id in list(self._states):
+                entity_states = self._states[entity_id]
+                keep_from = 0
+                for idx, state in enumerate(entity_states):
+                    if state.last_updated_timestamp >= end_ts:
+                        break
+                    keep_from = idx
+                if keep_from:
+                    del entity_states[:keep_from]
+                if (
+                    len(entity_states) == 1
+                    and entity_states[0].last_updated_timestamp < end_ts
+                    and self._hass.states.get(entity_id) is None
+                ):
+                    # The entity has been removed
+                    del self._states[entity_id]
+            self._complete_since = max(self._complete_since, end_ts)
+
+
+@callback
+def async_setup_statistics(hass: HomeAssistant) -> None:
+    """Start buffering sensor states for the statistics compile."""
+    if STATISTICS_STATES in hass.data:
+        return
+    buffer = hass.data[STATISTICS_STATES] = StatisticsStatesBuffer(hass)
+    buffer.async_start()
+
+    @callback
+    def _async_stop_buffer(_event: Event) -> None:
+        buffer.async_stop()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop_buffer)
 
 
 def _get_sensor_states(hass: HomeAssistant) -> list[State]:
@@ -108,33 +300,17 @@ def _time_weighted_average(
     state changes.
     Note: there's no interpolation of values between state changes.
     """
-    old_fstate: float | None = None
-    old_start_time: datetime.datetime | None = None
-    accumulated = 0.0
-
-    for fstate, state in fstates:
-        # The recorder will give us the last known state, which may be well
-        # before the requested start time for the statistics
-        start_time = max(state.last_updated, start)
-        if old_start_time is None:
-            # Adjust start time, if there was no last known state
-            start = start_time
-        else:
-            duration = start_time - old_start_time
-            # Accumulate the value, weighted by duration until next state change
-            assert old_fstate is not None
-            accumulated += old_fstate * duration.total_seconds()
-
-        old_fstate = fstate
-        old_start_time = start_time
-
-    if old_fstate is not None:
-        # Accumulate the value, weighted by duration until end of the period
-        assert old_start_time is not None
-        duration = end - old_start_time
-        accumulated += old_fstate * duration.total_seconds()
-
-    period_seconds = (end - start).total_seconds()
+    if not fstates:
+        return 0.0
+    start_ts = start.timestamp()
+    # The recorder will give us the last known state, which may be well
+    # before the requested start time for the statistics
+    start_times = [max(state.last_updated_timestamp, start_ts) for _, state in fstates]
+    # Each value is weighted by the duration until the next state change
+    # or until the end of the period for the last state
+    end_times = start_times[1:]
+    end_times.append(end.timestamp())
+    period_seconds = end_times[-1] - start_times[0]
     if period_seconds == 0:
         # If the only state changed that happened was at the exact moment
         # at the end of the period, we can't calculate a meaningful average
@@ -143,6 +319,12 @@ def _time_weighted_average(
         # column schema in the database is incorrect but it is actually possible
         # to happen if the state change event fired at the exact microsecond
         return 0.0
+    accumulated = sum(
+        fstate * (end_time - start_time)
+        for (fstate, _), start_time, end_time in zip(
+            fstates, start_times, end_times, strict=True
+        )
+    )
     return accumulated / period_seconds
 
 
@@ -417,30 +599,51 @@ def compile_statistics(  # noqa: C901
     entities_full_history = [
         i.entity_id for i in sensor_states if "sum" in wanted_statistics[i.entity_id]
     ]
-    history_list: dict[str, list[State]] = {}
-    if entities_full_history:
-        history_list = history.get_full_significant_states_with_session(
-            hass,
-            session,
-            start - datetime.timedelta.resolution,
-            end,
-            entity_ids=entities_full_history,
-            significant_changes_only=False,
-        )
     entities_significant_history = [
         i.entity_id
         for i in sensor_states
         if "sum" not in wanted_statistics[i.entity_id]
     ]
-    if entities_significant_history:
-        _history_list = history.get_full_significant_states_with_session(
-            hass,
-            session,
-            start - datetime.timedelta.resolution,
-            end,
-            entity_ids=entities_significant_history,
+    history_list: dict[str, list[State]] = {}
+    if (
+        (states_buffer := hass.data.get(STATISTICS_STATES))
+        and (
+            full_history := states_buffer.states_during_period(
+                start, end, entities_full_history, False
+            )
         )
-        history_list = {**history_list, **_history_list}
+        is not None
+        and (
+            significant_history := states_buffer.states_during_period(
+                start, end, entities_significant_history, True
+            )
+        )
+        is not None
+    ):
+        # All states of the period have been buffered, no need to
+        # query the history from the database
+        history_list = {**full_history, **significant_history}
+    else:
+        if entities_full_history:
+            history_list = history.get_full_significant_states_with_session(
+                hass,
+                session,
+                start - datetime.timedelta.resolution,
+                end,
+                entity_ids=entities_full_history,
+                significant_changes_only=False,
+            )
+        if entities_significant_history:
+            _history_list = history.get_full_significant_states_with_session(
+                hass,
+                session,
+                start - datetime.timedelta.resolution,
+                end,
+                entity_ids=entities_significant_history,
+            )
+            history_list = {**history_list, **_history_list}
+    if states_buffer:
+        states_buffer.prune(end)
 
     entities_with_float_states: dict[str, list[tuple[float, State]]] = {}
     for _state in sensor_states:
@@ -525,14 +728,15 @@ def compile_statistics(  # noqa: C901
 
         # Make calculations
         stat: StatisticData = {"start": start}
-        if "max" in wanted_statistics[entity_id]:
-            stat["max"] = max(
-                *itertools.islice(zip(*valid_float_states, strict=False), 1)
-            )
-        if "min" in wanted_statistics[entity_id]:
-            stat["min"] = min(
-                *itertools.islice(zip(*valid_float_states, strict=False), 1)
-            )
+        if (
+            "max" in wanted_statistics[entity_id]
+            or "min" in wanted_statistics[entity_id]
+        ):
+            values = [fstate for fstate, _ in valid_float_states]
+            if "max" in wanted_statistics[entity_id]:
+                stat["max"] = max(values)
+            if "min" in wanted_statistics[entity_id]:
+                stat["min"] = min(values)
 
         if "mean" in wanted_statistics[entity_id]:
             stat["mean"] = _time_weighted_average(valid_float_states, start, end)
@@ -14,15 +14,23 @@ from homeassistant.auth.models import User
 from homeassistant.auth.permissions.const import POLICY_READ
 from homeassistant.auth.permissions.events import SUBSCRIBE_ALLOWLIST
 from homeassistant.const import (
+    ATTR_AREA_ID,
+    ATTR_DEVICE_ID,
+    ATTR_ENTITY_ID,
+    ATTR_FLOOR_ID,
+    ATTR_LABEL_ID,
     EVENT_STATE_CHANGED,
     MATCH_ALL,
     SIGNAL_BOOTSTRAP_INTEGRATIONS,
 )
 from homeassistant.core import (
+    CALLBACK_TYPE,
     Context,
     Event,
+    EventListenerKey,
     EventStateChangedData,
     HomeAssistant,
+    ServiceCall,
     ServiceResponse,
     State,
     callback,
@@ -34,7 +42,17 @@ from homeassistant.exceptions import (
     TemplateError,
     Unauthorized,
 )
-from homeassistant.helpers import config_validation as cv, entity, template
+from homeassistant.helpers import (
+    area_registry as ar,
+    config_validation as cv,
+    device_registry as dr,
+    entity,
+    entity_registry as er,
+    floor_registry as fr,
+    label_registry as lr,
+    template,
+)
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
@@ -52,7 +70,10 @@ from homeassistant.helpers.json import (
     json_bytes,
     json_fragment,
 )
-from homeassistant.helpers.service import async_get_all_descriptions
+from homeassistant.helpers.service import (
+    async_extract_referenced_entity_ids,
+    async_get_all_descriptions,
+)
 from homeassistant.loader import (
     IntegrationNotFound,
     async_get_integration,
@@ -68,6 +89,23 @@ from .messages import construct_result_message
 
 ALL_SERVICE_DESCRIPTIONS_JSON_CACHE = "websocket_api_all_service_descriptions_json"
 
+# Selectors of subscribe_entities which are resolved against the registries
+ENTITY_SELECTORS = (ATTR_AREA_ID, ATTR_DEVICE_ID, ATTR_FLOOR_ID, ATTR_LABEL_ID)
+
+# The changes of a registry entry which can make it match other selectors
+DEVICE_SELECTOR_CHANGES = {"area_id", "labels"}
+ENTITY_SELECTOR_CHANGES = {
+    "area_id",
+    "device_id",
+    "entity_category",
+    "hidden_by",
+    "labels",
+}
+
+# Registry updates often come in bursts, the selected entities are
+# resolved once the registries are quiet
+SELECTOR_UPDATE_COOLDOWN = 0.5
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -367,9 +405,19 @@ def _send_handle_get_states_response(
     )
 
 
+def _can_read_entity(user: User, entity_id: str) -> bool:
+    """Return if the user is allowed to read the entity."""
+    permissions = user.permissions
+    return (
+        user.is_admin
+        or permissions.access_all_entities(POLICY_READ)
+        or permissions.check_entity(entity_id, POLICY_READ)
+    )
+
+
 @callback
 def _forward_entity_changes(
-    send_message: Callable[[str | bytes | dict[str, Any]], None],
+    send_state_diff: Callable[[bytes, Event[EventStateChangedData]], None],
     entity_ids: set[str] | None,
     entity_filter: Callable[[str], bool] | None,
     user: User,
@@ -378,20 +426,183 @@ def _forward_entity_changes(
 ) -> None:
     """Forward entity state changed events to websocket."""
     entity_id = event.data["entity_id"]
-    if (entity_ids and entity_id not in entity_ids) or (
+    if (entity_ids is not None and entity_id not in entity_ids) or (
         entity_filter and not entity_filter(entity_id)
     ):
         return
     # We have to lookup the permissions again because the user might have
     # changed since the subscription was created.
-    permissions = user.permissions
-    if (
-        not user.is_admin
-        and not permissions.access_all_entities(POLICY_READ)
-        and not permissions.check_entity(entity_id, POLICY_READ)
-    ):
+    if not _can_read_entity(user, entity_id):
         return
-    send_message(messages.cached_state_diff_message(message_id_as_bytes, event))
+    send_state_diff(message_id_as_bytes, event)
+
+
+@callback
+def _async_resolve_entity_selectors(
+    hass: HomeAssistant, selectors: dict[str, list[str]]
+) -> set[str]:
+    """Resolve the entity ids matching the selectors against the registries.
+
+    The selectors match the same entities as a service call target, so
+    entities which are hidden or have an entity category only match when
+    they are listed explicitly.
+    """
+    selected = async_extract_referenced_entity_ids(
+        hass,
+        ServiceCall(const.DOMAIN, "subscribe_entities", selectors),
+        expand_group=False,
+    )
+    return selected.referenced | selected.indirectly_referenced
+
+
+@callback
+def _async_listen_entity_changes(
+    hass: HomeAssistant,
+    forward_entity_changes: Callable[[Event[EventStateChangedData]], None],
+    entity_ids: set[str] | None,
+    entity_filter: Callable[[str], bool] | None,
+) -> CALLBACK_TYPE:
+    """Listen for the state changed events of the subscription."""
+    if entity_ids is not None and not entity_filter:
+        if not entity_ids:
+            # The selectors do not match any entity yet
+            return callback(lambda: None)
+        # Only the listed entities are wanted so let the bus index
+        # the subscription instead of calling it for every state change
+        return hass.bus.async_listen_keyed(
+            EVENT_STATE_CHANGED,
+            forward_entity_changes,
+            EventListenerKey.ENTITY_ID,
+            entity_ids,
+        )
+    return hass.bus.async_listen(EVENT_STATE_CHANGED, forward_entity_changes)
+
+
+@callback
+def _area_registry_updated_filter(
+    event_data: ar.EventAreaRegistryUpdatedData,
+) -> bool:
+    """Filter the area updates which can change the selected entities."""
+    # A new area has no devices or entities yet
+    return event_data["action"] != "create"
+
+
+@callback
+def _device_registry_updated_filter(
+    event_data: dr.EventDeviceRegistryUpdatedData,
+) -> bool:
+    """Filter the device updates which can change the selected entities."""
+    return event_data["action"] != "update" or not DEVICE_SELECTOR_CHANGES.isdisjoint(
+        event_data["changes"]
+    )
+
+
+@callback
+def _entity_registry_updated_filter(
+    event_data: er.EventEntityRegistryUpdatedData,
+) -> bool:
+    """Filter the entity updates which can change the selected entities."""
+    return (
+        event_data["action"] != "update"
+        or "old_entity_id" in event_data
+        or not ENTITY_SELECTOR_CHANGES.isdisjoint(event_data["changes"])
+    )
+
+
+@callback
+def _floor_or_label_registry_updated_filter(
+    event_data: fr.EventFloorRegistryUpdatedData | lr.EventLabelRegistryUpdatedData,
+) -> bool:
+    """Filter the floor and label updates which can change the selected entities.
+
+    Only a removed floor or label can change them, the areas, devices and
+    entities are updated when they are added to one.
+    """
+    return event_data["action"] == "remove"
+
+
+# The registries which can change the entities matching the selectors
+REGISTRY_UPDATED_EVENT_FILTERS: dict[str, Callable[[Any], bool]] = {
+    ar.EVENT_AREA_REGISTRY_UPDATED: _area_registry_updated_filter,
+    dr.EVENT_DEVICE_REGISTRY_UPDATED: _device_registry_updated_filter,
+    er.EVENT_ENTITY_REGISTRY_UPDATED: _entity_registry_updated_filter,
+    fr.EVENT_FLOOR_REGISTRY_UPDATED: _floor_or_label_registry_updated_filter,
+    lr.EVENT_LABEL_REGISTRY_UPDATED: _floor_or_label_registry_updated_filter,
+}
+
+
+@callback
+def _async_update_selected_entities(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    selectors: dict[str, list[str]],
+    entity_ids: set[str],
+    entity_filter: Callable[[str], bool] | None,
+    forward_entity_changes: Callable[[Event[EventStateChangedData]], None],
+    message_id_as_bytes: bytes,
+    unsubs: list[CALLBACK_TYPE],
+) -> None:
+    """Update the entities of a subscription after a registry change.
+
+    The states of the entities which start matching the selectors are
+    sent as additions and the entities which stop matching are removed.
+    """
+    selected = _async_resolve_entity_selectors(hass, selectors)
+    if selected == entity_ids:
+        return
+    added = selected - entity_ids
+    removed = entity_ids - selected
+    # The forwarder holds the same set
+    entity_ids.clear()
+    entity_ids.update(selected)
+    if not entity_filter:
+        unsubs[0]()
+        unsubs[0] = _async_listen_entity_changes(
+            hass, forward_entity_changes, entity_ids, entity_filter
+        )
+
+    user = connection.user
+    serialized_states: list[bytes] = []
+    for entity_id in sorted(added):
+        if (
+            (state := hass.states.get(entity_id)) is None
+            or (entity_filter and not entity_filter(entity_id))
+            or not _can_read_entity(user, entity_id)
+        ):
+            continue
+        try:
+            serialized_states.append(state.as_compressed_state_json)
+        except (ValueError, TypeError):
+            connection.logger.error(
+                "Unable to serialize to JSON. Bad data found at %s",
+                format_unserializable_data(
+                    find_paths_unserializable_data(state, dump=JSON_DUMP)
+                ),
+            )
+    removed_entity_ids = [
+        entity_id
+        for entity_id in sorted(removed)
+        if (not entity_filter or entity_filter(entity_id))
+        and _can_read_entity(user, entity_id)
+    ]
+    if not serialized_states and not removed_entity_ids:
+        return
+    changes: list[bytes] = []
+    if serialized_states:
+        changes.append(b"".join((b'"a":{', b",".join(serialized_states), b"}")))
+    if removed_entity_ids:
+        changes.append(b'"r":' + json_bytes(removed_entity_ids))
+    connection.send_message(
+        b"".join(
+            (
+                b'{"id":',
+                message_id_as_bytes,
+                b',"type":"event","event":{',
+                b",".join(changes),
+                b"}}",
+            )
+        )
+    )
 
 
 @callback
@@ -399,14 +610,30 @@ def _forward_entity_changes(
     {
         vol.Required("type"): "subscribe_entities",
         vol.Optional("entity_ids"): cv.entity_ids,
+        **{
+            vol.Optional(selector): vol.All(cv.ensure_list, [cv.string])
+            for selector in ENTITY_SELECTORS
+        },
         **INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.schema,
     }
 )
 def handle_subscribe_entities(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
-    """Handle subscribe entities command."""
-    entity_ids = set(msg.get("entity_ids", [])) or None
+    """Handle subscribe entities command.
+
+    The area, device, floor and label selectors are resolved against the
+    registries and kept up to date as the registries change.
+    """
+    entity_ids: set[str] | None
+    if selectors := {
+        selector: msg[selector] for selector in ENTITY_SELECTORS if selector in msg
+    }:
+        if "entity_ids" in msg:
+            selectors[ATTR_ENTITY_ID] = msg["entity_ids"]
+        entity_ids = _async_resolve_entity_selectors(hass, selectors)
+    else:
+        entity_ids = set(msg.get("entity_ids", [])) or None
     _filter = convert_include_exclude_filter(msg)
     entity_filter = None if _filter.empty_filter else _filter.get_filter()
     # We must never await between sending the states and listening for
@@ -415,28 +642,71 @@ def handle_subscribe_entities(
     states = _async_get_allowed_states(hass, connection)
     msg_id = msg["id"]
     message_id_as_bytes = str(msg_id).encode()
-    connection.subscriptions[msg_id] = hass.bus.async_listen(
-        EVENT_STATE_CHANGED,
-        partial(
-            _forward_entity_changes,
-            connection.send_message,
+    forward_entity_changes = partial(
+        _forward_entity_changes,
+        connection.send_state_diff,
+        entity_ids,
+        entity_filter,
+        connection.user,
+        message_id_as_bytes,
+    )
+    unsub = _async_listen_entity_changes(
+        hass, forward_entity_changes, entity_ids, entity_filter
+    )
+    if selectors:
+        assert entity_ids is not None
+        # The first unsub is replaced when the selected entities change
+        unsubs = [unsub]
+        update_selected_entities = partial(
+            _async_update_selected_entities,
+            hass,
+            connection,
+            selectors,
             entity_ids,
             entity_filter,
-            connection.user,
+            forward_entity_changes,
             message_id_as_bytes,
-        ),
-    )
+            unsubs,
+        )
+        debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=SELECTOR_UPDATE_COOLDOWN,
+            immediate=False,
+            function=update_selected_entities,
+        )
+
+        @callback
+        def _async_registry_updated(_event: Event) -> None:
+            debouncer.async_schedule_call()
+
+        unsubs.extend(
+            hass.bus.async_listen(
+                event_type, _async_registry_updated, event_filter=event_filter
+            )
+            for event_type, event_filter in REGISTRY_UPDATED_EVENT_FILTERS.items()
+        )
+
+        @callback
+        def _unsub_selected_entities() -> None:
+            debouncer.async_shutdown()
+            for unsub in unsubs:
+                unsub()
+
+        connection.subscriptions[msg_id] = _unsub_selected_entities
+    else:
+        connection.subscriptions[msg_id] = unsub
     connection.send_result(msg_id)
 
     # JSON serialize here so we can recover if it blows up due to the
     # state machine containing unserializable data. This command is required
     # to succeed for the UI to show.
     try:
-        if entity_ids or entity_filter:
+        if entity_ids is not None or entity_filter:
             serialized_states = [
                 state.as_compressed_state_json
                 for state in states
-                if (not entity_ids or state.entity_id in entity_ids)
+                if (entity_ids is None or state.entity_id in entity_ids)
                 and (not entity_filter or entity_filter(state.entity_id))
             ]
         else:
@@ -10,7 +10,13 @@ from aiohttp import web
 import voluptuous as vol
 
 from homeassistant.auth.models import RefreshToken, User
-from homeassistant.core import Context, HomeAssistant, callback
+from homeassistant.core import (
+    Context,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
 from homeassistant.exceptions import HomeAssistantError, Unauthorized
 from homeassistant.helpers.http import current_request
 from homeassistant.util.json import JsonValueType
@@ -37,11 +43,13 @@ class ActiveConnection:
         "logger",
         "hass",
         "send_message",
+        "send_state_diff",
         "user",
         "refresh_token_id",
         "subscriptions",
         "last_id",
         "can_coalesce",
+        "compression_level",
         "supported_features",
         "handlers",
         "binary_handlers",
@@ -59,11 +67,16 @@ class ActiveConnection:
         self.logger = logger
         self.hass = hass
         self.send_message = send_message
+        # Replaced by the websocket handler to coalesce the pending diffs
+        self.send_state_diff: Callable[[bytes, Event[EventStateChangedData]], None] = (
+            self._send_state_diff
+        )
         self.user = user
         self.refresh_token_id = refresh_token.id
         self.subscriptions: dict[Hashable, Callable[[], Any]] = {}
         self.last_id = 0
         self.can_coalesce = False
+        self.compression_level: int | None = None
         self.supported_features: dict[str, float] = {}
         self.handlers: dict[str, tuple[MessageHandler, vol.Schema | Literal[False]]] = (
             self.hass.data[const.DOMAIN]
@@ -79,6 +92,10 @@ class ActiveConnection:
         """Set supported features."""
         self.supported_features = features
         self.can_coalesce = const.FEATURE_COALESCE_MESSAGES in features
+        level = features.get(const.FEATURE_COMPRESSION_LEVEL)
+        self.compression_level = (
+            int(level) if level is not None and 0 <= level <= 9 else None
+        )
 
     def get_description(self, request: web.Request | None) -> str:
         """Return a description of the connection."""
@@ -128,6 +145,15 @@ class ActiveConnection:
         """Send a result message."""
         self.send_message(messages.result_message(msg_id, result))
 
+    @callback
+    def _send_state_diff(
+        self, message_id_as_bytes: bytes, event: Event[EventStateChangedData]
+    ) -> None:
+        """Send a state diff message."""
+        self.send_message(
+            messages.cached_state_diff_message(message_id_as_bytes, event)
+        )
+
     @callback
     def send_event(self, msg_id: int, event: Any | None = None) -> None:
         """Send a event message."""
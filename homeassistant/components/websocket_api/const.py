@@ -34,6 +34,11 @@ MAX_PENDING_MSG: Final = 4096
 # resolve the ready future.
 PENDING_MSG_MAX_FORCE_READY: Final = 256
 
+# Number of pending messages at which the pending state diffs of an
+# entity are merged so a client which is not keeping up only gets
+# the latest state of each entity.
+PENDING_MSG_COALESCE_STATE_DIFFS: Final = 256
+
 ERR_ID_REUSE: Final = "id_reuse"
 ERR_INVALID_FORMAT: Final = "invalid_format"
 ERR_NOT_ALLOWED: Final = "not_allowed"
@@ -58,3 +63,5 @@ SIGNAL_WEBSOCKET_DISCONNECTED: Final = "websocket_disconnected"
 DATA_CONNECTIONS: Final = f"{DOMAIN}.connections"
 
 FEATURE_COALESCE_MESSAGES = "coalesce_messages"
+# The zlib level of the permessage-deflate compression of the connection
+FEATURE_COMPRESSION_LEVEL = "compression_level"
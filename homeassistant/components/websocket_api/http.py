@@ -9,13 +9,21 @@ import datetime as dt
 from functools import partial
 import logging
 from typing import TYPE_CHECKING, Any, Final
+import zlib
 
 from aiohttp import WSMsgType, web
-from aiohttp.http_websocket import WebSocketWriter
+from aiohttp.compression_utils import ZLibCompressor
+from aiohttp.http_websocket import WEBSOCKET_MAX_SYNC_CHUNK_SIZE, WebSocketWriter
 
 from homeassistant.components.http import KEY_HASS, HomeAssistantView
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.core import (
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_call_later
 from homeassistant.util.async_ import create_eager_task
@@ -25,6 +33,7 @@ from .auth import AUTH_REQUIRED_MESSAGE, AuthPhase
 from .const import (
     DATA_CONNECTIONS,
     MAX_PENDING_MSG,
+    PENDING_MSG_COALESCE_STATE_DIFFS,
     PENDING_MSG_MAX_FORCE_READY,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
@@ -33,7 +42,11 @@ from .const import (
     URL,
 )
 from .error import Disconnect
-from .messages import message_to_json_bytes
+from .messages import (
+    cached_state_diff_message,
+    message_to_json_bytes,
+    state_diff_message,
+)
 from .util import describe_request
 
 if TYPE_CHECKING:
@@ -82,6 +95,8 @@ class WebSocketHandler:
         "_message_queue",
         "_ready_future",
         "_release_ready_queue_size",
+        "_dequeued_count",
+        "_pending_state_diffs",
     )
 
     def __init__(self, hass: HomeAssistant, request: web.Request) -> None:
@@ -105,6 +120,14 @@ class WebSocketHandler:
         self._message_queue: deque[bytes] = deque()
         self._ready_future: asyncio.Future[int] | None = None
         self._release_ready_queue_size: int = 0
+        # The number of messages taken from the queue by the writer, which
+        # turns the positions of the pending state diffs into queue indexes
+        self._dequeued_count = 0
+        # The queue position of the pending state diff of each subscription
+        # and entity, and the state the client had before that diff
+        self._pending_state_diffs: dict[
+            tuple[bytes, str], tuple[int, State | None]
+        ] = {}
 
     def __repr__(self) -> str:
         """Return the representation."""
@@ -138,6 +161,7 @@ class WebSocketHandler:
         is_debug_log_enabled = partial(logger.isEnabledFor, logging.DEBUG)
         debug = logger.debug
         can_coalesce = connection.can_coalesce
+        compression_level: int | None = None
         ready_message_count = len(message_queue)
         # Exceptions if Socket disconnected or cancelled by connection handler
         try:
@@ -153,15 +177,24 @@ class WebSocketHandler:
                     # coalesce may be enabled later in the connection
                     can_coalesce = connection.can_coalesce
 
+                if connection.compression_level != compression_level:
+                    compression_level = connection.compression_level
+                    self._set_compression_level(compression_level)
+
                 if not can_coalesce or ready_message_count == 1:
                     message = message_queue.popleft()
+                    self._dequeued_count += 1
+                    if not message_queue:
+                        self._pending_state_diffs.clear()
                     if is_debug_log_enabled():
                         debug("%s: Sending %s", self.description, message)
                     await send_bytes_text(message)
                     continue
 
                 coalesced_messages = b"".join((b"[", b",".join(message_queue), b"]"))
+                self._dequeued_count += len(message_queue)
                 message_queue.clear()
+                self._pending_state_diffs.clear()
                 if is_debug_log_enabled():
                     debug("%s: Sending %s", self.description, coalesced_messages)
                 await send_bytes_text(coalesced_messages)
@@ -175,6 +208,41 @@ class WebSocketHandler:
             # Clean up the peak checker when we shut down the writer
             self._cancel_peak_checker()
 
+    @callback
+    def _set_compression_level(self, level: int | None) -> None:
+        """Compress the next messages with the zlib level.
+
+        The writer flushes the compressor after each message so a new
+        compressor can take over. The client keeps the previous messages in
+        its window and the new compressor only refers back to its own output.
+        The writer makes its compressors with _make_compress_obj, either once
+        or for each message without context takeover, so the level is set
+        there and the current compressor is dropped.
+        """
+        writer = self._wsock._writer  # noqa: SLF001
+        if writer is None or not writer.compress:
+            # permessage-deflate was not negotiated in the handshake
+            return
+        if not hasattr(writer, "_compressobj") or not hasattr(
+            writer, "_make_compress_obj"
+        ):
+            self._logger.debug(
+                "%s: Compression level not supported by the websocket writer",
+                self.description,
+            )
+            return
+        zlib_level = zlib.Z_BEST_SPEED if level is None else level
+
+        def make_compress_obj(compress: int) -> ZLibCompressor:
+            return ZLibCompressor(
+                level=zlib_level,
+                wbits=-compress,
+                max_sync_chunk_size=WEBSOCKET_MAX_SYNC_CHUNK_SIZE,
+            )
+
+        writer._make_compress_obj = make_compress_obj  # type: ignore[method-assign]  # noqa: SLF001
+        writer._compressobj = None  # noqa: SLF001
+
     @callback
     def _cancel_peak_checker(self) -> None:
         """Cancel the peak checker."""
@@ -234,6 +302,39 @@ class WebSocketHandler:
                 self._hass, PENDING_MSG_PEAK_TIME, self._check_write_peak
             )
 
+    @callback
+    def _send_state_diff(
+        self, message_id_as_bytes: bytes, event: Event[EventStateChangedData]
+    ) -> None:
+        """Queue sending a state diff message to the client.
+
+        Once the queue is backed up, a diff for an entity which still has a
+        diff for the same subscription in the queue replaces that one with
+        the diff from the state the client has to the new state. A client
+        which is not keeping up only gets the latest state of each entity
+        instead of being disconnected.
+
+        Async friendly.
+        """
+        if self._closing:
+            return
+        entity_id = event.data["entity_id"]
+        key = (message_id_as_bytes, entity_id)
+        if (
+            len(self._message_queue) >= PENDING_MSG_COALESCE_STATE_DIFFS
+            and (pending := self._pending_state_diffs.get(key)) is not None
+            and (index := pending[0] - self._dequeued_count) >= 0
+        ):
+            self._message_queue[index] = state_diff_message(
+                message_id_as_bytes, entity_id, pending[1], event.data["new_state"]
+            )
+            return
+        self._pending_state_diffs[key] = (
+            self._dequeued_count + len(self._message_queue),
+            event.data["old_state"],
+        )
+        self._send_message(cached_state_diff_message(message_id_as_bytes, event))
+
     @callback
     def _release_ready_future_or_reschedule(self) -> None:
         """Release the ready future or reschedule.
@@ -407,6 +508,7 @@ class WebSocketHandler:
         # We only start the writer queue after the auth phase is completed
         # since there is no need to queue messages before the auth phase
         self._connection = connection
+        connection.send_state_diff = self._send_state_diff
         self._writer_task = create_eager_task(self._writer(connection, send_bytes_text))
         self._hass.data[DATA_CONNECTIONS] = self._hass.data.get(DATA_CONNECTIONS, 0) + 1
         async_dispatcher_send(self._hass, SIGNAL_WEBSOCKET_CONNECTED)
@@ -15,7 +15,7 @@ from homeassistant.const import (
     COMPRESSED_STATE_LAST_UPDATED,
     COMPRESSED_STATE_STATE,
 )
-from homeassistant.core import CompressedState, Event, EventStateChangedData
+from homeassistant.core import CompressedState, Event, EventStateChangedData, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.json import (
     JSON_DUMP,
@@ -177,6 +177,35 @@ def _partial_cached_state_diff_message(event: Event[EventStateChangedData]) -> b
     )
 
 
+def state_diff_message(
+    message_id_as_bytes: bytes,
+    entity_id: str,
+    old_state: State | None,
+    new_state: State | None,
+) -> bytes:
+    """Return an event message with the diff between two states of an entity.
+
+    The message is not cached as it is only used to coalesce the pending
+    state diffs of a single connection.
+    """
+    return b"".join(
+        (
+            (
+                _message_to_json_bytes_or_none(
+                    {
+                        "type": "event",
+                        "event": _state_diff(entity_id, old_state, new_state),
+                    }
+                )
+                or INVALID_JSON_PARTIAL_MESSAGE
+            )[:-1],
+            b',"id":',
+            message_id_as_bytes,
+            b"}",
+        )
+    )
+
+
 def _state_diff_event(
     event: Event[EventStateChangedData],
 ) -> dict[
@@ -195,9 +224,22 @@ def _state_diff_event(
         "r": [entity_id,…]
     }
     """
-    if (new_state := event.data["new_state"]) is None:
-        return {ENTITY_EVENT_REMOVE: [event.data["entity_id"]]}
-    if (old_state := event.data["old_state"]) is None:
+    data = event.data
+    return _state_diff(data["entity_id"], data["old_state"], data["new_state"])
+
+
+def _state_diff(
+    entity_id: str, old_state: State | None, new_state: State | None
+) -> dict[
+    str,
+    list[str]
+    | dict[str, CompressedState]
+    | dict[str, dict[str, dict[str, str | list[str]]]],
+]:
+    """Return the minimal version of the change from old_state to new_state."""
+    if new_state is None:
+        return {ENTITY_EVENT_REMOVE: [entity_id]}
+    if old_state is None:
         return {ENTITY_EVENT_ADD: {new_state.entity_id: new_state.as_compressed_state}}
     additions: dict[str, Any] = {}
     diff: dict[str, dict[str, Any]] = {STATE_DIFF_ADDITIONS: additions}
@@ -221,9 +263,11 @@ def _state_diff_event(
             additions[COMPRESSED_STATE_CONTEXT]["id"] = new_state_context.id
         else:
             additions[COMPRESSED_STATE_CONTEXT] = new_state_context.id
-    if (old_attributes := old_state.attributes) != (
+    # The state machine reuses the attributes object when the attributes
+    # are unchanged so the identity check avoids comparing them key by key
+    if (old_attributes := old_state.attributes) is not (
         new_attributes := new_state.attributes
-    ):
+    ) and old_attributes != new_attributes:
         if added := {
             key: value
             for key, value in new_attributes.items()
@@ -44,6 +44,7 @@ from typing import (
 )
 from urllib.parse import urlparse
 
+from lru import LRU
 from propcache import cached_property, under_cached_property
 from typing_extensions import TypeVar
 import voluptuous as vol
@@ -1421,6 +1422,52 @@ _FilterableJobType = tuple[
     Callable[[_DataT], bool] | None,  # event_filter
 ]
 
+_KeyedJobsType = dict[
+    str, list[HassJob[[Event[Any]], Coroutine[Any, Any, None] | None]]
+]
+
+
+class EventListenerKey(enum.StrEnum):
+    """Key used to index listeners registered with EventBus.async_listen_keyed."""
+
+    ENTITY_ID = "entity_id"
+    DOMAIN = "domain"
+    DEVICE_ID = "device_id"
+
+
+def _event_data_entity_id(event_data: Mapping[str, Any]) -> str | None:
+    """Return the entity_id of the event data."""
+    if type(entity_id := event_data.get("entity_id")) is not str:
+        # The event data is not validated, it may be a list of entity_ids
+        return None
+    return entity_id
+
+
+def _event_data_domain(event_data: Mapping[str, Any]) -> str | None:
+    """Return the domain of the entity_id of the event data."""
+    if type(entity_id := event_data.get("entity_id")) is not str:
+        return None
+    try:
+        return split_entity_id(entity_id)[0]
+    except ValueError:
+        return None
+
+
+def _event_data_device_id(event_data: Mapping[str, Any]) -> str | None:
+    """Return the device_id of the event data."""
+    if type(device_id := event_data.get("device_id")) is not str:
+        return None
+    return device_id
+
+
+_EVENT_LISTENER_KEY_GETTERS: dict[
+    EventListenerKey, Callable[[Mapping[str, Any]], str | None]
+] = {
+    EventListenerKey.ENTITY_ID: _event_data_entity_id,
+    EventListenerKey.DOMAIN: _event_data_domain,
+    EventListenerKey.DEVICE_ID: _event_data_device_id,
+}
+
 
 @dataclass(slots=True)
 class _OneTimeListener(Generic[_DataT]):
@@ -1460,15 +1507,30 @@ def _verify_event_type_length_or_raise(event_type: EventType[_DataT] | str) -> N
 class EventBus:
     """Allow the firing of and listening for events."""
 
-    __slots__ = ("_debug", "_hass", "_listeners", "_match_all_listeners")
+    __slots__ = (
+        "_debug",
+        "_hass",
+        "_keyed_listeners",
+        "_listeners",
+        "_listeners_generation",
+        "_match_all_listeners",
+    )
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: defaultdict[
             EventType[Any] | str, list[_FilterableJobType[Any]]
         ] = defaultdict(list)
+        # Incremented every time a listener is added or removed so
+        # async_fire_many_internal can reuse its listener snapshot
+        # between events as long as nothing has changed.
+        self._listeners_generation = 0
         self._match_all_listeners: list[_FilterableJobType[Any]] = []
         self._listeners[MATCH_ALL] = self._match_all_listeners
+        # event_type -> key -> key value -> jobs
+        self._keyed_listeners: dict[
+            EventType[Any] | str, dict[EventListenerKey, _KeyedJobsType]
+        ] = {}
         self._hass = hass
         self._async_logging_changed()
         self.async_listen(EVENT_LOGGING_CHANGED, self._async_logging_changed)
@@ -1484,7 +1546,17 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(listeners) for key, listeners in self._listeners.items()}
+        for event_type, keyed_listeners in self._keyed_listeners.items():
+            listeners[event_type] = listeners.get(event_type, 0) + len(
+                {
+                    job
+                    for keyed_jobs in keyed_listeners.values()
+                    for jobs in keyed_jobs.values()
+                    for job in jobs
+                }
+            )
+        return listeners
 
     @property
     def listeners(self) -> dict[EventType[Any] | str, int]:
@@ -1579,6 +1651,135 @@ class EventBus:
             except Exception:
                 _LOGGER.exception("Error running job: %s", job)
 
+        if event_data is not None and (
+            keyed_listeners := self._keyed_listeners.get(event_type)
+        ):
+            self._async_fire_keyed(
+                keyed_listeners,
+                event,
+                event_type,
+                event_data,
+                origin,
+                context,
+                time_fired,
+            )
+
+    @callback
+    def async_fire_many_internal(
+        self,
+        events: Iterable[
+            tuple[EventType[Any] | str, Any, Context | None, float | None]
+        ],
+        origin: EventOrigin = EventOrigin.local,
+    ) -> None:
+        """Fire multiple events, for internal use only.
+
+        Each item in events is a tuple of
+        (event_type, event_data, context, time_fired).
+        The events are dispatched in order and each listener sees them in
+        the same order as if async_fire_internal had been called for each
+        one, but the listener lookup is only done once per event type for
+        the whole batch unless a listener is added or removed while
+        dispatching.
+
+        This method is intended to only be used by core internally
+        and should not be considered a stable API. We will make
+        breaking changes to this function in the future and it
+        should not be used in integrations.
+
+        This method must be run in the event loop.
+        """
+        generation = -1
+        jobs_by_event_type: dict[EventType[Any] | str, list[_FilterableJobType[Any]]]
+        debug = self._debug
+        for event_type, event_data, context, time_fired in events:
+            if debug:
+                _LOGGER.debug(
+                    "Bus:Handling %s", _event_repr(event_type, origin, event_data)
+                )
+
+            if generation != self._listeners_generation:
+                generation = self._listeners_generation
+                jobs_by_event_type = {}
+            if (filterable_jobs := jobs_by_event_type.get(event_type)) is None:
+                filterable_jobs = self._listeners.get(event_type, EMPTY_LIST)
+                if event_type not in EVENTS_EXCLUDED_FROM_MATCH_ALL:
+                    filterable_jobs = filterable_jobs + self._match_all_listeners
+                else:
+                    filterable_jobs = filterable_jobs.copy()
+                jobs_by_event_type[event_type] = filterable_jobs
+
+            event: Event[Any] | None = None
+            for job, event_filter in filterable_jobs:
+                if event_filter is not None:
+                    try:
+                        if event_data is None or not event_filter(event_data):
+                            continue
+                    except Exception:
+                        _LOGGER.exception("Error in event filter")
+                        continue
+
+                if not event:
+                    event = Event(
+                        event_type,
+                        event_data,
+                        origin,
+                        time_fired,
+                        context,
+                    )
+
+                try:
+                    self._hass.async_run_hass_job(job, event)
+                except Exception:
+                    _LOGGER.exception("Error running job: %s", job)
+
+            if event_data is not None and (
+                keyed_listeners := self._keyed_listeners.get(event_type)
+            ):
+                self._async_fire_keyed(
+                    keyed_listeners,
+                    event,
+                    event_type,
+                    event_data,
+                    origin,
+                    context,
+                    time_fired,
+                )
+
+    @callback
+    def _async_fire_keyed(
+        self,
+        keyed_listeners: dict[EventListenerKey, _KeyedJobsType],
+        event: Event[_DataT] | None,
+        event_type: EventType[_DataT] | str,
+        event_data: _DataT,
+        origin: EventOrigin,
+        context: Context | None,
+        time_fired: float | None,
+    ) -> None:
+        """Run the keyed listeners matching the event data."""
+        for listener_key, keyed_jobs in keyed_listeners.items():
+            if (
+                key := _EVENT_LISTENER_KEY_GETTERS[listener_key](event_data)  # type: ignore[arg-type]
+            ) is None or not (jobs := keyed_jobs.get(key)):
+                continue
+
+            if not event:
+                event = Event(
+                    event_type,
+                    event_data,
+                    origin,
+                    time_fired,
+                    context,
+                )
+
+            # Copy the list as a job may remove itself while running
+            for job in jobs.copy():
+                try:
+                    self._hass.async_run_hass_job(job, event)
+                except Exception:
+                    _LOGGER.exception("Error running job: %s", job)
+
     def listen(
         self,
         event_type: EventType[_DataT] | str,
@@ -1642,6 +1843,76 @@ class EventBus:
                 )
         return self._async_listen_filterable_job(event_type, filterable_job)
 
+    @callback
+    def async_listen_keyed(
+        self,
+        event_type: EventType[_DataT] | str,
+        listener: Callable[[Event[_DataT]], Coroutine[Any, Any, None] | None],
+        listener_key: EventListenerKey,
+        keys: str | Iterable[str],
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type matching one of the keys.
+
+        Instead of an event_filter that is called for every event, the
+        listener declares which entity_ids, domains or device_ids it is
+        interested in. The bus keeps an index of keyed listeners so only the
+        matching listeners are looked up when an event is fired, regardless
+        of how many keyed listeners are registered.
+
+        Keyed listeners run after the other listeners of the event type.
+
+        This method must be run in the event loop.
+        """
+        if event_type == MATCH_ALL:
+            raise HomeAssistantError("Keyed listeners must specify an event type")
+        keys = (keys,) if isinstance(keys, str) else tuple(dict.fromkeys(keys))
+        if not keys:
+            raise HomeAssistantError("Keyed listeners must specify at least one key")
+        job: HassJob[[Event[_DataT]], Coroutine[Any, Any, None] | None] = HassJob(
+            listener, f"listen {event_type} by {listener_key}"
+        )
+        if not (keyed_listeners := self._keyed_listeners.get(event_type)):
+            keyed_listeners = self._keyed_listeners[event_type] = {}
+        if not (keyed_jobs := keyed_listeners.get(listener_key)):
+            keyed_jobs = keyed_listeners[listener_key] = {}
+        for key in keys:
+            if key in keyed_jobs:
+                keyed_jobs[key].append(job)
+            else:
+                keyed_jobs[key] = [job]
+        return functools.partial(
+            self._async_remove_keyed_listener, event_type, listener_key, keys, job
+        )
+
+    @callback
+    def _async_remove_keyed_listener(
+        self,
+        event_type: EventType[_DataT] | str,
+        listener_key: EventListenerKey,
+        keys: tuple[str, ...],
+        job: HassJob[[Event[_DataT]], Coroutine[Any, Any, None] | None],
+    ) -> None:
+        """Remove a keyed listener of a specific event_type.
+
+        This method must be run in the event loop.
+        """
+        try:
+            keyed_listeners = self._keyed_listeners[event_type]
+            keyed_jobs = keyed_listeners[listener_key]
+            for key in keys:
+                jobs = keyed_jobs[key]
+                jobs.remove(job)
+                if not jobs:
+                    del keyed_jobs[key]
+        except (KeyError, ValueError):
+            _LOGGER.exception("Unable to remove unknown keyed listener %s", job)
+            return
+
+        if not keyed_jobs:
+            del keyed_listeners[listener_key]
+        if not keyed_listeners:
+            del self._keyed_listeners[event_type]
+
     @callback
     def _async_listen_filterable_job(
         self,
@@ -1650,6 +1921,7 @@ class EventBus:
     ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type."""
         self._listeners[event_type].append(filterable_job)
+        self._listeners_generation += 1
         return functools.partial(
             self._async_remove_listener, event_type, filterable_job
         )
@@ -1731,6 +2003,7 @@ class EventBus:
         """
         try:
             self._listeners[event_type].remove(filterable_job)
+            self._listeners_generation += 1
 
             # delete event_type list if empty
             if not self._listeners[event_type] and event_type != MATCH_ALL:
@@ -1910,10 +2183,22 @@ class State:
             as_dict["context"] = ReadOnlyDict(context)
         return ReadOnlyDict(as_dict)
 
+    @under_cached_property
+    def _attributes_json_fragment(self) -> json_fragment:
+        """Return a JSON fragment of the attributes.
+
+        The fragment is handed over to the next state of the entity when
+        its attributes are unchanged so the attributes are only serialized
+        once no matter how often the state itself changes.
+        """
+        return json_fragment(json_bytes(self.attributes))
+
     @under_cached_property
     def as_dict_json(self) -> bytes:
         """Return a JSON string of the State."""
-        return json_bytes(self._as_dict)
+        return json_bytes(
+            {**self._as_dict, "attributes": self._attributes_json_fragment}
+        )
 
     @under_cached_property
     def json_fragment(self) -> json_fragment:
@@ -1956,7 +2241,14 @@ class State:
 
         It is used for sending multiple states in a single message.
         """
-        return json_bytes({self.entity_id: self.as_compressed_state})[1:-1]
+        return json_bytes(
+            {
+                self.entity_id: {
+                    **self.as_compressed_state,
+                    COMPRESSED_STATE_ATTRIBUTES: self._attributes_json_fragment,
+                }
+            }
+        )[1:-1]
 
     @classmethod
     def from_dict(cls, json_dict: dict[str, Any]) -> Self | None:
@@ -2064,10 +2356,38 @@ class States(UserDict[str, State]):
         return self._domain_index[key].values()
 
 
+# The number of distinct attribute strings kept for sharing, values which
+# are unique to an entity, such as its friendly name, are evicted first
+ATTRIBUTE_VALUE_POOL_SIZE = 8192
+
+
+def _share_attribute_strings(
+    string_pool: LRU[str, str], attributes: Mapping[str, Any]
+) -> dict[str, Any]:
+    """Return the attributes with their strings replaced by shared copies."""
+    shared: dict[str, Any] = {}
+    for attr, value in attributes.items():
+        if (shared_attr := string_pool.get(attr)) is None:
+            string_pool[attr] = shared_attr = attr
+        if type(value) is str:
+            if (shared_value := string_pool.get(value)) is None:
+                string_pool[value] = shared_value = value
+            value = shared_value
+        shared[shared_attr] = value
+    return shared
+
+
 class StateMachine:
     """Helper class that tracks the state of different entities."""
 
-    __slots__ = ("_states", "_states_data", "_reservations", "_bus", "_loop")
+    __slots__ = (
+        "_states",
+        "_states_data",
+        "_reservations",
+        "_bus",
+        "_loop",
+        "_string_pool",
+    )
 
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
@@ -2078,6 +2398,8 @@ class StateMachine:
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
+        # Set when the compact store is enabled
+        self._string_pool: LRU[str, str] | None = None
 
     def entity_ids(self, domain_filter: str | None = None) -> list[str]:
         """List of entity ids that are being tracked."""
@@ -2245,6 +2567,28 @@ class StateMachine:
 
         self._reservations.add(entity_id)
 
+    @callback
+    def async_enable_compact_store(self) -> None:
+        """Share equal attribute strings between the stored states.
+
+        Integrations usually build the attributes of each state from freshly
+        parsed data, so equal strings such as units, device classes and
+        attribution texts are held once per state. Once enabled, the string
+        keys and values of new attributes are replaced with a single shared
+        copy before the state is created. Attributes reused from the
+        previous state of the entity are not rebuilt.
+
+        Trades a little CPU time on every state write for a lower memory
+        footprint on systems with many entities.
+
+        Must be called before any state is set.
+        """
+        if self._states_data or self._reservations:
+            raise HomeAssistantError(
+                "async_enable_compact_store must be called before any state is set"
+            )
+        self._string_pool = LRU(ATTRIBUTE_VALUE_POOL_SIZE)
+
     @callback
     def async_available(self, entity_id: str) -> bool:
         """Check to see if an entity_id is available to be used."""
@@ -2283,6 +2627,44 @@ class StateMachine:
             timestamp or time.time(),
         )
 
+    @callback
+    def async_set_many(
+        self,
+        states: Iterable[tuple[str, str, Mapping[str, Any] | None]],
+        force_update: bool = False,
+        context: Context | None = None,
+        timestamp: float | None = None,
+    ) -> None:
+        """Set the state of multiple entities, add entities that do not exist.
+
+        states is an iterable of (entity_id, new_state, attributes) tuples.
+
+        All states are validated before any of them are written, so an
+        invalid entry will raise without modifying the state machine.
+
+        The resulting state_changed events, or state_reported events for
+        entities whose state and attributes did not change, are dispatched
+        as a single batch in the order of the writes after all states have
+        been written.
+
+        This method must be run in the event loop.
+        """
+        timestamp = timestamp or time.time()
+        self.async_set_many_internal(
+            [
+                (
+                    entity_id.lower(),
+                    str(new_state),
+                    attributes or {},
+                    force_update,
+                    context,
+                    None,
+                    timestamp,
+                )
+                for entity_id, new_state, attributes in states
+            ]
+        )
+
     @callback
     def async_set_internal(
         self,
@@ -2358,6 +2740,8 @@ class StateMachine:
             if TYPE_CHECKING:
                 assert old_state is not None
             attributes = old_state.attributes
+        elif (string_pool := self._string_pool) is not None and attributes:
+            attributes = _share_attribute_strings(string_pool, attributes)
 
         # This is intentionally called with positional only arguments for performance
         # reasons
@@ -2374,6 +2758,14 @@ class StateMachine:
             timestamp,
         )
         if old_state is not None:
+            if same_attr and (
+                attributes_json_fragment := old_state._cache.get(  # noqa: SLF001
+                    "_attributes_json_fragment"
+                )
+            ):
+                # The attributes object is shared with the old state
+                # so its serialized form can be shared as well
+                state._cache["_attributes_json_fragment"] = attributes_json_fragment  # noqa: SLF001
             old_state.expire()
         self._states[entity_id] = state
         state_changed_data: EventStateChangedData = {
@@ -2388,6 +2780,172 @@ class StateMachine:
             time_fired=timestamp,
         )
 
+    @callback
+    def async_set_many_internal(
+        self,
+        updates: Collection[
+            tuple[
+                str,
+                str,
+                Mapping[str, Any] | None,
+                bool,
+                Context | None,
+                StateInfo | None,
+                float,
+            ]
+        ],
+    ) -> None:
+        """Set the state of multiple entities, add entities that do not exist.
+
+        Each update is a tuple of the arguments to async_set_internal.
+
+        This method is intended to only be used by core internally
+        and should not be considered a stable API. We will make
+        breaking changes to this function in the future and it
+        should not be used in integrations.
+
+        This method must be run in the event loop.
+        """
+        states_data = self._states_data
+        for entity_id, new_state, *_ in updates:
+            if entity_id not in states_data and not valid_entity_id(entity_id):
+                raise InvalidEntityFormatError(
+                    f"Invalid entity id encountered: {entity_id}. "
+                    "Format should be <domain>.<object_id>"
+                )
+            validate_state(new_state)
+
+        events: list[
+            tuple[
+                EventType[Any],
+                EventStateChangedData | EventStateReportedData,
+                Context,
+                float,
+            ]
+        ] = []
+        for (
+            entity_id,
+            new_state,
+            attributes,
+            force_update,
+            context,
+            state_info,
+            timestamp,
+        ) in updates:
+            event_type, event_data, context = self._async_write_state(
+                entity_id,
+                new_state,
+                attributes,
+                force_update,
+                context,
+                state_info,
+                timestamp,
+            )
+            events.append((event_type, event_data, context, timestamp))
+
+        self._bus.async_fire_many_internal(events)
+
+    @callback
+    def _async_write_state(
+        self,
+        entity_id: str,
+        new_state: str,
+        attributes: Mapping[str, Any] | None,
+        force_update: bool,
+        context: Context | None,
+        state_info: StateInfo | None,
+        timestamp: float,
+    ) -> tuple[EventType[Any], EventStateChangedData | EventStateReportedData, Context]:
+        """Write the state of an entity without firing an event.
+
+        Returns a tuple of the type and data of the event to fire,
+        state_changed if the state changed or state_reported if it did not,
+        and the event context.
+        """
+        # Most cases the key will be in the dict
+        # so we optimize for the happy path as
+        # python 3.11+ has near zero overhead for
+        # try when it does not raise an exception.
+        old_state: State | None
+        try:
+            old_state = self._states_data[entity_id]
+        except KeyError:
+            old_state = None
+            same_state = False
+            same_attr = False
+            last_changed = None
+        else:
+            same_state = old_state.state == new_state and not force_update
+            same_attr = old_state.attributes == attributes
+            last_changed = old_state.last_changed if same_state else None
+
+        # It is much faster to convert a timestamp to a utc datetime object
+        # than converting a utc datetime object to a timestamp since cpython
+        # does not have a fast path for handling the UTC timezone and has to do
+        # multiple local timezone conversions.
+        #
+        # from_timestamp implementation:
+        # https://github.com/python/cpython/blob/c90a862cdcf55dc1753c6466e5fa4a467a13ae24/Modules/_datetimemodule.c#L2936
+        #
+        # timestamp implementation:
+        # https://github.com/python/cpython/blob/c90a862cdcf55dc1753c6466e5fa4a467a13ae24/Modules/_datetimemodule.c#L6387
+        # https://github.com/python/cpython/blob/c90a862cdcf55dc1753c6466e5fa4a467a13ae24/Modules/_datetimemodule.c#L6323
+        now = dt_util.utc_from_timestamp(timestamp)
+
+        if context is None:
+            context = Context(id=ulid_at_time(timestamp))
+
+        if same_state and same_attr:
+            # mypy does not understand this is only possible if old_state is not None
+            old_last_reported = old_state.last_reported  # type: ignore[union-attr]
+            old_state.last_reported = now  # type: ignore[union-attr]
+            old_state._cache["last_reported_timestamp"] = timestamp  # type: ignore[union-attr] # noqa: SLF001
+            state_reported_data: EventStateReportedData = {
+                "entity_id": entity_id,
+                "old_last_reported": old_last_reported,
+                "new_state": old_state,
+            }
+            return EVENT_STATE_REPORTED, state_reported_data, context
+
+        if same_attr:
+            if TYPE_CHECKING:
+                assert old_state is not None
+            attributes = old_state.attributes
+        elif (string_pool := self._string_pool) is not None and attributes:
+            attributes = _share_attribute_strings(string_pool, attributes)
+
+        # This is intentionally called with positional only arguments for performance
+        # reasons
+        state = State(
+            entity_id,
+            new_state,
+            attributes,
+            last_changed,
+            now,
+            now,
+            context,
+            old_state is None,
+            state_info,
+            timestamp,
+        )
+        if old_state is not None:
+            if same_attr and (
+                attributes_json_fragment := old_state._cache.get(  # noqa: SLF001
+                    "_attributes_json_fragment"
+                )
+            ):
+                # The attributes object is shared with the old state
+                # so its serialized form can be shared as well
+                state._cache["_attributes_json_fragment"] = attributes_json_fragment  # noqa: SLF001
+            old_state.expire()
+        self._states[entity_id] = state
+        state_changed_data: EventStateChangedData = {
+            "entity_id": entity_id,
+            "old_state": old_state,
+            "new_state": state,
+        }
+        return EVENT_STATE_CHANGED, state_changed_data, context
+
 
 class SupportsResponse(enum.StrEnum):
     """Service call response configuration."""
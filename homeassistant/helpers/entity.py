@@ -5,7 +5,8 @@ from __future__ import annotations
 from abc import ABCMeta
 import asyncio
 from collections import deque
-from collections.abc import Callable, Coroutine, Iterable, Mapping
+from collections.abc import Callable, Coroutine, Generator, Iterable, Mapping
+from contextlib import contextmanager
 import dataclasses
 from enum import Enum, IntFlag, auto
 import functools as ft
@@ -48,6 +49,7 @@ from homeassistant.core import (
     callback,
     get_hassjob_callable_job_type,
     get_release_channel,
+    validate_state,
 )
 from homeassistant.exceptions import (
     HomeAssistantError,
@@ -57,6 +59,7 @@ from homeassistant.exceptions import (
 from homeassistant.loader import async_suggest_report_issue, bind_hass
 from homeassistant.util import ensure_unique_string, slugify
 from homeassistant.util.frozen_dataclass_compat import FrozenOrThawed
+from homeassistant.util.hass_dict import HassKey
 
 from . import device_registry as dr, entity_registry as er, singleton
 from .device_registry import DeviceInfo, EventDeviceRegistryUpdatedData
@@ -75,6 +78,19 @@ if TYPE_CHECKING:
 _LOGGER = logging.getLogger(__name__)
 SLOW_UPDATE_WARNING = 10
 DATA_ENTITY_SOURCE = "entity_info"
+DATA_STATE_WRITE_BATCH: HassKey[
+    list[
+        tuple[
+            str,
+            str,
+            Mapping[str, Any] | None,
+            bool,
+            Context | None,
+            StateInfo | None,
+            float,
+        ]
+    ]
+] = HassKey("entity_state_write_batch")
 
 # Used when converting float states to string: limit precision according to machine
 # epsilon to make the string representation readable
@@ -100,6 +116,43 @@ def entity_sources(hass: HomeAssistant) -> dict[str, EntityInfo]:
     return {}
 
 
+@contextmanager
+def async_batch_write_ha_state(hass: HomeAssistant) -> Generator[None]:
+    """Batch the state writes of all entities until the context exits.
+
+    While the context is active, async_write_ha_state queues the calculated
+    states instead of writing them to the state machine. When the outermost
+    context exits the queued states are written with a single call to
+    StateMachine.async_set_many_internal which dispatches the resulting
+    state_changed events as one batch.
+
+    Intended for integrations that receive updates for many entities at once.
+    The context must be entered and exited in the event loop without awaiting
+    in between.
+    """
+    if DATA_STATE_WRITE_BATCH in hass.data:
+        # Already batching, the outermost context will write the states
+        yield
+        return
+
+    hass.data[DATA_STATE_WRITE_BATCH] = batch = []
+    try:
+        yield
+    except BaseException:
+        del hass.data[DATA_STATE_WRITE_BATCH]
+        if batch:
+            # Write the states queued before the error without
+            # hiding the original exception if writing them fails
+            try:
+                hass.states.async_set_many_internal(batch)
+            except Exception:
+                _LOGGER.exception("Error writing batched states")
+        raise
+    del hass.data[DATA_STATE_WRITE_BATCH]
+    if batch:
+        hass.states.async_set_many_internal(batch)
+
+
 def generate_entity_id(
     entity_id_format: str,
     name: str | None,
@@ -1205,6 +1258,31 @@ class Entity(
             self._context = None
             self._context_set = None
 
+        if (batch := hass.data.get(DATA_STATE_WRITE_BATCH)) is not None:
+            # Validate now so an invalid state does not fail the whole batch
+            try:
+                validate_state(state)
+            except InvalidStateError:
+                _LOGGER.exception(
+                    "Failed to set state for %s, fall back to %s",
+                    entity_id,
+                    STATE_UNKNOWN,
+                )
+                state = STATE_UNKNOWN
+                attr = {}
+            batch.append(
+                (
+                    entity_id,
+                    state,
+                    attr,
+                    self.force_update,
+                    self._context,
+                    self._state_info,
+                    time_now,
+                )
+            )
+            return
+
         try:
             hass.states.async_set_internal(
                 entity_id,
@@ -87,11 +87,15 @@ def session_scope(
     """Provide a transactional scope around a series of operations.
 
     read_only is used to indicate that the session is only used for reading
-    data and that no commit is required. It does not prevent the session
-    from writing and is not a security measure.
+    data and that no commit is required. When the recorder has a separate
+    read only engine the session is created from it, otherwise it does not
+    prevent the session from writing and is not a security measure.
     """
     if session is None and hass is not None:
-        session = get_instance(hass).get_session()
+        instance = get_instance(hass)
+        session = (
+            instance.get_read_only_session() if read_only else instance.get_session()
+        )
 
     if session is None:
         raise RuntimeError("Session required")
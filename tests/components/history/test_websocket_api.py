@@ -1,7 +1,10 @@
 """The tests the History component websocket_api."""
 
 import asyncio
+from collections.abc import Iterator
 from datetime import timedelta
+import threading
+from typing import Any
 from unittest.mock import ANY, patch
 
 from freezegun import freeze_time
@@ -10,8 +13,10 @@ import pytest
 from homeassistant.components import history
 from homeassistant.components.history import websocket_api
 from homeassistant.components.recorder import Recorder
+from homeassistant.components.websocket_api.const import SIGNAL_WEBSOCKET_DISCONNECTED
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE, STATE_OFF, STATE_ON
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
@@ -173,6 +178,70 @@ async def test_history_during_period(
     assert sensor_test_history[2]["a"] == {"any": "attr"}
 
 
+async def test_history_during_period_max_points(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history_during_period downsamples to max_points."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    values = [str(value) for value in range(100)]
+    values[50] = "500"
+    values[60] = "nan"
+    values[70] = "-5"
+    values[80] = "unavailable"
+    with freeze_time(now) as freezer:
+        for value in values:
+            freezer.tick(timedelta(seconds=1))
+            hass.states.async_set("sensor.test", value)
+        await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/history_during_period",
+            "start_time": now.isoformat(),
+            "end_time": (now + timedelta(seconds=101)).isoformat(),
+            "entity_ids": ["sensor.test"],
+            "minimal_response": True,
+            "no_attributes": True,
+            "max_points": 8,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert [state["s"] for state in response["result"]["sensor.test"]] == [
+        "0",
+        "49",
+        "500",
+        "nan",
+        "61",
+        "-5",
+        "unavailable",
+        "81",
+        "99",
+    ]
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/history_during_period",
+            "start_time": now.isoformat(),
+            "end_time": (now + timedelta(seconds=101)).isoformat(),
+            "entity_ids": ["sensor.test"],
+            "minimal_response": True,
+            "no_attributes": True,
+            "max_points": 3,
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_format"
+
+
 async def test_history_during_period_impossible_conditions(
     hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -543,6 +612,142 @@ async def test_history_stream_historical_only(
     }
 
 
+async def test_history_stream_historical_only_in_chunks(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history stream sends the historical states in chunks of rows."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    entity_ids = ["sensor.one", "sensor.two", "sensor.three", "sensor.four"]
+    last_updated_timestamps = {}
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, "on")
+        last_updated_timestamps[entity_id] = hass.states.get(
+            entity_id
+        ).last_updated_timestamp
+        await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+    end_time = dt_util.utcnow()
+
+    client = await hass_ws_client()
+    with patch.object(websocket_api, "HISTORY_CHUNK_SIZE", 2):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "entity_ids": entity_ids,
+                "start_time": now.isoformat(),
+                "end_time": end_time.isoformat(),
+                "include_start_time_state": True,
+                "significant_changes_only": False,
+                "no_attributes": True,
+                "minimal_response": True,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        assert response["id"] == 1
+        assert response["type"] == "result"
+
+        for chunk in (entity_ids[:2], entity_ids[2:]):
+            response = await client.receive_json()
+            assert response == {
+                "event": {
+                    "end_time": pytest.approx(last_updated_timestamps[chunk[1]]),
+                    "start_time": pytest.approx(now.timestamp()),
+                    "states": {
+                        entity_id: [
+                            {
+                                "lu": pytest.approx(last_updated_timestamps[entity_id]),
+                                "s": "on",
+                            }
+                        ]
+                        for entity_id in chunk
+                    },
+                },
+                "id": 1,
+                "type": "event",
+            }
+
+
+async def test_history_stream_historical_only_stops_on_disconnect(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history stream stops fetching the chunks once the client is gone."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    entity_ids = ["sensor.one", "sensor.two", "sensor.three", "sensor.four"]
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, "on")
+        await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+    end_time = dt_util.utcnow()
+
+    disconnected = asyncio.Event()
+
+    @callback
+    def _async_disconnected() -> None:
+        disconnected.set()
+
+    async_dispatcher_connect(hass, SIGNAL_WEBSOCKET_DISCONNECTED, _async_disconnected)
+    resume = threading.Event()
+    chunks_fetched = 0
+    fetch_closed = False
+    get_significant_states_chunks = websocket_api.history.get_significant_states_chunks
+
+    def _get_significant_states_chunks(*args: Any) -> Iterator[dict[str, Any]]:
+        nonlocal chunks_fetched, fetch_closed
+        try:
+            for chunk in get_significant_states_chunks(*args):
+                chunks_fetched += 1
+                yield chunk
+                # Hold the fetch until the client is gone
+                resume.wait()
+        finally:
+            fetch_closed = True
+
+    client = await hass_ws_client()
+    with (
+        patch.object(websocket_api, "HISTORY_CHUNK_SIZE", 1),
+        patch.object(
+            websocket_api.history,
+            "get_significant_states_chunks",
+            _get_significant_states_chunks,
+        ),
+    ):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "entity_ids": entity_ids,
+                "start_time": now.isoformat(),
+                "end_time": end_time.isoformat(),
+                "include_start_time_state": True,
+                "significant_changes_only": False,
+                "no_attributes": True,
+                "minimal_response": True,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        response = await client.receive_json()
+        assert list(response["event"]["states"]) == ["sensor.one"]
+
+        await client.close()
+        await disconnected.wait()
+        resume.set()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    # The chunk fetched before the client was gone is not sent
+    # and the remaining chunks are not fetched
+    assert chunks_fetched == 2
+    assert fetch_closed
+
+
 async def test_history_stream_significant_domain_historical_only(
     hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
 ) -> None:
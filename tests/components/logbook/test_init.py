@@ -957,6 +957,54 @@ async def test_exclude_attribute_changes(
     assert response_json[2]["entity_id"] == "light.kitchen"
 
 
+@pytest.mark.usefixtures("recorder_mock")
+async def test_logbook_context_recorded_again(
+    hass: HomeAssistant, hass_client: ClientSessionGenerator
+) -> None:
+    """Test the earliest origin is used for a context which has more than one."""
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook", "automation", "script")
+        ]
+    )
+    await async_recorder_block_till_done(hass)
+    start = dt_util.utcnow()
+
+    context = ha.Context(
+        id="01GTDGKBCH00GW0X476W5TVAAA",
+        user_id="b400facee45711eaa9308bfd3d19e474",
+    )
+    hass.bus.async_fire(
+        EVENT_AUTOMATION_TRIGGERED,
+        {ATTR_NAME: "Mock automation", ATTR_ENTITY_ID: "automation.alarm"},
+        context=context,
+    )
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    await async_wait_recording_done(hass)
+    # The recorder forgets the origins it has seen when it restarts
+    instance = recorder.get_instance(hass)
+    await instance.async_add_executor_job(instance.context_origins_manager.reset)
+    hass.bus.async_fire(
+        EVENT_SCRIPT_STARTED,
+        {ATTR_NAME: "Mock script", ATTR_ENTITY_ID: "script.mock_script"},
+        context=context,
+    )
+    hass.states.async_set("light.kitchen", STATE_ON, context=context)
+    await async_wait_recording_done(hass)
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/logbook/{start.isoformat()}", params={"entity": "light.kitchen"}
+    )
+    assert response.status == HTTPStatus.OK
+    json_dict = await response.json()
+    assert len(json_dict) == 1
+    assert json_dict[0]["entity_id"] == "light.kitchen"
+    assert json_dict[0]["context_event_type"] == EVENT_AUTOMATION_TRIGGERED
+    assert json_dict[0]["context_entity_id"] == "automation.alarm"
+
+
 @pytest.mark.usefixtures("recorder_mock")
 async def test_logbook_entity_context_id(
     hass: HomeAssistant, hass_client: ClientSessionGenerator
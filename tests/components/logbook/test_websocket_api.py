@@ -423,6 +423,144 @@ async def test_get_events_bad_end_time(
     assert response["error"]["code"] == "invalid_end_time"
 
 
+@pytest.mark.parametrize("entity_ids", [None, ["light.kitchen", "light.hallway"]])
+async def test_get_events_paginated(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    entity_ids: list[str] | None,
+) -> None:
+    """Test get_events in pages returns the same events newest page first."""
+    now = dt_util.utcnow()
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+    await async_recorder_block_till_done(hass)
+
+    for state in (STATE_ON, STATE_OFF, STATE_ON, STATE_OFF, STATE_ON, STATE_OFF):
+        hass.states.async_set("light.kitchen", state)
+        hass.states.async_set("light.hallway", state)
+        logbook.async_log_entry(hass, "Alarm", "is triggered", "switch")
+        await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+    end_time = dt_util.utcnow()
+
+    request: dict[str, Any] = {
+        "type": "logbook/get_events",
+        "start_time": now.isoformat(),
+        "end_time": end_time.isoformat(),
+    }
+    if entity_ids:
+        request["entity_ids"] = entity_ids
+    client = await hass_ws_client()
+    await client.send_json({"id": 1, **request})
+    response = await client.receive_json()
+    assert response["success"]
+    all_events = response["result"]
+    assert len(all_events) >= 10
+
+    pages: list[list[dict[str, Any]]] = []
+    cursor: str | None = None
+    msg_id = 2
+    while True:
+        await client.send_json(
+            {"id": msg_id, **request, "limit": 3}
+            | ({"cursor": cursor} if cursor else {})
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        pages.append(response["result"]["events"])
+        assert len(pages[-1]) <= 3
+        if not (cursor := response["result"]["cursor"]):
+            break
+        msg_id += 1
+
+    assert len(pages) > 3
+    assert [event for page in reversed(pages) for event in page] == all_events
+
+
+@pytest.mark.parametrize("entity_ids", [None, ["light.kitchen"]])
+async def test_get_events_paginated_context_origin_on_older_page(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    entity_ids: list[str] | None,
+) -> None:
+    """Test the origin of a context is found when it is on an older page."""
+    now = dt_util.utcnow()
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook", "automation")
+        ]
+    )
+    await async_recorder_block_till_done(hass)
+
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    context = core.Context(
+        id="01GTDGKBCH00GW0X476W5TVAAA",
+        user_id="b400facee45711eaa9308bfd3d19e474",
+    )
+    hass.bus.async_fire(
+        EVENT_AUTOMATION_TRIGGERED,
+        {ATTR_NAME: "Mock automation", ATTR_ENTITY_ID: "automation.alarm"},
+        context=context,
+    )
+    await hass.async_block_till_done()
+    for state in (STATE_ON, STATE_OFF, STATE_ON, STATE_OFF):
+        hass.states.async_set("light.kitchen", state, context=context)
+        await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+
+    request: dict[str, Any] = {
+        "type": "logbook/get_events",
+        "start_time": now.isoformat(),
+        "end_time": dt_util.utcnow().isoformat(),
+        "limit": 2,
+    }
+    if entity_ids:
+        request["entity_ids"] = entity_ids
+    client = await hass_ws_client()
+    await client.send_json({"id": 1, **request})
+    response = await client.receive_json()
+    assert response["success"]
+    events = response["result"]["events"]
+    # The automation event is on an older page
+    assert [event["entity_id"] for event in events] == [
+        "light.kitchen",
+        "light.kitchen",
+    ]
+    for event in events:
+        assert event["context_event_type"] == EVENT_AUTOMATION_TRIGGERED
+        assert event["context_entity_id"] == "automation.alarm"
+
+
+async def test_get_events_invalid_cursor(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test get_events with an invalid cursor."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "logbook", {})
+    await async_recorder_block_till_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/get_events",
+            "start_time": now.isoformat(),
+            "limit": 10,
+            "cursor": "cats",
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_cursor"
+
+
 async def test_get_events_invalid_filters(
     recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
 ) -> None:
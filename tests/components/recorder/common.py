@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Iterable, Iterator
+from collections.abc import Callable, Iterable, Iterator
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -15,7 +15,7 @@ from typing import Any, Literal, cast
 from unittest.mock import MagicMock, patch, sentinel
 
 from freezegun import freeze_time
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm.session import Session
 
 from homeassistant import core as ha
@@ -436,6 +436,23 @@ class MockMigrationTask(migration.MigrationTask):
         """Run migration task."""
 
 
+def _old_insert_params_from_event(
+    mapped_class: type,
+) -> Callable[[Event], dict[str, Any]]:
+    """Return an insert_params_from_event for a table of an old schema."""
+    column_keys = [
+        prop.key
+        for prop in inspect(mapped_class).column_attrs
+        if not any(column.primary_key for column in prop.columns)
+    ]
+
+    def insert_params_from_event(event: Event) -> dict[str, Any]:
+        row = mapped_class.from_event(event)
+        return {key: getattr(row, key) for key in column_keys}
+
+    return insert_params_from_event
+
+
 @contextmanager
 def old_db_schema(schema_version_postfix: str) -> Iterator[None]:
     """Fixture to initialize the db with the old schema."""
@@ -454,6 +471,18 @@ def old_db_schema(schema_version_postfix: str) -> Iterator[None]:
         patch.object(core, "States", old_db_schema.States),
         patch.object(core, "Events", old_db_schema.Events),
         patch.object(core, "StateAttributes", old_db_schema.StateAttributes),
+        patch.object(
+            old_db_schema.States,
+            "insert_params_from_event",
+            _old_insert_params_from_event(old_db_schema.States),
+            create=True,
+        ),
+        patch.object(
+            old_db_schema.Events,
+            "insert_params_from_event",
+            _old_insert_params_from_event(old_db_schema.Events),
+            create=True,
+        ),
         patch.object(migration.EntityIDMigration, "task", MockMigrationTask),
         patch(
             CREATE_ENGINE_TARGET,
@@ -0,0 +1,104 @@
+"""Test recent states manager."""
+
+from homeassistant.components.recorder.table_managers.recent_states import (
+    RecentStatesManager,
+)
+
+
+def _add_committed(manager: RecentStatesManager, *states: tuple) -> None:
+    """Add states and commit them."""
+    for entity_id, state, attributes, last_updated_ts in states:
+        manager.add_pending(entity_id, state, attributes, last_updated_ts, None)
+    manager.post_commit_pending()
+
+
+def test_recent_states_coverage() -> None:
+    """Test periods are only answered when they are covered."""
+    manager = RecentStatesManager()
+    manager.add_pending("sensor.one", "1", "{}", 10.0, None)
+    assert manager.get_many(["sensor.one"], 5.0, None, False) is None
+
+    manager.post_commit_pending()
+    _add_committed(
+        manager,
+        ("sensor.one", "2", "{}", 20.0),
+        ("sensor.one", "3", "{}", 30.0),
+        ("sensor.two", "a", "{}", 15.0),
+    )
+    assert manager.get_many(["sensor.one"], 5.0, None, False) is None
+    assert manager.get_many(["sensor.one"], 10.0, None, True) is None
+    result = manager.get_many(["sensor.one"], 10.0, None, False)
+    assert result["sensor.one"][0] is None
+    assert [state.state for state in result["sensor.one"][1]] == ["2", "3"]
+
+    result = manager.get_many(["sensor.one", "sensor.two"], 20.0, 30.0, True)
+    assert result["sensor.one"][0].state == "1"
+    assert result["sensor.one"][1] == []
+    assert result["sensor.two"][0].state == "a"
+    assert manager.get_many(["sensor.one", "sensor.three"], 20.0, None, True) is None
+    assert (manager.hits, manager.misses) == (2, 4)
+
+
+def test_recent_states_memory_budget() -> None:
+    """Test the oldest states are dropped once the budget is used up."""
+    attributes = '{"friendly_name":"One"}'
+    manager = RecentStatesManager()
+    _add_committed(
+        manager,
+        ("sensor.one", "1", attributes, 10.0),
+        ("sensor.one", "2", attributes, 20.0),
+    )
+    first, second = manager._states["sensor.one"]
+    # The attributes are shared with the previous state
+    assert second.attributes is first.attributes
+    assert second.size == first.size - len(attributes)
+
+    manager = RecentStatesManager(max_bytes=first.size + second.size)
+    _add_committed(
+        manager,
+        ("sensor.one", "1", attributes, 10.0),
+        ("sensor.two", "a", attributes, 15.0),
+        ("sensor.one", "2", attributes, 20.0),
+    )
+    assert manager.size <= manager.max_bytes
+    assert manager.get_many(["sensor.one"], 10.0, None, False) is None
+    result = manager.get_many(["sensor.one", "sensor.two"], 20.0, None, False)
+    assert [state.state for state in result["sensor.one"][1]] == []
+    assert manager.get_many(["sensor.two"], 16.0, None, True) is not None
+
+
+def test_recent_states_clock_going_backwards() -> None:
+    """Test an entity is dropped when its states are recorded out of order."""
+    manager = RecentStatesManager()
+    _add_committed(
+        manager,
+        ("sensor.one", "1", "{}", 10.0),
+        ("sensor.one", "2", "{}", 20.0),
+        ("sensor.one", "3", "{}", 15.0),
+    )
+    assert manager.get_many(["sensor.one"], 10.0, None, False) is None
+    result = manager.get_many(["sensor.one"], 15.0, None, False)
+    assert result["sensor.one"] == (None, [])
+    assert manager.size == manager._states["sensor.one"][0].size
+
+
+def test_recent_states_evict_before_and_reset() -> None:
+    """Test purged states are dropped."""
+    manager = RecentStatesManager()
+    _add_committed(
+        manager,
+        ("sensor.one", "1", "{}", 10.0),
+        ("sensor.one", "2", "{}", 20.0),
+        ("sensor.two", "a", "{}", 15.0),
+    )
+    manager.evict_before(16.0)
+    assert manager.get_many(["sensor.two"], 16.0, None, False) is None
+    assert manager.get_many(["sensor.one"], 15.0, None, False) is None
+    result = manager.get_many(["sensor.one"], 20.0, None, False)
+    assert result["sensor.one"] == (None, [])
+
+    manager.add_pending("sensor.one", "3", "{}", 30.0, None)
+    manager.reset()
+    manager.post_commit_pending()
+    assert manager.size == 0
+    assert manager.get_many(["sensor.one"], 20.0, None, False) is None
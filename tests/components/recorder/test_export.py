@@ -0,0 +1,215 @@
+"""Test exporting and importing recorder data."""
+
+import csv
+from datetime import timedelta
+import gzip
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder import DOMAIN, Recorder, export
+from homeassistant.components.recorder.export import STATISTICS_COLUMNS
+from homeassistant.components.recorder.services import (
+    SERVICE_EXPORT_STATES,
+    SERVICE_EXPORT_STATISTICS,
+    SERVICE_IMPORT_STATISTICS,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    async_import_statistics,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_recording_done, statistics_during_period
+
+
+async def test_export_states(
+    recorder_mock: Recorder, hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test exporting states."""
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.one", "1", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.one", "2", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.two", "a")
+    await async_wait_recording_done(hass)
+
+    filename = str(tmp_path / "states.csv.gz")
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_EXPORT_STATES,
+        {
+            "filename": filename,
+            "start_time": start - timedelta(seconds=1),
+            "entity_id": ["sensor.one"],
+        },
+        blocking=True,
+    )
+    with gzip.open(filename, "rt", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [(row["entity_id"], row["state"]) for row in rows] == [
+        ("sensor.one", "1"),
+        ("sensor.one", "2"),
+    ]
+    assert json.loads(rows[0]["attributes"]) == {"unit_of_measurement": "W"}
+    assert dt_util.parse_datetime(rows[0]["last_updated"]) >= start
+
+    filename = str(tmp_path / "states.csv")
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_EXPORT_STATES,
+        {"filename": filename, "start_time": start - timedelta(seconds=1)},
+        blocking=True,
+    )
+    rows = list(csv.DictReader(Path(filename).read_text().splitlines()))
+    assert len(rows) == 3
+
+
+async def test_export_import_statistics(
+    recorder_mock: Recorder, hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test statistics survive an export and import."""
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+    period1 = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    period2 = period1 + timedelta(hours=1)
+    last_reset = period1 - timedelta(days=1)
+    internal_metadata = {
+        "has_mean": False,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": DOMAIN,
+        "statistic_id": "sensor.total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    external_metadata = {
+        "has_mean": True,
+        "has_sum": False,
+        "name": None,
+        "source": "test",
+        "statistic_id": "test:temperature",
+        "unit_of_measurement": "°C",
+    }
+    async_import_statistics(
+        hass,
+        internal_metadata,
+        [
+            {"start": period1, "last_reset": last_reset, "state": 0, "sum": 2},
+            {"start": period2, "last_reset": last_reset, "state": 1, "sum": 3},
+        ],
+    )
+    async_add_external_statistics(
+        hass,
+        external_metadata,
+        [{"start": period1, "mean": 20.5, "min": 19, "max": 22}],
+    )
+    await async_wait_recording_done(hass)
+    statistic_ids = {"sensor.total_energy_import", "test:temperature"}
+    stats = statistics_during_period(
+        hass, period1, period="hour", statistic_ids=statistic_ids
+    )
+    assert len(stats["sensor.total_energy_import"]) == 2
+
+    filename = str(tmp_path / "statistics.csv.gz")
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_EXPORT_STATISTICS,
+        {"filename": filename, "start_time": period1 - timedelta(hours=1)},
+        blocking=True,
+    )
+
+    # Change the statistics and restore them from the export
+    async_import_statistics(
+        hass,
+        internal_metadata,
+        [{"start": period1, "last_reset": None, "state": 5, "sum": 10}],
+    )
+    await async_wait_recording_done(hass)
+    assert (
+        statistics_during_period(
+            hass, period1, period="hour", statistic_ids=statistic_ids
+        )
+        != stats
+    )
+    with patch.object(export, "IMPORT_CHUNK_SIZE", 1):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_IMPORT_STATISTICS, {"filename": filename}, blocking=True
+        )
+    await async_wait_recording_done(hass)
+    assert (
+        statistics_during_period(
+            hass, period1, period="hour", statistic_ids=statistic_ids
+        )
+        == stats
+    )
+
+
+async def test_import_short_term_statistics(
+    recorder_mock: Recorder, hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test an export of 5 minute statistics is rejected before importing."""
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+    filename = tmp_path / "statistics.csv"
+    period1 = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    with filename.open("w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(STATISTICS_COLUMNS)
+        for idx, period in enumerate(("hour", "5minute")):
+            writer.writerow(
+                (
+                    "test:temperature",
+                    "test",
+                    "",
+                    "°C",
+                    "True",
+                    "False",
+                    period,
+                    (period1 + timedelta(minutes=5 * idx)).isoformat(),
+                    "20.5",
+                    "19",
+                    "22",
+                    "",
+                    "",
+                    "",
+                )
+            )
+
+    with (
+        patch.object(export, "async_add_external_statistics") as add_statistics,
+        pytest.raises(HomeAssistantError, match="only hourly statistics"),
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_IMPORT_STATISTICS,
+            {"filename": str(filename)},
+            blocking=True,
+        )
+    add_statistics.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("service", "service_data"),
+    [
+        (SERVICE_EXPORT_STATES, {"start_time": "2024-01-01 00:00:00"}),
+        (SERVICE_EXPORT_STATISTICS, {"start_time": "2024-01-01 00:00:00"}),
+        (SERVICE_IMPORT_STATISTICS, {}),
+    ],
+)
+async def test_path_not_allowed(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    service: str,
+    service_data: dict[str, str],
+) -> None:
+    """Test the services only access allowed paths."""
+    with pytest.raises(ServiceValidationError) as err:
+        await hass.services.async_call(
+            DOMAIN,
+            service,
+            {"filename": "/etc/passwd", **service_data},
+            blocking=True,
+        )
+    assert err.value.translation_key == "path_not_allowed"
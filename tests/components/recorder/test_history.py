@@ -5,9 +5,11 @@ from __future__ import annotations
 from copy import copy
 from datetime import datetime, timedelta
 import json
-from unittest.mock import sentinel
+from typing import Any
+from unittest.mock import patch, sentinel
 
 from freezegun import freeze_time
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 
 from homeassistant.components import recorder
@@ -15,6 +17,7 @@ from homeassistant.components.recorder import Recorder, history
 from homeassistant.components.recorder.db_schema import (
     StateAttributes,
     States,
+    StatesCheckpoints,
     StatesMeta,
 )
 from homeassistant.components.recorder.filters import Filters
@@ -33,6 +36,7 @@ from .common import (
     async_wait_recording_done,
 )
 
+from tests.common import async_fire_time_changed
 from tests.typing import RecorderInstanceGenerator
 
 
@@ -618,6 +622,49 @@ async def test_get_significant_states_multiple_entity_ids(
     )
 
 
+async def test_get_significant_states_chunks(hass: HomeAssistant) -> None:
+    """Test the significant states can be fetched in chunks of rows."""
+    zero, four, _states = record_states(hass)
+    await async_wait_recording_done(hass)
+    entity_ids = ["media_player.test", "media_player.test2", "thermostat.test"]
+
+    hist = history.get_significant_states(hass, zero, four, entity_ids)
+    chunks = list(
+        history.get_significant_states_chunks(
+            hass, zero, four, entity_ids, chunk_size=1
+        )
+    )
+    assert len(chunks) == sum(len(states) for states in hist.values())
+    combined: dict[str, list[State]] = {}
+    for chunk in chunks:
+        for entity_id, states in chunk.items():
+            combined.setdefault(entity_id, []).extend(states)
+    assert_dict_of_states_equal_without_context_and_last_changed(combined, hist)
+
+
+async def test_get_significant_states_chunks_minimal_response(
+    hass: HomeAssistant,
+) -> None:
+    """Test the minimal response continues from the previous chunk."""
+    zero, four, _states = record_states(hass)
+    await async_wait_recording_done(hass)
+    entity_ids = ["media_player.test", "media_player.test2", "thermostat.test"]
+    options = {
+        "significant_changes_only": False,
+        "minimal_response": True,
+        "compressed_state_format": True,
+    }
+
+    hist = history.get_significant_states(hass, zero, four, entity_ids, **options)
+    combined: dict[str, list[dict[str, Any]]] = {}
+    for chunk in history.get_significant_states_chunks(
+        hass, zero, four, entity_ids, chunk_size=1, **options
+    ):
+        for entity_id, states in chunk.items():
+            combined.setdefault(entity_id, []).extend(states)
+    assert combined == hist
+
+
 async def test_get_significant_states_are_ordered(
     hass: HomeAssistant,
 ) -> None:
@@ -928,6 +975,151 @@ async def test_state_changes_during_period_multiple_entities_single_test(
         assert hist[entity_id][0].state == value
 
 
+async def test_get_significant_states_from_states_checkpoint(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test the start states are found from the latest states checkpoint."""
+    now = dt_util.utcnow()
+    hour1 = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    hour2 = hour1 + timedelta(hours=1)
+
+    freezer.move_to(now + timedelta(seconds=1))
+    hass.states.async_set("sensor.unchanged", "a")
+    hass.states.async_set("sensor.changed", "1")
+    await async_wait_recording_done(hass)
+    unchanged_ts = hass.states.get("sensor.unchanged").last_updated_timestamp
+
+    freezer.move_to(hour1 + timedelta(seconds=10))
+    async_fire_time_changed(hass, hour1 + timedelta(seconds=10))
+    await async_wait_recording_done(hass)
+    freezer.move_to(hour1 + timedelta(minutes=1))
+    hass.states.async_set("sensor.changed", "2")
+    await async_wait_recording_done(hass)
+
+    freezer.move_to(hour2 + timedelta(seconds=10))
+    async_fire_time_changed(hass, hour2 + timedelta(seconds=10))
+    await async_wait_recording_done(hass)
+    freezer.move_to(hour2 + timedelta(minutes=1))
+    hass.states.async_set("sensor.changed", "3")
+    hass.states.async_set("sensor.new", "x")
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        checkpoints = {
+            (row.checkpoint_ts, entity_id): row.last_updated_ts
+            for row, entity_id in session.query(
+                StatesCheckpoints, StatesMeta.entity_id
+            ).join(StatesMeta, StatesCheckpoints.metadata_id == StatesMeta.metadata_id)
+        }
+    assert checkpoints == {
+        (hour1.timestamp(), "sensor.unchanged"): unchanged_ts,
+        (hour1.timestamp(), "sensor.changed"): unchanged_ts,
+        (hour2.timestamp(), "sensor.unchanged"): unchanged_ts,
+        (hour2.timestamp(), "sensor.changed"): (
+            hour1 + timedelta(minutes=1)
+        ).timestamp(),
+    }
+
+    entity_ids = ["sensor.changed", "sensor.new", "sensor.unchanged"]
+    # Bypass the recent states so the database is queried
+    instance = recorder.get_instance(hass)
+    with patch.object(instance.recent_states_manager, "get_many", return_value=None):
+        hist = history.get_significant_states(
+            hass, hour2 + timedelta(minutes=30), None, entity_ids
+        )
+    assert {
+        entity_id: [state.state for state in states]
+        for entity_id, states in hist.items()
+    } == {"sensor.changed": ["3"], "sensor.new": ["x"], "sensor.unchanged": ["a"]}
+    with patch.object(instance.recent_states_manager, "get_many", return_value=None):
+        hist = history.get_significant_states(hass, hour2, None, entity_ids)
+    assert {
+        entity_id: [state.state for state in states]
+        for entity_id, states in hist.items()
+    } == {"sensor.changed": ["2", "3"], "sensor.new": ["x"], "sensor.unchanged": ["a"]}
+
+    # The result is the same without the checkpoints
+    with session_scope(hass=hass) as session:
+        session.query(StatesCheckpoints).delete()
+    with patch.object(instance.recent_states_manager, "get_many", return_value=None):
+        assert_dict_of_states_equal_without_context_and_last_changed(
+            history.get_significant_states(hass, hour2, None, entity_ids), hist
+        )
+
+
+@pytest.mark.parametrize(
+    ("kwargs"),
+    [
+        {},
+        {"significant_changes_only": False},
+        {"minimal_response": True},
+        {"no_attributes": True},
+        {"compressed_state_format": True},
+        {"include_start_time_state": False},
+    ],
+)
+async def test_get_significant_states_from_recent_states(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, kwargs: dict[str, bool]
+) -> None:
+    """Test the recent states give the same history as the database."""
+    now = dt_util.utcnow()
+    instance = recorder.get_instance(hass)
+    entity_ids = ["sensor.one", "climate.two", "sensor.three"]
+
+    freezer.move_to(now + timedelta(seconds=1))
+    hass.states.async_set("sensor.one", "1", {"unit": "W"})
+    hass.states.async_set("climate.two", "heat", {"temperature": 20})
+    hass.states.async_set("sensor.three", "a")
+    await async_wait_recording_done(hass)
+    for second, attributes in ((2, {"unit": "W", "extra": 1}), (3, {"unit": "W"})):
+        freezer.move_to(now + timedelta(seconds=second))
+        hass.states.async_set("sensor.one", "1", attributes)
+        hass.states.async_set("climate.two", "heat", {"temperature": 20 + second})
+        await async_wait_recording_done(hass)
+    freezer.move_to(now + timedelta(seconds=4))
+    hass.states.async_set("sensor.one", "2", {"unit": "W"})
+    hass.states.async_remove("sensor.three")
+    await async_wait_recording_done(hass)
+    freezer.move_to(now + timedelta(seconds=5))
+    hass.states.async_set("sensor.one", "3", {"unit": "W"})
+    await async_wait_recording_done(hass)
+
+    def _as_dicts(
+        hist: dict[str, list[State | dict[str, Any]]],
+    ) -> dict[str, list[dict[str, Any]]]:
+        return {
+            entity_id: [
+                state.as_dict() if isinstance(state, State) else state
+                for state in states
+            ]
+            for entity_id, states in hist.items()
+        }
+
+    for start_time, end_time, query_entity_ids in (
+        (now + timedelta(seconds=2), None, entity_ids),
+        (now + timedelta(seconds=1.5), now + timedelta(seconds=4), entity_ids),
+        (now + timedelta(seconds=3), None, ["sensor.one"]),
+    ):
+        hits = instance.recent_states_manager.hits
+        hist = history.get_significant_states(
+            hass, start_time, end_time, query_entity_ids, **kwargs
+        )
+        assert instance.recent_states_manager.hits == hits + 1
+        with patch.object(
+            instance.recent_states_manager, "get_many", return_value=None
+        ):
+            assert _as_dicts(hist) == _as_dicts(
+                history.get_significant_states(
+                    hass, start_time, end_time, query_entity_ids, **kwargs
+                )
+            )
+
+    # States from before the recorder saw the entities are not covered
+    misses = instance.recent_states_manager.misses
+    history.get_significant_states(hass, now, None, entity_ids, **kwargs)
+    assert instance.recent_states_manager.misses == misses + 1
+
+
 @pytest.mark.freeze_time("2039-01-19 03:14:07.555555-00:00")
 async def test_get_full_significant_states_past_year_2038(
     hass: HomeAssistant,
@@ -9,10 +9,11 @@ import sqlite3
 import sys
 import threading
 from typing import Any, cast
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import MagicMock, Mock, PropertyMock, patch
 
 from freezegun.api import FrozenDateTimeFactory
 import pytest
+from sqlalchemy import text
 from sqlalchemy.exc import DatabaseError, OperationalError, SQLAlchemyError
 from sqlalchemy.pool import QueuePool
 
@@ -28,22 +29,28 @@ from homeassistant.components.recorder import (
     CONFIG_SCHEMA,
     DOMAIN,
     Recorder,
+    compression,
     db_schema,
     get_instance,
+    history,
     migration,
     statistics,
 )
 from homeassistant.components.recorder.const import (
+    COMMIT_BACKLOG_THRESHOLD,
     EVENT_RECORDER_5MIN_STATISTICS_GENERATED,
     EVENT_RECORDER_HOURLY_STATISTICS_GENERATED,
     KEEPALIVE_TIME,
+    SHED_BACKLOG_THRESHOLD,
     SupportedDialect,
 )
 from homeassistant.components.recorder.db_schema import (
     SCHEMA_VERSION,
+    ContextOrigins,
     EventData,
     Events,
     EventTypes,
+    MigrationChanges,
     RecorderRuns,
     StateAttributes,
     States,
@@ -51,10 +58,14 @@ from homeassistant.components.recorder.db_schema import (
     StatisticsRuns,
 )
 from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.models.compression import COMPRESSED_KEY
 from homeassistant.components.recorder.queries import select_event_type_ids
 from homeassistant.components.recorder.services import (
     SERVICE_DISABLE,
     SERVICE_ENABLE,
+    SERVICE_EXPORT_STATES,
+    SERVICE_EXPORT_STATISTICS,
+    SERVICE_IMPORT_STATISTICS,
     SERVICE_PURGE,
     SERVICE_PURGE_ENTITIES,
 )
@@ -62,6 +73,7 @@ from homeassistant.components.recorder.table_managers import (
     state_attributes as state_attributes_table_manager,
     states_meta as states_meta_table_manager,
 )
+from homeassistant.components.recorder.tasks import CommitTask
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import (
     EVENT_COMPONENT_LOADED,
@@ -77,10 +89,12 @@ from homeassistant.helpers import (
     issue_registry as ir,
     recorder as recorder_helper,
 )
+from homeassistant.helpers.json import json_dumps
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as dt_util
 from homeassistant.util.json import json_loads
+from homeassistant.util.ulid import ulid_to_bytes
 
 from .common import (
     async_block_recorder,
@@ -136,6 +150,8 @@ def _default_recorder(hass: HomeAssistant) -> Recorder:
         db_retry_wait=3,
         entity_filter=CONFIG_SCHEMA({DOMAIN: {}}),
         exclude_event_types=set(),
+        shed_event_types=set(),
+        partition_by_day=False,
     )
 
 
@@ -394,19 +410,16 @@ async def test_saving_state_with_exception(
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
-            if isinstance(obj, States):
-                raise OperationalError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+    def _throw_if_state_pending(*args, **kwargs):
+        if get_instance(hass)._pending_states:
+            raise OperationalError("insert the state", "fake params", "forced to fail")
 
     with (
         patch("time.sleep"),
         patch.object(
             get_instance(hass).event_session,
             "flush",
-            side_effect=_throw_if_state_in_session,
+            side_effect=_throw_if_state_pending,
         ),
     ):
         hass.states.async_set(entity_id, "fail", attributes)
@@ -437,19 +450,16 @@ async def test_saving_state_with_sqlalchemy_exception(
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
-            if isinstance(obj, States):
-                raise SQLAlchemyError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+    def _throw_if_state_pending(*args, **kwargs):
+        if get_instance(hass)._pending_states:
+            raise SQLAlchemyError("insert the state", "fake params", "forced to fail")
 
     with (
         patch("time.sleep"),
         patch.object(
             get_instance(hass).event_session,
             "flush",
-            side_effect=_throw_if_state_in_session,
+            side_effect=_throw_if_state_pending,
         ),
     ):
         hass.states.async_set(entity_id, "fail", attributes)
@@ -580,6 +590,147 @@ async def test_saving_state_with_commit_interval_zero(
         assert db_states[0].event_id is None
 
 
+async def test_compress_shared_data(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test existing and new shared attributes and data are compressed."""
+    instance = await async_setup_recorder_instance(hass)
+    attributes = {
+        "friendly_name": "Living room temperature",
+        "device_class": "temperature",
+        "state_class": "measurement",
+        "unit_of_measurement": "°C",
+        "icon": "mdi:thermometer",
+        "sensor_location": "Living room, next to the window",
+    }
+    event_data = {
+        "entity_id": "light.living_room",
+        "service_data": {"brightness": 255, "transition": 10},
+        "description": "Turn on the living room lights in the evening",
+    }
+    hass.states.async_set("sensor.temperature", "20", attributes)
+    hass.bus.async_fire("test_event", event_data)
+    await async_wait_recording_done(hass)
+
+    instance.compress_shared_data = True
+    hass.states.async_set("sensor.temperature", "21", attributes | {"icon": "mdi:sun"})
+    await async_wait_recording_done(hass)
+    migrator = migration.SharedDataCompressionMigration(SCHEMA_VERSION, {})
+    with patch.object(compression, "COMPRESS_BATCH_SIZE", 1):
+        while not await instance.async_add_executor_job(
+            migrator.migrate_data, instance
+        ):
+            pass
+
+    # The migration is recorded as done and is not run after a restart
+    def _get_migration_changes() -> dict[str, int]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return {
+                change.migration_id: change.version
+                for change in session.query(MigrationChanges)
+            }
+
+    migration_changes = await instance.async_add_executor_job(_get_migration_changes)
+    assert migration_changes[migrator.migration_id] == migrator.migration_version
+    migrator = migration.SharedDataCompressionMigration(
+        SCHEMA_VERSION, migration_changes
+    )
+    with session_scope(hass=hass, read_only=True) as session:
+        assert not migrator.needs_migrate(instance, session)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        db_state_attributes = list(session.query(StateAttributes))
+        db_event_data = [
+            db_data
+            for db_data in session.query(EventData)
+            if "light.living_room" in db_data.shared_data
+        ]
+        assert len(db_state_attributes) == 2
+        assert len(db_event_data) == 1
+        for db_attributes in db_state_attributes:
+            shared_attrs = json_loads(db_attributes.shared_attrs)
+            # The keys matched with SQL stay readable
+            assert shared_attrs.keys() == {
+                "unit_of_measurement",
+                "icon",
+                COMPRESSED_KEY,
+            }
+            assert len(db_attributes.shared_attrs) < len(json_dumps(attributes))
+            assert db_attributes.to_native() == attributes | {
+                "icon": shared_attrs["icon"]
+            }
+        assert json_loads(db_event_data[0].shared_data).keys() == {
+            "entity_id",
+            COMPRESSED_KEY,
+        }
+        assert db_event_data[0].to_native() == event_data
+
+    hist = history.get_significant_states(
+        hass, dt_util.utcnow() - timedelta(hours=1), None, ["sensor.temperature"]
+    )
+    assert [dict(state.attributes) for state in hist["sensor.temperature"]] == [
+        attributes,
+        attributes | {"icon": "mdi:sun"},
+    ]
+
+
+async def test_compress_shared_data_with_writes(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test the shared attributes cache is kept right while they are compressed."""
+    instance = await async_setup_recorder_instance(hass)
+    attributes = {
+        "friendly_name": "Living room temperature",
+        "device_class": "temperature",
+        "unit_of_measurement": "°C",
+        "sensor_location": "Living room, next to the window",
+    }
+    hass.states.async_set("sensor.temperature", "20", attributes)
+    hass.states.async_set("sensor.humidity", "50", attributes | {"icon": "mdi:water"})
+    await async_wait_recording_done(hass)
+    shared_attrs = json_dumps(attributes)
+    attributes_id = instance.state_attributes_manager.get_from_cache(shared_attrs)
+    assert attributes_id is not None
+
+    def _get_migration_changes() -> dict[str, int]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return {
+                change.migration_id: change.version
+                for change in session.query(MigrationChanges)
+            }
+
+    instance.compress_shared_data = True
+    migrator = migration.SharedDataCompressionMigration(SCHEMA_VERSION, {})
+    with patch.object(compression, "COMPRESS_BATCH_SIZE", 1):
+        instance.queue_task(migration.MigrationTask(migrator))
+        for state in range(21, 24):
+            # The migration requeues itself between the writes
+            hass.states.async_set("sensor.temperature", str(state), attributes)
+            await async_wait_recording_done(hass)
+        while migrator.migration_id not in await instance.async_add_executor_job(
+            _get_migration_changes
+        ):
+            await async_wait_recording_done(hass)
+
+    # The rewritten row is no longer cached with its old shared_attrs
+    assert instance.state_attributes_manager.get_from_cache(shared_attrs) is None
+    hist = history.get_significant_states(
+        hass,
+        dt_util.utcnow() - timedelta(hours=1),
+        None,
+        ["sensor.temperature", "sensor.humidity"],
+        significant_changes_only=False,
+    )
+    assert [
+        (state.state, dict(state.attributes)) for state in hist["sensor.temperature"]
+    ] == [(str(state), attributes) for state in range(20, 24)]
+    assert [dict(state.attributes) for state in hist["sensor.humidity"]] == [
+        attributes | {"icon": "mdi:water"}
+    ]
+
+
 async def _add_entities(hass: HomeAssistant, entity_ids: list[str]) -> list[State]:
     """Add entities."""
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
@@ -716,6 +867,128 @@ async def test_saving_event_exclude_event_type(
     assert events[0].event_type == "test2"
 
 
+async def test_shedding_event_types_while_backlogged(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test shed event types are not recorded while the backlog is too deep."""
+    # Use a long interval so the timer does not add commit ticks of its own
+    instance = await async_setup_recorder_instance(
+        hass,
+        {
+            CONF_COMMIT_INTERVAL: 30,
+            "exclude": {"event_types": ["excluded"]},
+            "shed_event_types": ["excluded", "shed", "state_changed"],
+        },
+    )
+    assert instance.shed_event_types == {"excluded", "shed"}
+    assert "State change events cannot be shed" in caplog.text
+
+    def _get_event_types() -> list[str]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return [
+                event_type
+                for (event_type,) in session.query(EventTypes.event_type)
+                .select_from(Events)
+                .join(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+                .where(EventTypes.event_type.in_(["excluded", "shed", "kept"]))
+            ]
+
+    with patch.object(
+        Recorder,
+        "backlog",
+        new_callable=PropertyMock,
+        return_value=SHED_BACKLOG_THRESHOLD,
+    ):
+        # Shedding only starts once the commit interval is fully stretched
+        for shedding in (False, False, True):
+            instance.queue_task(CommitTask())
+            await async_recorder_block_till_done(hass)
+            await hass.async_block_till_done()
+            assert instance.shedding is shedding
+    assert instance.recording is True
+    assert "events of type excluded, shed will not be recorded" in caplog.text
+
+    for event_type in ("excluded", "shed", "kept"):
+        hass.bus.async_fire(event_type)
+    await async_wait_recording_done(hass)
+    assert await instance.async_add_executor_job(_get_event_types) == ["kept"]
+
+    # Shedding stops once the commit interval is back to normal
+    assert instance.commit_interval_multiplier > 1
+    while instance.commit_interval_multiplier > 1:
+        assert instance.shedding is True
+        instance.queue_task(CommitTask())
+        await async_recorder_block_till_done(hass)
+        await hass.async_block_till_done()
+    assert instance.shedding is False
+
+    for event_type in ("excluded", "shed", "kept"):
+        hass.bus.async_fire(event_type)
+    await async_wait_recording_done(hass)
+    assert sorted(await instance.async_add_executor_job(_get_event_types)) == [
+        "kept",
+        "kept",
+        "shed",
+    ]
+
+
+async def test_commit_interval_stretches_while_backlogged(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test the commit interval grows with the backlog and shrinks when idle."""
+    # Use a long interval so the timer does not add commit ticks of its own
+    instance = await async_setup_recorder_instance(hass, {CONF_COMMIT_INTERVAL: 30})
+    await async_wait_recording_done(hass)
+
+    hass.states.async_set("test.one", "on")
+    await async_recorder_block_till_done(hass)
+    assert len(instance._pending_states) == 1
+
+    with patch.object(
+        Recorder,
+        "backlog",
+        new_callable=PropertyMock,
+        return_value=COMMIT_BACKLOG_THRESHOLD,
+    ):
+        for multiplier in (2, 4, 8, 8, 8, 8, 8):
+            instance.queue_task(CommitTask())
+            await async_recorder_block_till_done(hass)
+            assert instance.commit_interval_multiplier == multiplier
+            assert len(instance._pending_states) == 1
+
+        instance.queue_task(CommitTask())
+        await async_recorder_block_till_done(hass)
+        assert not instance._pending_states
+        assert instance.commit_batch_size == 1
+
+    hass.states.async_set("test.one", "off")
+    await async_recorder_block_till_done(hass)
+    for multiplier, pending_states in ((4, 1), (2, 0)):
+        instance.queue_task(CommitTask())
+        await async_recorder_block_till_done(hass)
+        assert instance.commit_interval_multiplier == multiplier
+        assert len(instance._pending_states) == pending_states
+
+    hass.states.async_set("test.one", "on")
+    await async_recorder_block_till_done(hass)
+    with (
+        patch.object(
+            Recorder,
+            "backlog",
+            new_callable=PropertyMock,
+            return_value=COMMIT_BACKLOG_THRESHOLD,
+        ),
+        patch.object(recorder.core, "MAX_COMMIT_BATCH_SIZE", 1),
+    ):
+        instance.queue_task(CommitTask())
+        await async_recorder_block_till_done(hass)
+    assert instance.commit_interval_multiplier == 4
+    assert not instance._pending_states
+
+
 async def test_saving_state_exclude_domains(
     hass: HomeAssistant,
     async_setup_recorder_instance: RecorderInstanceGenerator,
@@ -1468,6 +1741,69 @@ async def test_saving_sets_old_state(hass: HomeAssistant, setup_recorder: None)
         assert states_by_state["s4"].old_state_id == states_by_state["s2"].state_id
 
 
+@pytest.mark.parametrize("bulk_insert_states", [True, False])
+async def test_saving_links_old_states_in_same_commit(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    bulk_insert_states: bool,
+) -> None:
+    """Test states linking to states pending in the same commit are linked."""
+    instance = await async_setup_recorder_instance(hass)
+    instance._bulk_insert_states = bulk_insert_states
+
+    hass.states.async_set("test.one", "s1", {"attr": 1})
+    hass.states.async_set("test.two", "s2", {"attr": 1})
+    hass.states.async_set("test.one", "s3", {"attr": 2})
+    hass.states.async_set("test.one", "s4", {"attr": 1})
+    hass.bus.async_fire("test_event", {"data": 1})
+    hass.bus.async_fire("test_event")
+    await async_wait_recording_done(hass)
+    assert not instance._pending_states
+    assert not instance._pending_events
+
+    hass.states.async_set("test.one", "s5", {"attr": 1})
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = list(
+            session.query(
+                StatesMeta.entity_id,
+                States.state_id,
+                States.old_state_id,
+                States.state,
+                StateAttributes.shared_attrs,
+            )
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .outerjoin(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
+        )
+        assert len(states) == 5
+        states_by_state = {state.state: state for state in states}
+
+        assert states_by_state["s1"].old_state_id is None
+        assert states_by_state["s2"].old_state_id is None
+        assert states_by_state["s3"].old_state_id == states_by_state["s1"].state_id
+        assert states_by_state["s4"].old_state_id == states_by_state["s3"].state_id
+        assert states_by_state["s5"].old_state_id == states_by_state["s4"].state_id
+        assert states_by_state["s4"].entity_id == "test.one"
+        assert states_by_state["s2"].entity_id == "test.two"
+        assert states_by_state["s3"].shared_attrs == '{"attr":2}'
+        assert states_by_state["s4"].shared_attrs == '{"attr":1}'
+
+        events = list(
+            session.query(EventTypes.event_type, EventData.shared_data)
+            .select_from(Events)
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .outerjoin(EventData, Events.data_id == EventData.data_id)
+            .filter(EventTypes.event_type == "test_event")
+        )
+        assert sorted(event.shared_data or "" for event in events) == [
+            "",
+            '{"data":1}',
+        ]
+
+
 async def test_saving_state_with_serializable_data(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture, setup_recorder: None
 ) -> None:
@@ -1500,6 +1836,9 @@ async def test_has_services(hass: HomeAssistant, setup_recorder: None) -> None:
     assert hass.services.has_service(DOMAIN, SERVICE_ENABLE)
     assert hass.services.has_service(DOMAIN, SERVICE_PURGE)
     assert hass.services.has_service(DOMAIN, SERVICE_PURGE_ENTITIES)
+    assert hass.services.has_service(DOMAIN, SERVICE_EXPORT_STATES)
+    assert hass.services.has_service(DOMAIN, SERVICE_EXPORT_STATISTICS)
+    assert hass.services.has_service(DOMAIN, SERVICE_IMPORT_STATISTICS)
 
 
 async def test_service_disable_events_not_recording(
@@ -2746,3 +3085,157 @@ async def test_empty_entity_id(
     hass.bus.async_fire("hello", {"entity_id": ""})
     await async_wait_recording_done(hass)
     assert "Invalid entity ID" not in caplog.text
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_read_only_sessions_use_query_only_connections(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test read only sessions cannot write to a SQLite file database.
+
+    This test is specific for SQLite.
+    """
+    hass.states.async_set("test.read_only", "on", {})
+    await async_wait_recording_done(hass)
+    instance = get_instance(hass)
+    assert instance._read_only_engine is not None
+
+    def _query_only_from_executor() -> tuple[int, int, tuple[int, int, int]]:
+        with session_scope(hass=hass, read_only=True) as session:
+            query_only = session.execute(text("PRAGMA query_only")).scalar()
+            with pytest.raises(OperationalError):
+                session.execute(text("DELETE FROM states"))
+            count = session.execute(text("SELECT COUNT(*) FROM states")).scalar()
+            # The standard connection settings are applied as well
+            settings = tuple(
+                session.execute(text(f"PRAGMA {pragma}")).scalar()
+                for pragma in ("cache_size", "synchronous", "foreign_keys")
+            )
+        return query_only, count, settings
+
+    query_only, count, settings = await instance.async_add_executor_job(
+        _query_only_from_executor
+    )
+    assert query_only == 1
+    assert count == 1
+    # synchronous is FULL (2) without a commit interval and NORMAL (1) with one
+    assert settings == (-16384, 1 if instance.commit_interval else 2, 1)
+
+    query_only_future: asyncio.Future[int] = hass.loop.create_future()
+
+    class QueryOnlyTask(recorder.tasks.RecorderTask):
+        """Task to check the session used in the recorder thread."""
+
+        commit_before = False
+
+        def run(self, instance: Recorder) -> None:
+            with session_scope(hass=hass, read_only=True) as session:
+                query_only = session.execute(text("PRAGMA query_only")).scalar()
+            hass.loop.call_soon_threadsafe(query_only_future.set_result, query_only)
+
+    instance.queue_task(QueryOnlyTask())
+    assert await query_only_future == 0
+
+
+@pytest.mark.parametrize("bulk_insert_states", [True, False])
+async def test_context_origins(
+    hass: HomeAssistant, recorder_mock: Recorder, bulk_insert_states: bool
+) -> None:
+    """Test the first event or state of each context is recorded as its origin."""
+    instance = recorder_mock
+    assert instance.context_origins_ready
+    # Without bulk inserts the event_ids are looked up by their context
+    instance._bulk_insert_states &= bulk_insert_states
+    await async_wait_recording_done(hass)
+
+    def _get_origins() -> dict[str, tuple[str | None, str | None]]:
+        """Return the earliest origin of each context."""
+        origins: dict[str, tuple[str | None, str | None]] = {}
+        with session_scope(hass=hass, read_only=True) as session:
+            for context_id_bin, event_type, entity_id in (
+                session.query(
+                    ContextOrigins.context_id_bin,
+                    EventTypes.event_type,
+                    StatesMeta.entity_id,
+                )
+                .outerjoin(Events, ContextOrigins.event_id == Events.event_id)
+                .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+                .outerjoin(States, ContextOrigins.state_id == States.state_id)
+                .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                .filter(
+                    EventTypes.event_type.in_(("automation_triggered", "test_event"))
+                    | StatesMeta.entity_id.like("light.%")
+                )
+                .order_by(ContextOrigins.time_fired_ts)
+            ):
+                origins.setdefault(context_id_bin.hex(), (event_type, entity_id))
+        return origins
+
+    automation_context = Context()
+    state_context = Context()
+    hass.bus.async_fire("automation_triggered", {}, context=automation_context)
+    hass.states.async_set("light.kitchen", "on", context=automation_context)
+    hass.states.async_set("light.hallway", "on", context=state_context)
+    await async_wait_recording_done(hass)
+    hass.bus.async_fire("test_event", {}, context=state_context)
+    hass.states.async_set("light.kitchen", "off", context=automation_context)
+    await async_wait_recording_done(hass)
+
+    origins = {
+        ulid_to_bytes(automation_context.id).hex(): ("automation_triggered", None),
+        ulid_to_bytes(state_context.id).hex(): (None, "light.hallway"),
+    }
+    assert await instance.async_add_executor_job(_get_origins) == origins
+
+    # The origins of rows recorded before the table existed are migrated
+    def _delete_origins() -> None:
+        with session_scope(hass=hass) as session:
+            session.query(ContextOrigins).delete()
+
+    await instance.async_add_executor_job(_delete_origins)
+    migrator = migration.ContextOriginsMigration(SCHEMA_VERSION, {})
+    with patch.object(migration, "CONTEXT_ORIGINS_BATCH_SIZE", 1):
+        while not await instance.async_add_executor_job(
+            migrator.migrate_data, instance
+        ):
+            pass
+    assert await instance.async_add_executor_job(_get_origins) == origins
+
+
+@pytest.mark.parametrize("bulk_insert_states", [True, False])
+async def test_context_origins_recorded_again(
+    hass: HomeAssistant, recorder_mock: Recorder, bulk_insert_states: bool
+) -> None:
+    """Test a context recorded again after a restart gets the first new event as origin."""
+    instance = recorder_mock
+    # Without bulk inserts the event_ids are looked up by their context
+    instance._bulk_insert_states &= bulk_insert_states
+    await async_wait_recording_done(hass)
+
+    def _get_origin_event_types() -> list[str]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return [
+                event_type
+                for (event_type,) in session.query(EventTypes.event_type)
+                .select_from(ContextOrigins)
+                .join(Events, ContextOrigins.event_id == Events.event_id)
+                .join(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+                .filter(ContextOrigins.context_id_bin == ulid_to_bytes(context.id))
+                .order_by(ContextOrigins.origin_id)
+            ]
+
+    context = Context()
+    hass.bus.async_fire("automation_triggered", {}, context=context)
+    await async_wait_recording_done(hass)
+    # The recorder forgets the origins it has seen when it restarts
+    await instance.async_add_executor_job(instance.context_origins_manager.reset)
+    hass.bus.async_fire("test_event", {}, context=context)
+    hass.bus.async_fire("other_event", {}, context=context)
+    await async_wait_recording_done(hass)
+
+    assert await instance.async_add_executor_job(_get_origin_event_types) == [
+        "automation_triggered",
+        "test_event",
+    ]
@@ -488,7 +488,7 @@ async def test_events_during_migration_queue_exhausted(
     async_setup_recorder_instance: RecorderInstanceGenerator,
     instrument_migration: InstrumentedMigration,
 ) -> None:
-    """Test that events during migration takes so long the queue is exhausted."""
+    """Test events are spilled to disk when migration takes so long the queue is exhausted."""
 
     assert recorder.util.async_migration_in_progress(hass) is False
 
@@ -524,13 +524,13 @@ async def test_events_during_migration_queue_exhausted(
     db_states = await recorder.get_instance(hass).async_add_executor_job(
         _get_native_states, hass, "my.entity"
     )
-    assert len(db_states) == 1
+    assert len(db_states) == 2
     hass.states.async_set("my.entity", "on", {})
     await async_wait_recording_done(hass)
     db_states = await recorder.get_instance(hass).async_add_executor_job(
         _get_native_states, hass, "my.entity"
     )
-    assert len(db_states) == 2
+    assert len(db_states) == 3
 
 
 @pytest.mark.parametrize(
@@ -1470,3 +1470,52 @@ def test_update_states_table_with_foreign_key_options_unsupported_engine(
         match="_update_states_table_with_foreign_key_options not supported for sqlite",
     ):
         migration._update_states_table_with_foreign_key_options(session_maker, engine)
+
+
+@pytest.mark.parametrize(
+    ("dialect", "expected_tasks"),
+    [
+        (
+            recorder.const.SupportedDialect.SQLITE,
+            [migration.MigrationTask, migration.MigrationTask],
+        ),
+        (
+            recorder.const.SupportedDialect.POSTGRESQL,
+            [migration.ConcurrentMigrationTask],
+        ),
+    ],
+)
+def test_queue_run_time_migrations(
+    dialect: recorder.const.SupportedDialect, expected_tasks: list[type]
+) -> None:
+    """Test the context id migrations run concurrently if the database allows."""
+    instance = Mock(dialect_name=dialect)
+    migrators = [
+        migration.StatesContextIDMigration(0, {}),
+        migration.EventsContextIDMigration(0, {}),
+    ]
+    migration.queue_run_time_migrations(instance, Mock(), migrators)
+    tasks = [task for (task,), _ in instance.queue_task.call_args_list]
+    assert [type(task) for task in tasks] == expected_tasks
+
+    if dialect == recorder.const.SupportedDialect.POSTGRESQL:
+        assert tasks[0].migrators == migrators
+        instance.queue_task.reset_mock()
+        with (
+            patch.object(migrators[0], "migrate_data", return_value=True),
+            patch.object(migrators[1], "migrate_data", return_value=False),
+        ):
+            tasks[0].run(instance)
+        (task,), _ = instance.queue_task.call_args
+        assert task.migrators == [migrators[1]]
+
+
+def test_migration_progress() -> None:
+    """Test the progress of a migration."""
+    progress = migration.MigrationProgress(min_id=101, max_id=300)
+    assert progress.as_dict() == {"rows_done": 0, "rows_total": 200, "eta": None}
+    progress.update(150)
+    assert progress.as_dict() == {"rows_done": 50, "rows_total": 200, "eta": None}
+    progress.started -= 10
+    progress.update(200)
+    assert progress.as_dict() == {"rows_done": 100, "rows_total": 200, "eta": 20}
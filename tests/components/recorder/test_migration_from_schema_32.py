@@ -927,6 +927,60 @@ async def test_migrate_entity_ids(hass: HomeAssistant, recorder_mock: Recorder)
     )
 
 
+@pytest.mark.parametrize("enable_migrate_entity_ids", [True])
+@pytest.mark.usefixtures("db_schema_32")
+async def test_migrate_entity_ids_in_batches(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test entity_ids are migrated in batches after a cursor with progress."""
+    await async_wait_recording_done(hass)
+    importlib.import_module(SCHEMA_MODULE)
+    old_db_schema = sys.modules[SCHEMA_MODULE]
+
+    def _insert_states():
+        with session_scope(hass=hass) as session:
+            session.add_all(
+                old_db_schema.States(
+                    entity_id=f"sensor.{idx}",
+                    state=str(idx),
+                    last_updated_ts=1.452529 + idx,
+                )
+                for idx in range(5)
+            )
+
+    await recorder_mock.async_add_executor_job(_insert_states)
+    await _async_wait_migration_done(hass)
+
+    migrator = migration.EntityIDMigration(old_db_schema.SCHEMA_VERSION, {})
+    progress: list[dict[str, Any]] = []
+
+    def _migrate_in_batches():
+        while not migrator.migrate_data(recorder_mock):
+            progress.append(
+                recorder_mock.migration_progress[migrator.migration_id].as_dict()
+            )
+
+    with patch.object(recorder_mock, "max_bind_vars", 2):
+        await recorder_mock.async_add_executor_job(_migrate_in_batches)
+
+    assert [(item["rows_done"], item["rows_total"]) for item in progress] == [
+        (2, 5),
+        (4, 5),
+        (5, 5),
+        # The cursor starts over to check for rows left behind
+        (5, 5),
+    ]
+    assert progress[0]["eta"] is None
+    assert progress[-1]["eta"] == 0
+    assert migrator.migration_id not in recorder_mock.migration_progress
+
+    def _fetch_unmigrated_states():
+        with session_scope(hass=hass, read_only=True) as session:
+            return session.query(States).filter(States.metadata_id.is_(None)).count()
+
+    assert await recorder_mock.async_add_executor_job(_fetch_unmigrated_states) == 0
+
+
 @pytest.mark.parametrize("enable_migrate_entity_ids", [True])
 @pytest.mark.usefixtures("db_schema_32")
 async def test_post_migrate_entity_ids(
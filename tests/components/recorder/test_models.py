@@ -13,13 +13,18 @@ from homeassistant.components.recorder.db_schema import (
     States,
 )
 from homeassistant.components.recorder.models import (
+    SHARED_ATTRS_PLAIN_KEYS,
     LazyState,
+    compress_json_object,
+    decompress_json_object,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
+from homeassistant.components.recorder.models.compression import COMPRESSED_KEY
 from homeassistant.const import EVENT_STATE_CHANGED
 import homeassistant.core as ha
 from homeassistant.exceptions import InvalidEntityFormatError
+from homeassistant.helpers.json import json_bytes
 from homeassistant.util import dt as dt_util
 from homeassistant.util.json import json_loads
 
@@ -315,6 +320,48 @@ async def test_lazy_state_can_decode_attributes(
     }
 
 
+def test_compress_json_object() -> None:
+    """Test compressing JSON objects and decoding them."""
+    attributes = {
+        "friendly_name": "Kitchen power",
+        "device_class": "power",
+        "state_class": "measurement",
+        "unit_of_measurement": "W",
+        "supported_features": 0,
+    }
+    attributes_bytes = json_bytes(attributes)
+    compressed = compress_json_object(
+        attributes_bytes, SHARED_ATTRS_PLAIN_KEYS, json_bytes
+    )
+    assert len(compressed) < len(attributes_bytes)
+    data = json_loads(compressed)
+    assert data.keys() == {"unit_of_measurement", COMPRESSED_KEY}
+    assert decompress_json_object(data) == attributes
+
+    row = PropertyMock(attributes=compressed.decode())
+    assert LazyState(row, {}, None, "sensor.power", "", 1, False).attributes == (
+        attributes
+    )
+
+    # Objects that would not get smaller are kept as they are
+    small = json_bytes({"friendly_name": "Kitchen"})
+    assert compress_json_object(small, SHARED_ATTRS_PLAIN_KEYS, json_bytes) is small
+    plain = json_bytes({"unit_of_measurement": "W", "icon": "mdi:flash" * 20})
+    assert compress_json_object(plain, SHARED_ATTRS_PLAIN_KEYS, json_bytes) is plain
+    assert decompress_json_object(json_loads(plain)) == json_loads(plain)
+
+    # An object with a key named like the marker is always compressed
+    # and a row written before that keeps the key as it is
+    marker = {COMPRESSED_KEY: "aW52YWxpZA=="}
+    compressed = compress_json_object(
+        json_bytes(marker), SHARED_ATTRS_PLAIN_KEYS, json_bytes
+    )
+    assert json_loads(compressed) != marker
+    assert decompress_json_object(json_loads(compressed)) == marker
+    assert decompress_json_object(dict(marker)) == marker
+    assert decompress_json_object({COMPRESSED_KEY: 1}) == {COMPRESSED_KEY: 1}
+
+
 async def test_lazy_state_handles_different_last_updated_and_last_changed(
     caplog: pytest.LogCaptureFixture,
 ) -> None:
@@ -338,6 +385,7 @@ async def test_lazy_state_handles_different_last_updated_and_last_changed(
         "state": "off",
     }
     assert lstate.last_updated.timestamp() == row.last_updated_ts
+    assert lstate.last_updated_timestamp == row.last_updated_ts
     assert lstate.last_changed.timestamp() == row.last_changed_ts
     assert lstate.as_dict() == {
         "attributes": {"shared": True},
@@ -0,0 +1,173 @@
+"""Test the time partitioned layout."""
+
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from sqlalchemy import text
+
+from homeassistant.components.recorder import CONF_PARTITION_BY_DAY
+from homeassistant.components.recorder.db_schema import States
+from homeassistant.components.recorder.partition import (
+    PARTITION_DAYS_AHEAD,
+    expired_partitions,
+    find_expired_partitions,
+    partition_day,
+    partition_name,
+)
+from homeassistant.components.recorder.purge import _drop_expired_partitions
+from homeassistant.components.recorder.tasks import PurgeTask
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .common import (
+    async_recorder_block_till_done,
+    async_wait_purge_done,
+    async_wait_recording_done,
+)
+
+from tests.typing import RecorderInstanceGenerator
+
+
+def test_partition_name_round_trip() -> None:
+    """Test the day of a partition can be found from its name."""
+    name = partition_name("states", date(2024, 2, 29))
+    assert name == "states_p20240229"
+    assert partition_day(name) == date(2024, 2, 29)
+    assert partition_day("states_default") is None
+    assert partition_day("states_p2024") is None
+
+
+def test_expired_partitions() -> None:
+    """Test only the day partitions ending before the purge time are expired."""
+    names = [
+        "states_p20240112",
+        "states_default",
+        "states_p20240110",
+        "states_p20240111",
+    ]
+    assert expired_partitions(names, datetime(2024, 1, 12, tzinfo=dt_util.UTC)) == [
+        "states_p20240110",
+        "states_p20240111",
+    ]
+    assert expired_partitions(
+        names, datetime(2024, 1, 11, 23, 59, tzinfo=dt_util.UTC)
+    ) == ["states_p20240110"]
+    assert expired_partitions(names, datetime(2024, 1, 10, tzinfo=dt_util.UTC)) == []
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_drop_partition_disconnects_old_states(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test dropping a states partition disconnects the states after it.
+
+    This test is specific for SQLite, a plain table stands in for the
+    day partition.
+    """
+    instance = await async_setup_recorder_instance(hass)
+    hass.states.async_set("sensor.test", "old")
+    await async_wait_recording_done(hass)
+    hass.states.async_set("sensor.test", "new")
+    await async_wait_recording_done(hass)
+
+    def _drop_partition() -> None:
+        with session_scope(hass=hass) as session:
+            old_state_id = (
+                session.query(States.state_id).filter(States.state == "old").scalar()
+            )
+            session.execute(
+                text(
+                    "CREATE TABLE states_p20240110 AS SELECT * FROM states"
+                    " WHERE state_id = :state_id"
+                ),
+                {"state_id": old_state_id},
+            )
+            with patch(
+                "homeassistant.components.recorder.purge.find_expired_partitions",
+                side_effect=(["states_p20240110"], []),
+            ):
+                assert _drop_expired_partitions(
+                    instance, session, datetime(2024, 1, 11, tzinfo=dt_util.UTC)
+                )
+
+    await instance.async_add_executor_job(_drop_partition)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        new_state = session.query(States).filter(States.state == "new").one()
+        assert new_state.old_state_id is None
+        assert not session.execute(
+            text("SELECT name FROM sqlite_master WHERE name = 'states_p20240110'")
+        ).all()
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_partition_by_day_needs_postgresql(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the partitioned layout is not created for SQLite.
+
+    This test is specific for SQLite.
+    """
+    instance = await async_setup_recorder_instance(hass, {CONF_PARTITION_BY_DAY: True})
+    assert not instance.partitioned_layout
+    assert (
+        "The partitioned layout can only be created for a new PostgreSQL database"
+        in caplog.text
+    )
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "sqlite"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_purge_drops_expired_partitions(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test purging drops the day partitions older than the purge time.
+
+    This test is specific for PostgreSQL.
+    """
+    start = datetime(2024, 1, 10, 12, tzinfo=dt_util.UTC)
+    freezer.move_to(start)
+    instance = await async_setup_recorder_instance(hass, {CONF_PARTITION_BY_DAY: True})
+    assert instance.partitioned_layout
+
+    hass.states.async_set("sensor.old", "on", {"old": True})
+    await async_wait_recording_done(hass)
+    freezer.move_to(start + timedelta(days=3))
+    hass.states.async_set("sensor.new", "on", {"new": True})
+    await async_wait_recording_done(hass)
+
+    purge_before = start + timedelta(days=2)
+    with session_scope(hass=hass, read_only=True) as session:
+        assert find_expired_partitions(session, "states", purge_before) == [
+            "states_p20240110",
+            "states_p20240111",
+        ]
+        assert (
+            session.execute(text("SELECT COUNT(*) FROM states_p20240110")).scalar() == 1
+        )
+
+    instance.queue_task(PurgeTask(purge_before, repack=False, apply_filter=False))
+    await async_recorder_block_till_done(hass)
+    await async_wait_purge_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        assert find_expired_partitions(session, "states", purge_before) == []
+        assert find_expired_partitions(session, "events", purge_before) == []
+        assert session.query(States).count() == 1
+        # Partitions up to PARTITION_DAYS_AHEAD after the start remain
+        assert find_expired_partitions(
+            session, "states", start + timedelta(days=PARTITION_DAYS_AHEAD + 1)
+        ) == [
+            partition_name("states", (start + timedelta(days=days)).date())
+            for days in range(2, PARTITION_DAYS_AHEAD + 1)
+        ]
@@ -4,7 +4,7 @@ from collections.abc import Generator
 from datetime import datetime, timedelta
 import json
 import sqlite3
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from freezegun import freeze_time
 import pytest
@@ -15,17 +15,25 @@ from voluptuous.error import MultipleInvalid
 from homeassistant.components.recorder import DOMAIN as RECORDER_DOMAIN, Recorder
 from homeassistant.components.recorder.const import SupportedDialect
 from homeassistant.components.recorder.db_schema import (
+    ContextOrigins,
     Events,
     EventTypes,
     RecorderRuns,
     StateAttributes,
     States,
+    StatesCheckpoints,
     StatesMeta,
     StatisticsRuns,
     StatisticsShortTerm,
 )
 from homeassistant.components.recorder.history import get_significant_states
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.purge import (
+    DEFAULT_EVENTS_BATCHES_PER_PURGE,
+    DEFAULT_STATES_BATCHES_PER_PURGE,
+    MAX_BATCHES_PER_PURGE_MULTIPLIER,
+    adapt_batches_per_purge,
+    purge_old_data,
+)
 from homeassistant.components.recorder.queries import select_event_type_ids
 from homeassistant.components.recorder.services import (
     SERVICE_PURGE,
@@ -342,6 +350,74 @@ async def test_purge_old_events(hass: HomeAssistant, recorder_mock: Recorder) ->
         assert events.count() == 2
 
 
+async def test_purge_old_states_checkpoints(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test deleting states checkpoints of purged states and entity_ids."""
+    now = dt_util.utcnow()
+    hass.states.async_set("sensor.keep", "on")
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        keep_metadata_id = session.query(StatesMeta.metadata_id).one()[0]
+        purged = StatesMeta(entity_id="sensor.purged")
+        session.add(purged)
+        session.flush()
+        for metadata_id, checkpoint, last_updated in (
+            (keep_metadata_id, now - timedelta(days=5), now - timedelta(days=6)),
+            (keep_metadata_id, now - timedelta(hours=1), now - timedelta(hours=2)),
+            (purged.metadata_id, now - timedelta(hours=1), now - timedelta(hours=2)),
+        ):
+            session.add(
+                StatesCheckpoints(
+                    checkpoint_ts=checkpoint.timestamp(),
+                    metadata_id=metadata_id,
+                    last_updated_ts=last_updated.timestamp(),
+                )
+            )
+
+    purge_before = now - timedelta(days=4)
+    finished = purge_old_data(recorder_mock, purge_before, repack=False)
+    assert finished
+
+    with session_scope(hass=hass) as session:
+        checkpoints = session.query(StatesCheckpoints).all()
+        assert len(checkpoints) == 1
+        assert checkpoints[0].metadata_id == keep_metadata_id
+        assert checkpoints[0].checkpoint_ts == (now - timedelta(hours=1)).timestamp()
+
+
+async def test_purge_old_context_origins(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test deleting the context origins of purged events and states."""
+    now = dt_util.utcnow()
+
+    with session_scope(hass=hass) as session:
+        for context_id_bin, time_fired in (
+            (b"purged", now - timedelta(days=6)),
+            (b"keep", now - timedelta(hours=1)),
+        ):
+            session.add(
+                ContextOrigins(
+                    context_id_bin=context_id_bin,
+                    time_fired_ts=time_fired.timestamp(),
+                )
+            )
+
+    purge_before = now - timedelta(days=4)
+    finished = purge_old_data(recorder_mock, purge_before, repack=False)
+    assert finished
+
+    with session_scope(hass=hass) as session:
+        assert {
+            origin.context_id_bin
+            for origin in session.query(ContextOrigins).filter(
+                ContextOrigins.context_id_bin.in_((b"purged", b"keep"))
+            )
+        } == {b"keep"}
+
+
 async def test_purge_old_recorder_runs(
     hass: HomeAssistant, recorder_mock: Recorder
 ) -> None:
@@ -2065,3 +2141,54 @@ async def test_purge_entities_keep_days(
     )
     assert len(states["sensor.keep"]) == 2
     assert "sensor.purge" not in states
+
+
+@pytest.mark.parametrize(
+    ("batches", "elapsed", "expected"),
+    [
+        (10, 1.0, 10),
+        (10, 0.5, 20),
+        (10, 0.01, 20),
+        (10, 0, 20),
+        (10, 4.0, 5),
+        (10, 1.25, 8),
+        (1, 60.0, 1),
+        (40, 0.1, 15 * MAX_BATCHES_PER_PURGE_MULTIPLIER),
+    ],
+)
+def test_adapt_batches_per_purge(batches: int, elapsed: float, expected: int) -> None:
+    """Test the batches per purge are scaled to the target time."""
+    assert adapt_batches_per_purge(batches, 15, elapsed) == expected
+
+
+def test_purge_task_adapts_batches_to_elapsed_time() -> None:
+    """Test an unfinished purge requeues itself with adapted batch sizes."""
+    instance = MagicMock()
+    purge_before = dt_util.utcnow()
+    with (
+        patch(
+            "homeassistant.components.recorder.tasks.purge.purge_old_data",
+            return_value=False,
+        ) as purge_old_data_mock,
+        patch(
+            "homeassistant.components.recorder.tasks.time.monotonic",
+            side_effect=[100.0, 104.0],
+        ),
+    ):
+        PurgeTask(purge_before, repack=False, apply_filter=False).run(instance)
+
+    purge_old_data_mock.assert_called_once_with(
+        instance,
+        purge_before,
+        False,
+        False,
+        DEFAULT_EVENTS_BATCHES_PER_PURGE,
+        DEFAULT_STATES_BATCHES_PER_PURGE,
+    )
+    assert instance.queue_task.call_args[0][0] == PurgeTask(
+        purge_before,
+        repack=False,
+        apply_filter=False,
+        events_batch_size=DEFAULT_EVENTS_BATCHES_PER_PURGE // 2,
+        states_batch_size=DEFAULT_STATES_BATCHES_PER_PURGE // 2,
+    )
@@ -0,0 +1,288 @@
+"""Test spilling the recorder backlog to disk."""
+
+import asyncio
+from dataclasses import dataclass
+from pathlib import Path
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components import recorder
+from homeassistant.components.recorder import Recorder, spool
+from homeassistant.components.recorder.db_schema import (
+    States,
+    StatesCheckpoints,
+    StatesMeta,
+)
+from homeassistant.components.recorder.spool import EventSpool
+from homeassistant.components.recorder.tasks import (
+    RecorderTask,
+    ReplaySpooledEventsTask,
+    StatesCheckpointTask,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, EventOrigin, HomeAssistant, State
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+
+@dataclass
+class HoldRecorderTask(RecorderTask):
+    """A task to hold the recorder until it is released."""
+
+    started: asyncio.Event
+    release: threading.Event
+
+    def run(self, instance: Recorder) -> None:
+        """Hold the recorders event loop."""
+        instance.hass.loop.call_soon_threadsafe(self.started.set)
+        self.release.wait()
+
+
+async def test_event_spool(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test events are replayed in order from the segments and the buffer."""
+    event_spool = EventSpool(hass, str(tmp_path / "spool"))
+    old_state = State("sensor.one", "1", {"unit_of_measurement": "W"})
+    new_state = State("sensor.one", "2", {"unit_of_measurement": "W"})
+    context = Context("user", "parent")
+    events = [
+        Event(
+            EVENT_STATE_CHANGED,
+            {"entity_id": "sensor.one", "old_state": old_state, "new_state": new_state},
+            context=context,
+        ),
+        Event("test_event", {"value": 1}, EventOrigin.remote),
+        Event(
+            EVENT_STATE_CHANGED,
+            {"entity_id": "sensor.one", "old_state": new_state, "new_state": None},
+        ),
+        *(Event("test_event", {"value": idx}) for idx in range(2, 7)),
+    ]
+
+    assert not event_spool.async_put(events[0])
+    event_spool.async_start()
+    with patch.object(spool, "SEGMENT_MAX_BYTES", 1):
+        for event in events[:3]:
+            assert event_spool.async_put(event)
+        event_spool.flush()
+        for event in events[3:6]:
+            assert event_spool.async_put(event)
+        event_spool.flush()
+    for event in events[6:]:
+        assert event_spool.async_put(event)
+    assert event_spool.size == len(events)
+    assert len(list((tmp_path / "spool").iterdir())) == 2
+
+    replayed = event_spool.take(2)
+    assert len(list((tmp_path / "spool").iterdir())) == 2
+    replayed += event_spool.take(100)
+    assert len(replayed) == 6
+    assert not any((tmp_path / "spool").iterdir())
+    # The events which have not been flushed are replayed last
+    replayed += event_spool.take(100)
+    assert event_spool.active
+    assert event_spool.take(100) == []
+    assert not event_spool.active
+    assert event_spool.size == 0
+
+    assert [
+        (event.event_type, event.origin, event.time_fired_timestamp, event.context)
+        for event in replayed
+    ] == [
+        (event.event_type, event.origin, event.time_fired_timestamp, event.context)
+        for event in events
+    ]
+    assert replayed[0].data["old_state"].as_dict() == old_state.as_dict()
+    assert replayed[0].data["new_state"].as_dict() == new_state.as_dict()
+    assert replayed[0].context.parent_id == "parent"
+    assert replayed[2].data["new_state"] is None
+    assert [event.data for event in replayed[3:]] == [
+        event.data for event in events[3:]
+    ]
+
+    event_spool.async_start()
+    with patch.object(spool, "FLUSH_EVENTS", 1):
+        event_spool.async_put(events[1])
+        await hass.async_block_till_done(wait_background_tasks=True)
+    assert len(list((tmp_path / "spool").iterdir())) == 1
+    event_spool.clear()
+    assert not (tmp_path / "spool").exists()
+    assert not event_spool.active
+    assert event_spool.take(100) == []
+
+
+async def test_event_spool_load(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test the events left on disk by a previous run are replayed first."""
+    path = str(tmp_path / "spool")
+    event_spool = EventSpool(hass, path)
+    assert not event_spool.load()
+    event_spool.async_start()
+    with patch.object(spool, "SEGMENT_MAX_BYTES", 1):
+        for idx in range(2):
+            event_spool.async_put(Event("test_event", {"value": idx}))
+            event_spool.flush()
+    # The previous run stopped while it was writing an event
+    with (tmp_path / "spool" / "00000002.jsonl").open("ab") as file:
+        file.write(b'["test_event",{"value"')
+
+    event_spool = EventSpool(hass, path)
+    assert event_spool.load()
+    assert event_spool.active
+    assert event_spool.size == 2
+    assert event_spool.async_put(Event("test_event", {"value": 2}))
+    event_spool.flush()
+    assert sorted(segment.name for segment in (tmp_path / "spool").iterdir()) == [
+        "00000001.jsonl",
+        "00000002.jsonl",
+        "00000003.jsonl",
+    ]
+    assert [event.data["value"] for event in event_spool.take(100)] == [0, 1, 2]
+    assert event_spool.take(100) == []
+    assert not event_spool.active
+    assert event_spool.size == 0
+    assert not any((tmp_path / "spool").iterdir())
+
+
+async def test_recorder_spills_backlog(
+    recorder_mock: Recorder, hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test the recorder spills a deep backlog to disk and records it in order."""
+    instance = recorder_mock
+    instance.event_spool.path = str(tmp_path / "spool")
+    await async_wait_recording_done(hass)
+    # Hold the recorder so the spilled events are not replayed yet
+    release = threading.Event()
+    started = asyncio.Event()
+    instance.queue_task(HoldRecorderTask(started, release))
+    await started.wait()
+
+    with (
+        patch.object(recorder.core, "MAX_QUEUE_BACKLOG_MIN_VALUE", 0),
+        patch.object(spool, "FLUSH_EVENTS", 3),
+        patch.object(
+            spool, "_serialize_event", wraps=spool._serialize_event
+        ) as serialize_mock,
+    ):
+        for idx in range(10):
+            hass.states.async_set("sensor.one", str(idx))
+        await hass.async_block_till_done(wait_background_tasks=True)
+    assert serialize_mock.call_count == 10
+    assert instance.event_spool.active
+    assert instance.event_spool.size == 10
+    assert instance.backlog >= 10
+    assert instance.recording
+    release.set()
+
+    while instance.event_spool.active:
+        await async_wait_recording_done(hass)
+    hass.states.async_set("sensor.one", "10")
+    await async_wait_recording_done(hass)
+
+    def _get_states() -> list[str]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return [
+                state
+                for (state,) in session.query(States.state)
+                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                .filter(StatesMeta.entity_id == "sensor.one")
+                .order_by(States.state_id)
+            ]
+
+    assert await instance.async_add_executor_job(_get_states) == [
+        str(idx) for idx in range(11)
+    ]
+
+
+async def test_recorder_replays_events_left_on_disk(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+    tmp_path: Path,
+) -> None:
+    """Test the events a previous run left on disk are recorded first."""
+    path = str(tmp_path / "spool")
+    event_spool = EventSpool(hass, path)
+    event_spool.async_start()
+    for idx in range(3):
+        event_spool.async_put(
+            Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": "sensor.one",
+                    "old_state": None,
+                    "new_state": State("sensor.one", str(idx)),
+                },
+            )
+        )
+    event_spool.flush()
+
+    with patch.object(recorder.core, "SPOOL_DIR", path):
+        instance = await async_setup_recorder_instance(hass)
+    hass.states.async_set("sensor.one", "3")
+    while instance.event_spool.active:
+        await async_wait_recording_done(hass)
+    assert not any((tmp_path / "spool").iterdir())
+
+    def _get_states() -> list[str]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return [
+                state
+                for (state,) in session.query(States.state)
+                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                .filter(StatesMeta.entity_id == "sensor.one")
+                .order_by(States.state_id)
+            ]
+
+    assert await instance.async_add_executor_job(_get_states) == ["0", "1", "2", "3"]
+
+
+async def test_replayed_states_invalidate_states_checkpoints(
+    recorder_mock: Recorder, hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test the checkpoints written while older states were on disk are rewritten."""
+    instance = recorder_mock
+    instance.event_spool.path = str(tmp_path / "spool")
+    hass.states.async_set("sensor.one", "1")
+    await async_wait_recording_done(hass)
+    first_ts = hass.states.get("sensor.one").last_updated_timestamp
+
+    instance.event_spool.async_start()
+    hass.states.async_set("sensor.one", "2")
+    await hass.async_block_till_done()
+    assert instance.event_spool.size == 1
+    late_ts = hass.states.get("sensor.one").last_updated_timestamp
+    checkpoint_ts = late_ts + 1
+
+    def _get_checkpoints() -> dict[float, float]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return {
+                row.checkpoint_ts: row.last_updated_ts
+                for row in session.query(StatesCheckpoints)
+                .join(
+                    StatesMeta, StatesCheckpoints.metadata_id == StatesMeta.metadata_id
+                )
+                .filter(StatesMeta.entity_id == "sensor.one")
+            }
+
+    # The checkpoint is written while the state is still on disk
+    instance.queue_task(StatesCheckpointTask(checkpoint_ts))
+    await async_wait_recording_done(hass)
+    assert instance.states_checkpoint_ts == checkpoint_ts
+    assert await instance.async_add_executor_job(_get_checkpoints) == {
+        checkpoint_ts: first_ts
+    }
+
+    instance.queue_task(ReplaySpooledEventsTask())
+    while instance.event_spool.active:
+        await async_wait_recording_done(hass)
+    assert instance.states_checkpoint_ts is None
+    assert await instance.async_add_executor_job(_get_checkpoints) == {}
+
+    instance.queue_task(StatesCheckpointTask(checkpoint_ts))
+    await async_wait_recording_done(hass)
+    assert await instance.async_add_executor_job(_get_checkpoints) == {
+        checkpoint_ts: pytest.approx(late_ts)
+    }
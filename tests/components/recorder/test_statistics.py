@@ -9,7 +9,11 @@ from sqlalchemy import select
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder import Recorder, history, statistics
-from homeassistant.components.recorder.db_schema import StatisticsShortTerm
+from homeassistant.components.recorder.db_schema import (
+    StatisticsDaily,
+    StatisticsMonthly,
+    StatisticsShortTerm,
+)
 from homeassistant.components.recorder.models import (
     datetime_to_timestamp_or_none,
     process_timestamp,
@@ -1844,6 +1848,93 @@ async def test_monthly_statistics_sum(
     assert stats == {}
 
 
+@pytest.mark.freeze_time("2021-12-01 00:00:00+00:00")
+async def test_statistics_rollups(
+    hass: HomeAssistant,
+    setup_recorder: None,
+) -> None:
+    """Test daily and monthly statistics are read from the rollup tables."""
+    await hass.config.async_set_time_zone("Europe/Vienna")
+    await async_wait_recording_done(hass)
+    instance = recorder.get_instance(hass)
+    assert instance.statistics_rollups_ready
+
+    # The hours span the end of daylight saving time on 2021-10-31
+    zero = dt_util.as_utc(dt_util.parse_datetime("2021-10-29 00:00:00"))
+    external_statistics = [
+        {
+            "start": zero + timedelta(hours=hour),
+            "mean": hour,
+            "min": hour - 1,
+            "max": hour + 1,
+            "state": hour,
+            "sum": hour * 2,
+        }
+        for hour in range(24 * 5)
+    ]
+    external_metadata = {
+        "has_mean": True,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        assert session.query(StatisticsDaily).count() == 5
+        assert session.query(StatisticsMonthly).count() == 2
+
+    def _all_periods() -> dict[str, list[dict[str, Any]]]:
+        return {
+            period: statistics_during_period(
+                hass,
+                zero,
+                period=period,
+                statistic_ids={"test:total_energy_import"},
+                types=types,
+            )["test:total_energy_import"]
+            for period, types in (
+                ("day", {"change", "max", "mean", "min", "state", "sum"}),
+                ("week", {"change", "state", "sum"}),
+                ("month", {"change", "max", "mean", "min", "state", "sum"}),
+            )
+        }
+
+    with patch.object(
+        statistics,
+        "_generate_statistics_during_period_stmt",
+        wraps=statistics._generate_statistics_during_period_stmt,
+    ) as generate_stmt_mock:
+        from_rollups = _all_periods()
+    assert [call.args[3] for call in generate_stmt_mock.mock_calls] == [
+        StatisticsDaily,
+        StatisticsDaily,
+        StatisticsMonthly,
+    ]
+    assert len(from_rollups["day"]) == 5
+    instance.statistics_rollups_ready = False
+    from_hourly = _all_periods()
+    instance.statistics_rollups_ready = True
+    for period, rows in from_rollups.items():
+        assert rows == [pytest.approx(row) for row in from_hourly[period]]
+
+    # Rollups made for another time zone are rebuilt
+    await hass.config.async_set_time_zone("America/Regina")
+    await async_wait_recording_done(hass)
+    instance.statistics_rollups_ready = False
+    from_hourly = _all_periods()
+    instance.statistics_rollups_ready = True
+    assert _all_periods() == from_hourly
+    # The rebuild queues a task per month
+    for _ in range(3):
+        await async_wait_recording_done(hass)
+    assert instance.statistics_rollups_ready
+    assert _all_periods() == from_hourly
+
+
 def test_cache_key_for_generate_statistics_during_period_stmt() -> None:
     """Test cache key for _generate_statistics_during_period_stmt."""
     stmt = _generate_statistics_during_period_stmt(
@@ -6,6 +6,7 @@ import pytest
 
 from homeassistant.components.recorder import Recorder, get_instance
 from homeassistant.components.recorder.const import SupportedDialect
+from homeassistant.components.recorder.models import DatabaseJobStats
 from homeassistant.core import HomeAssistant
 from homeassistant.setup import async_setup_component
 
@@ -35,6 +36,9 @@ async def test_recorder_system_health(
         "estimated_db_size": ANY,
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
+        "database_queries": ANY,
+        "average_query_time": ANY,
+        "slowest_query_time": ANY,
     }
 
 
@@ -64,6 +68,9 @@ async def test_recorder_system_health_alternate_dbms(
         "estimated_db_size": "1.00 MiB",
         "database_engine": db_engine.value,
         "database_version": ANY,
+        "database_queries": ANY,
+        "average_query_time": ANY,
+        "slowest_query_time": ANY,
     }
 
 
@@ -99,6 +106,9 @@ async def test_recorder_system_health_db_url_missing_host(
         "estimated_db_size": "1.00 MiB",
         "database_engine": db_engine.value,
         "database_version": ANY,
+        "database_queries": ANY,
+        "average_query_time": ANY,
+        "slowest_query_time": ANY,
     }
 
 
@@ -127,4 +137,24 @@ async def test_recorder_system_health_crashed_recorder_runs_table(
         "estimated_db_size": ANY,
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
+        "database_queries": ANY,
+        "average_query_time": ANY,
+        "slowest_query_time": ANY,
     }
+
+
+async def test_recorder_system_health_query_timing(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Test recorder system health reports database job timing."""
+    assert await async_setup_component(hass, "system_health", {})
+    await async_wait_recording_done(hass)
+    job_stats = DatabaseJobStats()
+    job_stats.add(0.25)
+    job_stats.add(0.75)
+    with patch.object(get_instance(hass), "database_job_stats", job_stats):
+        info = await get_system_health_info(hass, "recorder")
+    # The system health job itself is timed as well
+    assert info["database_queries"] == 3
+    assert info["slowest_query_time"] == "750.00 ms"
+    assert job_stats.total_time >= 1
@@ -2534,10 +2534,17 @@ async def test_recorder_info(
     assert response["success"]
     assert response["result"] == {
         "backlog": 0,
+        "commit_batch_size": ANY,
+        "commit_interval": 0,
         "max_backlog": 65000,
         "migration_in_progress": False,
         "migration_is_live": False,
+        "migration_progress": {},
+        "queue_latency": ANY,
+        "recent_states_hits": 0,
+        "recent_states_misses": 0,
         "recording": True,
+        "shedding": False,
         "thread_running": True,
     }
 
@@ -2638,7 +2645,8 @@ async def test_recorder_info_migration_queue_exhausted(
             response = await client.receive_json()
             assert response["success"]
             assert response["result"]["migration_in_progress"] is True
-            assert response["result"]["recording"] is False
+            # The events are spilled to disk instead of stopping recording
+            assert response["result"]["recording"] is True
             assert response["result"]["thread_running"] is True
 
             # Let migration finish
@@ -36,6 +36,7 @@ from homeassistant.components.recorder.statistics import (
 )
 from homeassistant.components.recorder.util import get_instance, session_scope
 from homeassistant.components.sensor import ATTR_OPTIONS, DOMAIN, SensorDeviceClass
+from homeassistant.components.sensor.recorder import STATISTICS_STATES
 from homeassistant.const import ATTR_FRIENDLY_NAME, STATE_UNAVAILABLE
 from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers import issue_registry as ir
@@ -2294,6 +2295,127 @@ async def test_compile_hourly_statistics_unchanged(
     assert "Error while processing event StatisticsTask" not in caplog.text
 
 
+async def test_compile_statistics_from_buffered_states(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test compiling statistics from the states buffered since the last period."""
+    await async_setup_component(hass, "sensor", {})
+    # Wait for the sensor recorder platform to be added
+    await async_recorder_block_till_done(hass)
+    zero = get_start_time(dt_util.utcnow()) + timedelta(minutes=5)
+    four, _ = await async_record_states(
+        hass, freezer, zero, "sensor.test1", TEMPERATURE_SENSOR_ATTRIBUTES
+    )
+    await async_record_states(
+        hass, freezer, zero, "sensor.test2", ENERGY_SENSOR_ATTRIBUTES, [10, 15, 20]
+    )
+    freezer.move_to(four)
+    await async_wait_recording_done(hass)
+
+    # The buffered states match the states in the database
+    states_buffer = hass.data[STATISTICS_STATES]
+    end = zero + timedelta(minutes=5)
+    for entity_id, significant_changes_only in (
+        ("sensor.test1", True),
+        ("sensor.test2", False),
+    ):
+        buffered = states_buffer.states_during_period(
+            zero, end, [entity_id], significant_changes_only
+        )
+        with session_scope(hass=hass, read_only=True) as session:
+            hist = history.get_full_significant_states_with_session(
+                hass,
+                session,
+                zero - timedelta.resolution,
+                end,
+                entity_ids=[entity_id],
+                significant_changes_only=significant_changes_only,
+            )
+        assert [state.state for state in buffered[entity_id]] == [
+            state.state for state in hist[entity_id]
+        ]
+
+    with patch.object(
+        history,
+        "get_full_significant_states_with_session",
+        wraps=history.get_full_significant_states_with_session,
+    ) as get_history_mock:
+        do_adhoc_statistics(hass, start=zero)
+        await async_wait_recording_done(hass)
+    get_history_mock.assert_not_called()
+    stats = statistics_during_period(hass, zero, period="5minute")
+    assert stats["sensor.test1"][0]["mean"] == pytest.approx(13.050847)
+    assert stats["sensor.test1"][0]["min"] == pytest.approx(-10.0)
+    assert stats["sensor.test1"][0]["max"] == pytest.approx(30.0)
+    assert stats["sensor.test2"][0]["state"] == pytest.approx(20.0)
+    assert stats["sensor.test2"][0]["sum"] == pytest.approx(10.0)
+
+    # The states of the compiled period are dropped, except the last one
+    assert states_buffer.states_during_period(end, four, ["sensor.test1"], True) == {
+        "sensor.test1": [hass.states.get("sensor.test1")]
+    }
+    assert states_buffer.states_during_period(zero, end, ["sensor.test1"], True) is None
+
+
+@pytest.mark.parametrize(
+    "recorder_config", [{"exclude": {"entities": ["sensor.excluded"]}}]
+)
+async def test_buffered_states_excluded_and_stopped(hass: HomeAssistant) -> None:
+    """Test excluded sensors are not buffered and the buffer can be stopped."""
+    await async_setup_component(hass, "sensor", {})
+    # Wait for the sensor recorder platform to be added
+    await async_recorder_block_till_done(hass)
+    states_buffer = hass.data[STATISTICS_STATES]
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.excluded", "1", TEMPERATURE_SENSOR_ATTRIBUTES)
+    hass.states.async_set("sensor.included", "1", TEMPERATURE_SENSOR_ATTRIBUTES)
+    end = dt_util.utcnow() + timedelta(seconds=1)
+    assert states_buffer.states_during_period(
+        start, end, ["sensor.excluded", "sensor.included"], False
+    ) == {"sensor.included": [hass.states.get("sensor.included")]}
+
+    states_buffer.async_stop()
+    hass.states.async_set("sensor.included", "2", TEMPERATURE_SENSOR_ATTRIBUTES)
+    assert (
+        states_buffer.states_during_period(start, end, ["sensor.included"], False)
+        is None
+    )
+    assert not states_buffer._states
+
+
+async def test_buffered_states_recorder_disabled(hass: HomeAssistant) -> None:
+    """Test states the disabled recorder does not record make the buffer incomplete."""
+    await async_setup_component(hass, "sensor", {})
+    # Wait for the sensor recorder platform to be added
+    await async_recorder_block_till_done(hass)
+    states_buffer = hass.data[STATISTICS_STATES]
+    now = dt_util.utcnow().timestamp()
+    get_instance(hass).set_enable(False)
+
+    hass.states.async_set(
+        "sensor.test1", "1", TEMPERATURE_SENSOR_ATTRIBUTES, timestamp=now + 20
+    )
+    # A state with an older timestamp does not move the missed period back
+    hass.states.async_set(
+        "sensor.test2", "2", TEMPERATURE_SENSOR_ATTRIBUTES, timestamp=now + 10
+    )
+    assert (
+        states_buffer.states_during_period(
+            dt_util.utc_from_timestamp(now + 15),
+            dt_util.utc_from_timestamp(now + 30),
+            ["sensor.test1"],
+            False,
+        )
+        is None
+    )
+    assert states_buffer.states_during_period(
+        dt_util.utc_from_timestamp(now + 20),
+        dt_util.utc_from_timestamp(now + 30),
+        ["sensor.test1"],
+        False,
+    ) == {"sensor.test1": [hass.states.get("sensor.test1")]}
+
+
 async def test_compile_hourly_statistics_partially_unavailable(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture
 ) -> None:
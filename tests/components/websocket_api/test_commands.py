@@ -2,6 +2,7 @@
 
 import asyncio
 from copy import deepcopy
+from datetime import timedelta
 import logging
 from typing import Any
 from unittest.mock import ANY, AsyncMock, Mock, patch
@@ -11,7 +12,7 @@ import voluptuous as vol
 
 from homeassistant import loader
 from homeassistant.components.device_automation import toggle_entity
-from homeassistant.components.websocket_api import const
+from homeassistant.components.websocket_api import commands, const
 from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH,
     TYPE_AUTH_OK,
@@ -22,11 +23,16 @@ from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import SIGNAL_BOOTSTRAP_INTEGRATIONS
 from homeassistant.core import Context, HomeAssistant, State, SupportsResponse, callback
 from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
-from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
 from homeassistant.util.json import json_loads
 
 from tests.common import (
@@ -34,6 +40,7 @@ from tests.common import (
     MockEntity,
     MockEntityPlatform,
     MockUser,
+    async_fire_time_changed,
     async_mock_service,
     mock_platform,
 )
@@ -1310,6 +1317,189 @@ async def test_subscribe_unsubscribe_entities_with_filter(
     }
 
 
+@callback
+def _async_fire_selector_update(hass: HomeAssistant) -> None:
+    """Fire the debounced update of the entities matching the selectors."""
+    async_fire_time_changed(
+        hass,
+        dt_util.utcnow() + timedelta(seconds=commands.SELECTOR_UPDATE_COOLDOWN),
+    )
+
+
+async def test_subscribe_unsubscribe_entities_with_area(
+    hass: HomeAssistant,
+    websocket_client: MockHAClientWebSocket,
+    area_registry: ar.AreaRegistry,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test subscribe/unsubscribe entities of an area as the area changes."""
+    kitchen = area_registry.async_create("Kitchen")
+    ceiling = entity_registry.async_get_or_create(
+        "light", "test", "ceiling", suggested_object_id="ceiling"
+    )
+    hallway = entity_registry.async_get_or_create(
+        "light", "test", "hallway", suggested_object_id="hallway"
+    )
+    entity_registry.async_update_entity(ceiling.entity_id, area_id=kitchen.id)
+    hass.states.async_set("light.ceiling", "off")
+    hass.states.async_set("light.hallway", "off")
+
+    await websocket_client.send_json(
+        {"id": 7, "type": "subscribe_entities", "area_id": kitchen.id}
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "a": {"light.ceiling": {"a": {}, "c": ANY, "lc": ANY, "s": "off"}}
+    }
+
+    hass.states.async_set("light.hallway", "on")
+    hass.states.async_set("light.ceiling", "on")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {"light.ceiling": {"+": {"c": ANY, "lc": ANY, "s": "on"}}}
+    }
+
+    entity_registry.async_update_entity(hallway.entity_id, area_id=kitchen.id)
+    _async_fire_selector_update(hass)
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "a": {"light.hallway": {"a": {}, "c": ANY, "lc": ANY, "s": "on"}}
+    }
+
+    entity_registry.async_update_entity(ceiling.entity_id, area_id=None)
+    _async_fire_selector_update(hass)
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {"r": ["light.ceiling"]}
+
+    hass.states.async_set("light.ceiling", "off")
+    hass.states.async_set("light.hallway", "off")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {"light.hallway": {"+": {"c": ANY, "lc": ANY, "s": "off"}}}
+    }
+
+    await websocket_client.send_json(
+        {"id": 8, "type": "unsubscribe_events", "subscription": 7}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 8
+    assert msg["success"]
+
+    entity_registry.async_update_entity(ceiling.entity_id, area_id=kitchen.id)
+    _async_fire_selector_update(hass)
+    hass.states.async_set("light.hallway", "on")
+    await hass.async_block_till_done()
+    await websocket_client.send_json({"id": 9, "type": "ping"})
+    msg = await websocket_client.receive_json()
+    assert msg == {"id": 9, "type": "pong"}
+
+
+async def test_subscribe_entities_with_empty_area(
+    hass: HomeAssistant,
+    websocket_client: MockHAClientWebSocket,
+    area_registry: ar.AreaRegistry,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test subscribe entities of an area without entities until one is added."""
+    kitchen = area_registry.async_create("Kitchen")
+    ceiling = entity_registry.async_get_or_create(
+        "light", "test", "ceiling", suggested_object_id="ceiling"
+    )
+    hass.states.async_set("light.ceiling", "off")
+
+    await websocket_client.send_json(
+        {"id": 7, "type": "subscribe_entities", "area_id": kitchen.id}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"a": {}}
+
+    hass.states.async_set("light.ceiling", "on")
+    entity_registry.async_update_entity(ceiling.entity_id, area_id=kitchen.id)
+    _async_fire_selector_update(hass)
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["event"] == {
+        "a": {"light.ceiling": {"a": {}, "c": ANY, "lc": ANY, "s": "on"}}
+    }
+
+    hass.states.async_set("light.ceiling", "off")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {"light.ceiling": {"+": {"c": ANY, "lc": ANY, "s": "off"}}}
+    }
+
+
+async def test_subscribe_entities_with_area_debounces_registry_updates(
+    hass: HomeAssistant,
+    websocket_client: MockHAClientWebSocket,
+    area_registry: ar.AreaRegistry,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test the entities of an area are resolved once after related updates."""
+    kitchen = area_registry.async_create("Kitchen")
+    ceiling = entity_registry.async_get_or_create(
+        "light", "test", "ceiling", suggested_object_id="ceiling"
+    )
+    hallway = entity_registry.async_get_or_create(
+        "light", "test", "hallway", suggested_object_id="hallway"
+    )
+    entity_registry.async_update_entity(ceiling.entity_id, area_id=kitchen.id)
+    hass.states.async_set("light.ceiling", "off")
+    hass.states.async_set("light.hallway", "off")
+
+    with patch.object(
+        commands,
+        "_async_resolve_entity_selectors",
+        wraps=commands._async_resolve_entity_selectors,
+    ) as resolve_mock:
+        await websocket_client.send_json(
+            {"id": 7, "type": "subscribe_entities", "area_id": kitchen.id}
+        )
+        msg = await websocket_client.receive_json()
+        assert msg["success"]
+        msg = await websocket_client.receive_json()
+        assert msg["event"] == {
+            "a": {"light.ceiling": {"a": {}, "c": ANY, "lc": ANY, "s": "off"}}
+        }
+        assert resolve_mock.call_count == 1
+
+        # Updates which cannot change the entities of the area are ignored
+        area_registry.async_create("Office")
+        entity_registry.async_update_entity(ceiling.entity_id, name="Ceiling")
+        _async_fire_selector_update(hass)
+        await hass.async_block_till_done()
+        assert resolve_mock.call_count == 1
+
+        entity_registry.async_update_entity(hallway.entity_id, area_id=kitchen.id)
+        entity_registry.async_update_entity(ceiling.entity_id, area_id=None)
+        entity_registry.async_update_entity(ceiling.entity_id, area_id=kitchen.id)
+        await hass.async_block_till_done()
+        assert resolve_mock.call_count == 1
+
+        _async_fire_selector_update(hass)
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == 7
+        assert msg["event"] == {
+            "a": {"light.hallway": {"a": {}, "c": ANY, "lc": ANY, "s": "off"}}
+        }
+        assert resolve_mock.call_count == 2
+
+
 async def test_render_template_renders_template(
     hass: HomeAssistant, websocket_client
 ) -> None:
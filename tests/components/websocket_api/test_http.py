@@ -3,9 +3,10 @@
 import asyncio
 from datetime import timedelta
 from typing import Any, cast
-from unittest.mock import patch
+from unittest.mock import ANY, call, patch
 
-from aiohttp import WSMsgType, WSServerHandshakeError, web
+from aiohttp import WSMsgType, WSServerHandshakeError, hdrs, web
+from aiohttp.http_websocket import ws_ext_gen
 import pytest
 
 from homeassistant.components.websocket_api import (
@@ -14,12 +15,22 @@ from homeassistant.components.websocket_api import (
     http,
     websocket_command,
 )
+from homeassistant.components.websocket_api.auth import (
+    TYPE_AUTH,
+    TYPE_AUTH_OK,
+    TYPE_AUTH_REQUIRED,
+)
 from homeassistant.components.websocket_api.connection import ActiveConnection
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.setup import async_setup_component
 from homeassistant.util.dt import utcnow
 
 from tests.common import async_fire_time_changed
-from tests.typing import MockHAClientWebSocket, WebSocketGenerator
+from tests.typing import (
+    ClientSessionGenerator,
+    MockHAClientWebSocket,
+    WebSocketGenerator,
+)
 
 
 @pytest.fixture
@@ -345,6 +356,53 @@ async def test_pending_msg_peak_but_does_not_overflow(
     assert "Client unable to keep up with pending messages" not in caplog.text
 
 
+@patch(
+    "homeassistant.components.websocket_api.http.PENDING_MSG_COALESCE_STATE_DIFFS", 1
+)
+async def test_pending_state_diffs_are_coalesced(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test pending state diffs of an entity are merged into one diff."""
+    hass.states.async_set("light.kitchen", "on", {"color": "red", "brightness": 1})
+    hass.states.async_set("light.hallway", "on")
+    await websocket_client.send_json_auto_id(
+        {
+            "type": "subscribe_entities",
+            "entity_ids": ["light.kitchen", "light.hallway"],
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert set(msg["event"]["a"]) == {"light.kitchen", "light.hallway"}
+
+    # The writer does not run until the loop is released so all the
+    # changes are pending at the same time
+    hass.states.async_set("light.kitchen", "off", {"color": "red", "brightness": 2})
+    hass.states.async_set("light.hallway", "off")
+    hass.states.async_set("light.kitchen", "on", {"color": "blue", "brightness": 2})
+    hass.states.async_remove("light.hallway")
+    hass.states.async_set("light.kitchen", "on", {"color": "blue"})
+
+    kitchen = await websocket_client.receive_json()
+    hallway = await websocket_client.receive_json()
+    assert kitchen["event"]["c"]["light.kitchen"] == {
+        "+": {
+            "a": {"color": "blue"},
+            "c": ANY,
+            "lc": ANY,
+        },
+        "-": {"a": ["brightness"]},
+    }
+    assert hallway["event"] == {"r": ["light.hallway"]}
+
+    hass.states.async_set("light.kitchen", "off", {"color": "blue"})
+    kitchen = await websocket_client.receive_json()
+    assert kitchen["event"]["c"]["light.kitchen"] == {
+        "+": {"s": "off", "c": ANY, "lc": ANY}
+    }
+
+
 async def test_non_json_message(
     hass: HomeAssistant, websocket_client, caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -451,6 +509,74 @@ async def test_enable_coalesce(
         await asyncio.gather(*send_tasks_with_close)
 
 
+@pytest.mark.parametrize(
+    ("compression_level", "expected_level"), [(9, 9), (0, 0), (12, None)]
+)
+@pytest.mark.parametrize("no_context_takeover", [False, True])
+async def test_compression_level(
+    hass: HomeAssistant,
+    aiohttp_client: ClientSessionGenerator,
+    hass_access_token: str,
+    socket_enabled: None,
+    compression_level: int,
+    expected_level: int | None,
+    no_context_takeover: bool,
+) -> None:
+    """Test changing the compression level of a deflate connection."""
+    assert await async_setup_component(hass, "websocket_api", {})
+    client = await aiohttp_client(hass.http.app)
+    extensions = ws_ext_gen(compress=15)
+    if no_context_takeover:
+        extensions += "; server_no_context_takeover"
+    with patch("aiohttp.client.ws_ext_gen", return_value=extensions):
+        websocket_client = await client.ws_connect(const.URL, compress=15)
+    assert websocket_client.compress == 15
+    assert (
+        "server_no_context_takeover"
+        in websocket_client._response.headers[hdrs.SEC_WEBSOCKET_EXTENSIONS]
+    ) is no_context_takeover
+    assert websocket_client.compress == 15
+    assert (await websocket_client.receive_json())["type"] == TYPE_AUTH_REQUIRED
+    await websocket_client.send_json(
+        {"type": TYPE_AUTH, "access_token": hass_access_token}
+    )
+    assert (await websocket_client.receive_json())["type"] == TYPE_AUTH_OK
+
+    with patch.object(
+        http, "ZLibCompressor", wraps=http.ZLibCompressor
+    ) as compressor_mock:
+        await websocket_client.send_json(
+            {
+                "id": 1,
+                "type": "supported_features",
+                "features": {const.FEATURE_COMPRESSION_LEVEL: compression_level},
+            }
+        )
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == 1
+        assert msg["success"] is True
+
+        for id_ in range(2, 12):
+            await websocket_client.send_json({"id": id_, "type": "ping"})
+        for id_ in range(2, 12):
+            msg = await websocket_client.receive_json()
+            assert msg == {"id": id_, "type": "pong"}
+
+    if expected_level is None:
+        compressor_mock.assert_not_called()
+    elif no_context_takeover:
+        # The writer may make a new compressor for each message
+        assert compressor_mock.call_args_list
+        for compressor_call in compressor_mock.call_args_list:
+            assert compressor_call == call(
+                level=expected_level, wbits=-15, max_sync_chunk_size=ANY
+            )
+    else:
+        compressor_mock.assert_called_once_with(
+            level=expected_level, wbits=-15, max_sync_chunk_size=ANY
+        )
+
+
 async def test_binary_message(
     hass: HomeAssistant, websocket_client, caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -21,6 +21,7 @@ from homeassistant.const import (
     ATTR_ATTRIBUTION,
     ATTR_DEVICE_CLASS,
     ATTR_FRIENDLY_NAME,
+    EVENT_STATE_CHANGED,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
     EntityCategory,
@@ -44,6 +45,7 @@ from tests.common import (
     MockEntityPlatform,
     MockModule,
     MockPlatform,
+    async_capture_events,
     mock_integration,
     mock_registry,
 )
@@ -2652,3 +2654,84 @@ async def test_async_write_ha_state_thread_safety_always(
     ):
         await hass.async_add_executor_job(ent2.async_write_ha_state)
     assert not hass.states.get(ent2.entity_id)
+
+
+async def test_async_batch_write_ha_state(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test entity state writes are batched until the context exits."""
+    entities = []
+    for idx in range(3):
+        ent = entity.Entity()
+        ent.entity_id = f"test.test_{idx}"
+        ent.hass = hass
+        ent._attr_state = str(idx)
+        entities.append(ent)
+    entities[2]._attr_state = "x" * 256
+    state_changed_events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    with entity.async_batch_write_ha_state(hass):
+        for ent in entities:
+            ent.async_write_ha_state()
+        with entity.async_batch_write_ha_state(hass):
+            entities[0]._attr_state = "updated"
+            entities[0].async_write_ha_state()
+        assert hass.states.get("test.test_0") is None
+        assert not state_changed_events
+
+    await hass.async_block_till_done()
+    assert [event.data["entity_id"] for event in state_changed_events] == [
+        "test.test_0",
+        "test.test_1",
+        "test.test_2",
+        "test.test_0",
+    ]
+    assert hass.states.get("test.test_0").state == "updated"
+    assert hass.states.get("test.test_1").state == "1"
+    assert hass.states.get("test.test_2").state == STATE_UNKNOWN
+    assert (
+        "homeassistant.helpers.entity",
+        logging.ERROR,
+        f"Failed to set state for test.test_2, fall back to {STATE_UNKNOWN}",
+    ) in caplog.record_tuples
+
+    # Writes outside of the context are not batched
+    entities[1]._attr_state = "unbatched"
+    entities[1].async_write_ha_state()
+    assert hass.states.get("test.test_1").state == "unbatched"
+
+
+async def test_async_batch_write_ha_state_error(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test an error in the context still writes the states and propagates."""
+    ent = entity.Entity()
+    ent.entity_id = "test.test"
+    ent.hass = hass
+    ent._attr_state = "on"
+
+    def write_and_fail() -> None:
+        with entity.async_batch_write_ha_state(hass):
+            ent.async_write_ha_state()
+            raise ValueError("body failed")
+
+    with pytest.raises(ValueError, match="body failed"):
+        write_and_fail()
+    assert hass.states.get("test.test").state == "on"
+
+    ent._attr_state = "off"
+    with (
+        patch(
+            "homeassistant.core.StateMachine.async_set_many_internal",
+            side_effect=RuntimeError("write failed"),
+        ),
+        pytest.raises(ValueError, match="body failed"),
+    ):
+        write_and_fail()
+    assert "Error writing batched states" in caplog.text
+    assert "write failed" in caplog.text
+    assert hass.states.get("test.test").state == "on"
+
+    # The batch is not left active after an error
+    ent.async_write_ha_state()
+    assert hass.states.get("test.test").state == "off"
@@ -11,9 +11,11 @@ import logging
 import os
 from pathlib import Path
 import re
+import sys
 from tempfile import TemporaryDirectory
 import threading
 import time
+import tracemalloc
 from typing import Any
 from unittest.mock import MagicMock, Mock, PropertyMock, patch
 
@@ -64,6 +66,7 @@ from homeassistant.helpers.json import json_dumps
 from homeassistant.setup import async_setup_component
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
 from homeassistant.util.read_only_dict import ReadOnlyDict
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
@@ -3576,3 +3579,415 @@ async def test_async_set_updates_last_reported(hass: HomeAssistant) -> None:
         assert state.last_reported_timestamp != last_reported_timestamp
         last_reported = state.last_reported
         last_reported_timestamp = state.last_reported_timestamp
+
+
+async def test_statemachine_async_set_many(hass: HomeAssistant) -> None:
+    """Test setting multiple states at once."""
+    hass.states.async_set("light.bowl", "on", {})
+    hass.states.async_set("light.kitchen", "off", {})
+    state_changed_events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    state_reported_events: list[ha.Event] = []
+
+    @ha.callback
+    def mock_filter(event_data):
+        """Mock filter."""
+        return True
+
+    @ha.callback
+    def listener(event: ha.Event) -> None:
+        state_reported_events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_REPORTED, listener, event_filter=mock_filter)
+    context = ha.Context()
+
+    hass.states.async_set_many(
+        [
+            ("light.bowl", "off", {"brightness": 0}),
+            ("light.kitchen", "off", {}),
+            ("Light.New", "on", None),
+        ],
+        context=context,
+        timestamp=1700000000.0,
+    )
+    await hass.async_block_till_done()
+
+    assert [event.data["entity_id"] for event in state_changed_events] == [
+        "light.bowl",
+        "light.new",
+    ]
+    assert [event.data["entity_id"] for event in state_reported_events] == [
+        "light.kitchen"
+    ]
+    assert state_changed_events[0].data["old_state"].state == "on"
+    assert state_changed_events[0].data["new_state"].attributes == {"brightness": 0}
+    assert state_changed_events[1].data["old_state"] is None
+    for event in (*state_changed_events, *state_reported_events):
+        assert event.context is context
+        assert event.time_fired_timestamp == 1700000000.0
+    assert hass.states.get("light.bowl").state == "off"
+    assert hass.states.get("light.new").state == "on"
+    assert hass.states.get("light.kitchen").last_reported_timestamp == 1700000000.0
+
+
+async def test_statemachine_async_set_many_keeps_write_order(
+    hass: HomeAssistant,
+) -> None:
+    """Test the events of a batch are fired in the order of the writes."""
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("light.kitchen", "off")
+    events: list[tuple[str, str]] = []
+
+    @ha.callback
+    def listener(event: ha.Event) -> None:
+        events.append((event.event_type, event.data["entity_id"]))
+
+    @ha.callback
+    def mock_filter(event_data):
+        """Mock filter."""
+        return True
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, listener)
+    hass.bus.async_listen(EVENT_STATE_REPORTED, listener, event_filter=mock_filter)
+
+    hass.states.async_set_many(
+        [
+            ("light.kitchen", "off", None),
+            ("light.bowl", "off", None),
+            ("light.kitchen", "on", None),
+            ("light.bowl", "off", None),
+        ]
+    )
+    await hass.async_block_till_done()
+
+    assert events == [
+        (EVENT_STATE_REPORTED, "light.kitchen"),
+        (EVENT_STATE_CHANGED, "light.bowl"),
+        (EVENT_STATE_CHANGED, "light.kitchen"),
+        (EVENT_STATE_REPORTED, "light.bowl"),
+    ]
+
+
+async def test_statemachine_async_set_many_validates_first(
+    hass: HomeAssistant,
+) -> None:
+    """Test an invalid entry does not write any state of the batch."""
+    hass.states.async_set("light.bowl", "on")
+    state_changed_events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    with pytest.raises(InvalidStateError):
+        hass.states.async_set_many(
+            [("light.bowl", "off", None), ("light.kitchen", "x" * 256, None)]
+        )
+    with pytest.raises(InvalidEntityFormatError):
+        hass.states.async_set_many(
+            [("light.bowl", "off", None), ("invalid_entity_id", "on", None)]
+        )
+    await hass.async_block_till_done()
+
+    assert hass.states.get("light.bowl").state == "on"
+    assert hass.states.get("light.kitchen") is None
+    assert len(state_changed_events) == 0
+
+
+async def test_eventbus_async_fire_many_internal(hass: HomeAssistant) -> None:
+    """Test firing a batch of events honors listener changes mid-batch."""
+    calls: list[tuple[str, int]] = []
+
+    @ha.callback
+    def first_listener(event: ha.Event) -> None:
+        calls.append(("first", event.data["idx"]))
+        if event.data["idx"] == 0:
+            unsub_second()
+            hass.bus.async_listen("test_event", third_listener)
+
+    @ha.callback
+    def second_listener(event: ha.Event) -> None:
+        calls.append(("second", event.data["idx"]))
+
+    @ha.callback
+    def third_listener(event: ha.Event) -> None:
+        calls.append(("third", event.data["idx"]))
+
+    @ha.callback
+    def even_filter(event_data: dict[str, Any]) -> bool:
+        return event_data["idx"] % 2 == 0
+
+    @ha.callback
+    def filtered_listener(event: ha.Event) -> None:
+        calls.append(("filtered", event.data["idx"]))
+
+    hass.bus.async_listen("test_event", first_listener)
+    hass.bus.async_listen("test_event", filtered_listener, event_filter=even_filter)
+    unsub_second = hass.bus.async_listen("test_event", second_listener)
+    match_all_events = async_capture_events(hass, MATCH_ALL)
+
+    hass.bus.async_fire_many_internal(
+        [("test_event", {"idx": idx}, None, None) for idx in range(3)]
+    )
+    await hass.async_block_till_done()
+
+    assert calls == [
+        ("first", 0),
+        ("filtered", 0),
+        ("second", 0),
+        ("first", 1),
+        ("third", 1),
+        ("first", 2),
+        ("filtered", 2),
+        ("third", 2),
+    ]
+    assert [event.data["idx"] for event in match_all_events] == [0, 1, 2]
+
+
+async def test_eventbus_keyed_listener(hass: HomeAssistant) -> None:
+    """Test listeners indexed by entity_id, domain and device_id."""
+    calls: list[tuple[str, str]] = []
+
+    @ha.callback
+    def entity_listener(event: ha.Event) -> None:
+        calls.append(("entity", event.data["entity_id"]))
+
+    @ha.callback
+    def domain_listener(event: ha.Event) -> None:
+        calls.append(("domain", event.data["entity_id"]))
+
+    @ha.callback
+    def device_listener(event: ha.Event) -> None:
+        calls.append(("device", event.data["device_id"]))
+
+    listeners_before = hass.bus.async_listeners()
+    unsub_entity = hass.bus.async_listen_keyed(
+        EVENT_STATE_CHANGED,
+        entity_listener,
+        ha.EventListenerKey.ENTITY_ID,
+        ["light.kitchen", "switch.fan", "light.kitchen"],
+    )
+    unsub_domain = hass.bus.async_listen_keyed(
+        EVENT_STATE_CHANGED, domain_listener, ha.EventListenerKey.DOMAIN, "switch"
+    )
+    unsub_device = hass.bus.async_listen_keyed(
+        "device_event", device_listener, ha.EventListenerKey.DEVICE_ID, "abc"
+    )
+    listeners = hass.bus.async_listeners()
+    assert listeners[EVENT_STATE_CHANGED] == (
+        listeners_before.get(EVENT_STATE_CHANGED, 0) + 2
+    )
+    assert listeners["device_event"] == 1
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.bedroom", "on")
+    hass.states.async_set("switch.fan", "on")
+    hass.states.async_set("switch.other", "on")
+    hass.bus.async_fire("device_event", {"device_id": "abc"})
+    hass.bus.async_fire("device_event", {"device_id": "def"})
+    hass.bus.async_fire("device_event")
+    await hass.async_block_till_done()
+
+    assert calls == [
+        ("entity", "light.kitchen"),
+        ("entity", "switch.fan"),
+        ("domain", "switch.fan"),
+        ("domain", "switch.other"),
+        ("device", "abc"),
+    ]
+
+    unsub_entity()
+    unsub_domain()
+    unsub_device()
+    assert hass.bus.async_listeners() == listeners_before
+
+    calls.clear()
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("switch.fan", "off")
+    hass.bus.async_fire("device_event", {"device_id": "abc"})
+    await hass.async_block_till_done()
+    assert calls == []
+
+
+async def test_eventbus_keyed_listener_requires_event_type(
+    hass: HomeAssistant,
+) -> None:
+    """Test keyed listeners cannot listen to all events."""
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen_keyed(
+            MATCH_ALL,
+            ha.callback(lambda event: None),
+            ha.EventListenerKey.ENTITY_ID,
+            "light.kitchen",
+        )
+
+
+async def test_eventbus_keyed_listener_requires_keys(hass: HomeAssistant) -> None:
+    """Test keyed listeners must listen to at least one key."""
+    listeners_before = hass.bus.async_listeners()
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen_keyed(
+            EVENT_STATE_CHANGED,
+            ha.callback(lambda event: None),
+            ha.EventListenerKey.ENTITY_ID,
+            [],
+        )
+    assert hass.bus.async_listeners() == listeners_before
+
+
+async def test_eventbus_keyed_listener_invalid_keys(hass: HomeAssistant) -> None:
+    """Test events with keys which are not strings do not break keyed listeners."""
+    calls: list[tuple[str, Any]] = []
+
+    @ha.callback
+    def listener(event: ha.Event) -> None:
+        calls.append(("listener", event.data))
+
+    @ha.callback
+    def entity_listener(event: ha.Event) -> None:
+        calls.append(("entity", event.data["entity_id"]))
+
+    @ha.callback
+    def domain_listener(event: ha.Event) -> None:
+        calls.append(("domain", event.data["entity_id"]))
+
+    @ha.callback
+    def device_listener(event: ha.Event) -> None:
+        calls.append(("device", event.data["device_id"]))
+
+    hass.bus.async_listen("test_event", listener)
+    hass.bus.async_listen_keyed(
+        "test_event", entity_listener, ha.EventListenerKey.ENTITY_ID, "light.kitchen"
+    )
+    hass.bus.async_listen_keyed(
+        "test_event", domain_listener, ha.EventListenerKey.DOMAIN, "light"
+    )
+    hass.bus.async_listen_keyed(
+        "test_event", device_listener, ha.EventListenerKey.DEVICE_ID, "abc"
+    )
+
+    for data in (
+        {"entity_id": ["light.kitchen"], "device_id": ["abc"]},
+        {"entity_id": "light", "device_id": {"id": "abc"}},
+        {"entity_id": "light.kitchen", "device_id": "abc"},
+    ):
+        hass.bus.async_fire("test_event", data)
+    await hass.async_block_till_done()
+
+    assert calls == [
+        ("listener", {"entity_id": ["light.kitchen"], "device_id": ["abc"]}),
+        ("listener", {"entity_id": "light", "device_id": {"id": "abc"}}),
+        ("listener", {"entity_id": "light.kitchen", "device_id": "abc"}),
+        ("entity", "light.kitchen"),
+        ("domain", "light.kitchen"),
+        ("device", "abc"),
+    ]
+
+
+async def test_statemachine_compact_store(hass: HomeAssistant) -> None:
+    """Test the compact store shares equal attribute strings."""
+    states = ha.StateMachine(hass.bus, hass.loop)
+    states.async_enable_compact_store()
+    state_changed_events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    states.async_set(
+        "sensor.kitchen",
+        "1",
+        {**json_loads('{"unit": "kWh"}'), "rgb": [1, 2, 3], "friendly_name": "K"},
+    )
+    states.async_set("sensor.bedroom", "2", json_loads('{"unit": "kWh"}'))
+    states.async_set("sensor.porch", "3", {"effects": {"a", "b"}})
+
+    kitchen = states.get("sensor.kitchen")
+    bedroom = states.get("sensor.bedroom")
+    assert kitchen.attributes == {"unit": "kWh", "rgb": [1, 2, 3], "friendly_name": "K"}
+    assert bedroom.attributes == {"unit": "kWh"}
+    assert kitchen.attributes["unit"] is bedroom.attributes["unit"]
+    assert states.get("sensor.porch").attributes == {"effects": {"a", "b"}}
+    # The strings are shared before the state is created
+    assert kitchen.as_dict()["attributes"] is kitchen.attributes
+    assert state_changed_events[1].data["new_state"] is bedroom
+
+    # Attributes reused from the previous state are not rebuilt
+    states.async_set("sensor.kitchen", "4", dict(kitchen.attributes))
+    assert states.get("sensor.kitchen").attributes is kitchen.attributes
+    assert states.get("sensor.kitchen").state == "4"
+    assert len(states.async_all()) == 3
+    assert states.async_entity_ids("sensor") == [
+        "sensor.kitchen",
+        "sensor.bedroom",
+        "sensor.porch",
+    ]
+
+    assert states.async_remove("sensor.bedroom")
+    assert states.get("sensor.bedroom") is None
+
+
+async def test_statemachine_compact_store_memory(hass: HomeAssistant) -> None:
+    """Test the compact store lowers the memory used by the attributes."""
+    attribution = "Data provided by a weather service " * 10
+    # Parsed data holds its own copy of each string
+    attributes_json = json_dumps(
+        {"attribution": attribution, "unit_of_measurement": "°C"}
+    )
+
+    def _async_set_states(states: ha.StateMachine) -> int:
+        tracemalloc.start()
+        try:
+            for idx in range(500):
+                states.async_set(
+                    f"sensor.test_{idx}",
+                    str(idx),
+                    {**json_loads(attributes_json), "friendly_name": f"Test {idx}"},
+                )
+            return tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    states = ha.StateMachine(hass.bus, hass.loop)
+    used = _async_set_states(states)
+    compact_states = ha.StateMachine(hass.bus, hass.loop)
+    compact_states.async_enable_compact_store()
+    compact_used = _async_set_states(compact_states)
+
+    assert (
+        compact_states.get("sensor.test_0").attributes
+        == states.get("sensor.test_0").attributes
+    )
+    # Only one copy of the attribution is kept instead of one per state
+    assert used - compact_used > sys.getsizeof(attribution) * 450
+
+
+async def test_statemachine_compact_store_must_be_empty(
+    hass: HomeAssistant,
+) -> None:
+    """Test the compact store can only be enabled before states are set."""
+    hass.states.async_set("light.kitchen", "on")
+    with pytest.raises(HomeAssistantError):
+        hass.states.async_enable_compact_store()
+
+
+async def test_statemachine_shares_attributes_json(hass: HomeAssistant) -> None:
+    """Test the serialized attributes are reused when attributes do not change."""
+    hass.states.async_set("sensor.power", "1", {"unit_of_measurement": "W"})
+    state = hass.states.get("sensor.power")
+    assert json_loads(state.as_dict_json)["attributes"] == {"unit_of_measurement": "W"}
+    attributes_json = state._attributes_json_fragment
+
+    hass.states.async_set("sensor.power", "2", {"unit_of_measurement": "W"})
+    new_state = hass.states.get("sensor.power")
+    assert new_state.attributes is state.attributes
+    assert new_state._attributes_json_fragment is attributes_json
+    assert json_loads(b"{" + new_state.as_compressed_state_json + b"}") == {
+        "sensor.power": {
+            "s": "2",
+            "a": {"unit_of_measurement": "W"},
+            "c": new_state.context.id,
+            "lc": new_state.last_changed_timestamp,
+        }
+    }
+    assert json_loads(new_state.as_dict_json) == json_loads(
+        json_dumps(new_state.as_dict())
+    )
+
+    hass.states.async_set("sensor.power", "3", {"unit_of_measurement": "kW"})
+    changed_state = hass.states.get("sensor.power")
+    assert changed_state._attributes_json_fragment is not attributes_json
+    assert json_loads(changed_state.as_dict_json)["attributes"] == {
+        "unit_of_measurement": "kW"
+    }